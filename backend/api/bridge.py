@@ -1,14 +1,46 @@
 import os
 import threading
-from typing import Optional
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
 
 import webview
 
+from backend.api.event_bus import EventBus
+from backend.api.http_api import job_api
+from backend.api.segment_store import SegmentStore
 from backend.core.ai_engine import ai_engine
-from backend.core.srt_utils import save_srt
+from backend.core.checkpoint import TranscriptCheckpoint
+from backend.core.live import STDIN, LiveSession, LiveSource, open_source
+from backend.core.media_io import TimeRange, list_audio_streams, normalize_ranges
+from backend.core.pipeline import (
+    job_stages,
+    load_checkpoint,
+    save_translation_progress,
+    srt_path_for,
+    transcribe_media,
+    translate_segments,
+)
+from backend.core.segment_filter import SegmentFilter, filter_segments
+from backend.core.srt_utils import (
+    SubtitleAppender,
+    load_srt,
+    merge_segments,
+    save_srt,
+)
+from backend.core.two_pass import RefinementMerger
 from backend.core.whisper_svc import whisper_svc
 from backend.services.config_mgr import config_mgr
-from backend.services.logger import logger
+from backend.services.folder_watcher import folder_watcher
+from backend.services.job_queue import job_queue
+from backend.services.logger import in_log_context, logger
+from backend.services.metrics import metrics
+from backend.services.profiler import (
+    profiles_dir,
+    profiling,
+    profiling_enabled,
+    span,
+)
 
 
 class ApiBridge:
@@ -22,6 +54,9 @@ class ApiBridge:
         self._is_processing: bool = False
         self._cancel_flag = threading.Event()
         self._dep_cancel_flag = threading.Event()
+        self._task_lock = threading.Lock()
+        self._events = EventBus()
+        self._segments = SegmentStore()
 
     def get_app_info(self) -> dict:
         """Returns application metadata including version."""
@@ -31,9 +66,47 @@ class ApiBridge:
 
     def set_window(self, window: Optional[webview.Window]) -> None:
         """
-        Sets the webview window instance.
+        Sets the webview window instance and starts the job queue scheduler
+        (and the folder watcher and HTTP job API, if enabled).
         """
         self._window = window
+        if window is None:
+            self._events.stop()
+        else:
+            self._events.start(window.evaluate_js)
+            job_queue.start(
+                job_stages(),
+                self._notify_frontend,
+                prefetch=lambda: config_mgr.config.pipeline.prefetch,
+            )
+            self._apply_watch_config()
+            self._apply_api_config()
+
+    def _apply_api_config(self) -> None:
+        """Starts, restarts or stops the HTTP job API to match the config."""
+        if not config_mgr.config.api.enabled:
+            job_api.stop()
+            return
+        try:
+            job_api.start(job_queue)
+        except (OSError, ValueError) as e:
+            logger.error(f"job_api_start_failed: {e}")
+
+    def _apply_watch_config(self) -> None:
+        """Starts, restarts or stops the folder watcher to match the config."""
+        if config_mgr.config.watch.enabled:
+            folder_watcher.start(job_queue)
+        else:
+            folder_watcher.stop()
+
+    def _claim_processing(self) -> bool:
+        """Marks the pipeline busy; returns False if a task already holds it."""
+        with self._task_lock:
+            if self._is_processing:
+                return False
+            self._is_processing = True
+            self._cancel_flag.clear()
+            return True
 
     def check_dep_status(self) -> dict:
         """
@@ -55,7 +128,9 @@ class ApiBridge:
         """
         from backend.services.dep_mgr import dep_mgr
 
-        self._dep_cancel_flag.clear()
+        # A fresh event: a cancelled download may still be winding down
+        self._dep_cancel_flag = threading.Event()
+        cancel_event = self._dep_cancel_flag
 
         def _on_progress(progress: float, message: str):
             self._notify_frontend(
@@ -65,7 +140,7 @@ class ApiBridge:
 
         def _run_install():
             success = dep_mgr.download_deps(
-                progress_callback=_on_progress, cancel_event=self._dep_cancel_flag
+                progress_callback=_on_progress, cancel_event=cancel_event
             )
             if success:
                 self._notify_frontend(
@@ -75,10 +150,13 @@ class ApiBridge:
                     },
                 )
             else:
-                if self._dep_cancel_flag.is_set():
+                if cancel_event.is_set():
                     self._notify_frontend(
                         "dep_install_failed",
-                        {"message": "Installation cancelled by user."},
+                        {
+                            "message": "Installation cancelled by user.",
+                            "cancelled": True,
+                        },
                     )
                 else:
                     self._notify_frontend(
@@ -91,13 +169,207 @@ class ApiBridge:
 
     def cancel_install_deps(self) -> dict:
         """
-        Signals the dependency installation to cancel.
+        Signals the dependency installation to cancel; the download in
+        flight is abandoned at once and its partial file kept for resuming.
         """
+        self._dep_cancel_flag.set()
         return {"status": "cancelling"}
 
+    def get_tuning_profile(self) -> dict:
+        """
+        Returns the persisted Whisper tuning profile for the configured model.
+        """
+        from backend.services.tuner_mgr import tuner_mgr
+
+        config = config_mgr.config.whisper
+        profile = tuner_mgr.get_profile(config.model_size, config.device)
+        return {"status": "success", "profile": profile}
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the app's performance metrics: transcription real-time
+        factor and throughput, model load times, translation latency and
+        token rates, retries, fallbacks and queue depths.
+
+        Returns:
+            dict: 'metrics' maps each metric name to its type, help text and
+            values by label set (see MetricsRegistry.snapshot).
+        """
+        try:
+            return {"status": "success", "metrics": metrics.snapshot()}
+        except Exception as e:
+            logger.error(f"get_metrics_failed: {e}")
+            return {"status": "error", "message": str(e)}
+
+    def _calibration_sample(self) -> Optional[str]:
+        """Returns the media of the latest completed job that still exists."""
+        for job in job_queue.list_jobs():
+            if job["status"] == "completed" and os.path.exists(job["path"]):
+                return str(job["path"])
+        return None
+
+    def run_calibration(self, sample_path: Optional[str] = None) -> dict:
+        """
+        Benchmarks compute types and thread counts for the configured model
+        and decoding options in the background.
+
+        Holds the pipeline like a task (cancel_task stops it) and is refused
+        while the job queue is running a job, so the timings are not skewed.
+
+        Args:
+            sample_path (Optional[str]): Media whose speech is benchmarked.
+                Defaults to the latest completed job's media, then to a
+                synthetic signal.
+        """
+        if any(job["status"] == "running" for job in job_queue.list_jobs()):
+            return {
+                "status": "error",
+                "message": "Wait for the running queue jobs to finish.",
+            }
+        if not self._claim_processing():
+            return {"status": "error", "message": "A task is already running."}
+
+        def _on_progress(progress: float, message: str):
+            self._notify_frontend(
+                "calibration_progress", {"progress": progress, "message": message}
+            )
+
+        def _run_calibration():
+            try:
+                profile = whisper_svc.calibrate(
+                    sample_path or self._calibration_sample(),
+                    progress_callback=_on_progress,
+                    cancel_event=self._cancel_flag,
+                )
+            except Exception as e:
+                logger.error(f"calibration_failed: {e}", exc_info=True)
+                profile = None
+            finally:
+                self._is_processing = False
+            if profile:
+                self._notify_frontend("calibration_completed", {"profile": profile})
+            elif self._cancel_flag.is_set():
+                self._notify_frontend(
+                    "calibration_failed", {"message": "Calibration cancelled."}
+                )
+            else:
+                self._notify_frontend(
+                    "calibration_failed",
+                    {"message": "Calibration failed. Check the logs for details."},
+                )
+
+        threading.Thread(
+            target=in_log_context(_run_calibration, task_id="calibration"),
+            daemon=True,
+        ).start()
+        return {"status": "started"}
+
+    def list_models(self) -> dict:
+        """
+        Returns the models installed in the local model store.
+        """
+        from backend.services.model_store import model_store
+
+        return {"status": "success", "models": model_store.list_models()}
+
+    def _run_model_store_op(self, name: str, op) -> None:
+        """Runs a long model store operation in the background and reports it."""
+        from backend.services.model_store import model_store
+
+        def _run():
+            try:
+                entry = op()
+            except Exception as e:
+                logger.error(f"model_store_{name}_failed: {e}", exc_info=True)
+                self._notify_frontend("model_store_failed", {"message": str(e)})
+                return
+            self._notify_frontend(
+                "model_store_updated",
+                {"entry": entry, "models": model_store.list_models()},
+            )
+
+        threading.Thread(target=_run, daemon=True).start()
+
+    def _on_model_store_progress(self, progress: float, message: str) -> None:
+        self._notify_frontend(
+            "model_store_progress", {"progress": progress, "message": message}
+        )
+
+    def download_model(self, model_size: str) -> dict:
+        """
+        Downloads a model from the hub into the local model store.
+        """
+        from backend.services.model_store import model_store
+
+        self._run_model_store_op(
+            "download",
+            lambda: model_store.download(
+                model_size, progress_callback=self._on_model_store_progress
+            ),
+        )
+        return {"status": "started"}
+
+    def quantize_model(self, model_size: str, compute_type: str) -> dict:
+        """
+        Converts a model with pre-quantized weights into the local model store.
+        """
+        from backend.services.model_store import model_store
+
+        self._run_model_store_op(
+            "quantize",
+            lambda: model_store.quantize(
+                model_size,
+                compute_type,
+                progress_callback=self._on_model_store_progress,
+            ),
+        )
+        return {"status": "started"}
+
+    def import_model(
+        self, source_path: str, model_size: str, compute_type: str = "float16"
+    ) -> dict:
+        """
+        Imports a converted model from a local folder or archive.
+        """
+        from backend.services.model_store import model_store
+
+        self._run_model_store_op(
+            "import",
+            lambda: model_store.import_model(source_path, model_size, compute_type),
+        )
+        return {"status": "started"}
+
+    def remove_model(self, model_size: str, compute_type: str) -> dict:
+        """
+        Deletes a model from the local model store.
+        """
+        from backend.services.model_store import model_store
+
+        try:
+            removed = model_store.remove(model_size, compute_type)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+        if not removed:
+            return {"status": "error", "message": "Model not installed."}
+        return {"status": "success", "models": model_store.list_models()}
+
+    def benchmark_model_load(self, model_size: str, compute_type: str) -> dict:
+        """
+        Measures how long an installed model takes to load.
+        """
+        from backend.services.model_store import model_store
+        from backend.services.tuner_mgr import tuner_mgr
+
+        device = tuner_mgr.resolve_device(config_mgr.config.whisper.device)
+        self._run_model_store_op(
+            "benchmark",
+            lambda: model_store.benchmark_load(model_size, compute_type, device=device),
+        )
+        return {"status": "started"}
+
     def get_app_paths(self) -> dict:
         """
-        Returns the paths for config, logs, and libs.
+        Returns the paths for config, logs, libs, models and profile reports.
         """
         # config is stored in user_config_dir
         # But config_mgr doesn't expose the path publicly properly yet, let's reconstruct it
@@ -106,6 +378,7 @@ class ApiBridge:
 
         from backend.services.dep_mgr import dep_mgr
         from backend.services.logger import get_log_file_path
+        from backend.services.model_store import model_store
 
         config_path = os.path.join(
             user_config_dir("UniversalSub", "UniversalSub"), "config.json"
@@ -115,12 +388,14 @@ class ApiBridge:
             "config": config_path,
             "logs": get_log_file_path(),
             "libs": dep_mgr.get_lib_dir(),
+            "models": model_store.root,
+            "profiles": profiles_dir(),
         }
 
     def open_path(self, path_type: str) -> dict:
         """
         Opens the system file explorer at the requested location.
-        path_type: 'config', 'logs', 'libs'
+        path_type: 'config', 'logs', 'libs', 'models', 'profiles'
         """
         paths = self.get_app_paths()
         target = paths.get(path_type)
@@ -158,7 +433,14 @@ class ApiBridge:
         """
         Updates the application configuration.
         """
+        watch_before = config_mgr.config.watch.model_dump()
+        api_before = config_mgr.config.api.model_dump()
         config_mgr.update_config(updates)
+        if self._window is not None:
+            if config_mgr.config.watch.model_dump() != watch_before:
+                self._apply_watch_config()
+            if config_mgr.config.api.model_dump() != api_before:
+                self._apply_api_config()
         return {"status": "success", "config": config_mgr.config.model_dump()}
 
     def select_file(self) -> Optional[str]:
@@ -174,6 +456,23 @@ class ApiBridge:
         )
         return result[0] if result else None
 
+    def select_model_source(self, archive: bool = False) -> Optional[str]:
+        """
+        Opens a dialog to pick a model folder (or archive) to import.
+        """
+        if not self._window:
+            return None
+
+        if archive:
+            result = self._window.create_file_dialog(
+                webview.OPEN_DIALOG,
+                allow_multiple=False,
+                file_types=("Model archives (*.zip;*.tar;*.tar.gz;*.tgz)",),
+            )
+        else:
+            result = self._window.create_file_dialog(webview.FOLDER_DIALOG)
+        return result[0] if result else None
+
     def minimize(self) -> None:
         """Minimizes the window."""
         if self._window:
@@ -221,19 +520,67 @@ class ApiBridge:
         Detects if temporary audio or transcript files exist for the given video.
         """
         audio_path = video_path + ".temp.wav"
-        transcript_path = video_path + ".temp.json"
+        checkpoint = TranscriptCheckpoint(video_path)
+        segments, complete = checkpoint.load() if checkpoint.exists() else ([], False)
 
         return {
             "has_audio": os.path.exists(audio_path),
-            "has_transcript": os.path.exists(transcript_path),
+            "has_transcript": complete and bool(segments),
+            "has_partial_transcript": bool(segments) and not complete,
+            "resume_from": float(segments[-1]["end"]) if segments else 0.0,
         }
 
+    def list_audio_streams(self, video_path: str) -> dict:
+        """
+        Lists the audio tracks of a media file so one can be picked.
+        """
+        if not os.path.exists(video_path):
+            return {"status": "error", "message": "File not found."}
+        try:
+            streams = list_audio_streams(video_path)
+        except Exception as e:
+            logger.error(f"audio_stream_probe_failed: {e}", exc_info=True)
+            return {"status": "error", "message": str(e)}
+        return {"status": "success", "streams": streams}
+
+    def analyze_media(
+        self, video_path: str, options: Optional[dict] = None, audio_stream: int = 0
+    ) -> dict:
+        """
+        Returns cached or freshly computed speech statistics for a media file,
+        so a job can be estimated before it starts.
+        """
+        if not os.path.exists(video_path):
+            return {"status": "error", "message": "File not found."}
+        try:
+            stats = whisper_svc.analyze_media(
+                video_path, options=options, audio_stream=audio_stream
+            )
+        except Exception as e:
+            logger.error(f"media_analysis_failed: {e}", exc_info=True)
+            return {"status": "error", "message": str(e)}
+        return {"status": "success", **stats}
+
     def start_task(
-        self, video_path: str, target_lang: str = "Chinese", resume_mode: str = "fresh"
+        self,
+        video_path: str,
+        target_lang: str = "Chinese",
+        resume_mode: str = "fresh",
+        options: Optional[dict] = None,
+        time_ranges: Optional[list] = None,
+        audio_stream: int = 0,
+        profile: Optional[bool] = None,
     ) -> dict:
         """
         Starts the subtitle generation process.
         resume_mode: 'fresh', 'use_audio', 'use_transcript'
+        ('use_transcript' continues transcription mid-file if the checkpoint is partial)
+        options: per-job decoding overrides, e.g. {"preset": "draft", "beam_size": 2}
+        time_ranges: [[start, end], ...] in seconds; only these parts are
+        transcribed and merged into the existing transcript and SRT
+        audio_stream: index among the file's audio tracks
+        profile: write a profile report for this task (None = profiling.enabled);
+        a 'profile_ready' event carries its folder
         """
         if self._is_processing:
             return {"status": "error", "message": "A task is already running."}
@@ -241,26 +588,91 @@ class ApiBridge:
         if not os.path.exists(video_path):
             return {"status": "error", "message": "File not found."}
 
-        self._is_processing = True
-        self._cancel_flag.clear()
+        try:
+            ranges = normalize_ranges(time_ranges)
+        except (TypeError, ValueError) as e:
+            return {"status": "error", "message": f"Invalid time ranges: {e}"}
+        if ranges is not None and not ranges:
+            return {"status": "error", "message": "Time ranges are empty."}
+
+        if not self._claim_processing():
+            return {"status": "error", "message": "A task is already running."}
+        task_id = uuid.uuid4().hex[:8]
+        run = self._run_task
+        if profiling_enabled(profile):
+            run = self._profiled(run, f"{os.path.basename(video_path)}-{task_id}")
         threading.Thread(
-            target=self._run_task,
-            args=(video_path, target_lang, resume_mode),
+            target=in_log_context(run, task_id=task_id),
+            args=(video_path, target_lang, resume_mode, options, ranges, audio_stream),
             daemon=True,
         ).start()
-        return {"status": "started"}
+        return {"status": "started", "task_id": task_id}
+
+    def _profiled(self, fn: Callable[..., None], label: str) -> Callable[..., None]:
+        """Wraps a task so it is profiled and its report announced to the UI."""
+
+        def _run(*args: Any) -> None:
+            with profiling(label) as profiler:
+                fn(*args)
+            if profiler is not None and profiler.report_path:
+                self._notify_frontend(
+                    "profile_ready", {"path": profiler.report_path, "label": label}
+                )
 
-    def _run_task(self, video_path: str, target_lang: str, resume_mode: str) -> None:
+        return _run
+
+    def _run_task(
+        self,
+        video_path: str,
+        target_lang: str,
+        resume_mode: str,
+        options: Optional[dict] = None,
+        time_ranges: Optional[List[TimeRange]] = None,
+        audio_stream: int = 0,
+    ) -> None:
         """
         Inner method to run the transcription and translation flow with resume support.
         """
+        started = time.monotonic()
+        outcome = "failed"
         try:
             audio_path = video_path + ".temp.wav"
-            transcript_path = video_path + ".temp.json"
-            segments = []
+            checkpoint = TranscriptCheckpoint(video_path)
+            segments: List[Dict[str, Any]] = []
+            complete = False
+
+            if time_ranges:
+                with span("selective"):
+                    self._run_selective(
+                        video_path,
+                        target_lang,
+                        dict(options or {}),
+                        time_ranges,
+                        audio_stream,
+                        checkpoint,
+                    )
+                outcome = "completed"
+                return
+
+            job_options = dict(options or {})
+            two_pass = job_options.pop("two_pass", config_mgr.config.whisper.two_pass)
+            if resume_mode == "use_transcript":
+                checkpoint, segments, complete = load_checkpoint(
+                    video_path, job_options, audio_stream
+                )
+            else:
+                checkpoint.reset()
+
+            if two_pass and not segments:
+                with span("two_pass"):
+                    completed = self._run_two_pass(
+                        video_path, target_lang, job_options, checkpoint, audio_stream
+                    )
+                outcome = "completed" if completed else "no_speech"
+                return
 
             # --- STEP 1: Transcription ---
-            if resume_mode == "use_transcript" and os.path.exists(transcript_path):
+            if complete:
                 logger.info("resuming_from_transcript_cache")
                 self._notify_frontend(
                     "status_update",
@@ -270,43 +682,44 @@ class ApiBridge:
                         "stage": "transcribing",
                     },
                 )
-                import json
-
-                with open(transcript_path, "r", encoding="utf-8") as f:
-                    segments = json.load(f)
             else:
 
+                tracker = whisper_svc.progress_tracker(job_options)
+
                 def _status_cb(msg: str, stage: str = "loading_model"):
                     self._notify_frontend(
                         "status_update",
                         {"message": msg, "progress": 15, "stage": stage},
                     )
 
+                def _on_segment(segment: Dict[str, Any], count: int) -> None:
+                    self._notify_frontend(
+                        "status_update",
+                        {
+                            "message": f"Transcribed {count} segments...",
+                            "stage": "transcribing",
+                            **tracker.status(20, 45),
+                        },
+                    )
+
                 # Directly transcribe the video file
                 input_media = (
                     audio_path
                     if (resume_mode == "use_audio" and os.path.exists(audio_path))
                     else video_path
                 )
-
-                # Check for cancellation before starting
-                if self._cancel_flag.is_set():
-                    raise InterruptedError("cancelled_by_user")
-
-                for segment in whisper_svc.transcribe(
-                    input_media, status_callback=_status_cb
-                ):
-                    if self._cancel_flag.is_set():
-                        raise InterruptedError("cancelled_by_user")
-                    segments.append(segment)
-                    progress = min(20 + len(segments), 60)
-                    self._notify_frontend(
-                        "status_update",
-                        {
-                            "message": f"Transcribed {len(segments)} segments...",
-                            "progress": progress,
-                            "stage": "transcribing",
-                        },
+                with span("transcribe"):
+                    segments = transcribe_media(
+                        video_path,
+                        checkpoint,
+                        segments,
+                        input_media=input_media,
+                        options=job_options,
+                        audio_stream=audio_stream,
+                        cancel_event=self._cancel_flag,
+                        status_callback=_status_cb,
+                        segment_callback=_on_segment,
+                        progress_callback=tracker.update,
                     )
 
                 if not segments:
@@ -315,25 +728,24 @@ class ApiBridge:
                         "task_failed",
                         {"message": "No speech detected in this media file."},
                     )
+                    outcome = "no_speech"
                     return
+                tracker.finish()
 
-                # Save checkpoint for source segments
-                self._notify_frontend(
-                    "status_update",
-                    {
-                        "message": "Transcription finished, saving checkpoint...",
-                        "progress": 65,
-                        "stage": "transcribing",
-                    },
-                )
-                try:
-                    import json
-
-                    with open(transcript_path, "w", encoding="utf-8") as f:
-                        json.dump(segments, f, ensure_ascii=False, indent=2)
-                    logger.info("transcript_checkpoint_saved")
-                except Exception as ex:
-                    logger.error(f"failed_to_save_checkpoint: {ex}")
+            # Drop hallucination loops and junk before paying to translate them
+            transcript = segments
+            filter_stats = None
+            filter_options = config_mgr.config.whisper.segment_filter
+            if filter_options.enabled:
+                with span("filter"):
+                    segments, filter_stats = filter_segments(segments, filter_options)
+                if not segments:
+                    self._notify_frontend(
+                        "task_failed",
+                        {"message": "No speech detected in this media file."},
+                    )
+                    outcome = "no_speech"
+                    return
 
             # --- STEP 3: Translation ---
             if self._cancel_flag.is_set():
@@ -342,30 +754,12 @@ class ApiBridge:
                 "status_update",
                 {"message": "Translating...", "progress": 70, "stage": "translating"},
             )
-            batch_size = config_mgr.config.ai.batch_size
-            results = []
-
-            for i in range(0, len(segments), batch_size):
-                if self._cancel_flag.is_set():
-                    raise InterruptedError("cancelled_by_user")
-                batch = segments[i : i + batch_size]
-                texts = [s["text"] for s in batch]
-                translations = ai_engine.translate_batch(texts, target_lang)
-
-                for j, trans in enumerate(translations):
-                    if j < len(batch):
-                        batch[j]["translated_text"] = trans
-
-                results.extend(batch)
-                progress = 70 + int((i / len(segments)) * 25)
-                self._notify_frontend(
-                    "status_update",
-                    {
-                        "message": f"Translated {len(results)}/{len(segments)}...",
-                        "progress": progress,
-                        "stage": "translating",
-                    },
-                )
+            try:
+                with span("translate"):
+                    results = self._translate_segments(segments, target_lang)
+            except InterruptedError:
+                save_translation_progress(video_path, transcript)
+                raise
 
             # --- STEP 4: Save SRT ---
             if self._cancel_flag.is_set():
@@ -375,24 +769,23 @@ class ApiBridge:
                 {"message": "Saving SRT file...", "progress": 95, "stage": "saving"},
             )
 
-            # Generate SRT path: video.mp4 -> video.srt or video.zh.srt
-            base_path = os.path.splitext(video_path)[0]
-            # Use a language suffix if possible, or just .srt
-            srt_path = f"{base_path}.srt"
-
-            try:
-                save_srt(results, srt_path)
-                logger.info(f"srt_saved_successfully: {srt_path}")
-            except Exception as se:
-                logger.error(f"failed_to_save_srt: {se}")
+            with span("save"):
+                srt_path = self._save_results(video_path, results)
 
             # 5. Finalize
             self._notify_frontend(
-                "task_completed", {"segments": results, "srt_path": srt_path}
+                "task_completed",
+                {
+                    **self._set_segments(results),
+                    "srt_path": srt_path,
+                    "filter_stats": filter_stats,
+                },
             )
+            outcome = "completed"
 
         except InterruptedError:
             logger.info("task_cancelled_successfully")
+            outcome = "cancelled"
             self._notify_frontend(
                 "task_failed", {"message": "Task cancelled by user", "cancelled": True}
             )
@@ -401,16 +794,616 @@ class ApiBridge:
             self._notify_frontend("task_failed", {"message": str(e)})
         finally:
             self._is_processing = False
+            metrics.counter("unisub_tasks_total", "GUI tasks by outcome").inc(
+                outcome=outcome
+            )
+            metrics.histogram("unisub_task_seconds", "GUI task wall time").observe(
+                time.monotonic() - started, outcome=outcome
+            )
+
+    def _translate_segments(
+        self,
+        segments: list,
+        target_lang: str,
+        progress_start: int = 70,
+        progress_span: int = 25,
+        channel: Optional[str] = None,
+    ) -> list:
+        """
+        Translates segments in batches, filling 'translated_text' in place.
+        """
+        tracker = ai_engine.progress_tracker()
+
+        def _on_progress(done: int, total: int) -> None:
+            tracker.update(done, total)
+            status = {
+                "message": f"Translated {done}/{total}...",
+                "stage": "translating",
+                **tracker.status(progress_start, progress_span),
+            }
+            if channel:
+                status["channel"] = channel
+            self._notify_frontend("status_update", status)
+
+        results = translate_segments(
+            segments, target_lang, self._cancel_flag, progress_callback=_on_progress
+        )
+        tracker.finish()
+        return results
+
+    def _save_results(self, video_path: str, results: list) -> str:
+        """
+        Writes the SRT next to the video and returns its path.
+        """
+        srt_path = srt_path_for(video_path)
+
+        try:
+            save_srt(results, srt_path)
+            logger.info(f"srt_saved_successfully: {srt_path}")
+        except Exception as se:
+            logger.error(f"failed_to_save_srt: {se}")
+        return srt_path
+
+    def _run_two_pass(
+        self,
+        video_path: str,
+        target_lang: str,
+        options: dict,
+        checkpoint: TranscriptCheckpoint,
+        audio_stream: int = 0,
+    ) -> bool:
+        """
+        Draft pass with a small model that is translated and shown at once,
+        then a background refinement pass that replaces segments as it goes
+        and only re-translates segments whose text changed.
+
+        Returns:
+            bool: False if the draft found no speech.
+        """
+        draft_preset = config_mgr.config.whisper.draft_preset
+        draft_options = {**options, "preset": draft_preset}
+
+        def _draft_status_cb(msg: str, stage: str = "loading_model"):
+            self._notify_frontend(
+                "status_update",
+                {"message": msg, "progress": 5, "stage": stage, "channel": "draft"},
+            )
+
+        def _refine_status_cb(msg: str, stage: str = "loading_model"):
+            self._notify_frontend(
+                "status_update",
+                {"message": msg, "progress": 0, "stage": stage, "channel": "refine"},
+            )
+
+        # --- Pass 1: Draft ---
+        draft = []
+        draft_tracker = whisper_svc.progress_tracker(draft_options)
+        for segment in whisper_svc.transcribe(
+            video_path,
+            status_callback=_draft_status_cb,
+            options=draft_options,
+            cancel_event=self._cancel_flag,
+            audio_stream=audio_stream,
+            progress_callback=draft_tracker.update,
+        ):
+            if self._cancel_flag.is_set():
+                raise InterruptedError("cancelled_by_user")
+            draft.append(segment)
+            self._notify_frontend(
+                "status_update",
+                {
+                    "message": f"Draft: {len(draft)} segments...",
+                    "stage": "transcribing",
+                    "channel": "draft",
+                    **draft_tracker.status(10, 20),
+                },
+            )
+
+        if self._cancel_flag.is_set():
+            raise InterruptedError("cancelled_by_user")
+        if draft:
+            draft_tracker.finish()
+
+        filter_options = config_mgr.config.whisper.segment_filter
+        if filter_options.enabled:
+            draft, _ = filter_segments(draft, filter_options)
+
+        if not draft:
+            logger.warning("no_speech_detected")
+            self._notify_frontend(
+                "task_failed", {"message": "No speech detected in this media file."}
+            )
+            return False
+
+        # The refinement model decodes while the draft is being translated
+        refine_tracker = whisper_svc.progress_tracker(options)
+        settings = whisper_svc.transcript_settings(options, audio_stream)
+
+        def _on_refine_model(model_size: str, compute_type: str) -> None:
+            # Recorded in the checkpoint header; may be a downgraded model
+            settings["model"] = model_size
+
+        job = whisper_svc.refine_in_background(
+            video_path,
+            options=options,
+            status_callback=_refine_status_cb,
+            cancel_event=self._cancel_flag,
+            audio_stream=audio_stream,
+            progress_callback=refine_tracker.update,
+            model_callback=_on_refine_model,
+        )
+
+        try:
+            self._translate_segments(
+                draft, target_lang, progress_start=30, progress_span=20, channel="draft"
+            )
+            srt_path = self._save_results(video_path, draft)
+            self._notify_frontend(
+                "draft_ready", {**self._set_segments(draft), "srt_path": srt_path}
+            )
+            logger.info(f"two_pass_draft_ready: {len(draft)} segments")
+
+            # --- Pass 2: Refinement ---
+            merger = RefinementMerger(draft)
+            refine_filter = (
+                SegmentFilter(filter_options) if filter_options.enabled else None
+            )
+            refined: list = []
+            # What the UI shows: refined segments plus the draft past the frontier
+            shown = list(draft)
+            checkpoint.reset()
+            try:
+                for batch in job.batches(config_mgr.config.ai.batch_size):
+                    if self._cancel_flag.is_set():
+                        raise InterruptedError("cancelled_by_user")
+                    frontier = batch[-1]["end"]
+                    # The model was reported before its first segment
+                    checkpoint.open(settings)
+                    for seg in batch:
+                        checkpoint.append(seg)
+                    if refine_filter is not None:
+                        batch = [seg for seg in batch if refine_filter.accept(seg)]
+                    changed = [seg for seg in batch if merger.merge(seg)]
+                    if changed:
+                        translations = ai_engine.translate_batch(
+                            [seg["text"] for seg in changed],
+                            target_lang,
+                            cancel_event=self._cancel_flag,
+                        )
+                        for seg, trans in zip(changed, translations):
+                            seg["translated_text"] = trans
+                    refined.extend(batch)
+                    refined_ids = {id(seg) for seg in refined}
+                    shown = sorted(
+                        [
+                            seg
+                            for seg in shown
+                            if id(seg) in refined_ids
+                            or (seg["start"] + seg["end"]) / 2 >= frontier
+                        ]
+                        + batch,
+                        key=lambda seg: seg["start"],
+                    )
+
+                    self._notify_frontend(
+                        "segments_refined",
+                        {**self._set_segments(shown), "frontier": frontier},
+                    )
+                    self._notify_frontend(
+                        "status_update",
+                        {
+                            "message": f"Refined {len(refined)} segments...",
+                            "stage": "refining",
+                            "channel": "refine",
+                            **refine_tracker.status(50, 45),
+                        },
+                    )
+            finally:
+                checkpoint.close()
+
+            if self._cancel_flag.is_set():
+                raise InterruptedError("cancelled_by_user")
+
+            logger.info(
+                f"two_pass_refinement_completed: reused={merger.reused}, retranslated={merger.changed}"
+            )
+            if not refined:
+                # Refinement found nothing; keep the draft rather than an empty file
+                refined = draft
+            else:
+                checkpoint.mark_complete()
+                refine_tracker.finish()
+
+            srt_path = self._save_results(video_path, refined)
+            self._notify_frontend(
+                "task_completed",
+                {
+                    **self._set_segments(refined),
+                    "srt_path": srt_path,
+                    "filter_stats": refine_filter.stats if refine_filter else None,
+                },
+            )
+            return True
+        finally:
+            # Stops the refinement if anything above failed; it holds a model
+            # slot and no later task can cancel it through the task's event
+            job.cancel()
+            job.join()
+
+    def _run_selective(
+        self,
+        video_path: str,
+        target_lang: str,
+        options: dict,
+        ranges: List[TimeRange],
+        audio_stream: int,
+        checkpoint: TranscriptCheckpoint,
+    ) -> None:
+        """
+        Re-transcribes only the given time ranges and splices the result into
+        the existing transcript checkpoint and SRT, leaving the rest untouched.
+        """
+        options.pop("two_pass", None)
+
+        def _status_cb(msg: str, stage: str = "loading_model"):
+            self._notify_frontend(
+                "status_update", {"message": msg, "progress": 15, "stage": stage}
+            )
+
+        raw: List[Dict[str, Any]] = []
+        tracker = whisper_svc.progress_tracker(options)
+        for segment in whisper_svc.transcribe(
+            video_path,
+            status_callback=_status_cb,
+            options=options,
+            cancel_event=self._cancel_flag,
+            time_ranges=[list(r) for r in ranges],
+            audio_stream=audio_stream,
+            progress_callback=tracker.update,
+        ):
+            if self._cancel_flag.is_set():
+                raise InterruptedError("cancelled_by_user")
+            raw.append(segment)
+            self._notify_frontend(
+                "status_update",
+                {
+                    "message": f"Transcribed {len(raw)} segments...",
+                    "stage": "transcribing",
+                    **tracker.status(20, 45),
+                },
+            )
+
+        if self._cancel_flag.is_set():
+            raise InterruptedError("cancelled_by_user")
+        logger.info(f"selected_ranges_transcribed: {len(raw)} segments, {ranges}")
+
+        segments = list(raw)
+        filter_stats = None
+        filter_options = config_mgr.config.whisper.segment_filter
+        if filter_options.enabled:
+            segments, filter_stats = filter_segments(segments, filter_options)
+
+        self._notify_frontend(
+            "status_update",
+            {"message": "Translating...", "progress": 70, "stage": "translating"},
+        )
+        segments = self._translate_segments(segments, target_lang)
+
+        # Splice into the transcript cache so a later full resume stays consistent
+        transcript: List[Dict[str, Any]] = []
+        if checkpoint.exists():
+            transcript, complete = checkpoint.load()
+            if complete:
+                transcript = merge_segments(transcript, raw, ranges)
+                checkpoint.replace(transcript, complete=True)
+
+        srt_path = srt_path_for(video_path)
+        existing = load_srt(srt_path, transcript) if os.path.exists(srt_path) else []
+        merged = merge_segments(existing, segments, ranges)
+        srt_path = self._save_results(video_path, merged)
+        logger.info(f"selected_ranges_merged: {len(segments)} new, {len(merged)} total")
+
+        self._notify_frontend(
+            "task_completed",
+            {
+                **self._set_segments(merged),
+                "srt_path": srt_path,
+                "filter_stats": filter_stats,
+                "ranges": ranges,
+            },
+        )
+
+    def _set_segments(self, segments: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Makes segments the result list the UI pages through and returns the
+        counts that events carry instead of the segments themselves.
+        """
+        version = self._segments.replace(segments)
+        return {"total": len(segments), "version": version}
+
+    def get_segments(self, offset: int = 0, limit: int = 100) -> dict:
+        """
+        Returns a page of the current task's segments.
+
+        Args:
+            offset (int): Index of the first segment.
+            limit (int): Page size (at most 1000).
+
+        Returns:
+            dict: 'segments', 'offset', 'total' and 'version'.
+        """
+        try:
+            return {"status": "success", **self._segments.page(offset, limit)}
+        except (TypeError, ValueError) as e:
+            return {"status": "error", "message": str(e)}
+
+    def get_segments_since(
+        self, version: int, offset: int = 0, limit: Optional[int] = None
+    ) -> dict:
+        """
+        Returns the segments that changed after a version, within the
+        window [offset, offset + limit) the UI has loaded.
+
+        Args:
+            version (int): The last version the UI applied.
+            offset (int): First index of the loaded window.
+            limit (Optional[int]): Size of the loaded window.
+
+        Returns:
+            dict: 'changes' ({index, segment} items), 'total' and 'version'.
+        """
+        try:
+            return {
+                "status": "success",
+                **self._segments.since(version, offset, limit),
+            }
+        except (TypeError, ValueError) as e:
+            return {"status": "error", "message": str(e)}
+
+    def select_files(self) -> List[str]:
+        """
+        Opens a dialog to pick several media files for the job queue.
+        """
+        if not self._window:
+            return []
+
+        file_types = ("Video files (*.mp4;*.mkv;*.avi)", "All files (*.*)")
+        result = self._window.create_file_dialog(
+            webview.OPEN_DIALOG, allow_multiple=True, file_types=file_types
+        )
+        return list(result) if result else []
+
+    def select_folder(self) -> Optional[str]:
+        """
+        Opens a dialog to pick a folder whose media files are queued.
+        """
+        if not self._window:
+            return None
+
+        result = self._window.create_file_dialog(webview.FOLDER_DIALOG)
+        return result[0] if result else None
+
+    def enqueue_jobs(
+        self,
+        paths: List[str],
+        target_lang: str = "Chinese",
+        options: Optional[dict] = None,
+        priority: int = 0,
+        audio_stream: int = 0,
+    ) -> dict:
+        """
+        Adds files (folders are expanded to the media files they contain) to
+        the persistent job queue.
+        """
+        jobs = job_queue.enqueue(paths, target_lang, options, priority, audio_stream)
+        if not jobs:
+            return {"status": "error", "message": "No media files found."}
+        return {"status": "success", "jobs": jobs}
+
+    def list_jobs(self) -> dict:
+        """
+        Returns all queued, running and finished jobs and whether the queue
+        is paused.
+        """
+        return {"status": "success", **job_queue.snapshot()}
+
+    def pause_queue(self) -> dict:
+        """
+        Stops starting new jobs; the running job is allowed to finish.
+        """
+        job_queue.set_paused(True)
+        return {"status": "success"}
+
+    def resume_queue(self) -> dict:
+        """
+        Resumes starting queued jobs.
+        """
+        job_queue.set_paused(False)
+        return {"status": "success"}
+
+    def update_job(self, job_id: str, action: str, value: int = 0) -> dict:
+        """
+        Changes one job.
+        action: 'pause', 'resume', 'retry', 'remove', 'cancel' (a running job),
+        'move' (value = new index among pending jobs of its priority) or
+        'priority' (value = priority)
+        """
+        actions = {
+            "cancel": lambda: job_queue.cancel_job(job_id),
+            "pause": lambda: job_queue.pause_job(job_id),
+            "resume": lambda: job_queue.resume_job(job_id),
+            "retry": lambda: job_queue.retry_job(job_id),
+            "remove": lambda: job_queue.remove_job(job_id),
+            "move": lambda: job_queue.move_job(job_id, int(value)),
+            "priority": lambda: job_queue.set_priority(job_id, int(value)),
+        }
+        if action not in actions:
+            return {"status": "error", "message": f"Unknown action: {action}"}
+        if not actions[action]():
+            return {"status": "error", "message": f"Cannot {action} this job now."}
+        return {"status": "success"}
+
+    def clear_finished_jobs(self) -> dict:
+        """
+        Removes completed, failed and cancelled jobs from the queue.
+        """
+        return {"status": "success", "removed": job_queue.clear_finished()}
+
+    def get_watch_status(self) -> dict:
+        """
+        Returns the hot-folder watcher state and counters.
+        """
+        return {"status": "success", **folder_watcher.status()}
+
+    def start_live(
+        self,
+        source: str,
+        target_lang: str = "Chinese",
+        output_path: Optional[str] = None,
+        input_format: str = "auto",
+        audio_stream: int = 0,
+        options: Optional[dict] = None,
+    ) -> dict:
+        """
+        Starts live subtitling of a file that is still being recorded, a named
+        pipe, or '-' for stdin (raw s16le mono 16 kHz PCM).
+        Committed segments are translated and appended to the subtitle file
+        as they are decoded; cancel_task stops the session.
+        """
+        if self._is_processing:
+            return {"status": "error", "message": "A task is already running."}
+        if source != STDIN and not os.path.exists(source):
+            return {"status": "error", "message": "File not found."}
+
+        live_options = config_mgr.config.whisper.live
+        try:
+            live_source = open_source(source, input_format, audio_stream, live_options)
+            if output_path is None:
+                if source == STDIN:
+                    output_path = os.path.join(
+                        config_mgr.config.app.output_dir,
+                        f"live-{time.strftime('%Y%m%d-%H%M%S')}",
+                    )
+                else:
+                    output_path = os.path.splitext(source)[0] + ".live"
+                output_path += f".{live_options.subtitle_format}"
+            appender = SubtitleAppender(output_path, live_options.subtitle_format)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+
+        if not self._claim_processing():
+            return {"status": "error", "message": "A task is already running."}
+        self._segments.clear()
+        threading.Thread(
+            target=in_log_context(self._run_live, task_id=uuid.uuid4().hex[:8]),
+            args=(live_source, target_lang, appender, dict(options or {})),
+            daemon=True,
+        ).start()
+        return {"status": "started", "output_path": output_path}
+
+    def _run_live(
+        self,
+        live_source: LiveSource,
+        target_lang: str,
+        appender: SubtitleAppender,
+        options: dict,
+    ) -> None:
+        """
+        Runs a live session and streams committed and tentative segments to
+        the frontend.
+        """
+        live_options = config_mgr.config.whisper.live
+        options.setdefault("preset", live_options.preset)
+
+        def _status_cb(msg: str, stage: str = "loading_model"):
+            self._notify_frontend(
+                "status_update", {"message": msg, "progress": 10, "stage": stage}
+            )
+
+        filter_options = config_mgr.config.whisper.segment_filter
+        session = LiveSession(
+            live_source,
+            transcribe_fn=lambda audio, prompt: whisper_svc.transcribe_audio(
+                audio, options, prompt, _status_cb
+            ),
+            translate_fn=lambda texts: ai_engine.translate_batch(
+                texts, target_lang, cancel_event=self._cancel_flag
+            ),
+            appender=appender,
+            options=live_options,
+            cancel_event=self._cancel_flag,
+            segment_filter=(
+                SegmentFilter(filter_options) if filter_options.enabled else None
+            ),
+            batch_size=config_mgr.config.ai.batch_size,
+        )
+
+        def _on_commit(batch: List[Dict[str, Any]]) -> None:
+            # Only the new segments travel; the UI shows the newest ones
+            version = self._segments.append(batch)
+            self._notify_frontend(
+                "live_segments",
+                {
+                    "segments": batch,
+                    "latency": session.latency_stats(),
+                    "total": self._segments.total,
+                    "version": version,
+                },
+            )
+            self._notify_frontend(
+                "status_update",
+                {
+                    "message": f"Live: {len(session.segments)} segments written",
+                    "progress": 50,
+                    "stage": "live",
+                },
+            )
+
+        def _on_tentative(tentative: List[Dict[str, Any]]) -> None:
+            self._notify_frontend("live_tentative", {"segments": tentative})
+
+        session.on_commit = _on_commit
+        session.on_tentative = _on_tentative
+
+        try:
+            self._notify_frontend(
+                "status_update",
+                {"message": "Waiting for audio...", "progress": 5, "stage": "live"},
+            )
+            stats = session.run()
+            if self._cancel_flag.is_set():
+                raise InterruptedError("cancelled_by_user")
+            self._notify_frontend(
+                "task_completed",
+                {
+                    "total": self._segments.total,
+                    "version": self._segments.version,
+                    "srt_path": appender.path,
+                    "live_stats": stats,
+                },
+            )
+        except InterruptedError:
+            logger.info("live_session_cancelled")
+            self._notify_frontend(
+                "task_failed",
+                {
+                    "message": "Live session stopped",
+                    "cancelled": True,
+                    "srt_path": appender.path,
+                },
+            )
+        except Exception as e:
+            logger.error(f"live_session_failed: {e}", exc_info=True)
+            self._notify_frontend("task_failed", {"message": str(e)})
+        finally:
+            self._is_processing = False
 
     def _notify_frontend(self, event_name: str, data: dict) -> None:
         """
         Sends an event notification to the frontend via JS.
+
+        Events are queued on the event bus, which delivers them from its own
+        thread and coalesces progress updates (see EventBus).
         """
         if self._window:
-            # We assume a global function 'onBackendEvent' exists in JS
-            import json
-
-            payload = json.dumps(data)
-            self._window.evaluate_js(
-                f"window.onBackendEvent('{event_name}', {payload})"
-            )
+            self._events.publish(event_name, data)
@@ -0,0 +1,169 @@
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.services.config_mgr import config_mgr
+from backend.services.logger import logger
+from backend.services.metrics import metrics
+
+# Progress events: only the latest one per key is worth showing
+LATEST_WINS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "status_update": lambda data: data.get("channel"),
+    "job_progress": lambda data: data.get("job_id"),
+    "queue_updated": lambda data: None,
+    "live_tentative": lambda data: None,
+    "segments_refined": lambda data: None,
+    "calibration_progress": lambda data: None,
+    "dep_install_progress": lambda data: None,
+    "model_store_progress": lambda data: None,
+}
+# Segment deltas: pending batches are concatenated, other fields take the latest
+APPENDED = ("live_segments",)
+
+# Pending event: [name, coalescing key, data (ordered events: already JSON)]
+_Entry = List[Any]
+
+
+class EventBus:
+    """
+    Delivers backend events to the UI from a dedicated thread, at most
+    app.ui_event_rate times per second.
+
+    Between two deliveries, progress events are coalesced (only the latest
+    per job/channel is kept) and segment deltas are merged into one message.
+    Every other event (task_completed, task_failed, ...) is delivered exactly
+    once, in order, and without waiting for the next tick. All pending events
+    go to the UI in a single script evaluation.
+    """
+
+    def __init__(self) -> None:
+        self._send: Optional[Callable[[str], Any]] = None
+        self._pending: List[_Entry] = []
+        # Coalescing key -> pending entry, since the last ordered event
+        self._open: Dict[Tuple[str, Any], _Entry] = {}
+        self._urgent = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.stats = {"published": 0, "delivered": 0, "flushes": 0}
+        metrics.add_collector(self._collect_metrics)
+
+    def _collect_metrics(self) -> None:
+        metrics.gauge(
+            "unisub_ui_events_pending", "UI events waiting for the next delivery"
+        ).set(len(self._pending))
+
+    def start(self, send: Callable[[str], Any]) -> None:
+        """
+        Starts the delivery thread.
+
+        Args:
+            send (Callable[[str], Any]): Evaluates a script in the UI
+                (e.g. window.evaluate_js).
+        """
+        with self._cond:
+            self._send = send
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="ui-events", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Delivers what is pending and stops the thread."""
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def publish(self, event: str, data: Dict[str, Any]) -> None:
+        """
+        Queues an event for the UI; never blocks on the UI.
+
+        Args:
+            event (str): Event name passed to window.onBackendEvent.
+            data (Dict[str, Any]): JSON-serialisable payload.
+        """
+        ordered = event not in LATEST_WINS and event not in APPENDED
+        payload: Any = data
+        if ordered:
+            # Encoded now: the caller may keep mutating what it sent
+            try:
+                payload = json.dumps(data)
+            except (TypeError, ValueError) as e:
+                logger.error(f"ui_event_not_serializable: {event}: {e}")
+                return
+        with self._cond:
+            self.stats["published"] += 1
+            if not ordered:
+                key_fn = LATEST_WINS.get(event)
+                key = (event, key_fn(data) if key_fn else None)
+                previous = self._open.pop(key, None)
+                if previous is not None:
+                    self._pending.remove(previous)
+                    if event in APPENDED:
+                        data = {
+                            **data,
+                            "segments": previous[2]["segments"] + data["segments"],
+                        }
+                # Move to the end so it still follows what it supersedes
+                entry = [event, key, data]
+                self._open[key] = entry
+                self._pending.append(entry)
+            else:
+                # Later progress must not be merged into events sent before it
+                self._pending.append([event, None, payload])
+                self._open.clear()
+                self._urgent = True
+            self._cond.notify()
+
+    def _take(self) -> List[_Entry]:
+        pending, self._pending = self._pending, []
+        self._open.clear()
+        self._urgent = False
+        return pending
+
+    def _run(self) -> None:
+        last_flush = 0.0
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                interval = 1.0 / max(config_mgr.config.app.ui_event_rate, 0.1)
+                # Wait out the rest of the interval unless an ordered event arrived
+                while self._running and not self._urgent:
+                    remaining = last_flush + interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._take()
+                send = self._send
+                running = self._running
+            if batch and send is not None:
+                self._deliver(send, batch)
+                last_flush = time.monotonic()
+            if not running:
+                return
+
+    def _deliver(self, send: Callable[[str], Any], batch: List[_Entry]) -> None:
+        calls = []
+        for event, key, data in batch:
+            try:
+                payload = data if key is None else json.dumps(data)
+            except (TypeError, ValueError, RuntimeError) as e:
+                logger.error(f"ui_event_not_serializable: {event}: {e}")
+                continue
+            calls.append(f"window.onBackendEvent({json.dumps(event)}, {payload});")
+        try:
+            send("".join(calls))
+        except Exception as e:
+            # The window may be closing; nothing else to deliver to
+            logger.debug(f"ui_event_delivery_failed: {e}")
+            return
+        self.stats["delivered"] += len(calls)
+        self.stats["flushes"] += 1
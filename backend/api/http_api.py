@@ -0,0 +1,455 @@
+import hmac
+import ipaddress
+import json
+import os
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from backend.core.srt_utils import load_srt
+from backend.services.config_mgr import config_mgr
+from backend.services.job_queue import (
+    FINISHED_STATUSES,
+    JobQueue,
+    expand_media_paths,
+)
+from backend.services.logger import logger
+from backend.services.metrics import metrics
+
+# Events buffered per SSE client before the slowest ones start losing events
+SSE_BUFFER = 1000
+# Seconds between SSE keep-alive comments
+SSE_KEEPALIVE = 15.0
+# Request bodies must be JSON, which browsers cannot send cross-origin
+# without a preflight this server never answers
+JSON_CONTENT_TYPE = "application/json"
+# Host names a client on this machine uses; any other Host header without a
+# token may be a DNS-rebound name of an attacker's page
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+def is_loopback(host: str) -> bool:
+    """True if the address or name only reaches this machine."""
+    if host.strip("[]") in LOOPBACK_HOSTS:
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes requests to the JobApiServer that owns the HTTP server."""
+
+    server: "_Server"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("job_api_request: %s " + format, self.address_string(), *args)
+
+    def reply_json(
+        self, status: int, data: Any, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def reply_error(self, status: int, message: str, **extra: Any) -> None:
+        self.reply_json(status, {"status": "error", "message": message, **extra})
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        data = json.loads(self.rfile.read(length).decode("utf-8"))
+        if not isinstance(data, dict):
+            raise ValueError("request body must be a JSON object")
+        return data
+
+    def _authorized(self) -> bool:
+        token = config_mgr.config.api.token
+        if not token:
+            return True
+        header = self.headers.get("Authorization", "")
+        return hmac.compare_digest(header, f"Bearer {token}")
+
+    def _allowed_host(self) -> bool:
+        """
+        False if the Host header names anything but this server on a loopback
+        name. Without a token, that is what stops a page whose own name was
+        rebound to 127.0.0.1 from reaching the API as same-origin.
+        """
+        if config_mgr.config.api.token:
+            return True
+        try:
+            host = urlparse(f"//{self.headers.get('Host', '')}")
+            port = host.port
+        except ValueError:
+            return False
+        return host.hostname in LOOPBACK_HOSTS and port == self.server.server_address[1]
+
+    def _same_origin(self) -> bool:
+        """False for requests a web page on another origin sent."""
+        origin = self.headers.get("Origin")
+        if origin is None:
+            return True
+        return urlparse(origin).netloc == self.headers.get("Host", "")
+
+    def _route(self, method: str) -> None:
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if not self._authorized():
+            self.reply_error(401, "Unauthorized.")
+            return
+        if not self._allowed_host():
+            self.reply_error(403, "Unknown Host; use 127.0.0.1 or localhost.")
+            return
+        if not self._same_origin():
+            self.reply_error(403, "Cross-origin requests are not allowed.")
+            return
+        content_type = self.headers.get("Content-Type", "")
+        if method == "POST" and content_type.split(";")[0].strip() != JSON_CONTENT_TYPE:
+            self.reply_error(415, f"Content-Type must be {JSON_CONTENT_TYPE}.")
+            return
+        try:
+            self.server.api.handle(self, method, parts, query)
+        except (ValueError, KeyError, TypeError) as e:
+            self.reply_error(400, f"Bad request: {e}")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as e:
+            logger.error(f"job_api_failed: {method} {url.path}: {e}", exc_info=True)
+            self.reply_error(500, str(e))
+
+    def do_GET(self) -> None:
+        self._route("GET")
+
+    def do_POST(self) -> None:
+        self._route("POST")
+
+    def do_DELETE(self) -> None:
+        self._route("DELETE")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    api: "JobApiServer"
+
+
+class JobApiServer:
+    """
+    Local HTTP API over the job queue, so other tools can submit work.
+
+    Endpoints (JSON unless noted):
+        GET    /health                 Liveness and job counts.
+        GET    /jobs                   All jobs and the queue state.
+        POST   /jobs                   Submit {"paths": [...], "target_lang",
+                                       "options", "priority", "audio_stream",
+                                       "output_dir"}; 202 with the new jobs, or
+                                       429 if the files would take the queue
+                                       past api.max_pending unfinished jobs
+                                       (backpressure). output_dir must be in
+                                       one of api.output_roots.
+        GET    /jobs/<id>              One job.
+        DELETE /jobs/<id>              Cancel a running job or remove another.
+        GET    /jobs/<id>/result       The SRT (?format=json for segments).
+        GET    /events[?job_id=<id>]   Server-sent events: job_progress and
+                                       queue_updated (job_updated when filtered).
+        GET    /metrics                Prometheus text format (if api.metrics).
+
+    Jobs run on the queue's stage worker pools (see the pipeline config).
+    POST bodies must be sent as application/json, and requests from a web
+    page on another origin are refused, so a browser cannot submit jobs.
+    Without api.token the server only binds loopback addresses and only
+    answers requests addressed to a loopback name (against DNS rebinding).
+    """
+
+    def __init__(self) -> None:
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self._queue: Optional[JobQueue] = None
+        self._clients: List["queue.Queue[Tuple[str, Dict[str, Any]]]"] = []
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """True while the server is accepting requests."""
+        return self._server is not None
+
+    @property
+    def address(self) -> Optional[Tuple[str, int]]:
+        """(host, port) the server is bound to, or None."""
+        if self._server is None:
+            return None
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def start(
+        self,
+        job_queue: JobQueue,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+    ) -> Tuple[str, int]:
+        """
+        Starts serving (restarting if already running).
+
+        Args:
+            job_queue (JobQueue): The queue that runs submitted jobs.
+            host (Optional[str]): Address to bind; defaults to api.host.
+            port (Optional[int]): Port to bind; defaults to api.port.
+
+        Returns:
+            Tuple[str, int]: The bound address.
+
+        Raises:
+            OSError: If the address cannot be bound.
+            ValueError: If the address is reachable from other machines and
+                no api.token is set.
+        """
+        self.stop()
+        options = config_mgr.config.api
+        host = options.host if host is None else host
+        if not is_loopback(host) and not options.token:
+            raise ValueError(
+                f"Refusing to serve on {host or 'all interfaces'} without api.token."
+            )
+        server = _Server((host, options.port if port is None else port), _Handler)
+        server.api = self
+        self._server = server
+        self._queue = job_queue
+        job_queue.add_listener(self._broadcast)
+        self._thread = threading.Thread(target=server.serve_forever, daemon=True)
+        self._thread.start()
+        address = self.address
+        assert address is not None
+        logger.info(f"job_api_started: http://{address[0]}:{address[1]}")
+        return address
+
+    def stop(self) -> None:
+        """Stops the server and closes open event streams."""
+        if self._server is None:
+            return
+        if self._queue is not None:
+            self._queue.remove_listener(self._broadcast)
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            # An empty event ends the stream
+            try:
+                client.put_nowait(("", {}))
+            except queue.Full:
+                pass
+        logger.info("job_api_stopped")
+
+    def _broadcast(self, event: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            try:
+                client.put_nowait((event, data))
+            except queue.Full:
+                # A stalled client must not hold back the queue
+                pass
+
+    def handle(
+        self,
+        request: _Handler,
+        method: str,
+        parts: List[str],
+        query: Dict[str, str],
+    ) -> None:
+        """Dispatches one request."""
+        assert self._queue is not None
+        jobs = self._queue
+        if method == "GET" and parts == ["health"]:
+            counts: Dict[str, int] = {}
+            for entry in jobs.list_jobs():
+                counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+            request.reply_json(200, {"status": "ok", "jobs": counts})
+        elif method == "GET" and parts == ["jobs"]:
+            request.reply_json(200, {"status": "success", **jobs.snapshot()})
+        elif method == "POST" and parts == ["jobs"]:
+            self._submit(request)
+        elif method == "GET" and parts == ["events"]:
+            self._stream_events(request, query.get("job_id"))
+        elif method == "GET" and parts == ["metrics"] and config_mgr.config.api.metrics:
+            self._send_metrics(request)
+        elif len(parts) >= 2 and parts[0] == "jobs":
+            job = jobs.get(parts[1])
+            if job is None:
+                request.reply_error(404, "Job not found.")
+            elif method == "GET" and len(parts) == 2:
+                request.reply_json(200, {"status": "success", "job": job})
+            elif method == "DELETE" and len(parts) == 2:
+                if jobs.cancel_job(job["id"]):
+                    request.reply_json(200, {"status": "cancelled"})
+                elif jobs.remove_job(job["id"]):
+                    request.reply_json(200, {"status": "removed"})
+                else:
+                    request.reply_error(409, "Job cannot be removed.")
+            elif method == "GET" and parts[2:] == ["result"]:
+                self._send_result(request, job, query.get("format", "srt"))
+            else:
+                request.reply_error(404, "Not found.")
+        else:
+            request.reply_error(404, "Not found.")
+
+    def _submit(self, request: _Handler) -> None:
+        assert self._queue is not None
+        body = request._read_json()
+        paths = body.get("paths") or ([body["path"]] if body.get("path") else [])
+        if not isinstance(paths, list) or not paths:
+            raise ValueError("'paths' must be a non-empty list")
+        missing = [p for p in paths if not os.path.exists(p)]
+        if missing:
+            request.reply_error(400, "File not found.", paths=missing)
+            return
+        output_dir = body.get("output_dir")
+        if output_dir is not None and not self._allowed_output_dir(str(output_dir)):
+            request.reply_error(403, "output_dir is not in an allowed folder.")
+            return
+        files = expand_media_paths(paths)
+        if not files:
+            request.reply_error(400, "No media files found.")
+            return
+
+        limit = config_mgr.config.api.max_pending
+        pending = sum(
+            1
+            for job in self._queue.list_jobs()
+            if job["status"] not in FINISHED_STATUSES
+        )
+        if pending + len(files) > limit:
+            # Backpressure: the client should retry once jobs have drained
+            request.reply_json(
+                429,
+                {
+                    "status": "error",
+                    "message": "Job queue is full.",
+                    "pending": pending,
+                    "submitted": len(files),
+                    "limit": limit,
+                },
+                headers={"Retry-After": "10"},
+            )
+            return
+
+        created = self._queue.enqueue(
+            files,
+            str(body.get("target_lang") or "Chinese"),
+            options=dict(body.get("options") or {}),
+            priority=int(body.get("priority", 0)),
+            audio_stream=int(body.get("audio_stream", 0)),
+            output_dir=output_dir,
+        )
+        request.reply_json(202, {"status": "accepted", "jobs": created})
+
+    @staticmethod
+    def _allowed_output_dir(output_dir: str) -> bool:
+        """True if output_dir is an existing folder inside one of api.output_roots."""
+        if not os.path.isdir(output_dir):
+            return False
+        target = os.path.realpath(output_dir)
+        for root in config_mgr.config.api.output_roots:
+            root = os.path.realpath(root)
+            if os.path.commonpath([root, target]) == root:
+                return True
+        return False
+
+    def _send_result(self, request: _Handler, job: Dict[str, Any], fmt: str) -> None:
+        if job["status"] != "completed" or not job["srt_path"]:
+            request.reply_error(409, f"Job is {job['status']}.", job=job)
+            return
+        if not os.path.exists(job["srt_path"]):
+            request.reply_error(410, "Subtitle file no longer exists.")
+            return
+        if fmt == "json":
+            request.reply_json(
+                200, {"status": "success", "segments": load_srt(job["srt_path"])}
+            )
+            return
+        with open(job["srt_path"], "rb") as f:
+            body = f.read()
+        request.send_response(200)
+        request.send_header("Content-Type", "application/x-subrip; charset=utf-8")
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def _send_metrics(self, request: _Handler) -> None:
+        body = metrics.to_prometheus().encode("utf-8")
+        request.send_response(200)
+        request.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def _stream_events(self, request: _Handler, job_id: Optional[str]) -> None:
+        """Streams queue events until the client disconnects (or the job ends)."""
+        assert self._queue is not None
+        if job_id is not None and self._queue.get(job_id) is None:
+            request.reply_error(404, "Job not found.")
+            return
+        client: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue(SSE_BUFFER)
+        with self._lock:
+            self._clients.append(client)
+        request.send_response(200)
+        request.send_header("Content-Type", "text/event-stream")
+        request.send_header("Cache-Control", "no-cache")
+        request.send_header("Connection", "close")
+        request.end_headers()
+        request.close_connection = True
+
+        def _send(event: str, data: Any) -> None:
+            payload = json.dumps(data, ensure_ascii=False)
+            request.wfile.write(f"event: {event}\ndata: {payload}\n\n".encode("utf-8"))
+            request.wfile.flush()
+
+        try:
+            if job_id is not None:
+                job = self._queue.get(job_id)
+                _send("job_updated", job)
+                if job is None or job["status"] in FINISHED_STATUSES:
+                    return
+            else:
+                _send("queue_updated", self._queue.snapshot())
+            while self._server is not None:
+                try:
+                    event, data = client.get(timeout=SSE_KEEPALIVE)
+                except queue.Empty:
+                    request.wfile.write(b": keep-alive\n\n")
+                    request.wfile.flush()
+                    continue
+                if not event:
+                    break
+                if job_id is None:
+                    _send(event, data)
+                elif event == "job_progress" and data["job_id"] == job_id:
+                    _send(event, data)
+                elif event == "queue_updated":
+                    job = next((j for j in data["jobs"] if j["id"] == job_id), None)
+                    if job is None:
+                        break
+                    _send("job_updated", job)
+                    if job["status"] in FINISHED_STATUSES:
+                        break
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self._lock:
+                self._clients.remove(client)
+
+
+# Global job API server instance
+job_api = JobApiServer()
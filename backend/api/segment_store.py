@@ -0,0 +1,107 @@
+import threading
+from typing import Any, Dict, List, Optional
+
+# Most segments returned by one request
+MAX_PAGE = 1000
+
+
+class SegmentStore:
+    """
+    Holds the current task's segments on the Python side so the UI fetches
+    pages of them instead of receiving the whole list in one event.
+
+    Every change bumps a version number and records it on each index it
+    touched, so a client that has seen version v can fetch only what
+    changed since (get_segments_since). Replacing the list only marks the
+    indices from the first segment that differs.
+    """
+
+    def __init__(self) -> None:
+        self._segments: List[Dict[str, Any]] = []
+        self._versions: List[int] = []
+        self.version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        """Number of segments."""
+        return len(self._segments)
+
+    def replace(self, segments: List[Dict[str, Any]]) -> int:
+        """
+        Makes segments the current list.
+
+        Args:
+            segments (List[Dict[str, Any]]): The new segments in order.
+
+        Returns:
+            int: The new version.
+        """
+        with self._lock:
+            common = 0
+            limit = min(len(segments), len(self._segments))
+            while common < limit and segments[common] is self._segments[common]:
+                common += 1
+            self.version += 1
+            self._segments = list(segments)
+            self._versions = self._versions[:common] + [self.version] * (
+                len(segments) - common
+            )
+            return self.version
+
+    def append(self, segments: List[Dict[str, Any]]) -> int:
+        """Adds segments at the end and returns the new version."""
+        with self._lock:
+            self.version += 1
+            self._segments.extend(segments)
+            self._versions.extend([self.version] * len(segments))
+            return self.version
+
+    def clear(self) -> int:
+        """Removes all segments and returns the new version."""
+        return self.replace([])
+
+    def page(self, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """
+        Returns segments[offset:offset + limit] (limit capped at MAX_PAGE).
+        """
+        offset = max(int(offset), 0)
+        limit = min(max(int(limit), 0), MAX_PAGE)
+        with self._lock:
+            return {
+                "segments": self._segments[offset : offset + limit],
+                "offset": offset,
+                "total": len(self._segments),
+                "version": self.version,
+            }
+
+    def since(
+        self, version: int, offset: int = 0, limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Returns the segments changed after a version.
+
+        Args:
+            version (int): The last version the client has applied.
+            offset (int): First index the client cares about.
+            limit (Optional[int]): Size of the client's window (default and
+                cap: MAX_PAGE).
+
+        Returns:
+            Dict[str, Any]: 'changes' ({index, segment} items), 'total' (the
+            client drops indices past it) and 'version'.
+        """
+        offset = max(int(offset), 0)
+        limit = MAX_PAGE if limit is None else min(max(int(limit), 0), MAX_PAGE)
+        with self._lock:
+            end = min(offset + limit, len(self._segments))
+            changes = [
+                {"index": i, "segment": self._segments[i]}
+                for i in range(offset, end)
+                if self._versions[i] > version
+            ]
+            return {
+                "changes": changes,
+                "total": len(self._segments),
+                "version": self.version,
+            }
@@ -0,0 +1,667 @@
+"""
+Headless batch mode: subtitles files, globs or folders without the webview.
+
+    python -m backend.cli videos/ "extra/*.mkv" --lang English --jobs 2 --json
+    python -m backend.cli --watch /mnt/ingest
+    python -m backend.cli --serve --port 8765
+    python -m backend.cli --worker --processes 2 --queue-db /mnt/shared/tasks.db
+    python -m backend.cli --distribute /mnt/shared/videos --queue-db /mnt/shared/tasks.db
+
+Jobs run through the same prepare/transcribe/translate stages as the app's
+job queue, on a private in-memory queue. Exit codes: 0 when every file was
+subtitled or skipped, 1 when any failed, 2 for usage errors, 130 when
+interrupted. With --watch the folders are watched until SIGINT/SIGTERM and
+new files are queued as they arrive (see FolderWatcher); with --serve jobs
+are submitted over the local HTTP API (see JobApiServer). With --distribute
+files are split into tasks on a shared queue that --worker processes on any
+machine run (see backend.core.distributed).
+
+Progress goes to stdout and logs to stderr. The config and pipeline modules
+are imported once the console log handler has been moved to stderr, since
+loading the config already logs.
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from backend.services.job_queue import FINISHED_STATUSES, JobQueue, expand_media_paths
+from backend.services.logger import logger, set_console_stream
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+def parse_override(item: str) -> Dict[str, Any]:
+    """
+    Turns 'section.key=value' into a nested config update. The value is
+    parsed as JSON when possible ('2', 'true', '{"beam_size": 3}') and kept
+    as a string otherwise.
+
+    Raises:
+        ValueError: If the item is not of the form key=value.
+    """
+    key, sep, raw = item.partition("=")
+    if not sep or not key.strip():
+        raise ValueError(f"expected section.key=value, got '{item}'")
+    try:
+        value: Any = json.loads(raw)
+    except ValueError:
+        value = raw
+    update: Dict[str, Any] = {}
+    node = update
+    parts = key.strip().split(".")
+    for part in parts[:-1]:
+        node = node.setdefault(part, {})
+    node[parts[-1]] = value
+    return update
+
+
+def collect_media(patterns: Sequence[str]) -> List[str]:
+    """
+    Resolves files, folders and glob patterns into media file paths.
+
+    Args:
+        patterns (Sequence[str]): Paths or patterns ('**' matches recursively).
+
+    Returns:
+        List[str]: Absolute media paths in argument order, without duplicates.
+    """
+    paths: List[str] = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            paths.extend(sorted(glob.glob(pattern, recursive=True)))
+        else:
+            paths.append(pattern)
+    return expand_media_paths(paths)
+
+
+def is_up_to_date(media_path: str) -> bool:
+    """True if the media file already has an SRT at least as new as itself."""
+    from backend.core.pipeline import srt_path_for
+
+    srt_path = srt_path_for(media_path)
+    return os.path.exists(srt_path) and os.path.getmtime(srt_path) >= os.path.getmtime(
+        media_path
+    )
+
+
+class ProgressPrinter:
+    """
+    Prints queue events to stdout, as JSON lines or as short text lines.
+    Logs go to stderr so the stdout stream stays machine-readable.
+    """
+
+    def __init__(self, as_json: bool, total: int) -> None:
+        self.as_json = as_json
+        self.total = total
+        self.done = 0
+        self._lock = threading.RLock()
+        self._stages: Dict[str, Optional[str]] = {}
+
+    def emit(self, event: str, data: Dict[str, Any]) -> None:
+        """Writes one event."""
+        with self._lock:
+            if self.as_json:
+                print(json.dumps({"event": event, **data}), flush=True)
+                return
+            if event == "job_skipped":
+                print(f"[skip] {data['path']} (up to date)", flush=True)
+            elif event == "job_stage":
+                print(f"[{data['stage']}] {data['path']}", flush=True)
+            elif event == "job_finished":
+                done = f"{self.done}/{self.total}" if self.total else str(self.done)
+                line = f"[{done}] {data['status']}: {data['path']}"
+                if data.get("srt_path"):
+                    line += f" -> {data['srt_path']}"
+                if data.get("message"):
+                    line += f" ({data['message']})"
+                print(line, flush=True)
+            elif event == "summary":
+                print(
+                    f"{data['completed']} completed, {data['skipped']} skipped, "
+                    f"{data['failed']} failed, {data['cancelled']} cancelled "
+                    f"in {data['elapsed']:.1f}s",
+                    flush=True,
+                )
+            elif event == "job_submitted":
+                print(f"[queued] {data['path']} ({data['job_id']})", flush=True)
+            elif event == "api_started":
+                print(f"[serve] job API at {data['url']}", flush=True)
+            elif event == "watch_status":
+                print(
+                    f"[watch] {len(data['directories'])} folders ({data['mode']}): "
+                    f"{data['enqueued']} queued, {data['completed']} completed, "
+                    f"{data['failed']} failed, {data['duplicates']} duplicates, "
+                    f"{data['settling']} settling, {data['waiting']} waiting",
+                    flush=True,
+                )
+
+    def listener(self, event: str, data: Dict[str, Any]) -> None:
+        """JobQueue listener: reports stage changes and finished jobs once."""
+        if event == "job_progress":
+            if self.as_json:
+                self.emit(event, data)
+            return
+        if event != "queue_updated":
+            return
+        with self._lock:
+            for job in data["jobs"]:
+                previous = self._stages.get(job["id"], "")
+                if job["status"] in FINISHED_STATUSES:
+                    if previous is not None:
+                        self._stages[job["id"]] = None
+                        self.done += 1
+                        self.emit(
+                            "job_finished",
+                            {
+                                "job_id": job["id"],
+                                "path": job["path"],
+                                "status": job["status"],
+                                "message": job["message"],
+                                "srt_path": job["srt_path"],
+                            },
+                        )
+                elif previous is not None and job["stage"] not in (None, previous):
+                    self._stages[job["id"]] = job["stage"]
+                    self.emit(
+                        "job_stage",
+                        {
+                            "job_id": job["id"],
+                            "path": job["path"],
+                            "stage": job["stage"],
+                        },
+                    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Returns the argument parser of the CLI."""
+    parser = argparse.ArgumentParser(
+        prog="unisub",
+        description="Generate and translate subtitles without the GUI.",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="Media files, folders or glob patterns (folders to watch with --watch).",
+    )
+    parser.add_argument(
+        "-l",
+        "--lang",
+        help="Target language (default: Chinese, or watch.target_lang with --watch).",
+    )
+    parser.add_argument("--preset", help="Decoding preset (e.g. draft, accurate).")
+    parser.add_argument(
+        "--audio-stream", type=int, default=0, help="Audio track index to transcribe."
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Files transcribed at once (pipeline.transcribe_workers).",
+    )
+    parser.add_argument(
+        "--translate-workers",
+        type=int,
+        help="Files translated at once (pipeline.translate_workers).",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        help="Files analyzed ahead of transcription (pipeline.prefetch).",
+    )
+    parser.add_argument(
+        "--config", help="JSON file merged over the saved configuration."
+    )
+    parser.add_argument(
+        "--set",
+        dest="overrides",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Config override, e.g. whisper.model_size=small (repeatable).",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Redo files whose SRT is up to date."
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print progress as JSON lines."
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch folders (default: watch.directories) and queue new files.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Serve the HTTP job API until interrupted (see api.* config).",
+    )
+    parser.add_argument("--host", help="Address for --serve (default: api.host).")
+    parser.add_argument(
+        "--port", type=int, help="Port for --serve (default: api.port, 0 = any)."
+    )
+    parser.add_argument(
+        "--distribute",
+        action="store_true",
+        help="Submit the inputs to the shared task queue and wait for workers.",
+    )
+    parser.add_argument(
+        "--no-wait",
+        action="store_true",
+        help="With --distribute, exit once the jobs are submitted.",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Run tasks from the shared task queue until interrupted.",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Worker processes started by --worker (default: 1).",
+    )
+    parser.add_argument(
+        "--kinds",
+        default="transcribe,translate,merge",
+        help="Task kinds this --worker runs (default: all).",
+    )
+    parser.add_argument(
+        "--queue-db",
+        help="Shared task queue file (default: distributed.queue_db).",
+    )
+    parser.add_argument(
+        "--status-interval",
+        type=float,
+        default=60.0,
+        help="Seconds between watch status reports (default: 60).",
+    )
+    return parser
+
+
+def apply_config(args: argparse.Namespace) -> None:
+    """
+    Applies --config, --set and the parallelism flags for this run only;
+    the saved configuration is left untouched.
+
+    Raises:
+        ValueError: If an override or the config file is invalid.
+    """
+    from backend.services.config_mgr import config_mgr
+
+    updates: List[Dict[str, Any]] = []
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            updates.append(json.load(f))
+    updates.extend(parse_override(item) for item in args.overrides)
+
+    pipeline: Dict[str, Any] = {}
+    if args.jobs is not None:
+        pipeline["transcribe_workers"] = args.jobs
+    if args.translate_workers is not None:
+        pipeline["translate_workers"] = args.translate_workers
+    if args.prefetch is not None:
+        pipeline["prefetch"] = args.prefetch
+    if pipeline:
+        updates.append({"pipeline": pipeline})
+
+    if args.watch and args.lang:
+        updates.append({"watch": {"target_lang": args.lang}})
+
+    for update in updates:
+        config_mgr.update_config(update, persist=False)
+
+    # Parallel transcriptions need as many slots on the shared model
+    workers = config_mgr.config.pipeline.transcribe_workers
+    if config_mgr.config.whisper.max_concurrent_jobs < workers:
+        config_mgr.update_config(
+            {"whisper": {"max_concurrent_jobs": workers}}, persist=False
+        )
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Subtitles every input file and waits for the batch to finish.
+
+    Returns:
+        int: The process exit code.
+    """
+    from backend.core.pipeline import job_stages
+    from backend.services.config_mgr import config_mgr
+
+    media = collect_media(args.inputs)
+    if not media:
+        logger.error("cli_no_media_files")
+        print("No media files found.", file=sys.stderr)
+        return EXIT_USAGE
+
+    pending = media if args.force else [p for p in media if not is_up_to_date(p)]
+    printer = ProgressPrinter(args.json, len(pending))
+    for path in media:
+        if path not in pending:
+            printer.emit("job_skipped", {"path": path})
+
+    started = time.time()
+    jobs: List[Dict[str, Any]] = []
+    queue = JobQueue(db_path=":memory:")
+    if pending:
+        options = {"preset": args.preset} if args.preset else {}
+        jobs = queue.enqueue(
+            pending,
+            args.lang or "Chinese",
+            options=options,
+            audio_stream=args.audio_stream,
+        )
+        queue.start(
+            job_stages(),
+            printer.listener,
+            prefetch=lambda: config_mgr.config.pipeline.prefetch,
+        )
+
+    job_ids = [job["id"] for job in jobs]
+
+    def _results() -> List[Dict[str, Any]]:
+        return [job for job in map(queue.get, job_ids) if job]
+
+    def _finished() -> bool:
+        return all(job["status"] in FINISHED_STATUSES for job in _results())
+
+    code = EXIT_OK
+    try:
+        while not _finished():
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        logger.info("cli_interrupted")
+        code = EXIT_INTERRUPTED
+        for job_id in job_ids:
+            queue.cancel_job(job_id)
+        # Let running stages reach their cancellation checks
+        deadline = time.time() + 10
+        while time.time() < deadline and not _finished():
+            time.sleep(0.2)
+
+    counts = {
+        status: sum(1 for job in _results() if job["status"] == status)
+        for status in FINISHED_STATUSES
+    }
+    printer.emit(
+        "summary",
+        {
+            **counts,
+            "skipped": len(media) - len(pending),
+            "elapsed": round(time.time() - started, 2),
+        },
+    )
+    if code == EXIT_OK and (counts["failed"] or counts["cancelled"]):
+        code = EXIT_FAILED
+    return code
+
+
+def _raise_interrupt(signum: int, frame: Any) -> None:
+    raise KeyboardInterrupt()
+
+
+def serve(args: argparse.Namespace) -> int:
+    """
+    Runs as a daemon until interrupted: watches folders (--watch) and/or
+    serves the HTTP job API (--serve).
+
+    Returns:
+        int: The process exit code.
+    """
+    from backend.api.http_api import job_api
+    from backend.core.pipeline import job_stages
+    from backend.services.config_mgr import config_mgr
+    from backend.services.folder_watcher import folder_watcher
+
+    printer = ProgressPrinter(args.json, 0)
+    queue = JobQueue(db_path=":memory:")
+    queue.start(
+        job_stages(),
+        printer.listener,
+        prefetch=lambda: config_mgr.config.pipeline.prefetch,
+    )
+    if args.serve:
+        try:
+            host, port = job_api.start(queue, args.host, args.port)
+        except (OSError, ValueError) as e:
+            print(f"Cannot serve the job API: {e}", file=sys.stderr)
+            return EXIT_USAGE
+        printer.emit("api_started", {"url": f"http://{host}:{port}"})
+    if args.watch:
+        folder_watcher.start(queue, args.inputs or None)
+        if not folder_watcher.running:
+            print("No folders to watch.", file=sys.stderr)
+            job_api.stop()
+            return EXIT_USAGE
+
+    # Service managers stop daemons with SIGTERM
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    try:
+        while True:
+            time.sleep(max(1.0, args.status_interval))
+            if args.watch:
+                printer.emit("watch_status", folder_watcher.status())
+    except KeyboardInterrupt:
+        logger.info("cli_daemon_stopping")
+    job_api.stop()
+    folder_watcher.stop()
+    # Unfinished watched files are not marked processed and are picked up next time
+    for job in queue.list_jobs():
+        if job["status"] == "running":
+            queue.cancel_job(job["id"])
+    if args.watch:
+        printer.emit("watch_status", folder_watcher.status())
+    return EXIT_OK
+
+
+def distribute(args: argparse.Namespace) -> int:
+    """
+    Submits every input file to the shared task queue and, unless --no-wait,
+    waits until workers have finished them.
+
+    Returns:
+        int: The process exit code.
+    """
+    from backend.core.distributed import open_queue, submit_job
+
+    media = collect_media(args.inputs)
+    if not media:
+        print("No media files found.", file=sys.stderr)
+        return EXIT_USAGE
+    pending = media if args.force else [p for p in media if not is_up_to_date(p)]
+    printer = ProgressPrinter(args.json, len(pending))
+    for path in media:
+        if path not in pending:
+            printer.emit("job_skipped", {"path": path})
+
+    started = time.time()
+    queue = open_queue(args.queue_db)
+    options = {"preset": args.preset} if args.preset else {}
+    jobs = [
+        submit_job(
+            queue,
+            path,
+            args.lang or "Chinese",
+            options=options,
+            audio_stream=args.audio_stream,
+        )
+        for path in pending
+    ]
+    for job in jobs:
+        printer.emit(
+            "job_submitted",
+            {"job_id": job["id"], "path": job["path"], "queue": queue.db_path},
+        )
+    if args.no_wait:
+        return EXIT_OK
+
+    waiting = {job["id"] for job in jobs}
+    counts = dict.fromkeys(FINISHED_STATUSES, 0)
+    try:
+        while waiting:
+            for job_id in sorted(waiting):
+                entry = queue.get_job(job_id)
+                if entry is None or entry["status"] not in FINISHED_STATUSES:
+                    continue
+                waiting.discard(job_id)
+                counts[entry["status"]] += 1
+                printer.done += 1
+                printer.emit(
+                    "job_finished",
+                    {
+                        "job_id": job_id,
+                        "path": entry["path"],
+                        "status": entry["status"],
+                        "message": entry["message"],
+                        "srt_path": entry["srt_path"],
+                    },
+                )
+            if waiting:
+                time.sleep(1.0)
+    except KeyboardInterrupt:
+        # The jobs stay queued for the workers
+        return EXIT_INTERRUPTED
+    printer.emit(
+        "summary",
+        {
+            **counts,
+            "skipped": len(media) - len(pending),
+            "elapsed": round(time.time() - started, 2),
+        },
+    )
+    return EXIT_FAILED if counts["failed"] or counts["cancelled"] else EXIT_OK
+
+
+def _worker_process(
+    db_path: Optional[str], config: Dict[str, Any], kinds: List[str]
+) -> None:
+    """Entry point of a --worker child process."""
+    _logs_to_stderr()
+    from backend.core.distributed import open_queue, run_worker
+    from backend.core.whisper_worker import whisper_worker
+    from backend.services.config_mgr import config_mgr
+    from backend.services.platform_mgr import platform_mgr
+
+    # The parent's --config/--set changes were not saved
+    config_mgr.update_config(config, persist=False)
+    platform_mgr.setup_runtime_env()
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+    try:
+        run_worker(open_queue(db_path), stop_event, kinds=kinds)
+    finally:
+        whisper_worker.terminate()
+
+
+def work(args: argparse.Namespace) -> int:
+    """
+    Runs tasks from the shared task queue in --processes worker processes
+    until SIGINT/SIGTERM.
+
+    Returns:
+        int: The process exit code.
+    """
+    from backend.core.distributed import open_queue, run_worker
+    from backend.services.config_mgr import config_mgr
+    from backend.services.task_queue import TASK_KINDS
+
+    kinds = [kind.strip() for kind in args.kinds.split(",") if kind.strip()]
+    unknown = sorted(set(kinds) - set(TASK_KINDS))
+    if unknown or not kinds:
+        print(f"Unknown task kinds: {', '.join(unknown)}", file=sys.stderr)
+        return EXIT_USAGE
+
+    if args.processes <= 1:
+        stop_event = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+        try:
+            run_worker(open_queue(args.queue_db), stop_event, kinds=kinds)
+        except KeyboardInterrupt:
+            pass
+        return EXIT_OK
+
+    # Separate processes so each has its own model and GIL
+    context = multiprocessing.get_context("spawn")
+    config = config_mgr.config.model_dump()
+    children = [
+        # Not daemonic: each worker starts its own Whisper worker process
+        context.Process(target=_worker_process, args=(args.queue_db, config, kinds))
+        for _ in range(args.processes)
+    ]
+    for child in children:
+        child.start()
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    try:
+        for child in children:
+            child.join()
+    except KeyboardInterrupt:
+        logger.info("cli_workers_stopping")
+    for child in children:
+        if child.is_alive():
+            child.terminate()
+    for child in children:
+        child.join()
+    return EXIT_OK
+
+
+def _logs_to_stderr() -> None:
+    """Moves the console log handler to stderr, keeping stdout for progress."""
+    set_console_stream(sys.stderr)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Entry point of the headless CLI.
+
+    Args:
+        argv (Optional[Sequence[str]]): Arguments (defaults to sys.argv[1:]).
+
+    Returns:
+        int: The process exit code.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    _logs_to_stderr()
+
+    try:
+        if not args.inputs and not (args.watch or args.serve or args.worker):
+            raise ValueError("no inputs given")
+        apply_config(args)
+    except (OSError, ValueError) as e:
+        parser.print_usage(sys.stderr)
+        print(f"{parser.prog}: error: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    from backend.services.platform_mgr import platform_mgr
+
+    platform_mgr.setup_runtime_env()
+    try:
+        if args.worker:
+            return work(args)
+        if args.distribute:
+            return distribute(args)
+        return serve(args) if args.watch or args.serve else run(args)
+    finally:
+        # Release the transcription worker (and its model memory) on exit
+        from backend.core.whisper_worker import whisper_worker
+
+        whisper_worker.terminate()
+
+
+if __name__ == "__main__":
+    # Required for the spawned Whisper worker in frozen builds
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -1,9 +1,16 @@
-from typing import List
+import threading
+import time
+import uuid
+from typing import Any, Callable, List, Optional
 
 from openai import OpenAI
 
+from backend.services.cancellation import run_cancellable
 from backend.services.config_mgr import config_mgr
-from backend.services.logger import logger
+from backend.services.logger import log_context, logger
+from backend.services.metrics import RATE_BUCKETS, metrics
+from backend.services.profiler import span
+from backend.services.progress import StageProgress
 
 
 class AIEngine:
@@ -14,37 +21,108 @@ class AIEngine:
     def __init__(self) -> None:
         self.client: OpenAI | None = None
 
-    def _get_client(self) -> OpenAI:
+    def _get_client(self, on_request: Optional[Callable[[Any], None]] = None) -> OpenAI:
         """
         Returns a configured OpenAI client.
 
         Bypasses system proxies for local connections to avoid issues
         with system-wide proxies on Windows/WSL.
+
+        Args:
+            on_request (Optional[Callable[[Any], None]]): Called with every
+                HTTP request sent, including the client's own retries.
         """
         import httpx
 
         config = config_mgr.config.ai
-        logger.debug(f"initializing_ai_client: base_url={config.base_url}")
+        logger.debug("initializing_ai_client: base_url=%s", config.base_url)
 
         # trust_env=False prevents httpx from looking at system proxy environment variables
         # Set a longer timeout (60s) for local models which can be slow
-        http_client = httpx.Client(trust_env=False, timeout=60.0)
+        http_client = httpx.Client(
+            trust_env=False,
+            timeout=60.0,
+            event_hooks={"request": [on_request]} if on_request else None,
+        )
 
         return OpenAI(
             api_key=config.api_key, base_url=config.base_url, http_client=http_client
         )
 
+    def progress_tracker(self) -> StageProgress:
+        """
+        Returns a tracker for translation progress in lines, primed with how
+        fast the configured model translated before.
+
+        Returns:
+            StageProgress: Call finish() on it once the translation completed.
+        """
+        config = config_mgr.config.ai
+        return StageProgress(f"translate:{config.base_url}:{config.model_name}")
+
     def translate_batch(
-        self, lines: List[str], target_lang: str = "Chinese"
+        self,
+        lines: List[str],
+        target_lang: str = "Chinese",
+        cancel_event: Optional[threading.Event] = None,
     ) -> List[str]:
         """
         Translates a batch of subtitle lines to the target language.
+
+        Args:
+            lines (List[str]): Subtitle lines.
+            target_lang (str): Target language.
+            cancel_event (Optional[threading.Event]): Aborts the request in
+                flight (and the per-line fallbacks) when set.
+
+        Returns:
+            List[str]: One translation per line.
+
+        Raises:
+            InterruptedError: If cancelled.
         """
         if not lines:
             return []
-
+        with log_context(batch_id=uuid.uuid4().hex[:8]):
+            return self._translate_batch(lines, target_lang, cancel_event)
+
+    def _translate_batch(
+        self,
+        lines: List[str],
+        target_lang: str,
+        cancel_event: Optional[threading.Event],
+    ) -> List[str]:
+        """Does the work of translate_batch, in the batch's log context."""
         config = config_mgr.config.ai
-        client = self._get_client()
+        sent = [0]
+
+        def _on_request(request: Any) -> None:
+            sent[0] += 1
+
+        client = self._get_client(on_request=_on_request)
+        started = time.monotonic()
+        outcome = "error"
+
+        def _complete(**kwargs: Any) -> Any:
+            before = sent[0]
+            request_started = time.monotonic()
+            try:
+                # Closing the client drops the connection the request waits on
+                with span("llm_request"):
+                    response = run_cancellable(
+                        lambda: client.chat.completions.create(**kwargs),
+                        cancel_event,
+                        on_cancel=client.close,
+                    )
+            finally:
+                # The OpenAI client retries failed requests on its own
+                retries = sent[0] - before - 1
+                if retries > 0:
+                    metrics.counter(
+                        "unisub_ai_retries_total", "LLM requests retried by the client"
+                    ).inc(retries)
+            self._record_usage(response, time.monotonic() - request_started)
+            return response
 
         # Step 1: Format input with <L数字> markers as requested by prompt
         batch_lines = []
@@ -55,7 +133,7 @@ class AIEngine:
         logger.info(f"ai_translation_batch_started: {len(lines)} lines")
 
         try:
-            response = client.chat.completions.create(
+            response = _complete(
                 model=config.model_name,
                 messages=[
                     {"role": "system", "content": config.system_prompt},
@@ -65,7 +143,7 @@ class AIEngine:
             )
 
             result_text = response.choices[0].message.content or ""
-            logger.debug(f"ai_raw_response: {repr(result_text)}")
+            logger.debug("ai_raw_response: %r", result_text)
 
             # Parsing Step 1: Extract text by matching <L数字>
             import re
@@ -97,9 +175,12 @@ class AIEngine:
                 logger.warning(
                     f"batch_parsing_partial_failure: missing {len(missing_indices)} lines. falling_back_to_line_by_line"
                 )
+                metrics.counter(
+                    "unisub_fallbacks_total", "Fallbacks to a degraded mode"
+                ).inc(len(missing_indices), kind="line_by_line")
                 for i in missing_indices:
                     try:
-                        line_resp = client.chat.completions.create(
+                        line_resp = _complete(
                             model=config.model_name,
                             messages=[
                                 {"role": "system", "content": config.fallback_prompt},
@@ -110,16 +191,51 @@ class AIEngine:
                         final_lines[i] = (
                             line_resp.choices[0].message.content or lines[i]
                         ).strip()
+                    except InterruptedError:
+                        raise
                     except Exception as le:
                         logger.error(f"line_fallback_failed for index {i}: {le}")
 
             logger.info("ai_translation_batch_success")
+            outcome = "success"
+            metrics.counter("unisub_ai_lines_total", "Subtitle lines translated").inc(
+                len(lines)
+            )
             return final_lines
 
+        except InterruptedError:
+            logger.info("ai_translation_cancelled")
+            outcome = "cancelled"
+            raise
         except Exception as e:
             logger.error(f"ai_translation_failed: {e}", exc_info=True)
             # Re-raise exception to alert the user immediately
             raise e
+        finally:
+            # On cancellation run_cancellable closes the client in the
+            # background; closing here could wait on the abandoned request
+            if outcome != "cancelled":
+                client.close()
+            metrics.histogram(
+                "unisub_ai_batch_seconds", "Translation batch latency"
+            ).observe(time.monotonic() - started, outcome=outcome)
+
+    def _record_usage(self, response: Any, elapsed: float) -> None:
+        """Records the token counts an LLM response reports, if any."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        prompt = getattr(usage, "prompt_tokens", None) or 0
+        completion = getattr(usage, "completion_tokens", None) or 0
+        tokens = metrics.counter("unisub_ai_tokens_total", "LLM tokens used")
+        tokens.inc(prompt, kind="prompt")
+        tokens.inc(completion, kind="completion")
+        if completion and elapsed > 0:
+            metrics.histogram(
+                "unisub_ai_tokens_per_second",
+                "LLM output speed (completion tokens per second)",
+                RATE_BUCKETS,
+            ).observe(completion / elapsed)
 
 
 # Global AI engine instance
@@ -0,0 +1,176 @@
+import json
+import os
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+from backend.services.logger import logger
+
+CHECKPOINT_SUFFIX = ".temp.jsonl"
+LEGACY_CHECKPOINT_SUFFIX = ".temp.json"
+COMPLETE_MARKER_KEY = "__complete__"
+SETTINGS_KEY = "__settings__"
+
+
+class TranscriptCheckpoint:
+    """
+    Append-only JSONL checkpoint of transcribed segments for a single media file.
+
+    Every segment is written as one JSON line as soon as it is yielded by Whisper,
+    so a crash or cancel only loses the segment that was being decoded. A final
+    marker line records that transcription ran to the end of the media.
+
+    A header line records the settings the segments were transcribed with
+    (model, preset, audio stream), so a checkpoint from other settings is
+    not resumed. Checkpoints of older releases have no header.
+    """
+
+    def __init__(self, media_path: str) -> None:
+        self.path = media_path + CHECKPOINT_SUFFIX
+        self.legacy_path = media_path + LEGACY_CHECKPOINT_SUFFIX
+        self._handle: Optional[IO[str]] = None
+        # Header of the last loaded checkpoint, None if it had none
+        self.settings: Optional[Dict[str, Any]] = None
+
+    def exists(self) -> bool:
+        """Returns True if any (partial or complete) checkpoint is present."""
+        return os.path.exists(self.path) or os.path.exists(self.legacy_path)
+
+    def load(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Loads committed segments from disk.
+
+        A truncated trailing line (e.g. from a crash mid-write) is ignored.
+        The header is kept in self.settings.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], bool]: The segments and whether the
+            checkpoint was marked complete.
+        """
+        self.settings = None
+        if not os.path.exists(self.path):
+            if os.path.exists(self.legacy_path):
+                # Older releases wrote the whole transcript once at the end
+                with open(self.legacy_path, "r", encoding="utf-8") as f:
+                    return json.load(f), True
+            return [], False
+
+        segments: List[Dict[str, Any]] = []
+        complete = False
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"checkpoint_truncated_line_skipped: {self.path}")
+                    continue
+                if record.get(COMPLETE_MARKER_KEY):
+                    complete = True
+                    continue
+                if SETTINGS_KEY in record:
+                    self.settings = record[SETTINGS_KEY]
+                    continue
+                segments.append(record)
+        return segments, complete
+
+    def matches(self, settings: Dict[str, Any]) -> bool:
+        """
+        Returns whether the last loaded checkpoint was transcribed with the
+        given settings. One without a header cannot tell and is accepted.
+        """
+        if self.settings is None:
+            return True
+        return all(self.settings.get(k) == v for k, v in settings.items())
+
+    def open(self, settings: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Opens the checkpoint for appending, keeping existing segments.
+
+        Args:
+            settings (Optional[Dict[str, Any]]): Header to write if the
+                checkpoint is new.
+        """
+        if self._handle is None:
+            is_new = True
+            needs_newline = False
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                is_new = False
+                with open(self.path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    needs_newline = f.read(1) != b"\n"
+            self._handle = open(self.path, "a", encoding="utf-8")
+            if needs_newline:
+                # Terminate a line left half-written by a crash
+                self._handle.write("\n")
+            if is_new and settings is not None:
+                self._handle.write(json.dumps({SETTINGS_KEY: settings}) + "\n")
+
+    def append(self, segment: Dict[str, Any]) -> None:
+        """Commits a single segment to the checkpoint."""
+        if self._handle is None:
+            self.open()
+        assert self._handle is not None
+        self._handle.write(json.dumps(segment, ensure_ascii=False) + "\n")
+        self._handle.flush()
+
+    def mark_complete(self) -> None:
+        """Writes the completion marker and syncs the file to disk."""
+        if self._handle is None:
+            self.open()
+        assert self._handle is not None
+        self._handle.write(json.dumps({COMPLETE_MARKER_KEY: True}) + "\n")
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self.close()
+
+    def close(self) -> None:
+        """Closes the underlying file handle if open."""
+        if self._handle is not None:
+            try:
+                self._handle.flush()
+                os.fsync(self._handle.fileno())
+            except OSError as e:
+                logger.warning(f"checkpoint_sync_failed: {e}")
+            self._handle.close()
+            self._handle = None
+
+    def replace(
+        self,
+        segments: List[Dict[str, Any]],
+        complete: bool,
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Atomically rewrites the checkpoint with the given segments.
+
+        Args:
+            segments (List[Dict[str, Any]]): Segments in time order.
+            complete (bool): Whether to write the completion marker.
+            settings (Optional[Dict[str, Any]]): Header to write; by default
+                the existing one is kept.
+        """
+        self.close()
+        if settings is None:
+            self.load()
+            settings = self.settings
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            if settings is not None:
+                f.write(json.dumps({SETTINGS_KEY: settings}) + "\n")
+            for segment in segments:
+                f.write(json.dumps(segment, ensure_ascii=False) + "\n")
+            if complete:
+                f.write(json.dumps({COMPLETE_MARKER_KEY: True}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        if os.path.exists(self.legacy_path):
+            os.remove(self.legacy_path)
+
+    def reset(self) -> None:
+        """Removes any existing checkpoint so transcription starts from zero."""
+        self.close()
+        for path in (self.path, self.legacy_path):
+            if os.path.exists(path):
+                os.remove(path)
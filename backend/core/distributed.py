@@ -0,0 +1,307 @@
+"""
+Distributed jobs: headless workers on any number of machines share one
+LeaseQueue (an SQLite file on a shared volume) and split each job into
+tasks:
+
+    transcribe  one chunk of the media, cut in silences (chunk_seconds)
+    translate   one batch of segments (ai.batch_size)
+    merge       writes the job's checkpoint and SRT next to the media
+
+Media paths must be the same on every worker (e.g. the same mount point).
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from appdirs import user_data_dir
+
+from backend.core.checkpoint import TranscriptCheckpoint
+from backend.core.pipeline import load_checkpoint, srt_path_for, translate_segments
+from backend.core.segment_filter import filter_segments
+from backend.core.srt_utils import save_srt
+from backend.core.whisper_svc import whisper_svc
+from backend.services.config_mgr import config_mgr
+from backend.services.logger import log_context, logger
+from backend.services.task_queue import TASK_KINDS, LeaseQueue, NewTask
+
+# A transcription chunk: [start, end] in seconds; end None = to the end
+Chunk = List[Optional[float]]
+# Longest wait between claims while the shared database keeps failing
+MAX_CLAIM_BACKOFF = 60.0
+
+
+def default_queue_path() -> str:
+    """Returns distributed.queue_db, or tasks.db in the app data folder."""
+    return config_mgr.config.distributed.queue_db or os.path.join(
+        user_data_dir("UniversalSub", "UniversalSub"), "tasks.db"
+    )
+
+
+def open_queue(db_path: Optional[str] = None) -> LeaseQueue:
+    """Opens the shared task queue (default: default_queue_path())."""
+    return LeaseQueue(
+        db_path or default_queue_path(),
+        max_attempts=config_mgr.config.distributed.max_attempts,
+    )
+
+
+def new_worker_id() -> str:
+    """Returns a worker id unique across hosts: host:pid:random."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def plan_chunks(
+    regions: Sequence[Tuple[float, float]], chunk_seconds: float
+) -> List[Chunk]:
+    """
+    Groups speech regions into chunks of about chunk_seconds, cutting in the
+    middle of the silence between two regions so no speech is split.
+
+    Args:
+        regions (Sequence[Tuple[float, float]]): Speech (start, end) in seconds.
+        chunk_seconds (float): Target chunk length.
+
+    Returns:
+        List[Chunk]: Consecutive chunks covering the whole media.
+    """
+    chunks: List[Chunk] = []
+    start = 0.0
+    for previous, current in zip(regions, regions[1:]):
+        if current[0] - start >= chunk_seconds:
+            cut = (previous[1] + current[0]) / 2
+            chunks.append([start, cut])
+            start = cut
+    chunks.append([start, None])
+    return chunks
+
+
+def _translate_tasks(segments: List[Dict[str, Any]]) -> List[NewTask]:
+    batch_size = config_mgr.config.ai.batch_size
+    return [
+        ("translate", {"segments": segments[i : i + batch_size]})
+        for i in range(0, len(segments), batch_size)
+    ]
+
+
+def submit_job(
+    queue: LeaseQueue,
+    path: str,
+    target_lang: str,
+    options: Optional[Dict[str, Any]] = None,
+    audio_stream: int = 0,
+    output_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Splits a media file into tasks on the shared queue. A file with a
+    complete checkpoint of the same settings goes straight to translation.
+
+    Args:
+        queue (LeaseQueue): The shared queue.
+        path (str): Media path, as seen by every worker.
+        target_lang (str): Translation target language.
+        options (Optional[Dict[str, Any]]): Per-job decoding overrides.
+        audio_stream (int): Audio track to transcribe.
+        output_dir (Optional[str]): Folder for the SRT (None = next to media).
+
+    Returns:
+        Dict[str, Any]: The created job.
+    """
+    path = os.path.abspath(path)
+    options = dict(options or {})
+    options.pop("two_pass", None)
+    options.pop("profile", None)
+
+    _, segments, complete = load_checkpoint(path, options, audio_stream)
+    if complete and segments:
+        tasks = _translate_tasks(segments)
+    else:
+        try:
+            regions, _ = whisper_svc.speech_regions(path, options, audio_stream)
+        except Exception as e:
+            # Workers still run VAD on their chunk; it just isn't split
+            logger.warning(f"dist_plan_failed: {path}, {e}")
+            regions = []
+        chunk_seconds = config_mgr.config.distributed.chunk_seconds
+        tasks = [
+            ("transcribe", {"range": chunk})
+            for chunk in plan_chunks(regions, chunk_seconds)
+        ]
+    return queue.submit(
+        path,
+        target_lang,
+        tasks,
+        options=options,
+        audio_stream=audio_stream,
+        output_dir=output_dir,
+    )
+
+
+def on_stage_done(job: Dict[str, Any], kind: str, results: List[Any]) -> List[NewTask]:
+    """
+    Builds a job's next tasks once every task of a kind is done (see
+    LeaseQueue.complete).
+
+    Raises:
+        ValueError: If the transcription found no speech.
+    """
+    if kind == "transcribe":
+        segments = sorted(
+            (segment for chunk in results for segment in chunk),
+            key=lambda s: s["start"],
+        )
+        filter_options = config_mgr.config.whisper.segment_filter
+        if filter_options.enabled:
+            segments, _ = filter_segments(segments, filter_options)
+        if not segments:
+            raise ValueError("No speech detected in this media file.")
+        return _translate_tasks(segments)
+    if kind == "translate":
+        segments = [segment for batch in results for segment in batch]
+        return [("merge", {"segments": segments})]
+    return []
+
+
+def run_task(
+    queue: LeaseQueue, task: Dict[str, Any], cancel_event: threading.Event
+) -> Any:
+    """
+    Runs one leased task.
+
+    Returns:
+        Any: The task result (segments, or the SRT path for merges).
+
+    Raises:
+        InterruptedError: If cancel_event was set.
+    """
+    job = task["job"]
+    payload = task["payload"]
+    if task["kind"] == "transcribe":
+        segments = list(
+            whisper_svc.transcribe(
+                job["path"],
+                options=job["options"],
+                cancel_event=cancel_event,
+                time_ranges=[payload["range"]],
+                audio_stream=job["audio_stream"],
+            )
+        )
+        if cancel_event.is_set():
+            raise InterruptedError("cancelled_by_user")
+        return segments
+    if task["kind"] == "translate":
+        return translate_segments(
+            payload["segments"], job["target_lang"], cancel_event=cancel_event
+        )
+
+    segments = payload["segments"]
+    TranscriptCheckpoint(job["path"]).replace(
+        [
+            {
+                k: v
+                for k, v in s.items()
+                if k not in ("translated_text", "translated_lang")
+            }
+            for s in segments
+        ],
+        complete=True,
+        settings=whisper_svc.transcript_settings(job["options"], job["audio_stream"]),
+    )
+    srt_path = srt_path_for(job["path"], job["output_dir"])
+    if job["output_dir"]:
+        os.makedirs(job["output_dir"], exist_ok=True)
+    save_srt(segments, srt_path)
+    queue.set_srt_path(job["id"], srt_path)
+    logger.info(f"srt_saved_successfully: {srt_path}")
+    return srt_path
+
+
+def run_worker(
+    queue: LeaseQueue,
+    stop_event: threading.Event,
+    worker_id: Optional[str] = None,
+    kinds: Sequence[str] = TASK_KINDS,
+) -> int:
+    """
+    Leases and runs tasks until stop_event is set. A heartbeat thread keeps
+    the current lease alive; if the lease is lost the task is abandoned.
+
+    Args:
+        queue (LeaseQueue): The shared queue.
+        stop_event (threading.Event): Stops the worker (and its current task).
+        worker_id (Optional[str]): Lease owner (default: new_worker_id()).
+        kinds (Sequence[str]): Task kinds this worker runs (e.g. only
+            'translate' on a machine without a GPU).
+
+    Returns:
+        int: The number of tasks completed.
+    """
+    worker_id = worker_id or new_worker_id()
+    options = config_mgr.config.distributed
+    done = 0
+    failures = 0
+    logger.info(f"dist_worker_started: {worker_id}, {queue.db_path}")
+    while not stop_event.is_set():
+        try:
+            task = queue.claim(worker_id, options.lease_seconds, kinds)
+        except sqlite3.Error as e:
+            # Locked or briefly unreachable shared volume: back off and retry
+            failures += 1
+            delay = min(
+                options.poll_interval * 2 ** min(failures, 10), MAX_CLAIM_BACKOFF
+            )
+            logger.warning(f"dist_claim_failed: {e}, retrying in {delay:.0f}s")
+            stop_event.wait(delay)
+            continue
+        failures = 0
+        if task is None:
+            stop_event.wait(options.poll_interval)
+            continue
+
+        cancel_event = threading.Event()
+        finished = threading.Event()
+
+        def _heartbeat(task_id: int = task["id"]) -> None:
+            while not finished.wait(options.lease_seconds / 3):
+                if stop_event.is_set():
+                    cancel_event.set()
+                    return
+                try:
+                    held = queue.heartbeat(task_id, worker_id, options.lease_seconds)
+                except sqlite3.Error as e:
+                    # The lease is still ours until it lapses; try the next beat
+                    logger.warning(f"dist_heartbeat_failed: #{task_id}: {e}")
+                    continue
+                if not held:
+                    cancel_event.set()
+                    return
+
+        beat = threading.Thread(target=_heartbeat, daemon=True)
+        beat.start()
+        logger.info(
+            f"dist_task_started: {task['kind']} #{task['id']} of {task['job_id']}"
+        )
+        try:
+            with log_context(
+                worker=worker_id,
+                job_id=task["job_id"],
+                task_id=task["id"],
+                kind=task["kind"],
+            ):
+                result = run_task(queue, task, cancel_event)
+            if queue.complete(task["id"], worker_id, result, on_stage_done):
+                done += 1
+        except InterruptedError:
+            logger.info(f"dist_task_abandoned: #{task['id']}")
+            queue.release(task["id"], worker_id)
+        except Exception as e:
+            logger.error(f"dist_task_failed: #{task['id']}: {e}", exc_info=True)
+            queue.fail(task["id"], worker_id, str(e))
+        finally:
+            finished.set()
+            beat.join()
+    logger.info(f"dist_worker_stopped: {worker_id}, {done} tasks")
+    return done
@@ -0,0 +1,577 @@
+import abc
+import os
+import queue
+import select
+import stat
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from backend.core.media_io import SAMPLING_RATE, decode_audio_ranges
+from backend.core.segment_filter import SegmentFilter
+from backend.core.srt_utils import SubtitleAppender
+from backend.core.two_pass import normalize_text
+from backend.models.schema import LiveOptions
+from backend.services.logger import logger
+from backend.services.metrics import metrics
+
+# Path meaning "read from standard input"
+STDIN = "-"
+# Extensions treated as headerless s16le mono PCM at SAMPLING_RATE
+PCM_EXTENSIONS = (".pcm", ".raw")
+# Committed text (characters) used as the prompt of the next window
+PROMPT_CHARS = 200
+# Start times closer than this (seconds) count as the same segment across passes
+AGREEMENT_TOLERANCE = 0.5
+# How often the session stops waiting for audio to check for cancellation
+POLL_INTERVAL = 0.1
+
+_END_OF_STREAM = object()
+
+
+class LiveSource(abc.ABC):
+    """A live audio input yielding 16 kHz mono float32 chunks as they arrive."""
+
+    @abc.abstractmethod
+    def chunks(self, stop_event: threading.Event) -> Iterator[Any]:
+        """Yields audio chunks until the input ends or stop_event is set."""
+
+
+class PcmSource(LiveSource):
+    """
+    Headerless s16le mono PCM at SAMPLING_RATE from stdin, a named pipe or a
+    growing raw file.
+
+    Pipes end at EOF; a regular file is tailed until it stops growing for
+    idle_timeout seconds. Waiting on a pipe wakes every poll_interval to
+    check stop_event, except on Windows, where pipes cannot be polled.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        poll_interval: float = 0.5,
+        idle_timeout: float = 15.0,
+        chunk_seconds: float = 0.5,
+    ) -> None:
+        self.path = path
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.chunk_bytes = int(chunk_seconds * SAMPLING_RATE) * 2
+
+    def chunks(self, stop_event: threading.Event) -> Iterator[Any]:
+        import numpy as np
+
+        follow = self.path != STDIN and os.path.isfile(self.path)
+        handle = sys.stdin.buffer if self.path == STDIN else open(self.path, "rb")
+        remainder = b""
+        last_data = time.monotonic()
+        try:
+            while not stop_event.is_set():
+                if follow:
+                    data = handle.read(self.chunk_bytes)
+                else:
+                    pipe_data = self._read_pipe(handle)
+                    if pipe_data is None:
+                        continue
+                    data = pipe_data
+                if not data:
+                    if not follow or time.monotonic() - last_data >= self.idle_timeout:
+                        break
+                    stop_event.wait(self.poll_interval)
+                    continue
+                last_data = time.monotonic()
+                data = remainder + data
+                usable = len(data) - len(data) % 2
+                remainder = data[usable:]
+                if usable:
+                    samples = np.frombuffer(data[:usable], dtype=np.int16)
+                    yield samples.astype(np.float32) / 32768.0
+        finally:
+            if handle is not sys.stdin.buffer:
+                handle.close()
+
+    def _read_pipe(self, handle: Any) -> Optional[bytes]:
+        """
+        Reads what a pipe has available, up to one chunk, instead of waiting
+        for a full chunk. Returns None if nothing arrived within
+        poll_interval and b"" at EOF.
+        """
+        if os.name == "nt":
+            data: bytes = handle.read1(self.chunk_bytes)
+            return data
+        ready, _, _ = select.select([handle], [], [], self.poll_interval)
+        if not ready:
+            return None
+        # Unbuffered, so select() sees everything not yet read
+        return os.read(handle.fileno(), self.chunk_bytes)
+
+
+class StreamSource(LiveSource):
+    """
+    A media container (e.g. MPEG-TS) arriving over stdin or a named pipe,
+    decoded frame by frame as it is read.
+    """
+
+    def __init__(self, path: str, audio_stream: int = 0) -> None:
+        self.path = path
+        self.audio_stream = audio_stream
+
+    def chunks(self, stop_event: threading.Event) -> Iterator[Any]:
+        import av
+        import numpy as np
+
+        target: Any = sys.stdin.buffer if self.path == STDIN else self.path
+        with av.open(target, mode="r", metadata_errors="ignore") as container:
+            stream = container.streams.audio[self.audio_stream]
+            resampler = av.AudioResampler(
+                format="s16", layout="mono", rate=SAMPLING_RATE
+            )
+            for frame in container.decode(stream):
+                if stop_event.is_set():
+                    return
+                for out in resampler.resample(frame):
+                    yield out.to_ndarray().reshape(-1).astype(np.float32) / 32768.0
+            for out in resampler.resample(None):
+                yield out.to_ndarray().reshape(-1).astype(np.float32) / 32768.0
+
+
+class GrowingMediaSource(LiveSource):
+    """
+    A media file that is still being recorded.
+
+    Each time the file grows, the audio after the last position is decoded
+    (seeking, not re-reading the whole file). The last tail_guard seconds are
+    held back until the file stops growing, since the final packets may be
+    only partially written.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        audio_stream: int = 0,
+        poll_interval: float = 0.5,
+        idle_timeout: float = 15.0,
+        tail_guard: float = 0.5,
+    ) -> None:
+        self.path = path
+        self.audio_stream = audio_stream
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.tail_guard = tail_guard
+
+    def chunks(self, stop_event: threading.Event) -> Iterator[Any]:
+        import numpy as np
+
+        position = 0.0
+        last_size = -1
+        last_growth = time.monotonic()
+        while not stop_event.is_set():
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                size = -1
+            now = time.monotonic()
+            growing = size != last_size
+            if growing:
+                last_size = size
+                last_growth = now
+            idle = now - last_growth >= self.idle_timeout
+
+            if size > 0 and (growing or idle):
+                try:
+                    regions = decode_audio_ranges(
+                        self.path, [(position, None)], self.audio_stream
+                    )
+                except Exception as e:
+                    # Typically the header or first packets are not written yet
+                    logger.debug(f"live_decode_not_ready: {e}")
+                    regions = []
+                if regions:
+                    start, audio = regions[0]
+                    keep = audio.shape[0]
+                    if not idle:
+                        keep = max(0, keep - int(self.tail_guard * SAMPLING_RATE))
+                    if keep > 0:
+                        gap = int(round((start - position) * SAMPLING_RATE))
+                        if gap > 0:
+                            # Keep the sample clock aligned with media time
+                            yield np.zeros(gap, dtype=np.float32)
+                        yield audio[:keep]
+                        position = start + keep / SAMPLING_RATE
+
+            if idle:
+                return
+            stop_event.wait(self.poll_interval)
+
+
+def open_source(
+    path: str,
+    input_format: str = "auto",
+    audio_stream: int = 0,
+    options: Optional[LiveOptions] = None,
+) -> LiveSource:
+    """
+    Picks the live source for an input.
+
+    Args:
+        path (str): A file path, a named pipe, or '-' for stdin.
+        input_format (str): 'pcm' for raw s16le mono 16 kHz, 'media' for a
+            container, or 'auto': stdin, pipes and .pcm/.raw files are PCM,
+            other files are media being recorded.
+        audio_stream (int): Audio track of a media input.
+        options (Optional[LiveOptions]): Polling settings.
+
+    Returns:
+        LiveSource: The source.
+
+    Raises:
+        ValueError: If the input format is unknown.
+    """
+    options = options or LiveOptions()
+    if input_format not in ("auto", "pcm", "media"):
+        raise ValueError(f"Unknown live input format: {input_format}")
+
+    is_pipe = path == STDIN or (
+        os.path.exists(path) and stat.S_ISFIFO(os.stat(path).st_mode)
+    )
+    if input_format == "auto":
+        is_pcm = is_pipe or path.lower().endswith(PCM_EXTENSIONS)
+        input_format = "pcm" if is_pcm else "media"
+
+    if input_format == "pcm":
+        return PcmSource(path, options.poll_interval, options.idle_timeout)
+    if is_pipe:
+        return StreamSource(path, audio_stream)
+    return GrowingMediaSource(
+        path, audio_stream, options.poll_interval, options.idle_timeout
+    )
+
+
+class LiveTranscriber:
+    """
+    Sliding-window transcription with commit/rollback of the unstable tail.
+
+    Audio accumulates in a window that starts at the end of the last
+    committed segment. Every step_seconds of new audio the window is decoded
+    again. A segment is committed once it ends at least stability_margin
+    before the live edge and the previous pass produced the same text at the
+    same place; everything after it stays tentative and may still change
+    (a rollback). If the window reaches max_window_seconds everything but the
+    last segment is committed, or that segment itself when it is the only
+    one, which bounds both the decode cost per pass and the commit latency.
+    """
+
+    def __init__(
+        self,
+        transcribe_fn: Callable[[Any, Optional[str]], List[Dict[str, Any]]],
+        options: Optional[LiveOptions] = None,
+    ) -> None:
+        import numpy as np
+
+        self._transcribe = transcribe_fn
+        self.options = options or LiveOptions()
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.buffer_start = 0.0
+        self.received = 0
+        self._pending = 0
+        self._previous: List[Dict[str, Any]] = []
+        self._prompt = ""
+        # (total samples received, wall clock) per fed chunk
+        self._arrivals: Deque[Tuple[int, float]] = deque()
+        self.stats: Dict[str, int] = {"passes": 0, "committed": 0, "rollbacks": 0}
+
+    def feed(self, audio: Any, arrived_at: Optional[float] = None) -> None:
+        """Appends newly received audio to the window."""
+        import numpy as np
+
+        if audio.shape[0] == 0:
+            return
+        self.buffer = np.concatenate([self.buffer, audio])
+        self.received += audio.shape[0]
+        self._pending += audio.shape[0]
+        self._arrivals.append((self.received, arrived_at or time.time()))
+
+    def ready(self) -> bool:
+        """True once step_seconds of new audio are waiting to be decoded."""
+        return self._pending >= self.options.step_seconds * SAMPLING_RATE
+
+    def arrival_time(self, media_time: float) -> Optional[float]:
+        """Wall clock time at which the audio at media_time was received."""
+        sample = int(media_time * SAMPLING_RATE)
+        for received, wall_time in self._arrivals:
+            if received >= sample:
+                return wall_time
+        return self._arrivals[-1][1] if self._arrivals else None
+
+    def _agrees(self, segment: Dict[str, Any]) -> bool:
+        text = normalize_text(segment["text"])
+        return any(
+            abs(prev["start"] - segment["start"]) < AGREEMENT_TOLERANCE
+            and normalize_text(prev["text"]) == text
+            for prev in self._previous
+        )
+
+    def process(
+        self, final: bool = False
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Decodes the current window.
+
+        Args:
+            final (bool): The input has ended; commit everything.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: Newly committed
+            segments and the current tentative tail, in media time.
+        """
+        self._pending = 0
+        if self.buffer.shape[0] == 0:
+            return [], []
+
+        self.stats["passes"] += 1
+        segments = []
+        for seg in self._transcribe(self.buffer, self._prompt):
+            seg = dict(seg)
+            seg["start"] += self.buffer_start
+            seg["end"] += self.buffer_start
+            segments.append(seg)
+
+        window = self.buffer.shape[0] / SAMPLING_RATE
+        live_edge = self.buffer_start + window
+        if final:
+            committed = segments
+        else:
+            committed = []
+            for seg in segments:
+                if seg["end"] > live_edge - self.options.stability_margin:
+                    break
+                if not self._agrees(seg):
+                    break
+                committed.append(seg)
+            full = window >= self.options.max_window_seconds
+            if full and len(committed) < len(segments) - 1:
+                committed = segments[:-1]
+            elif full and len(segments) == 1:
+                # One segment spanning the window would otherwise keep it
+                # growing without bound
+                committed = segments
+            elif full and not segments:
+                # Nothing but silence: slide the window forward
+                self._trim(live_edge - self.options.stability_margin)
+        tentative = segments[len(committed) :]
+
+        # Tentative segments of the previous pass that did not survive
+        survivors = {normalize_text(seg["text"]) for seg in segments}
+        self.stats["rollbacks"] += sum(
+            1
+            for prev in self._previous
+            if normalize_text(prev["text"]) not in survivors
+        )
+        self._previous = tentative
+
+        if committed:
+            self.stats["committed"] += len(committed)
+            self._trim(committed[-1]["end"])
+            text = " ".join(seg["text"] for seg in committed)
+            self._prompt = (self._prompt + " " + text).strip()[-PROMPT_CHARS:]
+        elif final:
+            self._trim(live_edge)
+        return committed, tentative
+
+    def _trim(self, media_time: float) -> None:
+        """Drops window audio before media_time."""
+        cut = int(round((media_time - self.buffer_start) * SAMPLING_RATE))
+        cut = max(0, min(cut, self.buffer.shape[0]))
+        self.buffer = self.buffer[cut:]
+        self.buffer_start += cut / SAMPLING_RATE
+        first_needed = int(self.buffer_start * SAMPLING_RATE)
+        while len(self._arrivals) > 1 and self._arrivals[0][0] < first_needed:
+            self._arrivals.popleft()
+
+
+class LiveSession:
+    """
+    Runs live transcription end to end: a reader thread pulls audio from the
+    source, the calling thread decodes windows, and a translator thread
+    translates committed segments as soon as they are committed and appends
+    them to the subtitle file.
+
+    Latency is measured per segment from the moment its last audio sample
+    was received to the moment its cue was written.
+    """
+
+    def __init__(
+        self,
+        source: LiveSource,
+        transcribe_fn: Callable[[Any, Optional[str]], List[Dict[str, Any]]],
+        translate_fn: Optional[Callable[[List[str]], List[str]]] = None,
+        appender: Optional[SubtitleAppender] = None,
+        options: Optional[LiveOptions] = None,
+        cancel_event: Optional[threading.Event] = None,
+        segment_filter: Optional[SegmentFilter] = None,
+        batch_size: int = 10,
+        on_commit: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        on_tentative: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ) -> None:
+        self.source = source
+        self.options = options or LiveOptions()
+        self.transcriber = LiveTranscriber(transcribe_fn, self.options)
+        self.translate_fn = translate_fn
+        self.appender = appender
+        self.cancel_event = cancel_event or threading.Event()
+        self.segment_filter = segment_filter
+        self.batch_size = max(1, batch_size)
+        self.on_commit = on_commit
+        self.on_tentative = on_tentative
+        self.latencies: Deque[float] = deque(maxlen=1000)
+        self.segments: List[Dict[str, Any]] = []
+        self._audio: "queue.Queue[Any]" = queue.Queue()
+        self._commits: "queue.Queue[Any]" = queue.Queue()
+        self._errors: List[BaseException] = []
+
+    def _read(self) -> None:
+        try:
+            for chunk in self.source.chunks(self.cancel_event):
+                self._audio.put((chunk, time.time()))
+        except Exception as e:
+            logger.error(f"live_source_failed: {e}", exc_info=True)
+            self._errors.append(e)
+        finally:
+            self._audio.put(_END_OF_STREAM)
+
+    def _translate_loop(self) -> None:
+        finished = False
+        while not finished:
+            item = self._commits.get()
+            if item is _END_OF_STREAM:
+                break
+            batch = list(item)
+            # Take whatever else is already committed, up to one batch
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._commits.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _END_OF_STREAM:
+                    finished = True
+                    break
+                batch.extend(item)
+            if self.cancel_event.is_set():
+                break
+            self._emit(batch)
+
+    def _emit(self, batch: List[Dict[str, Any]]) -> None:
+        if self.translate_fn is not None:
+            try:
+                translations = self.translate_fn([seg["text"] for seg in batch])
+                for seg, translated in zip(batch, translations):
+                    seg["translated_text"] = translated
+            except Exception as e:
+                # Keep subtitling; the original text is written instead
+                logger.error(f"live_translation_failed: {e}")
+
+        now = time.time()
+        for seg in batch:
+            if self.appender is not None:
+                self.appender.append(seg)
+            arrived = seg.pop("_arrived_at", None)
+            if arrived is not None:
+                seg["latency"] = round(now - arrived, 3)
+                self.latencies.append(seg["latency"])
+                metrics.histogram(
+                    "unisub_live_latency_seconds",
+                    "Live subtitle latency, from a segment's last audio to its cue",
+                ).observe(now - arrived)
+                if seg["latency"] > self.options.max_latency:
+                    logger.warning(f"live_latency_exceeded: {seg['latency']:.1f}s")
+        self.segments.extend(batch)
+        if self.on_commit:
+            self.on_commit(batch)
+
+    def _commit(self, committed: List[Dict[str, Any]]) -> None:
+        kept = []
+        for seg in committed:
+            if self.segment_filter is not None and not self.segment_filter.accept(seg):
+                continue
+            seg["_arrived_at"] = self.transcriber.arrival_time(seg["end"])
+            kept.append(seg)
+        if kept:
+            self._commits.put(kept)
+
+    def latency_stats(self) -> Dict[str, Optional[float]]:
+        """Returns p50/p95/max end-to-end latency in seconds over recent segments."""
+        values = sorted(self.latencies)
+        if not values:
+            return {"p50": None, "p95": None, "max": None}
+
+        def _pct(p: float) -> float:
+            return values[min(len(values) - 1, int(p * len(values)))]
+
+        return {"p50": _pct(0.5), "p95": _pct(0.95), "max": values[-1]}
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Runs until the input ends or the session is cancelled.
+
+        Returns:
+            Dict[str, Any]: Counters, audio seconds and latency statistics.
+
+        Raises:
+            Exception: Re-raises errors from the source or the decoder.
+        """
+        reader = threading.Thread(target=self._read, daemon=True)
+        translator = threading.Thread(target=self._translate_loop, daemon=True)
+        reader.start()
+        translator.start()
+        started = time.time()
+        logger.info("live_session_started")
+
+        try:
+            ended = False
+            while not ended and not self.cancel_event.is_set():
+                # Wait for new audio, then take everything already queued
+                try:
+                    items = [self._audio.get(timeout=POLL_INTERVAL)]
+                except queue.Empty:
+                    continue
+                while True:
+                    try:
+                        items.append(self._audio.get_nowait())
+                    except queue.Empty:
+                        break
+                for item in items:
+                    if item is _END_OF_STREAM:
+                        ended = True
+                    else:
+                        self.transcriber.feed(*item)
+
+                if self._errors:
+                    raise self._errors[0]
+                if self.cancel_event.is_set():
+                    break
+                if ended or self.transcriber.ready():
+                    committed, tentative = self.transcriber.process(final=ended)
+                    self._commit(committed)
+                    if self.on_tentative:
+                        self.on_tentative(tentative)
+        finally:
+            # Unblocks a source that is waiting on the event
+            if not ended:
+                self.cancel_event.set()
+            self._commits.put(_END_OF_STREAM)
+            translator.join()
+            if self.appender is not None:
+                self.appender.close()
+
+        stats: Dict[str, Any] = {
+            **self.transcriber.stats,
+            "written": len(self.segments),
+            "audio_seconds": round(self.transcriber.received / SAMPLING_RATE, 2),
+            "wall_seconds": round(time.time() - started, 2),
+            "latency": self.latency_stats(),
+        }
+        logger.info(f"live_session_finished: {stats}")
+        return stats
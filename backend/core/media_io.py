@@ -0,0 +1,212 @@
+import gc
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.services.logger import logger
+
+SAMPLING_RATE = 16000
+# Seconds decoded before each range start and then discarded
+SEEK_PREROLL = 1.0
+
+# A time range in seconds; an end of None means "to the end of the stream"
+TimeRange = Tuple[float, Optional[float]]
+
+
+def normalize_ranges(
+    ranges: Optional[Sequence[Sequence[Any]]], start_offset: float = 0.0
+) -> Optional[List[TimeRange]]:
+    """
+    Sorts, validates and merges overlapping time ranges.
+
+    Args:
+        ranges (Optional[Sequence]): [start, end] pairs in seconds; end may be
+            None for "until the end".
+        start_offset (float): Drops everything before this time (used when
+            resuming a ranged job).
+
+    Returns:
+        Optional[List[TimeRange]]: The merged ranges, or None if no ranges
+        were requested.
+
+    Raises:
+        ValueError: If a range is malformed.
+    """
+    if not ranges:
+        return None
+
+    parsed: List[TimeRange] = []
+    for item in ranges:
+        if len(item) != 2:
+            raise ValueError(f"Invalid time range: {item!r}")
+        start = max(float(item[0]), start_offset, 0.0)
+        end = None if item[1] is None else float(item[1])
+        if end is not None and end <= start:
+            continue
+        parsed.append((start, end))
+    parsed.sort(key=lambda r: r[0])
+
+    merged: List[TimeRange] = []
+    for start, end in parsed:
+        if merged:
+            last_start, last_end = merged[-1]
+            if last_end is None or start <= last_end:
+                new_end = (
+                    None if last_end is None or end is None else max(last_end, end)
+                )
+                merged[-1] = (last_start, new_end)
+                continue
+        merged.append((start, end))
+    return merged
+
+
+def in_ranges(segment: Dict[str, Any], ranges: Sequence[TimeRange]) -> bool:
+    """Returns True if the segment's midpoint falls inside any of the ranges."""
+    mid = (segment["start"] + segment["end"]) / 2
+    return any(mid >= start and (end is None or mid < end) for start, end in ranges)
+
+
+def list_audio_streams(media_path: str) -> List[Dict[str, Any]]:
+    """
+    Lists the audio streams of a media file.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per audio stream with its index among
+        audio streams (what audio_stream refers to), codec, language, title,
+        channel count and duration in seconds when known.
+    """
+    import av
+
+    streams: List[Dict[str, Any]] = []
+    with av.open(media_path, mode="r", metadata_errors="ignore") as container:
+        for idx, stream in enumerate(container.streams.audio):
+            duration = None
+            if stream.duration is not None and stream.time_base is not None:
+                duration = round(float(stream.duration * stream.time_base), 3)
+            streams.append(
+                {
+                    "index": idx,
+                    "codec": stream.codec_context.name,
+                    "language": stream.metadata.get("language"),
+                    "title": stream.metadata.get("title"),
+                    "channels": stream.codec_context.channels,
+                    "duration": duration,
+                }
+            )
+    return streams
+
+
+def decode_audio_ranges(
+    media_path: str,
+    ranges: Optional[Sequence[TimeRange]] = None,
+    audio_stream: int = 0,
+    sampling_rate: int = SAMPLING_RATE,
+) -> List[Tuple[float, Any]]:
+    """
+    Demuxes and decodes only the requested time ranges of one audio stream.
+
+    Each range seeks to the nearest preceding keyframe and stops decoding at
+    the range end, so a short scene of a long movie is read in a fraction of
+    the time of a full decode.
+
+    Args:
+        media_path (str): Path to the media file.
+        ranges (Optional[Sequence[TimeRange]]): Ranges in seconds (the whole
+            stream if None).
+        audio_stream (int): Index among the file's audio streams.
+        sampling_rate (int): Output sample rate.
+
+    Returns:
+        List[Tuple[float, np.ndarray]]: (range start, float32 mono audio)
+        for each range that contained audio.
+
+    Raises:
+        ValueError: If the audio stream does not exist.
+    """
+    import av
+    import numpy as np
+
+    ranges = list(ranges or [(0.0, None)])
+    regions: List[Tuple[float, Any]] = []
+
+    with av.open(media_path, mode="r", metadata_errors="ignore") as container:
+        if audio_stream < 0 or audio_stream >= len(container.streams.audio):
+            raise ValueError(
+                f"Audio stream {audio_stream} not found "
+                f"({len(container.streams.audio)} audio streams)."
+            )
+        stream = container.streams.audio[audio_stream]
+
+        for start, end in ranges:
+            resampler = av.AudioResampler(
+                format="s16", layout="mono", rate=sampling_rate
+            )
+            if start > 0:
+                # Seek (in AV_TIME_BASE units) a little early so the decoder
+                # has pre-roll and the first kept sample is really at start
+                seek_to = max(0.0, start - SEEK_PREROLL)
+                container.seek(int(seek_to * av.time_base), backward=True)
+                # Drop frames still buffered from the previous range
+                stream.codec_context.flush_buffers()
+
+            pieces = []
+            first_time: Optional[float] = None
+            try:
+                for frame in container.decode(stream):
+                    if frame.time is None:
+                        continue
+                    if end is not None and frame.time >= end:
+                        break
+                    if first_time is None:
+                        first_time = frame.time
+                    for out in resampler.resample(frame):
+                        pieces.append(out.to_ndarray().reshape(-1))
+            except av.error.InvalidDataError as e:
+                logger.warning(f"audio_decode_stopped_on_invalid_data: {e}")
+            for out in resampler.resample(None):
+                pieces.append(out.to_ndarray().reshape(-1))
+
+            del resampler
+            if first_time is None or not pieces:
+                continue
+
+            audio = np.concatenate(pieces).astype(np.float32) / 32768.0
+            # Samples are contiguous from the first decoded frame; trim to the range
+            skip = max(0, int(round((start - first_time) * sampling_rate)))
+            audio = audio[skip:]
+            if end is not None:
+                audio = audio[: max(0, int(round((end - start) * sampling_rate)))]
+            if audio.shape[0] > 0:
+                regions.append((max(start, first_time), audio))
+
+    gc.collect()
+    logger.debug(
+        f"audio_ranges_decoded: stream={audio_stream}, ranges={len(ranges)}, "
+        f"seconds={sum(a.shape[0] for _, a in regions) / sampling_rate:.1f}"
+    )
+    return regions
+
+
+def decode_audio(
+    media_path: str, audio_stream: int = 0, sampling_rate: int = SAMPLING_RATE
+) -> Any:
+    """
+    Decodes a whole audio stream to 16 kHz mono float32.
+
+    The default stream goes through Faster-Whisper's decoder; other streams
+    use decode_audio_ranges.
+    """
+    if not audio_stream:
+        from faster_whisper.audio import decode_audio as fw_decode_audio
+
+        return fw_decode_audio(media_path, sampling_rate=sampling_rate)
+
+    import numpy as np
+
+    regions = decode_audio_ranges(media_path, None, audio_stream, sampling_rate)
+    if not regions:
+        return np.zeros(0, dtype=np.float32)
+    start, audio = regions[0]
+    # Keep sample 0 at time 0 when the stream starts late
+    lead = int(round(start * sampling_rate))
+    if lead > 0:
+        audio = np.concatenate([np.zeros(lead, dtype=np.float32), audio])
+    return audio
@@ -0,0 +1,362 @@
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.core.ai_engine import ai_engine
+from backend.core.checkpoint import TranscriptCheckpoint
+from backend.core.presets import job_decoding
+from backend.core.segment_filter import filter_segments
+from backend.core.srt_utils import save_srt
+from backend.core.whisper_svc import whisper_svc
+from backend.services.config_mgr import config_mgr
+from backend.services.job_queue import Stage
+from backend.services.logger import logger
+
+# Reports (progress %, message[, eta seconds]) for one job stage
+StageReporter = Callable[..., None]
+
+
+def _check_cancel(cancel_event: Optional[threading.Event]) -> None:
+    if cancel_event is not None and cancel_event.is_set():
+        raise InterruptedError("cancelled_by_user")
+
+
+def srt_path_for(media_path: str, output_dir: Optional[str] = None) -> str:
+    """
+    Returns the SRT path of a media file: next to it (video.mp4 -> video.srt),
+    or under output_dir when one is given.
+    """
+    base = os.path.splitext(media_path)[0]
+    if output_dir:
+        base = os.path.join(output_dir, os.path.basename(base))
+    return f"{base}.srt"
+
+
+def load_checkpoint(
+    media_path: str, options: Optional[Dict[str, Any]] = None, audio_stream: int = 0
+) -> Tuple[TranscriptCheckpoint, List[Dict[str, Any]], bool]:
+    """
+    Loads the transcript checkpoint of a media file for resuming, ignoring
+    one transcribed with another model, preset or audio stream.
+
+    Args:
+        media_path (str): The media file the checkpoint belongs to.
+        options (Optional[Dict[str, Any]]): The job's decoding overrides.
+        audio_stream (int): Index among the file's audio streams.
+
+    Returns:
+        Tuple[TranscriptCheckpoint, List[Dict[str, Any]], bool]: The
+        checkpoint, its segments and whether it was complete.
+    """
+    checkpoint = TranscriptCheckpoint(media_path)
+    if not checkpoint.exists():
+        return checkpoint, [], False
+    segments, complete = checkpoint.load()
+    settings = whisper_svc.transcript_settings(options, audio_stream)
+    if not checkpoint.matches(settings):
+        logger.info(
+            f"checkpoint_settings_changed: {checkpoint.settings} -> {settings}, "
+            "ignoring it"
+        )
+        return checkpoint, [], False
+    return checkpoint, segments, complete
+
+
+def transcribe_media(
+    media_path: str,
+    checkpoint: TranscriptCheckpoint,
+    segments: List[Dict[str, Any]],
+    input_media: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    audio_stream: int = 0,
+    cancel_event: Optional[threading.Event] = None,
+    status_callback: Optional[Callable[[str, str], None]] = None,
+    segment_callback: Optional[Callable[[Dict[str, Any], int], None]] = None,
+    progress_callback: Optional[Callable[[float, float], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Transcribes a media file into its checkpoint, continuing after the
+    segments already committed. Without any, the checkpoint starts over
+    with a header of the job's settings.
+
+    Args:
+        media_path (str): The media file the checkpoint belongs to.
+        checkpoint (TranscriptCheckpoint): Checkpoint to append to.
+        segments (List[Dict[str, Any]]): Segments already committed; new
+            ones are appended to this list.
+        input_media (Optional[str]): File to decode instead of media_path
+            (e.g. previously extracted audio).
+        options (Optional[Dict[str, Any]]): Per-job decoding overrides.
+        audio_stream (int): Index among the file's audio streams.
+        cancel_event (threading.Event): Stops the transcription when set.
+        status_callback (Callable): Receives (message, stage) updates.
+        segment_callback (Callable): Receives each new segment and the count.
+        progress_callback (Callable): Receives the decoding position (see
+            whisper_svc.transcribe).
+
+    Returns:
+        List[Dict[str, Any]]: All segments. The checkpoint is marked complete
+        unless no speech was found.
+
+    Raises:
+        InterruptedError: If cancelled.
+    """
+    # Resume right after the last committed segment
+    start_offset = float(segments[-1]["end"]) if segments else 0.0
+    if start_offset > 0:
+        logger.info(
+            f"resuming_transcription: {len(segments)} segments, offset={start_offset:.2f}s"
+        )
+    _check_cancel(cancel_event)
+
+    if not segments:
+        checkpoint.reset()
+    settings = whisper_svc.transcript_settings(options, audio_stream)
+
+    def _on_model(model_size: str, compute_type: str) -> None:
+        # The resource governor may have loaded a smaller model
+        settings["model"] = model_size
+
+    try:
+        for segment in whisper_svc.transcribe(
+            input_media or media_path,
+            status_callback=status_callback,
+            start_offset=start_offset,
+            options=options,
+            cancel_event=cancel_event,
+            audio_stream=audio_stream,
+            progress_callback=progress_callback,
+            model_callback=_on_model,
+        ):
+            _check_cancel(cancel_event)
+            if segment["end"] <= start_offset:
+                # Already committed before the interruption
+                continue
+            # The header (written once, for a new checkpoint) names the model
+            checkpoint.open(settings)
+            checkpoint.append(segment)
+            segments.append(segment)
+            if segment_callback:
+                segment_callback(segment, len(segments))
+    finally:
+        checkpoint.close()
+
+    # A cancelled transcription can end without raising; never mark it complete
+    _check_cancel(cancel_event)
+    if segments:
+        try:
+            checkpoint.mark_complete()
+            logger.info("transcript_checkpoint_completed")
+        except Exception as ex:
+            logger.error(f"failed_to_save_checkpoint: {ex}")
+    return segments
+
+
+def translate_segments(
+    segments: List[Dict[str, Any]],
+    target_lang: str,
+    cancel_event: Optional[threading.Event] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Translates segments in batches, filling 'translated_text' (and
+    'translated_lang') in place. Segments already translated to target_lang,
+    e.g. restored by save_translation_progress, are not sent again.
+
+    Args:
+        segments (List[Dict[str, Any]]): Segments to translate.
+        target_lang (str): Target language.
+        cancel_event (threading.Event): Aborts the request in flight.
+        progress_callback (Callable): Receives (segments done, total) before
+            the first batch and after each one.
+
+    Returns:
+        List[Dict[str, Any]]: The translated segments.
+
+    Raises:
+        InterruptedError: If cancelled.
+    """
+    batch_size = config_mgr.config.ai.batch_size
+    pending = [
+        s
+        for s in segments
+        if not (s.get("translated_text") and s.get("translated_lang") == target_lang)
+    ]
+    done = len(segments) - len(pending)
+    if done:
+        logger.info(f"translation_resumed: {done} of {len(segments)} already done")
+    if progress_callback:
+        progress_callback(done, len(segments))
+
+    for i in range(0, len(pending), batch_size):
+        _check_cancel(cancel_event)
+        batch = pending[i : i + batch_size]
+        translations = ai_engine.translate_batch(
+            [s["text"] for s in batch], target_lang, cancel_event=cancel_event
+        )
+
+        for j, trans in enumerate(translations):
+            if j < len(batch):
+                batch[j]["translated_text"] = trans
+                batch[j]["translated_lang"] = target_lang
+
+        done += len(batch)
+        if progress_callback:
+            progress_callback(done, len(segments))
+
+    return segments
+
+
+def save_translation_progress(
+    media_path: str, transcript: List[Dict[str, Any]]
+) -> None:
+    """
+    Writes the translations finished so far into the media's complete
+    transcript checkpoint, so resuming from it only translates the rest.
+
+    Args:
+        media_path (str): The media file the checkpoint belongs to.
+        transcript (List[Dict[str, Any]]): The full transcript, whose
+            segments translate_segments filled in place.
+    """
+    translated = sum(1 for s in transcript if s.get("translated_text"))
+    if not translated:
+        return
+    try:
+        TranscriptCheckpoint(media_path).replace(transcript, complete=True)
+        logger.info(f"translation_progress_saved: {translated}/{len(transcript)}")
+    except OSError as e:
+        logger.error(f"failed_to_save_checkpoint: {e}")
+
+
+def prepare_stage(
+    job: Dict[str, Any],
+    context: Dict[str, Any],
+    report: StageReporter,
+    cancel_event: threading.Event,
+) -> None:
+    """
+    Runs voice detection on a job's audio and caches its speech map, so the
+    transcription stage skips it. The audio is decoded in the transcription
+    worker when whisper.isolated_worker is enabled.
+    """
+    options = job["options"]
+    _, decoding = job_decoding(options)
+    if (
+        not decoding.vad_filter
+        or load_checkpoint(job["path"], options, job["audio_stream"])[2]
+    ):
+        # No VAD to cache, or already transcribed
+        return
+    report(0, "Analyzing audio...")
+    stats = whisper_svc.analyze_media(
+        job["path"],
+        options=options,
+        audio_stream=job["audio_stream"],
+        cancel_event=cancel_event,
+    )
+    context["analysis"] = stats
+    report(100, f"{stats['speech_seconds']:.0f}s of speech")
+
+
+def transcribe_stage(
+    job: Dict[str, Any],
+    context: Dict[str, Any],
+    report: StageReporter,
+    cancel_event: threading.Event,
+) -> None:
+    """Transcribes a job into its checkpoint (resuming a partial one)."""
+    options = job["options"]
+    checkpoint, segments, complete = load_checkpoint(
+        job["path"], options, job["audio_stream"]
+    )
+    if not complete:
+        tracker = whisper_svc.progress_tracker(options)
+
+        def _on_status(msg: str, stage: str = "loading_model") -> None:
+            report(100.0 * tracker.fraction, msg, tracker.eta)
+
+        def _on_segment(segment: Dict[str, Any], count: int) -> None:
+            report(
+                100.0 * tracker.fraction,
+                f"Transcribed {count} segments...",
+                tracker.eta,
+            )
+
+        segments = transcribe_media(
+            job["path"],
+            checkpoint,
+            segments,
+            options=options,
+            audio_stream=job["audio_stream"],
+            cancel_event=cancel_event,
+            status_callback=_on_status,
+            segment_callback=_on_segment,
+            progress_callback=tracker.update,
+        )
+        if segments:
+            tracker.finish()
+    if not segments:
+        raise RuntimeError("No speech detected in this media file.")
+    context["segments"] = segments
+    report(100, f"{len(segments)} segments")
+
+
+def translate_stage(
+    job: Dict[str, Any],
+    context: Dict[str, Any],
+    report: StageReporter,
+    cancel_event: threading.Event,
+) -> None:
+    """Filters, translates and writes the SRT of a transcribed job."""
+    transcript = segments = context["segments"]
+    filter_options = config_mgr.config.whisper.segment_filter
+    if filter_options.enabled:
+        segments, context["filter_stats"] = filter_segments(segments, filter_options)
+        if not segments:
+            raise RuntimeError("No speech detected in this media file.")
+
+    tracker = ai_engine.progress_tracker()
+
+    def _on_progress(done: int, total: int) -> None:
+        tracker.update(done, total)
+        report(100.0 * tracker.fraction, f"Translated {done}/{total}...", tracker.eta)
+
+    try:
+        results = translate_segments(
+            segments,
+            job["target_lang"],
+            cancel_event=cancel_event,
+            progress_callback=_on_progress,
+        )
+        tracker.finish()
+    except InterruptedError:
+        save_translation_progress(job["path"], transcript)
+        raise
+    srt_path = srt_path_for(job["path"], job.get("output_dir"))
+    if job.get("output_dir"):
+        os.makedirs(job["output_dir"], exist_ok=True)
+    save_srt(results, srt_path)
+    logger.info(f"srt_saved_successfully: {srt_path}")
+    context["srt_path"] = srt_path
+    report(100, "Saved")
+
+
+def job_stages() -> List[Stage]:
+    """
+    Returns the job queue stages; worker counts are read from the pipeline
+    config whenever the scheduler checks them.
+    """
+    return [
+        ("prepare", prepare_stage, lambda: config_mgr.config.pipeline.prepare_workers),
+        (
+            "transcribe",
+            transcribe_stage,
+            lambda: config_mgr.config.pipeline.transcribe_workers,
+        ),
+        (
+            "translate",
+            translate_stage,
+            lambda: config_mgr.config.pipeline.translate_workers,
+        ),
+    ]
@@ -0,0 +1,103 @@
+from typing import Any, Dict, Optional, Tuple
+
+from backend.models.schema import DecodingOptions
+from backend.services.config_mgr import config_mgr
+from backend.services.logger import logger
+from backend.services.resource_governor import MODEL_PARAMS
+
+DEFAULT_PRESET = "balanced"
+
+# Job options that travel with the decoding overrides but are not fields
+JOB_FLAGS = ("two_pass", "profile")
+
+# Named speed/accuracy trade-offs. "balanced" matches the historical defaults.
+# A preset's model_size is the largest model it uses (see resolve_decoding).
+DECODING_PRESETS: Dict[str, DecodingOptions] = {
+    "draft": DecodingOptions(
+        beam_size=1,
+        best_of=1,
+        temperature=[0.0],
+        condition_on_previous_text=False,
+        vad_threshold=0.6,
+        min_silence_duration_ms=300,
+        model_size="base",
+    ),
+    "balanced": DecodingOptions(),
+    "accurate": DecodingOptions(
+        beam_size=8,
+        best_of=5,
+        condition_on_previous_text=True,
+        vad_threshold=0.35,
+        min_silence_duration_ms=1000,
+    ),
+}
+
+
+def _capped_model_size(cap: str, configured: str) -> Optional[str]:
+    """
+    Returns the model a preset capped at 'cap' uses: the configured model
+    if it is no larger (None, i.e. keep it), else the cap, English-only
+    when the configured model is. Models of unknown size are kept.
+    """
+    if cap not in MODEL_PARAMS or configured not in MODEL_PARAMS:
+        return None
+    if MODEL_PARAMS[configured] <= MODEL_PARAMS[cap]:
+        return None
+    if configured.endswith(".en") and f"{cap}.en" in MODEL_PARAMS:
+        return f"{cap}.en"
+    return cap
+
+
+def resolve_decoding(
+    preset: Optional[str] = None, overrides: Optional[Dict[str, Any]] = None
+) -> DecodingOptions:
+    """
+    Builds the decoding options for a job from a named preset and overrides.
+
+    A preset's model_size caps whisper.model_size rather than replacing it,
+    so a preset never loads a larger model than the configured one. A
+    model_size override is used as given.
+
+    Args:
+        preset (Optional[str]): Preset name; unknown names fall back to 'balanced'.
+        overrides (Optional[Dict[str, Any]]): Per-job field overrides.
+
+    Returns:
+        DecodingOptions: The validated, merged options.
+    """
+    name = preset or DEFAULT_PRESET
+    if name not in DECODING_PRESETS:
+        logger.warning(f"unknown_decoding_preset: {name}, using {DEFAULT_PRESET}")
+        name = DEFAULT_PRESET
+
+    base = DECODING_PRESETS[name].model_dump()
+    if base["model_size"]:
+        base["model_size"] = _capped_model_size(
+            base["model_size"], config_mgr.config.whisper.model_size
+        )
+    if overrides:
+        unknown = set(overrides) - set(base)
+        if unknown:
+            logger.warning(f"unknown_decoding_overrides_ignored: {sorted(unknown)}")
+        base.update({k: v for k, v in overrides.items() if k in base})
+    return DecodingOptions(**base)
+
+
+def job_decoding(
+    options: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, DecodingOptions]:
+    """
+    Resolves a job's decoding options: its preset (or whisper.preset) with
+    whisper.decoding and the job's overrides applied on top. Job flags such
+    as two_pass are ignored.
+
+    Args:
+        options (Optional[Dict[str, Any]]): The job's options.
+
+    Returns:
+        Tuple[str, DecodingOptions]: The preset name and the options.
+    """
+    config = config_mgr.config.whisper
+    overrides = {k: v for k, v in (options or {}).items() if k not in JOB_FLAGS}
+    preset = overrides.pop("preset", None) or config.preset
+    return preset, resolve_decoding(preset, {**config.decoding, **overrides})
@@ -0,0 +1,111 @@
+import difflib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.core.two_pass import normalize_text
+from backend.models.schema import SegmentFilterOptions
+from backend.services.logger import logger
+
+
+class SegmentFilter:
+    """
+    Drops Whisper hallucinations before they are translated.
+
+    Catches three kinds of junk: empty or zero-length segments, segments
+    Whisper itself was unsure contained speech (high no_speech_prob with a
+    low avg_logprob), and repetition loops, where the same line is emitted
+    again and again over music or silence. A loop is collapsed to its first
+    max_repeats occurrences.
+
+    Segments are judged one at a time against what was kept so far, so the
+    filter also works on streamed segments.
+    """
+
+    def __init__(self, options: Optional[SegmentFilterOptions] = None) -> None:
+        self.options = options or SegmentFilterOptions()
+        self.stats: Dict[str, int] = {
+            "input": 0,
+            "kept": 0,
+            "empty": 0,
+            "low_confidence": 0,
+            "repeated": 0,
+        }
+        self._last_text: Optional[str] = None
+        self._run_length = 0
+
+    def _is_repeat(self, text: str) -> bool:
+        if self._last_text is None:
+            return False
+        if text == self._last_text:
+            return True
+        return (
+            difflib.SequenceMatcher(None, text, self._last_text).ratio()
+            >= self.options.similarity_threshold
+        )
+
+    def accept(self, segment: Dict[str, Any]) -> bool:
+        """
+        Decides whether a segment should be kept.
+
+        Args:
+            segment (Dict[str, Any]): A transcribed segment; avg_logprob and
+                no_speech_prob are used when present.
+
+        Returns:
+            bool: True if the segment should be kept.
+        """
+        opts = self.options
+        self.stats["input"] += 1
+
+        text = normalize_text(segment.get("text", ""))
+        if not text or segment["end"] - segment["start"] < opts.min_duration:
+            self.stats["empty"] += 1
+            return False
+
+        no_speech_prob = segment.get("no_speech_prob")
+        avg_logprob = segment.get("avg_logprob")
+        if (
+            no_speech_prob is not None
+            and avg_logprob is not None
+            and no_speech_prob > opts.no_speech_threshold
+            and avg_logprob < opts.logprob_threshold
+        ):
+            self.stats["low_confidence"] += 1
+            return False
+
+        if self._is_repeat(text):
+            self._run_length += 1
+        else:
+            self._run_length = 1
+        self._last_text = text
+        if self._run_length > opts.max_repeats:
+            self.stats["repeated"] += 1
+            return False
+
+        self.stats["kept"] += 1
+        return True
+
+    def filter(self, segments: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Returns the segments that pass the filter, in order."""
+        return [segment for segment in segments if self.accept(segment)]
+
+
+def filter_segments(
+    segments: Iterable[Dict[str, Any]],
+    options: Optional[SegmentFilterOptions] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Filters a finished transcript.
+
+    Args:
+        segments (Iterable[Dict[str, Any]]): Segments in time order.
+        options (Optional[SegmentFilterOptions]): Filter thresholds.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Dict[str, int]]: The kept segments and
+        counters for what was dropped.
+    """
+    segment_filter = SegmentFilter(options)
+    kept = segment_filter.filter(segments)
+    if segment_filter.stats["kept"] != segment_filter.stats["input"]:
+        logger.info(f"segments_filtered: {segment_filter.stats}")
+    return kept, segment_filter.stats
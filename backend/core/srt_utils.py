@@ -1,15 +1,24 @@
-from typing import Any, Dict, List
+import os
+import re
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple
 
+from backend.core.media_io import in_ranges
 
-def format_timestamp(seconds: float) -> str:
+_TIMESTAMP_LINE = re.compile(
+    r"(\d+):(\d{2}):(\d{2})[,.](\d{3})\s*-->\s*(\d+):(\d{2}):(\d{2})[,.](\d{3})"
+)
+
+
+def format_timestamp(seconds: float, separator: str = ",") -> str:
     """
     Converts seconds to SRT timestamp format (HH:MM:SS,mmm).
+    WebVTT uses the same format with '.' as the separator.
     """
     hours = int(seconds // 3600)
     minutes = int((seconds % 3600) // 60)
     secs = int(seconds % 60)
     milliseconds = int((seconds - int(seconds)) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{milliseconds:03d}"
 
 
 def save_srt(
@@ -40,3 +49,118 @@ def save_srt(
             f.write(f"{i}\n")
             f.write(f"{start} --> {end}\n")
             f.write(f"{text}\n\n")
+
+
+def _to_seconds(h: str, m: str, s: str, ms: str) -> float:
+    return int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
+
+
+def load_srt(
+    srt_path: str, transcript: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Reads an SRT file back into segments.
+
+    Args:
+        srt_path: Path of the .srt file.
+        transcript: Optional source-language segments; where one starts at the
+            same millisecond, its text is restored as the segment's 'text'.
+
+    Returns:
+        Segments with 'start', 'end', 'text' and 'translated_text'.
+    """
+    originals = {int(seg["start"] * 1000): seg["text"] for seg in transcript or []}
+    segments: List[Dict[str, Any]] = []
+    with open(srt_path, "r", encoding="utf-8-sig") as f:
+        blocks = re.split(r"\n\s*\n", f.read().replace("\r\n", "\n"))
+
+    for block in blocks:
+        lines = [line for line in block.strip().split("\n") if line.strip()]
+        for idx, line in enumerate(lines):
+            match = _TIMESTAMP_LINE.search(line)
+            if not match:
+                continue
+            start = _to_seconds(*match.groups()[:4])
+            end = _to_seconds(*match.groups()[4:])
+            text = "\n".join(lines[idx + 1 :])
+            segments.append(
+                {
+                    "start": start,
+                    "end": end,
+                    "text": originals.get(int(round(start * 1000)), text),
+                    "translated_text": text,
+                }
+            )
+            break
+    return segments
+
+
+def merge_segments(
+    existing: List[Dict[str, Any]],
+    replacements: List[Dict[str, Any]],
+    ranges: Sequence[Tuple[float, Optional[float]]],
+) -> List[Dict[str, Any]]:
+    """
+    Replaces the segments inside the given time ranges.
+
+    Args:
+        existing: Segments of the current transcript or subtitle file.
+        replacements: Newly transcribed segments for the ranges.
+        ranges: The re-transcribed (start, end) ranges in seconds.
+
+    Returns:
+        The merged segments sorted by start time.
+    """
+    kept = [seg for seg in existing if not in_ranges(seg, ranges)]
+    return sorted(kept + list(replacements), key=lambda seg: seg["start"])
+
+
+class SubtitleAppender:
+    """
+    Appends cues to an SRT or WebVTT file as they are produced.
+
+    Each cue is flushed as soon as it is written, so a player or a tail
+    reading the file sees subtitles while the stream is still running.
+    """
+
+    def __init__(self, output_path: str, subtitle_format: str = "srt") -> None:
+        if subtitle_format not in ("srt", "vtt"):
+            raise ValueError(f"Unsupported subtitle format: {subtitle_format}")
+        self.path = output_path
+        self.format = subtitle_format
+        self.count = 0
+        self._handle: Optional[IO[str]] = None
+
+    def open(self) -> None:
+        """Creates (truncates) the file; WebVTT files get their header."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._handle = open(self.path, "w", encoding="utf-8")
+        if self.format == "vtt":
+            self._handle.write("WEBVTT\n\n")
+            self._handle.flush()
+        self.count = 0
+
+    def append(self, segment: Dict[str, Any], use_translated: bool = True) -> None:
+        """Writes one segment as the next cue."""
+        if self._handle is None:
+            self.open()
+        assert self._handle is not None
+
+        separator = "." if self.format == "vtt" else ","
+        start = format_timestamp(segment["start"], separator)
+        end = format_timestamp(segment["end"], separator)
+        text = segment.get("translated_text") if use_translated else None
+        if text is None:
+            text = segment.get("text", "")
+
+        self.count += 1
+        if self.format == "srt":
+            self._handle.write(f"{self.count}\n")
+        self._handle.write(f"{start} --> {end}\n{text}\n\n")
+        self._handle.flush()
+
+    def close(self) -> None:
+        """Closes the file."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
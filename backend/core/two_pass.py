@@ -0,0 +1,187 @@
+import queue
+import threading
+import unicodedata
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional
+
+from backend.services.logger import in_log_context, logger
+
+_END_OF_STREAM = object()
+# Refined segments decoded ahead of the consumer before the decoder waits
+MAX_PENDING_SEGMENTS = 64
+# Seconds between cancellation checks while waiting on the queue
+POLL_INTERVAL = 0.2
+
+
+def normalize_text(text: str) -> str:
+    """Case-folds and strips whitespace/punctuation so cosmetic edits compare equal."""
+    return "".join(
+        ch
+        for ch in unicodedata.normalize("NFKC", text).casefold()
+        if not unicodedata.category(ch).startswith(("P", "Z", "C"))
+    )
+
+
+class RefinementJob:
+    """
+    Runs the refinement transcription on a background thread and hands the
+    segments over through a bounded queue, so the caller can translate the
+    draft while the larger model is still decoding, and the decoder waits
+    when the caller falls behind.
+
+    The job has its own cancel event, so it can be stopped (see cancel)
+    without touching the task's event, which a later task may clear.
+    """
+
+    def __init__(
+        self,
+        producer: Callable[[threading.Event], Iterable[Dict[str, Any]]],
+        cancel_event: Optional[threading.Event] = None,
+        max_pending: int = MAX_PENDING_SEGMENTS,
+    ) -> None:
+        """
+        Args:
+            producer (Callable): Returns the segments; receives the job's
+                cancel event to stop decoding with.
+            cancel_event (Optional[threading.Event]): The task's cancel
+                event; once set, the job cancels itself too.
+            max_pending (int): Segments decoded ahead of the consumer.
+        """
+        self._producer = producer
+        self._task_cancel = cancel_event
+        self.cancel_event = threading.Event()
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=in_log_context(self._run), daemon=True)
+
+    def start(self) -> "RefinementJob":
+        """Starts the background transcription."""
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        """Stops the background transcription; pending segments are dropped."""
+        self.cancel_event.set()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for the background thread, e.g. after cancel.
+
+        Returns:
+            bool: False if it is still running after the timeout.
+        """
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _cancelled(self) -> bool:
+        if self._task_cancel is not None and self._task_cancel.is_set():
+            self.cancel_event.set()
+        return self.cancel_event.is_set()
+
+    def _put(self, item: Any) -> bool:
+        """Queues an item, waiting for room; False if cancelled meanwhile."""
+        while True:
+            try:
+                self._queue.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                if self._cancelled():
+                    return False
+
+    def _get(self) -> Any:
+        """Takes the next item, or end of stream once cancelled."""
+        while True:
+            try:
+                return self._queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                if self._cancelled():
+                    return _END_OF_STREAM
+
+    def _run(self) -> None:
+        try:
+            for segment in self._producer(self.cancel_event):
+                if self._cancelled() or not self._put(segment):
+                    logger.info("refinement_cancelled")
+                    break
+        except Exception as e:
+            logger.error(f"refinement_failed: {e}", exc_info=True)
+            self._error = e
+        finally:
+            self._put(_END_OF_STREAM)
+
+    def batches(self, max_size: int) -> Generator[List[Dict[str, Any]], None, None]:
+        """
+        Yields refined segments in batches of up to max_size.
+
+        Blocks for the first segment of each batch, then takes whatever else
+        is already available, so replacements reach the UI as they are decoded.
+        Stops early once the job is cancelled.
+
+        Raises:
+            Exception: Re-raises any error from the background transcription.
+        """
+        finished = False
+        while not finished:
+            item = self._get()
+            if item is _END_OF_STREAM:
+                break
+            batch = [item]
+            while len(batch) < max_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _END_OF_STREAM:
+                    finished = True
+                    break
+                batch.append(item)
+            yield batch
+
+        if self._error is not None:
+            raise self._error
+
+
+class RefinementMerger:
+    """
+    Carries draft translations over to refined segments whose text is unchanged,
+    so only segments the larger model actually corrected are re-translated.
+    """
+
+    def __init__(self, draft_segments: List[Dict[str, Any]]) -> None:
+        self.draft = sorted(draft_segments, key=lambda s: s["start"])
+        self.reused = 0
+        self.changed = 0
+
+    def _best_overlap(self, segment: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        best: Optional[Dict[str, Any]] = None
+        best_overlap = 0.0
+        for draft in self.draft:
+            if draft["start"] >= segment["end"]:
+                break
+            overlap = min(draft["end"], segment["end"]) - max(
+                draft["start"], segment["start"]
+            )
+            if overlap > best_overlap:
+                best, best_overlap = draft, overlap
+        return best
+
+    def merge(self, segment: Dict[str, Any]) -> bool:
+        """
+        Copies the draft translation onto the refined segment when possible.
+
+        Args:
+            segment (Dict[str, Any]): A refined segment.
+
+        Returns:
+            bool: True if the segment still needs translating.
+        """
+        draft = self._best_overlap(segment)
+        if (
+            draft is not None
+            and draft.get("translated_text") is not None
+            and normalize_text(draft["text"]) == normalize_text(segment["text"])
+        ):
+            segment["translated_text"] = draft["translated_text"]
+            self.reused += 1
+            return False
+        self.changed += 1
+        return True
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from appdirs import user_cache_dir
+
+from backend.services.logger import logger
+
+SAMPLING_RATE = 16000
+# Bump when the stored layout or the VAD invocation changes
+CACHE_VERSION = 1
+
+
+class VadCache:
+    """
+    Persists Silero VAD speech maps per media file and VAD parameters.
+
+    Re-transcribing the same media with another model size or language then
+    skips the VAD pass entirely, and speech statistics are available before a
+    job starts.
+    """
+
+    def __init__(self) -> None:
+        self.cache_dir = os.path.join(
+            user_cache_dir("UniversalSub", "UniversalSub"), "vad"
+        )
+        self._lock = threading.Lock()
+
+    def _cache_key(
+        self, media_path: str, vad_params: Dict[str, Any], audio_stream: int = 0
+    ) -> str:
+        """Fingerprints the media (path, size, mtime), audio stream and VAD parameters."""
+        stat = os.stat(media_path)
+        parts = [
+            str(CACHE_VERSION),
+            os.path.abspath(media_path),
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+            json.dumps(vad_params, sort_keys=True),
+        ]
+        if audio_stream:
+            # The default stream keeps the key used before streams were selectable
+            parts.append(f"stream={audio_stream}")
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load(
+        self, media_path: str, vad_params: Dict[str, Any], audio_stream: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached speech map, or None if the media was never analysed.
+
+        Args:
+            media_path (str): Path to the media file.
+            vad_params (Dict[str, Any]): VadOptions fields used for detection.
+            audio_stream (int): Index among the file's audio streams.
+
+        Returns:
+            Optional[Dict[str, Any]]: The speech map with statistics.
+        """
+        path = self._cache_path(self._cache_key(media_path, vad_params, audio_stream))
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data: Dict[str, Any] = json.load(f)
+                return data
+        except (OSError, ValueError) as e:
+            logger.warning(f"vad_cache_unreadable: {path}, {e}")
+            return None
+
+    def _save(
+        self,
+        media_path: str,
+        vad_params: Dict[str, Any],
+        data: dict,
+        audio_stream: int = 0,
+    ) -> None:
+        key = self._cache_key(media_path, vad_params, audio_stream)
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._cache_path(key) + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self._cache_path(key))
+
+    def get_speech_map(
+        self,
+        media_path: str,
+        vad_params: Dict[str, Any],
+        audio: Optional[Any] = None,
+        audio_stream: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Returns the speech map for the media, computing and persisting it once.
+
+        Args:
+            media_path (str): Path to the media file.
+            vad_params (Dict[str, Any]): VadOptions fields used for detection.
+            audio (Optional[np.ndarray]): Already decoded 16 kHz mono audio.
+            audio_stream (int): Index among the file's audio streams.
+
+        Returns:
+            Dict[str, Any]: 'chunks' (start/end in samples at 16 kHz) plus
+            'duration', 'speech_seconds' and 'speech_ratio'.
+        """
+        cached = self.load(media_path, vad_params, audio_stream)
+        if cached is not None:
+            logger.info(f"vad_cache_hit: {media_path}")
+            return cached
+
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+        from backend.core.media_io import decode_audio
+
+        if audio is None:
+            audio = decode_audio(media_path, audio_stream, sampling_rate=SAMPLING_RATE)
+
+        chunks = get_speech_timestamps(audio, VadOptions(**vad_params))
+        duration = audio.shape[0] / SAMPLING_RATE
+        data = {
+            "chunks": [
+                {"start": int(c["start"]), "end": int(c["end"])} for c in chunks
+            ],
+            **self.compute_stats(chunks, duration),
+        }
+
+        try:
+            self._save(media_path, vad_params, data, audio_stream)
+        except OSError as e:
+            logger.warning(f"vad_cache_save_failed: {e}")
+
+        logger.info(
+            f"vad_speech_map_computed: {media_path}, ratio={data['speech_ratio']:.2f}"
+        )
+        return data
+
+    @staticmethod
+    def compute_stats(chunks: List[Dict[str, int]], duration: float) -> Dict[str, Any]:
+        """Computes speech duration/ratio statistics for a list of chunks."""
+        speech_seconds = sum(c["end"] - c["start"] for c in chunks) / SAMPLING_RATE
+        return {
+            "duration": round(duration, 3),
+            "speech_seconds": round(speech_seconds, 3),
+            "speech_ratio": round(speech_seconds / duration, 4) if duration else 0.0,
+            "chunk_count": len(chunks),
+        }
+
+
+vad_cache = VadCache()
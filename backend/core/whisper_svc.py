@@ -1,9 +1,29 @@
 import os
 import platform
-from typing import Any, Callable, Generator, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
 
+from backend.core.media_io import decode_audio, decode_audio_ranges, normalize_ranges
+from backend.core.presets import DECODING_PRESETS, job_decoding, resolve_decoding
+from backend.core.two_pass import RefinementJob
+from backend.core.vad_cache import SAMPLING_RATE, vad_cache
+from backend.models.schema import DecodingOptions
 from backend.services.config_mgr import config_mgr
 from backend.services.logger import logger
+from backend.services.metrics import RATE_BUCKETS, RATIO_BUCKETS, metrics
+from backend.services.model_store import model_store
+from backend.services.profiler import span
+from backend.services.progress import StageProgress, throughput_history
+from backend.services.resource_governor import resource_governor
+from backend.services.tuner_mgr import BENCHMARK_SECONDS, tuner_mgr
+
+# Draft + refinement models for two-pass transcription
+MAX_LOADED_MODELS = 2
+
+# Less speech than this in a calibration sample falls back to the synthetic clip
+MIN_CALIBRATION_SECONDS = 5
 
 
 class FasterWhisperService:
@@ -15,27 +35,145 @@ class FasterWhisperService:
 
     def __init__(self) -> None:
         self.model: Any = None
-        self._current_model_size: str = ""
+        self._models: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+        self._load_lock = threading.Lock()
+        # Requested model key -> the key the resource governor planned for it
+        self._plans: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+        # Gates concurrent transcriptions sharing the loaded model(s)
+        self._slots = threading.Condition()
+        self._active_jobs = 0
+        # True inside the isolated worker process, where jobs run in-process
+        self.in_worker = False
+
+    def _resolve_runtime(self, model_size: str) -> Tuple[str, int]:
+        """
+        Resolves the compute type and CPU thread count to load the model with.
+
+        Explicit config values win; otherwise, with auto_tune, the persisted
+        tuning profile for this machine is applied. Calibration never runs
+        here: until it has been run (see TunerManager.calibrate), the untuned
+        defaults are used.
+        """
+        config = config_mgr.config.whisper
+        compute_type = config.compute_type
+        cpu_threads = config.cpu_threads
+
+        if config.auto_tune and (compute_type == "default" or cpu_threads == 0):
+            profile = tuner_mgr.get_profile(model_size, config.device)
+            if profile is None:
+                logger.info(f"tuning_profile_missing: {model_size}, using defaults")
+            else:
+                if compute_type == "default":
+                    compute_type = profile["compute_type"]
+                if cpu_threads == 0:
+                    cpu_threads = profile["cpu_threads"]
+                logger.info(
+                    f"tuning_profile_applied: {compute_type}, threads={cpu_threads}"
+                )
+
+        # Auto-detect compute type if not specified
+        if compute_type == "default":
+            compute_type = "float16" if config.device == "cuda" else "int8"
+        return compute_type, cpu_threads
+
+    def _requested_key(self, model_size: Optional[str] = None) -> Tuple[Any, ...]:
+        """Returns the key of the model the config asks for (before planning)."""
+        config = config_mgr.config.whisper
+        model_size = model_size or config.model_size
+        compute_type, cpu_threads = self._resolve_runtime(model_size)
+        # One CTranslate2 worker per concurrent job lets their decodes overlap
+        num_workers = max(config.num_workers, config.max_concurrent_jobs)
+        cpu_threads = resource_governor.cap_threads(cpu_threads, num_workers)
+        return (model_size, config.device, compute_type, cpu_threads, num_workers)
+
+    def _planned_key(self, requested_key: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        """
+        Returns the key of the model to use for a requested one: itself, or
+        the smaller model the resource governor planned instead. A plan is
+        kept while its model is loaded; planning again would count the
+        resident model against the budget and step down further. Call with
+        _load_lock held.
+        """
+        if requested_key in self._models:
+            return requested_key
+        planned = self._plans.get(requested_key)
+        if planned is not None and planned in self._models:
+            return planned
+
+        config = config_mgr.config.whisper
+        model_size, device, compute_type = requested_key[:3]
+        size, planned_type = resource_governor.plan_model(
+            model_size,
+            compute_type,
+            tuner_mgr.resolve_device(device),
+            lambda size, ct: not config.offline
+            or model_store.find(size, ct) is not None,
+        )
+        planned = (size, device, planned_type, *requested_key[3:])
+        self._plans[requested_key] = planned
+        return planned
+
+    def loaded_model(self, model_size: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Returns the model size and compute type transcriptions of model_size
+        run with: the resolved compute type and, once the model was planned,
+        the model the resource governor chose.
+
+        Args:
+            model_size (Optional[str]): Overrides the configured model size.
+
+        Returns:
+            Tuple[str, str]: (model size, compute type).
+        """
+        requested_key = self._requested_key(model_size)
+        with self._load_lock:
+            key = self._plans.get(requested_key, requested_key)
+        return key[0], key[2]
 
     def _ensure_model_loaded(
-        self, status_callback: Optional[Callable[[str], None]] = None
-    ) -> None:
+        self,
+        status_callback: Optional[Callable[[str], None]] = None,
+        model_size: Optional[str] = None,
+    ) -> Any:
         """
-        Loads the model if it's not already loaded or if the size has changed.
+        Loads the model if it's not already loaded or if its settings have changed.
         Includes a fallback to CPU if CUDA initialization fails.
+
+        Up to MAX_LOADED_MODELS models stay resident (least recently used is
+        evicted), so a draft and a refinement model can be used side by side.
+        The resource governor caps the threads and, before a model is loaded,
+        may switch to a smaller one that fits the memory budget.
+
+        Args:
+            status_callback (Callable): Callback for loading status messages.
+            model_size (Optional[str]): Overrides the configured model size.
+
+        Returns:
+            WhisperModel: The loaded model.
         """
         config = config_mgr.config.whisper
-        if self.model is None or self._current_model_size != config.model_size:
-            msg = f"Loading AI Model ({config.model_size})..."
+        requested_key = self._requested_key(model_size)
+        with self._load_lock:
+            model_key = self._planned_key(requested_key)
+            model_size, _, compute_type, cpu_threads, num_workers = model_key
+            model = self._models.get(model_key)
+            if model is not None:
+                self._models.move_to_end(model_key)
+                self.model = model
+                return model
+
+            if model_key != requested_key and status_callback:
+                status_callback(
+                    f"Not enough memory for {requested_key[0]}/{requested_key[2]}, "
+                    f"using {model_size}/{compute_type}..."
+                )
+            msg = f"Loading AI Model ({model_size})..."
             logger.info(msg)
             if status_callback:
                 status_callback(msg)
 
-            # Auto-detect compute type if not specified
-            compute_type = config.compute_type
-            if compute_type == "default":
-                compute_type = "float16" if config.device == "cuda" else "int8"
-
+            load_started = time.monotonic()
+            device = config.device
             try:
                 # Debug info: print PATH and LD_LIBRARY_PATH if needed
                 if platform.system().lower() == "windows":
@@ -43,8 +181,16 @@ class FasterWhisperService:
 
                 from faster_whisper import WhisperModel
 
-                self.model = WhisperModel(
-                    config.model_size, device=config.device, compute_type=compute_type
+                source, local_only = model_store.resolve(
+                    model_size, compute_type, offline=config.offline
+                )
+                model = WhisperModel(
+                    source,
+                    device=config.device,
+                    compute_type=compute_type,
+                    cpu_threads=cpu_threads,
+                    num_workers=num_workers,
+                    local_files_only=local_only,
                 )
             except ImportError as ie:
                 logger.error(
@@ -54,12 +200,24 @@ class FasterWhisperService:
             except Exception as e:
                 if config.device == "cuda":
                     logger.warning(f"cuda_init_failed_falling_back_to_cpu: {e}")
+                    metrics.counter(
+                        "unisub_fallbacks_total", "Fallbacks to a degraded mode"
+                    ).inc(kind="cuda_to_cpu")
+                    device = "cpu"
                     # Force CPU fallback
                     try:
                         from faster_whisper import WhisperModel
 
-                        self.model = WhisperModel(
-                            config.model_size, device="cpu", compute_type="int8"
+                        source, local_only = model_store.resolve(
+                            model_size, "int8", offline=config.offline
+                        )
+                        model = WhisperModel(
+                            source,
+                            device="cpu",
+                            compute_type="int8",
+                            cpu_threads=cpu_threads,
+                            num_workers=num_workers,
+                            local_files_only=local_only,
                         )
                     except Exception as cpu_e:
                         logger.error(f"whisper_cpu_fallback_failed: {cpu_e}")
@@ -68,58 +226,772 @@ class FasterWhisperService:
                     logger.error(f"whisper_model_load_failed: {e}", exc_info=True)
                     raise e
 
-            self._current_model_size = config.model_size
-            logger.info(f"whisper_model_loaded_successfully: {config.model_size}")
+            self._models[model_key] = model
+            while len(self._models) > MAX_LOADED_MODELS:
+                evicted_key, _ = self._models.popitem(last=False)
+                logger.info(f"whisper_model_evicted: {evicted_key[0]}")
+            self.model = model
+            logger.info(f"whisper_model_loaded_successfully: {model_size}")
+            metrics.histogram(
+                "unisub_model_load_seconds", "Whisper model load time"
+            ).observe(time.monotonic() - load_started, model=model_size, device=device)
+            return model
+
+    def _vad_params(self, decoding: DecodingOptions) -> Dict[str, Any]:
+        """Returns the VadOptions fields derived from the decoding options."""
+        return {
+            "threshold": decoding.vad_threshold,
+            "min_silence_duration_ms": decoding.min_silence_duration_ms,
+        }
+
+    def _decoding_kwargs(
+        self, decoding: DecodingOptions, include_vad: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Maps decoding options onto Faster-Whisper transcribe() arguments.
+        With include_vad=False the caller has already removed non-speech audio.
+        """
+        kwargs: Dict[str, Any] = {
+            "beam_size": decoding.beam_size,
+            "best_of": decoding.best_of,
+            "temperature": decoding.temperature,
+            "condition_on_previous_text": decoding.condition_on_previous_text,
+            "vad_filter": False,
+        }
+        if include_vad and decoding.vad_filter:
+            kwargs["vad_filter"] = True
+            kwargs["vad_parameters"] = self._vad_params(decoding)
+        return kwargs
+
+    def _prepare_audio(
+        self,
+        media_path: str,
+        audio: Any,
+        decoding: DecodingOptions,
+        start_offset: float = 0.0,
+        audio_stream: int = 0,
+    ) -> Optional[Tuple[Any, Callable[[float, bool], float]]]:
+        """
+        Reduces decoded audio to what Whisper actually needs to decode.
+
+        With VAD enabled the cached speech map is used to keep only speech
+        (starting at start_offset); otherwise the waveform is just sliced.
+
+        Returns:
+            Optional[Tuple]: The audio to feed Whisper and a function mapping its
+            timestamps back to the original media, or None if nothing remains.
+        """
+        offset_sample = int(start_offset * SAMPLING_RATE)
+
+        if not decoding.vad_filter:
+            sliced = audio[offset_sample:]
+            if sliced.shape[0] == 0:
+                return None
+            return sliced, lambda t, is_end: t + start_offset
+
+        import numpy as np
+        from faster_whisper.vad import SpeechTimestampsMap, collect_chunks
+
+        speech_map = vad_cache.get_speech_map(
+            media_path,
+            self._vad_params(decoding),
+            audio=audio,
+            audio_stream=audio_stream,
+        )
+        chunks = []
+        for chunk in speech_map["chunks"]:
+            if chunk["end"] <= offset_sample:
+                continue
+            chunks.append(
+                {"start": max(chunk["start"], offset_sample), "end": chunk["end"]}
+            )
+        if not chunks:
+            return None
+
+        audio_chunks, _ = collect_chunks(audio, chunks)
+        speech_audio = np.concatenate(audio_chunks, axis=0)
+        ts_map = SpeechTimestampsMap(chunks, SAMPLING_RATE)
+        logger.info(
+            f"vad_speech_kept: {speech_audio.shape[0] / SAMPLING_RATE:.1f}s of {audio.shape[0] / SAMPLING_RATE:.1f}s"
+        )
+        return speech_audio, lambda t, is_end: ts_map.get_original_time(
+            t, is_end=is_end
+        )
+
+    def _prepare_regions(
+        self,
+        media_path: str,
+        regions: List[Tuple[float, Any]],
+        decoding: DecodingOptions,
+        audio_stream: int = 0,
+    ) -> Optional[Tuple[Any, Callable[[float, bool], float]]]:
+        """
+        Builds the Whisper input from decoded time ranges (see _prepare_audio).
+
+        A cached full-file speech map is clipped to the ranges when one
+        exists; otherwise VAD runs on the ranges only and is not cached.
+        """
+        import numpy as np
+        from faster_whisper.vad import (
+            SpeechTimestampsMap,
+            VadOptions,
+            get_speech_timestamps,
+        )
+
+        vad_params = self._vad_params(decoding)
+        cached = (
+            vad_cache.load(media_path, vad_params, audio_stream)
+            if decoding.vad_filter
+            else None
+        )
+
+        chunks: List[Dict[str, int]] = []
+        pieces = []
+        for region_start, audio in regions:
+            offset = int(round(region_start * SAMPLING_RATE))
+            length = audio.shape[0]
+            if not decoding.vad_filter:
+                region_chunks = [{"start": 0, "end": length}]
+            elif cached is not None:
+                region_chunks = [
+                    {
+                        "start": max(c["start"] - offset, 0),
+                        "end": min(c["end"] - offset, length),
+                    }
+                    for c in cached["chunks"]
+                    if c["end"] > offset and c["start"] < offset + length
+                ]
+            else:
+                region_chunks = get_speech_timestamps(audio, VadOptions(**vad_params))
+
+            for chunk in region_chunks:
+                pieces.append(audio[chunk["start"] : chunk["end"]])
+                chunks.append(
+                    {"start": chunk["start"] + offset, "end": chunk["end"] + offset}
+                )
+
+        if not chunks:
+            return None
+        ts_map = SpeechTimestampsMap(chunks, SAMPLING_RATE)
+        return np.concatenate(pieces, axis=0), lambda t, is_end: (
+            ts_map.get_original_time(t, is_end=is_end)
+        )
+
+    def analyze_media(
+        self,
+        media_path: str,
+        options: Optional[Dict[str, Any]] = None,
+        audio_stream: int = 0,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        Computes (or loads cached) speech statistics to estimate a job up front.
+
+        Computing them decodes the whole audio track, so with
+        whisper.isolated_worker enabled it runs in the worker process.
+
+        Args:
+            media_path (str): Path to the media file.
+            options (Optional[Dict[str, Any]]): Per-job decoding overrides.
+            audio_stream (int): Index among the file's audio streams.
+            cancel_event (threading.Event): Stops an analysis running in the
+                worker when set.
+
+        Returns:
+            Dict[str, Any]: Duration, speech seconds/ratio, chunk count and an
+            estimated transcription time when a tuning profile exists.
+
+        Raises:
+            InterruptedError: If cancelled.
+        """
+        config = config_mgr.config.whisper
+        if config.isolated_worker and not self.in_worker:
+            from backend.core.whisper_worker import whisper_worker
+
+            return whisper_worker.analyze_media(
+                media_path,
+                cancel_event=cancel_event,
+                options=options,
+                audio_stream=audio_stream,
+            )
+
+        _, decoding = job_decoding(options)
+
+        speech_map = vad_cache.get_speech_map(
+            media_path, self._vad_params(decoding), audio_stream=audio_stream
+        )
+        stats = {k: v for k, v in speech_map.items() if k != "chunks"}
+
+        rate = throughput_history.get(self._throughput_key(decoding))
+        if rate is None:
+            rate = self._calibrated_rtf(decoding)
+        stats["estimated_seconds"] = (
+            round(stats["speech_seconds"] * rate, 1) if rate is not None else None
+        )
+        return stats
+
+    def _throughput_key(self, decoding: DecodingOptions) -> str:
+        """
+        Keys throughput history by the model that actually runs: the
+        resolved compute type and the resource governor's planned model.
+        """
+        model_size, compute_type = self.loaded_model(decoding.model_size)
+        device = tuner_mgr.resolve_device(config_mgr.config.whisper.device)
+        return f"transcribe:{model_size}:{device}:{compute_type}"
+
+    def _calibrated_rtf(self, decoding: DecodingOptions) -> Optional[float]:
+        config = config_mgr.config.whisper
+        model_size = decoding.model_size or config.model_size
+        profile = tuner_mgr.get_profile(model_size, config.device)
+        return float(profile["rtf"]) if profile else None
+
+    def _calibration_audio(
+        self, sample_path: Optional[str], decoding: DecodingOptions
+    ) -> Optional[Any]:
+        """
+        Takes up to BENCHMARK_SECONDS of detected speech from sample_path.
+
+        Returns:
+            Optional[np.ndarray]: The speech audio, or None if the sample is
+            missing, unreadable or holds too little speech.
+        """
+        if not sample_path or not os.path.exists(sample_path):
+            return None
+
+        import numpy as np
+        from faster_whisper.vad import collect_chunks
+
+        try:
+            audio = decode_audio(sample_path)
+            speech_map = vad_cache.get_speech_map(
+                sample_path, self._vad_params(decoding), audio=audio
+            )
+        except (OSError, ValueError, RuntimeError) as e:
+            logger.warning(f"calibration_sample_unreadable: {sample_path}, {e}")
+            return None
+        if not speech_map["chunks"]:
+            return None
+
+        audio_chunks, _ = collect_chunks(audio, speech_map["chunks"])
+        speech = np.concatenate(audio_chunks, axis=0)
+        speech = speech[: BENCHMARK_SECONDS * SAMPLING_RATE]
+        if speech.shape[0] < MIN_CALIBRATION_SECONDS * SAMPLING_RATE:
+            logger.info(f"calibration_sample_too_short: {sample_path}")
+            return None
+        return speech
+
+    def calibrate(
+        self,
+        sample_path: Optional[str] = None,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Calibrates compute type and thread count for the configured model.
+
+        Each candidate decodes speech from sample_path with the configured
+        preset's decoding options, falling back to a synthetic signal when
+        the sample is unusable. With whisper.isolated_worker enabled it runs
+        in the worker process, so the candidate models never load here.
+
+        Args:
+            sample_path (Optional[str]): Media whose speech is benchmarked.
+            progress_callback (Callable): Receives (progress percent, message).
+            cancel_event (threading.Event): Stops the calibration when set.
+
+        Returns:
+            Optional[Dict[str, Any]]: The saved profile, or None if cancelled
+            or nothing could be measured.
+        """
+        config = config_mgr.config.whisper
+        if config.isolated_worker and not self.in_worker:
+            from backend.core.whisper_worker import whisper_worker
+
+            return whisper_worker.calibrate(
+                sample_path,
+                progress_callback=progress_callback,
+                cancel_event=cancel_event,
+            )
+
+        _, decoding = job_decoding()
+        return tuner_mgr.calibrate(
+            decoding.model_size or config.model_size,
+            config.device,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event,
+            audio=self._calibration_audio(sample_path, decoding),
+            transcribe_kwargs=self._decoding_kwargs(decoding, include_vad=False),
+        )
+
+    def progress_tracker(
+        self, options: Optional[Dict[str, Any]] = None
+    ) -> StageProgress:
+        """
+        Returns a tracker for the progress callback of transcribe, primed
+        with how fast this model ran here before (or its calibration).
+
+        Args:
+            options (Optional[Dict[str, Any]]): The job's decoding overrides.
+
+        Returns:
+            StageProgress: Call finish() on it once the transcription completed.
+        """
+        _, decoding = job_decoding(options)
+        return StageProgress(
+            self._throughput_key(decoding), self._calibrated_rtf(decoding)
+        )
+
+    def transcript_settings(
+        self, options: Optional[Dict[str, Any]] = None, audio_stream: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Returns the settings a transcript depends on, as recorded in its
+        checkpoint (see TranscriptCheckpoint).
+
+        Args:
+            options (Optional[Dict[str, Any]]): The job's decoding overrides.
+            audio_stream (int): Index among the file's audio streams.
+
+        Returns:
+            Dict[str, Any]: model, preset and audio_stream. model is the one
+            requested; the checkpoint header records the one that loaded, so
+            a transcript of a downgraded model is not resumed at full size.
+        """
+        config = config_mgr.config.whisper
+        preset, decoding = job_decoding(options)
+        return {
+            "model": decoding.model_size or config.model_size,
+            "preset": preset,
+            "audio_stream": audio_stream,
+        }
+
+    def speech_regions(
+        self,
+        media_path: str,
+        options: Optional[Dict[str, Any]] = None,
+        audio_stream: int = 0,
+    ) -> Tuple[List[Tuple[float, float]], float]:
+        """
+        Returns the speech regions of a media file from its (cached) VAD map.
+
+        Args:
+            media_path (str): Path to the media file.
+            options (Optional[Dict[str, Any]]): Per-job decoding overrides.
+            audio_stream (int): Index among the file's audio streams.
+
+        Returns:
+            Tuple: (start, end) pairs in seconds and the media duration.
+        """
+        _, decoding = job_decoding(options)
+
+        speech_map = vad_cache.get_speech_map(
+            media_path, self._vad_params(decoding), audio_stream=audio_stream
+        )
+        regions = [
+            (c["start"] / SAMPLING_RATE, c["end"] / SAMPLING_RATE)
+            for c in speech_map["chunks"]
+        ]
+        return regions, float(speech_map["duration"])
 
     def transcribe(
         self,
         media_path: str,
         status_callback: Optional[Callable[[str, str], None]] = None,
+        start_offset: float = 0.0,
+        options: Optional[Dict[str, Any]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        time_ranges: Optional[List[List[Any]]] = None,
+        audio_stream: int = 0,
+        progress_callback: Optional[Callable[[float, float], None]] = None,
+        model_callback: Optional[Callable[[str, str], None]] = None,
     ) -> Generator[dict, None, None]:
         """
         Transcribes an audio or video file and yields segments.
 
+        With whisper.isolated_worker enabled the job runs in the worker process
+        (see whisper_worker), so cancelling it stops decoding immediately.
+
         Args:
             media_path (str): Path to the media file.
             status_callback (Callable): Callback for status updates (e.g. model loading).
+            start_offset (float): Seconds of audio to skip, used to resume from a
+                checkpoint. Yielded timestamps stay relative to the original media.
+            options (Optional[Dict[str, Any]]): Per-job decoding overrides; may
+                include 'preset' to select a different named preset.
+            cancel_event (threading.Event): Stops the transcription when set.
+            time_ranges (Optional[List[List[Any]]]): [start, end] pairs in seconds;
+                only these parts of the media are decoded and transcribed.
+            audio_stream (int): Index among the file's audio streams.
+            progress_callback (Callable): Receives (seconds decoded, seconds to
+                decode) of the audio fed to Whisper (speech only with VAD),
+                once when decoding starts and before each segment is yielded;
+                see progress_tracker.
+            model_callback (Callable): Receives the (model size, compute type)
+                actually loaded, which the resource governor may have
+                downgraded, before the first segment.
 
         Yields:
-            dict: A segment with start, end, and text.
+            dict: A segment with start, end, text, avg_logprob and no_speech_prob.
         """
+        if config_mgr.config.whisper.isolated_worker and not self.in_worker:
+            from backend.core.whisper_worker import whisper_worker
+
+            yield from whisper_worker.transcribe(
+                media_path,
+                status_callback=status_callback,
+                cancel_event=cancel_event,
+                start_offset=start_offset,
+                options=options,
+                time_ranges=time_ranges,
+                audio_stream=audio_stream,
+                progress_callback=progress_callback,
+                model_callback=model_callback,
+            )
+            return
+
+        if not self._acquire_slot(status_callback, cancel_event):
+            return
+        try:
+            yield from self._transcribe_local(
+                media_path,
+                status_callback,
+                start_offset,
+                options,
+                cancel_event,
+                time_ranges,
+                audio_stream,
+                progress_callback,
+                model_callback,
+            )
+        finally:
+            self._release_slot()
+
+    def _acquire_slot(
+        self,
+        status_callback: Optional[Callable[[str, str], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> bool:
+        """
+        Waits until fewer than whisper.max_concurrent_jobs transcriptions run.
+
+        Returns:
+            bool: False if the job was cancelled while waiting.
+        """
+        with self._slots:
+            notified = False
+            while self._active_jobs >= max(
+                1, config_mgr.config.whisper.max_concurrent_jobs
+            ):
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                if not notified:
+                    logger.info(f"transcription_slot_wait: active={self._active_jobs}")
+                    if status_callback:
+                        status_callback(
+                            "Waiting for a free transcription slot...", "queued"
+                        )
+                    notified = True
+                self._slots.wait(timeout=0.2)
+            self._active_jobs += 1
+            self._report_active()
+            return True
+
+    def _release_slot(self) -> None:
+        with self._slots:
+            self._active_jobs -= 1
+            self._report_active()
+            self._slots.notify()
+
+    def _report_active(self) -> None:
+        metrics.gauge(
+            "unisub_transcriptions_active", "Transcriptions holding a model slot"
+        ).set(self._active_jobs)
+
+    def _transcribe_local(
+        self,
+        media_path: str,
+        status_callback: Optional[Callable[[str, str], None]],
+        start_offset: float,
+        options: Optional[Dict[str, Any]],
+        cancel_event: Optional[threading.Event],
+        time_ranges: Optional[List[List[Any]]] = None,
+        audio_stream: int = 0,
+        progress_callback: Optional[Callable[[float, float], None]] = None,
+        model_callback: Optional[Callable[[str, str], None]] = None,
+    ) -> Generator[dict, None, None]:
+        """Runs one transcription on the in-process model (see transcribe)."""
 
         def _load_cb(msg: str):
             if status_callback:
                 status_callback(msg, "loading_model")
 
-        self._ensure_model_loaded(status_callback=_load_cb)
+        config = config_mgr.config.whisper
+        preset, decoding = job_decoding(options)
+
+        resource_governor.apply_priority()
+        if not resource_governor.wait_for_headroom(cancel_event, status_callback):
+            logger.info("transcription_cancelled")
+            return
+
+        with span("model_load"):
+            model = self._ensure_model_loaded(
+                status_callback=_load_cb, model_size=decoding.model_size
+            )
+        if model_callback:
+            model_callback(*self.loaded_model(decoding.model_size))
 
         if status_callback:
             status_callback("Model ready, starting transcription...", "transcribing")
 
-        config = config_mgr.config.whisper
-        logger.info(f"transcription_started: {media_path}")
+        logger.info(f"transcription_started: {media_path}, preset={preset}")
 
-        # Faster-whisper handles video paths directly via PyAV
-        segments, info = self.model.transcribe(
-            media_path,
-            beam_size=5,
-            language=config.language,
-            vad_filter=True,
-            vad_parameters=dict(min_silence_duration_ms=500),
-        )
+        # Timed from decoding on; model loading is measured separately
+        started = time.monotonic()
+        ranges = normalize_ranges(time_ranges, start_offset)
+        if ranges is not None:
+            # Only the requested ranges are demuxed and decoded
+            with span("decode_audio"):
+                regions = decode_audio_ranges(media_path, ranges, audio_stream)
+            media_seconds = sum(len(audio) for _, audio in regions) / SAMPLING_RATE
+            with span("vad"):
+                prepared = self._prepare_regions(
+                    media_path, regions, decoding, audio_stream
+                )
+        else:
+            # Decode once via PyAV; the waveform feeds both VAD and Whisper
+            with span("decode_audio"):
+                audio = decode_audio(
+                    media_path, audio_stream, sampling_rate=SAMPLING_RATE
+                )
+            media_seconds = max(len(audio) / SAMPLING_RATE - start_offset, 0.0)
+            with span("vad"):
+                prepared = self._prepare_audio(
+                    media_path, audio, decoding, start_offset, audio_stream
+                )
+        if prepared is None:
+            logger.info("no_speech_after_offset")
+            return
+        speech_audio, to_original_time = prepared
+        if start_offset > 0:
+            logger.info(f"transcription_resumed_from_offset: {start_offset:.2f}s")
+
+        with span("language_detection"):
+            segments, info = model.transcribe(
+                speech_audio,
+                language=config.language,
+                **self._decoding_kwargs(decoding, include_vad=False),
+            )
 
         logger.info(
             f"detected_language: {info.language} with probability {info.language_probability}"
         )
 
-        for segment in segments:
-            yield {
+        segment_counter = metrics.counter(
+            "unisub_transcribed_segments_total", "Segments produced by Whisper"
+        )
+        count = 0
+        if progress_callback:
+            progress_callback(0.0, info.duration)
+        # Includes the consumer's handling of each segment between yields
+        with span("whisper_decode"):
+            for segment in segments:
+                if cancel_event is not None and cancel_event.is_set():
+                    logger.info("transcription_cancelled")
+                    return
+                # Decoding is lazy: not asking for the next segment pauses it
+                if not resource_governor.check_pressure(cancel_event, status_callback):
+                    logger.info("transcription_cancelled")
+                    return
+                count += 1
+                segment_counter.inc()
+                if progress_callback:
+                    # Position in the decoded audio, which info.duration measures
+                    progress_callback(min(segment.end, info.duration), info.duration)
+                yield {
+                    "start": to_original_time(segment.start, False),
+                    "end": to_original_time(segment.end, True),
+                    "text": segment.text.strip(),
+                    "avg_logprob": segment.avg_logprob,
+                    "no_speech_prob": segment.no_speech_prob,
+                }
+
+        logger.info("transcription_completed")
+        self._record_run(time.monotonic() - started, media_seconds, count)
+
+    def _record_run(self, elapsed: float, media_seconds: float, segments: int) -> None:
+        """Records the speed of a completed transcription."""
+        metrics.histogram(
+            "unisub_transcription_seconds", "Wall time of completed transcriptions"
+        ).observe(elapsed)
+        if media_seconds > 0:
+            metrics.histogram(
+                "unisub_transcription_rtf",
+                "Real-time factor (processing seconds per media second)",
+                RATIO_BUCKETS,
+            ).observe(elapsed / media_seconds)
+        if elapsed > 0:
+            metrics.histogram(
+                "unisub_transcription_segments_per_second",
+                "Segment throughput of completed transcriptions",
+                RATE_BUCKETS,
+            ).observe(segments / elapsed)
+
+    def transcribe_audio(
+        self,
+        audio: Any,
+        options: Optional[Dict[str, Any]] = None,
+        initial_prompt: Optional[str] = None,
+        status_callback: Optional[Callable[[str, str], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Transcribes an in-memory 16 kHz mono waveform on the in-process model.
+
+        Used for the short windows of live transcription, where the audio is
+        already in memory and each call finishes in a few seconds, so it does
+        not go through the isolated worker.
+
+        Args:
+            audio (np.ndarray): float32 samples at SAMPLING_RATE.
+            options (Optional[Dict[str, Any]]): Decoding overrides; may include
+                'preset'.
+            initial_prompt (Optional[str]): Text that preceded this audio.
+            status_callback (Callable): Callback for model loading messages.
+
+        Returns:
+            List[Dict[str, Any]]: Segments with timestamps relative to the
+            start of the audio.
+        """
+
+        def _load_cb(msg: str):
+            if status_callback:
+                status_callback(msg, "loading_model")
+
+        config = config_mgr.config.whisper
+        _, decoding = job_decoding(options)
+        model = self._ensure_model_loaded(
+            status_callback=_load_cb, model_size=decoding.model_size
+        )
+
+        segments, _ = model.transcribe(
+            audio,
+            language=config.language,
+            initial_prompt=initial_prompt or None,
+            **self._decoding_kwargs(decoding),
+        )
+        return [
+            {
                 "start": segment.start,
                 "end": segment.end,
                 "text": segment.text.strip(),
+                "avg_logprob": segment.avg_logprob,
+                "no_speech_prob": segment.no_speech_prob,
             }
+            for segment in segments
+        ]
 
-        logger.info("transcription_completed")
+    def refine_in_background(
+        self,
+        media_path: str,
+        options: Optional[Dict[str, Any]] = None,
+        status_callback: Optional[Callable[[str, str], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        audio_stream: int = 0,
+        progress_callback: Optional[Callable[[float, float], None]] = None,
+        model_callback: Optional[Callable[[str, str], None]] = None,
+    ) -> RefinementJob:
+        """
+        Starts the refinement pass of a two-pass transcription on a background
+        thread. Segments are consumed through RefinementJob.batches().
+
+        Args:
+            media_path (str): Path to the media file.
+            options (Optional[Dict[str, Any]]): Decoding overrides for the pass.
+            status_callback (Callable): Callback for status updates.
+            cancel_event (threading.Event): Stops the pass when set; the job
+                can also be stopped on its own with RefinementJob.cancel.
+            audio_stream (int): Index among the file's audio streams.
+            progress_callback (Callable): Receives the decoding position (see
+                transcribe), on the background thread.
+            model_callback (Callable): Receives the model actually loaded (see
+                transcribe), on the background thread.
+
+        Returns:
+            RefinementJob: The running job.
+        """
+        return RefinementJob(
+            lambda job_cancel: self.transcribe(
+                media_path,
+                status_callback=status_callback,
+                options=options,
+                cancel_event=job_cancel,
+                audio_stream=audio_stream,
+                progress_callback=progress_callback,
+                model_callback=model_callback,
+            ),
+            cancel_event=cancel_event,
+        ).start()
+
+    def benchmark_presets(
+        self,
+        media_path: str,
+        presets: Optional[List[str]] = None,
+        max_seconds: float = 120.0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Measures the real-time factor of each decoding preset on a media sample.
+
+        Model loading is excluded from the timing. Text agreement is reported
+        against the last preset in the list (the most accurate by default).
+
+        Args:
+            media_path (str): Media file to sample.
+            presets (Optional[List[str]]): Presets to compare (all by default).
+            max_seconds (float): Length of the sample taken from the start.
+
+        Returns:
+            List[Dict[str, Any]]: One result dict per preset.
+        """
+        import difflib
+
+        config = config_mgr.config.whisper
+        names = presets or list(DECODING_PRESETS)
+        audio = decode_audio(media_path)
+        audio = audio[: int(max_seconds * SAMPLING_RATE)]
+        audio_seconds = audio.shape[0] / SAMPLING_RATE
+
+        results: List[Dict[str, Any]] = []
+        for name in names:
+            decoding = resolve_decoding(name)
+            model = self._ensure_model_loaded(model_size=decoding.model_size)
+
+            start = time.perf_counter()
+            segments, _ = model.transcribe(
+                audio, language=config.language, **self._decoding_kwargs(decoding)
+            )
+            texts = [seg.text.strip() for seg in segments]
+            elapsed = time.perf_counter() - start
+
+            results.append(
+                {
+                    "preset": name,
+                    "model_size": decoding.model_size or config.model_size,
+                    "audio_seconds": round(audio_seconds, 2),
+                    "elapsed": round(elapsed, 3),
+                    "rtf": round(elapsed / audio_seconds, 4) if audio_seconds else 0.0,
+                    "segments": len(texts),
+                    "text": " ".join(texts),
+                }
+            )
+            logger.info(
+                f"preset_benchmarked: {name}, rtf={results[-1]['rtf']}, segments={len(texts)}"
+            )
+
+        reference = results[-1]["text"] if results else ""
+        for result in results:
+            result["agreement"] = round(
+                difflib.SequenceMatcher(None, result.pop("text"), reference).ratio(), 4
+            )
+        return results
 
 
 # Global whisper service instance
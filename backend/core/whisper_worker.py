@@ -0,0 +1,500 @@
+import multiprocessing
+import queue
+import threading
+import uuid
+from typing import Any, Callable, Dict, Generator, Optional, Tuple
+
+from backend.services.logger import current_log_context, in_log_context, logger
+from backend.services.metrics import metrics
+
+# Message types exchanged over the worker pipe
+MSG_TRANSCRIBE = "transcribe"
+MSG_ANALYZE = "analyze"
+MSG_CALIBRATE = "calibrate"
+MSG_CANCEL = "cancel"
+MSG_SHUTDOWN = "shutdown"
+MSG_STATUS = "status"
+MSG_SEGMENT = "segment"
+MSG_DONE = "done"
+MSG_ERROR = "error"
+MSG_CRASHED = "crashed"
+MSG_METRIC = "metric"
+MSG_PROFILE = "profile"
+MSG_PROGRESS = "progress"
+MSG_ACCEPTED = "accepted"
+MSG_RESULT = "result"
+MSG_MODEL = "model"
+
+# How often blocked loops wake up to check for cancellation
+POLL_INTERVAL = 0.05
+
+
+def worker_main(conn: Any, config_data: dict, idle_timeout: float) -> None:
+    """
+    Entry point of the isolated transcription process.
+
+    Hosts its own whisper_svc and runs each requested job on a thread, so
+    several jobs can share the loaded model. Exits when asked to, when the
+    parent goes away, or after idle_timeout seconds without work, which
+    returns the model's memory to the OS.
+    """
+    from backend.core.whisper_svc import whisper_svc
+    from backend.models.schema import GlobalConfig
+    from backend.services.config_mgr import config_mgr
+    from backend.services.platform_mgr import platform_mgr
+    from backend.services.profiler import start_profiler, use_profiler
+
+    platform_mgr.setup_runtime_env()
+    config_mgr.config = GlobalConfig(**config_data)
+    whisper_svc.in_worker = True
+
+    send_lock = threading.Lock()
+    cancel_events: Dict[str, threading.Event] = {}
+
+    def _send(*msg: Any) -> None:
+        with send_lock:
+            conn.send(msg)
+
+    # Metrics recorded here are replayed into the GUI process's registry
+    metrics.set_forwarder(lambda record: _send(MSG_METRIC, None, record))
+
+    def _run_job(job_id: str, media_path: str, kwargs: dict, profile: bool) -> None:
+        cancel_event = cancel_events[job_id]
+
+        def _status_cb(msg: str, stage: str = "loading_model") -> None:
+            _send(MSG_STATUS, job_id, msg, stage)
+
+        def _progress_cb(done: float, total: float) -> None:
+            _send(MSG_PROGRESS, job_id, done, total)
+
+        def _model_cb(model_size: str, compute_type: str) -> None:
+            _send(MSG_MODEL, job_id, model_size, compute_type)
+
+        # The parent adds this profile to the job's report
+        profiler = start_profiler(f"whisper-worker-{job_id}") if profile else None
+        result: Tuple[Any, ...] = (MSG_DONE, job_id)
+        try:
+            with use_profiler(profiler):
+                for segment in whisper_svc.transcribe(
+                    media_path,
+                    status_callback=_status_cb,
+                    cancel_event=cancel_event,
+                    progress_callback=_progress_cb,
+                    model_callback=_model_cb,
+                    **kwargs,
+                ):
+                    _send(MSG_SEGMENT, job_id, segment)
+        except Exception as e:
+            logger.error(f"worker_job_failed: {e}", exc_info=True)
+            result = (MSG_ERROR, job_id, f"{type(e).__name__}: {e}")
+        finally:
+            cancel_events.pop(job_id, None)
+        if profiler is not None:
+            _send(MSG_PROFILE, job_id, profiler.stop())
+        _send(*result)
+
+    def _run_analysis(job_id: str, media_path: str, kwargs: dict) -> None:
+        result: Tuple[Any, ...]
+        try:
+            stats = whisper_svc.analyze_media(media_path, **kwargs)
+            result = (MSG_RESULT, job_id, stats)
+        except Exception as e:
+            logger.error(f"worker_analysis_failed: {e}", exc_info=True)
+            result = (MSG_ERROR, job_id, f"{type(e).__name__}: {e}")
+        finally:
+            cancel_events.pop(job_id, None)
+        _send(*result)
+
+    def _run_calibration(job_id: str, sample_path: str) -> None:
+        cancel_event = cancel_events[job_id]
+
+        def _progress_cb(progress: float, message: str) -> None:
+            _send(MSG_PROGRESS, job_id, progress, message)
+
+        result: Tuple[Any, ...]
+        try:
+            profile = whisper_svc.calibrate(
+                sample_path or None,
+                progress_callback=_progress_cb,
+                cancel_event=cancel_event,
+            )
+            result = (MSG_RESULT, job_id, profile)
+        except Exception as e:
+            logger.error(f"worker_calibration_failed: {e}", exc_info=True)
+            result = (MSG_ERROR, job_id, f"{type(e).__name__}: {e}")
+        finally:
+            cancel_events.pop(job_id, None)
+        _send(*result)
+
+    logger.info("whisper_worker_started")
+    while True:
+        try:
+            if not conn.poll(idle_timeout if not cancel_events else POLL_INTERVAL):
+                if not cancel_events:
+                    logger.info("whisper_worker_idle_exit")
+                    break
+                continue
+            msg = conn.recv()
+        except (EOFError, OSError):
+            # Parent process is gone
+            break
+
+        kind = msg[0]
+        if kind in (MSG_TRANSCRIBE, MSG_ANALYZE, MSG_CALIBRATE):
+            _, job_id, media_path, kwargs, job_config, log_fields, profile = msg
+            # From here on the worker does not exit on idle
+            cancel_events[job_id] = threading.Event()
+            _send(MSG_ACCEPTED, job_id)
+            # Pick up settings changed in the GUI since the worker started
+            config_mgr.config = GlobalConfig(**job_config)
+            if kind == MSG_TRANSCRIBE:
+                target: Callable[..., None] = _run_job
+                args: Tuple[Any, ...] = (job_id, media_path, kwargs, profile)
+            elif kind == MSG_ANALYZE:
+                target, args = _run_analysis, (job_id, media_path, kwargs)
+            else:
+                target, args = _run_calibration, (job_id, media_path)
+            # Logged with the fields of the task that asked for it
+            threading.Thread(
+                target=in_log_context(target, **log_fields), args=args, daemon=True
+            ).start()
+        elif kind == MSG_CANCEL:
+            event = cancel_events.get(msg[1])
+            if event:
+                event.set()
+        elif kind == MSG_SHUTDOWN:
+            break
+
+
+class WhisperWorkerClient:
+    """
+    Supervises the isolated transcription process from the GUI process.
+
+    Segments stream back over a pipe. Cancelling the only running job
+    terminates the worker at once, even inside a model load or a long silent
+    stretch, and frees the model's memory; a crash in native code surfaces
+    as a RuntimeError instead of taking down the GUI.
+
+    The worker acknowledges each job. A job sent just as the worker exited
+    on idle is never acknowledged and is sent again to a new worker.
+    """
+
+    def __init__(self) -> None:
+        self._process: Optional[Any] = None
+        self._conn: Optional[Any] = None
+        # Guards the process and pipe; taken before _jobs_lock
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        # job_id -> (message queue, worker process running the job)
+        self._jobs: Dict[str, Tuple["queue.Queue[tuple]", Any]] = {}
+        self._jobs_lock = threading.Lock()
+
+    def _submit(
+        self, kind: str, job_id: str, job_queue: "queue.Queue[tuple]", *msg: Any
+    ) -> None:
+        """Registers a job with the running worker (starting one) and sends it."""
+        with self._lock:
+            process = self._ensure_started()
+            with self._jobs_lock:
+                self._jobs[job_id] = (job_queue, process)
+        self._send(kind, job_id, *msg)
+
+    def _job_messages(
+        self,
+        kind: str,
+        media_path: str,
+        kwargs: dict,
+        cancel_event: Optional[threading.Event] = None,
+        profile: bool = False,
+    ) -> Generator[tuple, None, None]:
+        """
+        Runs a job in the worker and yields the messages it sends back.
+
+        Ends quietly when cancel_event is set. A job the worker never
+        acknowledged before exiting on idle is sent once more.
+
+        Raises:
+            RuntimeError: If the worker dies mid-job.
+        """
+        from backend.services.config_mgr import config_mgr
+
+        job_id = uuid.uuid4().hex
+        job_queue: "queue.Queue[tuple]" = queue.Queue()
+        request = (
+            media_path,
+            kwargs,
+            config_mgr.config.model_dump(),
+            current_log_context(),
+            profile,
+        )
+        self._submit(kind, job_id, job_queue, *request)
+        accepted = resent = False
+
+        try:
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    self._cancel(job_id)
+                    return
+                try:
+                    msg = job_queue.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+
+                if msg[0] == MSG_ACCEPTED:
+                    accepted = True
+                elif msg[0] == MSG_CRASHED:
+                    if cancel_event is not None and cancel_event.is_set():
+                        return
+                    if not accepted and msg[2] == 0 and not resent:
+                        # The worker exited on idle as the job was being sent
+                        logger.info(f"whisper_worker_job_resent: {job_id}")
+                        resent = True
+                        self._submit(kind, job_id, job_queue, *request)
+                        continue
+                    raise RuntimeError(
+                        f"Transcription worker exited unexpectedly (code {msg[2]})."
+                    )
+                else:
+                    yield msg
+        finally:
+            with self._jobs_lock:
+                self._jobs.pop(job_id, None)
+
+    def _ensure_started(self) -> Any:
+        """
+        Starts the worker process and its reader thread if not running.
+        The caller holds self._lock.
+        """
+        from backend.services.config_mgr import config_mgr
+
+        if self._process is not None and self._process.is_alive():
+            return self._process
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe(duplex=True)
+        process = ctx.Process(
+            target=worker_main,
+            args=(
+                child_conn,
+                config_mgr.config.model_dump(),
+                config_mgr.config.whisper.worker_idle_timeout,
+            ),
+            daemon=True,
+            name="unisub-whisper-worker",
+        )
+        process.start()
+        child_conn.close()
+        self._process, self._conn = process, parent_conn
+        threading.Thread(
+            target=self._read_loop, args=(process, parent_conn), daemon=True
+        ).start()
+        logger.info(f"whisper_worker_spawned: pid={process.pid}")
+        metrics.counter(
+            "unisub_whisper_worker_spawns_total",
+            "Isolated Whisper worker processes started",
+        ).inc()
+        return process
+
+    def _read_loop(self, process: Any, conn: Any) -> None:
+        """Dispatches worker messages to the per-job queues."""
+        while True:
+            try:
+                msg = conn.recv()
+            except (EOFError, OSError):
+                break
+            if msg[0] == MSG_METRIC:
+                metrics.apply(msg[2])
+                continue
+            with self._jobs_lock:
+                job = self._jobs.get(msg[1])
+            if job is not None:
+                job[0].put(msg)
+
+        process.join(timeout=5)
+        exitcode = process.exitcode
+        logger.info(f"whisper_worker_exited: code={exitcode}")
+        # Its jobs are gone with it, whether or not it reported that
+        metrics.gauge("unisub_transcriptions_active").set(0)
+        with self._lock:
+            if self._process is process:
+                # The next job starts a new worker instead of joining this one
+                self._process, self._conn = None, None
+            with self._jobs_lock:
+                orphans = [
+                    (job_id, job_queue)
+                    for job_id, (job_queue, owner) in self._jobs.items()
+                    if owner is process
+                ]
+        conn.close()
+        # Anything still waiting on this worker will never hear back
+        for job_id, job_queue in orphans:
+            job_queue.put((MSG_CRASHED, job_id, exitcode))
+
+    def _send(self, *msg: Any) -> None:
+        with self._send_lock:
+            if self._conn is not None:
+                try:
+                    self._conn.send(msg)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"whisper_worker_send_failed: {e}")
+
+    def terminate(self) -> None:
+        """Kills the worker immediately, releasing all model memory."""
+        with self._lock:
+            process, conn = self._process, self._conn
+            self._process, self._conn = None, None
+        if process is not None and process.is_alive():
+            logger.info(f"whisper_worker_terminating: pid={process.pid}")
+            process.terminate()
+            process.join(timeout=2)
+            if process.is_alive():
+                process.kill()
+        if conn is not None:
+            conn.close()
+
+    def shutdown(self) -> None:
+        """Asks the worker to exit gracefully once idle work is flushed."""
+        self._send(MSG_SHUTDOWN)
+
+    def transcribe(
+        self,
+        media_path: str,
+        status_callback: Optional[Callable[[str, str], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        progress_callback: Optional[Callable[[float, float], None]] = None,
+        model_callback: Optional[Callable[[str, str], None]] = None,
+        **kwargs: Any,
+    ) -> Generator[dict, None, None]:
+        """
+        Runs whisper_svc.transcribe in the worker and yields its segments.
+
+        Args:
+            media_path (str): Path to the media file.
+            status_callback (Callable): Callback for status updates.
+            cancel_event (threading.Event): Stops the job when set.
+            progress_callback (Callable): Receives (seconds decoded, seconds
+                to decode) as reported by the worker.
+            model_callback (Callable): Receives the (model size, compute
+                type) the worker loaded.
+            **kwargs: Forwarded to whisper_svc.transcribe.
+
+        Yields:
+            dict: Segments as produced by the worker.
+
+        Raises:
+            RuntimeError: If the job fails or the worker dies mid-job.
+        """
+        from backend.services.profiler import active_profiler
+
+        profiler = active_profiler()
+        messages = self._job_messages(
+            MSG_TRANSCRIBE, media_path, kwargs, cancel_event, profiler is not None
+        )
+        try:
+            for msg in messages:
+                kind = msg[0]
+                if kind == MSG_SEGMENT:
+                    yield msg[2]
+                elif kind == MSG_STATUS:
+                    if status_callback:
+                        status_callback(msg[2], msg[3])
+                elif kind == MSG_PROGRESS:
+                    if progress_callback:
+                        progress_callback(msg[2], msg[3])
+                elif kind == MSG_MODEL:
+                    if model_callback:
+                        model_callback(msg[2], msg[3])
+                elif kind == MSG_PROFILE:
+                    if profiler is not None:
+                        profiler.merge(msg[2], "whisper-worker")
+                elif kind == MSG_DONE:
+                    return
+                elif kind == MSG_ERROR:
+                    raise RuntimeError(msg[2])
+        finally:
+            messages.close()
+
+    def analyze_media(
+        self,
+        media_path: str,
+        cancel_event: Optional[threading.Event] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """
+        Runs whisper_svc.analyze_media in the worker, so the audio is
+        decoded there rather than in the GUI process.
+
+        Args:
+            media_path (str): Path to the media file.
+            cancel_event (threading.Event): Stops the analysis when set.
+            **kwargs: Forwarded to whisper_svc.analyze_media.
+
+        Returns:
+            Dict[str, Any]: The speech statistics.
+
+        Raises:
+            InterruptedError: If cancelled.
+            RuntimeError: If the analysis fails or the worker dies.
+        """
+        messages = self._job_messages(MSG_ANALYZE, media_path, kwargs, cancel_event)
+        try:
+            for msg in messages:
+                if msg[0] == MSG_RESULT:
+                    stats: Dict[str, Any] = msg[2]
+                    return stats
+                if msg[0] == MSG_ERROR:
+                    raise RuntimeError(msg[2])
+        finally:
+            messages.close()
+        raise InterruptedError("cancelled_by_user")
+
+    def calibrate(
+        self,
+        sample_path: Optional[str] = None,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Runs whisper_svc.calibrate in the worker, so the candidate models
+        are loaded (and their memory released) there.
+
+        Args:
+            sample_path (Optional[str]): Media whose speech is benchmarked.
+            progress_callback (Callable): Receives (progress percent, message).
+            cancel_event (threading.Event): Stops the calibration when set.
+
+        Returns:
+            Optional[Dict[str, Any]]: The saved profile, or None if cancelled
+            or nothing could be measured.
+
+        Raises:
+            RuntimeError: If the calibration fails or the worker dies.
+        """
+        messages = self._job_messages(
+            MSG_CALIBRATE, sample_path or "", {}, cancel_event
+        )
+        try:
+            for msg in messages:
+                if msg[0] == MSG_PROGRESS:
+                    if progress_callback:
+                        progress_callback(msg[2], msg[3])
+                elif msg[0] == MSG_RESULT:
+                    profile: Optional[Dict[str, Any]] = msg[2]
+                    return profile
+                elif msg[0] == MSG_ERROR:
+                    raise RuntimeError(msg[2])
+        finally:
+            messages.close()
+        return None
+
+    def _cancel(self, job_id: str) -> None:
+        """Hard-kills the worker if this is its only job, else cancels cooperatively."""
+        with self._jobs_lock:
+            others = [j for j in self._jobs if j != job_id]
+        if others:
+            logger.info(f"whisper_worker_job_cancel_requested: {job_id}")
+            self._send(MSG_CANCEL, job_id)
+        else:
+            self.terminate()
+
+
+whisper_worker = WhisperWorkerClient()
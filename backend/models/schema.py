@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -47,6 +47,91 @@ class ModelConfig(BaseModel):
     )
 
 
+class DecodingOptions(BaseModel):
+    """
+    Decoding and VAD parameters passed to Faster-Whisper for one transcription.
+    """
+
+    beam_size: int = Field(default=5, description="Beam search width.")
+    best_of: int = Field(
+        default=5, description="Candidates sampled when temperature is non-zero."
+    )
+    temperature: List[float] = Field(
+        default_factory=lambda: [0.0, 0.2, 0.4, 0.6, 0.8, 1.0],
+        description="Temperature fallback sequence.",
+    )
+    condition_on_previous_text: bool = Field(
+        default=True, description="Prompt each window with the previous text."
+    )
+    vad_filter: bool = Field(default=True, description="Skip non-speech audio.")
+    vad_threshold: float = Field(
+        default=0.5, description="Speech probability threshold for Silero VAD."
+    )
+    min_silence_duration_ms: int = Field(
+        default=500, description="Minimum silence that splits speech chunks."
+    )
+    model_size: Optional[str] = Field(
+        default=None, description="Model size override (config model if None)."
+    )
+
+
+class SegmentFilterOptions(BaseModel):
+    """
+    Thresholds for dropping hallucinated segments before translation.
+    """
+
+    enabled: bool = Field(default=True, description="Filter segments at all.")
+    min_duration: float = Field(
+        default=0.05, description="Segments shorter than this (seconds) are junk."
+    )
+    no_speech_threshold: float = Field(
+        default=0.6, description="no_speech_prob above which a segment is suspect."
+    )
+    logprob_threshold: float = Field(
+        default=-1.0, description="avg_logprob below which a suspect one is dropped."
+    )
+    max_repeats: int = Field(
+        default=2, description="Consecutive near-identical segments to keep."
+    )
+    similarity_threshold: float = Field(
+        default=0.9, description="Text similarity at which segments count as equal."
+    )
+
+
+class LiveOptions(BaseModel):
+    """
+    Sliding-window settings for live transcription of a growing file or stream.
+    """
+
+    preset: str = Field(
+        default="draft", description="Decoding preset used for live windows."
+    )
+    step_seconds: float = Field(
+        default=2.0, description="New audio collected before each decoding pass."
+    )
+    max_window_seconds: float = Field(
+        default=20.0,
+        description="Window length at which all but the last segment are committed.",
+    )
+    stability_margin: float = Field(
+        default=1.0,
+        description="Segments ending this close to the live edge stay tentative.",
+    )
+    poll_interval: float = Field(
+        default=0.5, description="Seconds between checks of a growing file."
+    )
+    idle_timeout: float = Field(
+        default=15.0, description="A file that stops growing this long has ended."
+    )
+    subtitle_format: str = Field(
+        default="srt", description="Format of the appended subtitle file (srt/vtt)."
+    )
+    max_latency: float = Field(
+        default=10.0,
+        description="End-to-end latency (seconds) above which a warning is logged.",
+    )
+
+
 class WhisperConfig(BaseModel):
     """
     Configuration for Faster-Whisper.
@@ -60,6 +145,219 @@ class WhisperConfig(BaseModel):
     language: Optional[str] = Field(
         default=None, description="Source language (auto if None)."
     )
+    cpu_threads: int = Field(
+        default=0, description="CPU threads for CTranslate2 (0 = auto/tuned)."
+    )
+    num_workers: int = Field(
+        default=1, description="Number of CTranslate2 workers for the model."
+    )
+    max_concurrent_jobs: int = Field(
+        default=2,
+        description="Transcriptions that may share the loaded model at once.",
+    )
+    auto_tune: bool = Field(
+        default=False,
+        description="Apply the compute type/thread count measured by calibration.",
+    )
+    calibration_offered: bool = Field(
+        default=False,
+        description="Whether calibration was offered on first launch.",
+    )
+    preset: str = Field(
+        default="balanced",
+        description="Decoding preset (draft/balanced/accurate).",
+    )
+    decoding: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Overrides applied on top of the selected preset.",
+    )
+    two_pass: bool = Field(
+        default=False,
+        description="Show a fast draft first, then refine with the main model.",
+    )
+    draft_preset: str = Field(
+        default="draft", description="Decoding preset used for the draft pass."
+    )
+    segment_filter: SegmentFilterOptions = Field(
+        default_factory=SegmentFilterOptions,
+        description="Hallucination filter applied before translation.",
+    )
+    offline: bool = Field(
+        default=False,
+        description="Only load models from the local model store (no hub lookup).",
+    )
+    isolated_worker: bool = Field(
+        default=True,
+        description="Run Whisper in a separate process that can be killed on cancel.",
+    )
+    worker_idle_timeout: int = Field(
+        default=300,
+        description="Seconds an idle worker keeps the model loaded before exiting.",
+    )
+    live: LiveOptions = Field(
+        default_factory=LiveOptions,
+        description="Live transcription of growing files and streams.",
+    )
+
+
+class PipelineConfig(BaseModel):
+    """
+    Worker pools of the job queue stages.
+    """
+
+    prepare_workers: int = Field(
+        default=1, description="Jobs whose audio is analyzed (VAD) at once."
+    )
+    transcribe_workers: int = Field(default=1, description="Jobs transcribed at once.")
+    translate_workers: int = Field(
+        default=2, description="Jobs translated by the LLM at once."
+    )
+    prefetch: int = Field(
+        default=1,
+        description="Prepared jobs kept ready ahead of the transcription stage.",
+    )
+
+
+class WatchConfig(BaseModel):
+    """
+    Hot folders whose new media files are queued automatically.
+    """
+
+    enabled: bool = Field(default=False, description="Watch the folders below.")
+    directories: List[str] = Field(
+        default_factory=list, description="Folders to watch (recursively)."
+    )
+    target_lang: str = Field(default="Chinese", description="Translation target.")
+    use_output_dir: bool = Field(
+        default=False,
+        description="Write SRTs to app.output_dir instead of next to the media.",
+    )
+    settle_seconds: float = Field(
+        default=10.0,
+        description="A file is queued once its size and mtime stay unchanged this long.",
+    )
+    poll_interval: float = Field(
+        default=5.0,
+        description="Seconds between folder scans when inotify is unavailable.",
+    )
+    max_pending: int = Field(
+        default=2,
+        description="Watched files queued or running at once; the rest wait.",
+    )
+
+
+class ApiConfig(BaseModel):
+    """
+    Local HTTP job API for other tools.
+    """
+
+    enabled: bool = Field(default=False, description="Serve the job API.")
+    host: str = Field(default="127.0.0.1", description="Address to bind.")
+    port: int = Field(default=8765, description="Port to bind (0 = any free port).")
+    token: str = Field(
+        default="",
+        description="If set, requests need 'Authorization: Bearer <token>'. "
+        "Required to bind an address other than loopback.",
+    )
+    max_pending: int = Field(
+        default=100,
+        description="Unfinished jobs allowed before new submissions get HTTP 429.",
+    )
+    output_roots: List[str] = Field(
+        default_factory=list,
+        description="Folders a submitted output_dir may be in (empty = SRTs are "
+        "always written next to the media).",
+    )
+    metrics: bool = Field(
+        default=False,
+        description="Serve metrics in Prometheus text format at GET /metrics.",
+    )
+
+
+class DistributedConfig(BaseModel):
+    """
+    Shared task queue used by headless workers on several machines.
+    """
+
+    queue_db: str = Field(
+        default="",
+        description="SQLite file on a shared volume (empty = in the app data dir).",
+    )
+    chunk_seconds: float = Field(
+        default=600.0,
+        description="Target length of one transcription task, cut in silences.",
+    )
+    lease_seconds: float = Field(
+        default=60.0,
+        description="A task is handed to another worker when its lease lapses.",
+    )
+    max_attempts: int = Field(
+        default=3, description="Leases of one task before its job fails."
+    )
+    poll_interval: float = Field(
+        default=2.0, description="Seconds an idle worker waits between polls."
+    )
+
+
+class ProfilingConfig(BaseModel):
+    """
+    Per-job profiling: CPU samples, stage timings and memory allocations,
+    written as a report folder next to the logs.
+    """
+
+    enabled: bool = Field(
+        default=False,
+        description="Profile every job, one at a time (a single task can also ask for it).",
+    )
+    sample_interval: float = Field(
+        default=0.01, description="Seconds between CPU stack samples."
+    )
+    trace_memory: bool = Field(
+        default=True,
+        description="Trace allocations with tracemalloc (slows the job down).",
+    )
+    top_allocations: int = Field(
+        default=25, description="Allocation sites listed in the report."
+    )
+
+
+class ResourceLimits(BaseModel):
+    """
+    Resource governor: how much of the machine transcription may take.
+    """
+
+    max_cpu_threads: int = Field(
+        default=0,
+        description="CPU threads Whisper may use across its workers (0 = no cap).",
+    )
+    process_priority: str = Field(
+        default="normal",
+        description="Priority of transcription (normal/below_normal/idle).",
+    )
+    max_memory_mb: int = Field(
+        default=0,
+        description="Memory a Whisper model may take (0 = what is available).",
+    )
+    min_free_memory_mb: int = Field(
+        default=1024,
+        description="Memory left to the rest of the system when loading a model.",
+    )
+    auto_downgrade: bool = Field(
+        default=False,
+        description="Load a smaller model or compute type when the budget is short.",
+    )
+    pause_under_pressure: bool = Field(
+        default=False,
+        description="Pause transcription while free memory is low.",
+    )
+    pressure_free_memory_mb: int = Field(
+        default=512,
+        description="Free memory below which transcription pauses.",
+    )
+    max_pause_seconds: int = Field(
+        default=300,
+        description="Longest pause before transcription goes on anyway (0 = no limit).",
+    )
 
 
 class AppConfig(BaseModel):
@@ -79,6 +377,14 @@ class AppConfig(BaseModel):
     log_level: str = Field(
         default="INFO", description="Log level (DEBUG/INFO/WARNING/ERROR)."
     )
+    ui_event_rate: float = Field(
+        default=10.0,
+        description="UI updates per second; progress events in between are merged.",
+    )
+    resources: ResourceLimits = Field(
+        default_factory=ResourceLimits,
+        description="CPU, priority and memory limits for transcription.",
+    )
 
 
 class GlobalConfig(BaseModel):
@@ -89,3 +395,8 @@ class GlobalConfig(BaseModel):
     app: AppConfig = Field(default_factory=AppConfig)
     whisper: WhisperConfig = Field(default_factory=WhisperConfig)
     ai: ModelConfig = Field(default_factory=ModelConfig)
+    pipeline: PipelineConfig = Field(default_factory=PipelineConfig)
+    watch: WatchConfig = Field(default_factory=WatchConfig)
+    api: ApiConfig = Field(default_factory=ApiConfig)
+    distributed: DistributedConfig = Field(default_factory=DistributedConfig)
+    profiling: ProfilingConfig = Field(default_factory=ProfilingConfig)
@@ -0,0 +1,74 @@
+import threading
+from typing import Callable, List, Optional, TypeVar
+
+from backend.services.logger import in_log_context, logger
+
+T = TypeVar("T")
+
+# Seconds between checks of the cancel event while a call is blocked
+POLL_INTERVAL = 0.05
+
+
+def _cleanup(on_cancel: Callable[[], None]) -> None:
+    try:
+        on_cancel()
+    except Exception as e:
+        logger.debug(f"cancel_cleanup_failed: {e}")
+
+
+def run_cancellable(
+    fn: Callable[[], T],
+    cancel_event: Optional[threading.Event],
+    on_cancel: Optional[Callable[[], None]] = None,
+) -> T:
+    """
+    Runs a blocking call (an HTTP request, a download) so that cancelling
+    does not have to wait for it: the call runs in a helper thread and this
+    returns as soon as it finishes or cancel_event is set.
+
+    Args:
+        fn (Callable[[], T]): The blocking call.
+        cancel_event (Optional[threading.Event]): Aborts the wait when set;
+            None runs fn directly.
+        on_cancel (Optional[Callable[[], None]]): Called (in the background)
+            on cancellation to release what fn is blocked on, e.g. close its
+            HTTP client, so the helper thread ends soon too.
+
+    Returns:
+        T: The result of fn.
+
+    Raises:
+        InterruptedError: If cancel_event was set first.
+        Exception: Whatever fn raised.
+    """
+    if cancel_event is None:
+        return fn()
+    if cancel_event.is_set():
+        raise InterruptedError("cancelled_by_user")
+
+    done = threading.Event()
+    result: List[T] = []
+    error: List[BaseException] = []
+
+    def _target() -> None:
+        try:
+            result.append(fn())
+        except BaseException as e:
+            error.append(e)
+        finally:
+            done.set()
+
+    threading.Thread(
+        target=in_log_context(_target), name="cancellable-call", daemon=True
+    ).start()
+    while not done.wait(POLL_INTERVAL):
+        if cancel_event.is_set():
+            if on_cancel is not None:
+                # Closing may itself wait on the blocked call; don't wait for it
+                threading.Thread(
+                    target=_cleanup, args=(on_cancel,), daemon=True
+                ).start()
+            raise InterruptedError("cancelled_by_user")
+    if error:
+        raise error[0]
+    return result[0]
@@ -60,12 +60,14 @@ class ConfigManager:
         except Exception as e:
             logger.error(f"failed_to_save_config: {e}", exc_info=True)
 
-    def update_config(self, updates: dict[str, Any]) -> None:
+    def update_config(self, updates: dict[str, Any], persist: bool = True) -> None:
         """
         Updates the configuration with new values and saves.
 
         Args:
             updates (dict[str, Any]): Dictionary of updates to apply.
+            persist (bool): Write the result to disk; False keeps the change
+                for this process only.
         """
         logger.info(f"incoming_config_update_keys: {list(updates.keys())}")
 
@@ -97,7 +99,8 @@ class ConfigManager:
             self.config = GlobalConfig(**updated_dict)
             logger.info("config_object_updated_successfully")
             self._apply_log_level()
-            self.save_config()
+            if persist:
+                self.save_config()
         except Exception as e:
             logger.error(f"config_validation_failed: {e}")
             raise
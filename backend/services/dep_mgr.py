@@ -1,11 +1,21 @@
+import glob
+import hashlib
+import http.client
 import json
 import os
 import platform
+import time
+import urllib.error
 import urllib.request
 import zipfile
-from typing import Any, Callable, Optional
+from typing import Any, Callable, List, Optional, Tuple
 
+from backend.services.cancellation import run_cancellable
 from backend.services.logger import logger
+from backend.services.metrics import metrics
+
+# Bytes read per chunk; the cancel flag is checked between chunks
+DOWNLOAD_CHUNK = 256 * 1024
 
 
 class DependencyManager:
@@ -151,10 +161,128 @@ class DependencyManager:
         # Fallback to official PyPI
         if "pypi.org" not in mirror_base:
             logger.info("falling_back_to_official_pypi")
+            metrics.counter(
+                "unisub_fallbacks_total", "Fallbacks to a degraded mode"
+            ).inc(kind="official_pypi")
             return _fetch("https://pypi.org")
 
         return None
 
+    def _part_path(self, url: str, path: str) -> str:
+        """
+        Returns the partial file of a download. It is named after the URL,
+        so a partial file of another release of the wheel is never resumed.
+        """
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        return f"{path}.{digest}.part"
+
+    def _remove_part_files(self, path: str, keep: Optional[str] = None) -> None:
+        """Deletes the partial downloads of path, except keep."""
+        for part in glob.glob(glob.escape(path) + ".*.part"):
+            if part != keep:
+                try:
+                    os.remove(part)
+                    logger.info(f"download_part_removed: {part}")
+                except OSError as e:
+                    logger.warning(f"download_part_not_removed: {part}, {e}")
+
+    def _download(
+        self,
+        url: str,
+        path: str,
+        cancel_event: Optional[Any] = None,
+        progress_callback: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        """
+        Downloads url to path through a '.part' file (see _part_path). A
+        partial file left by a cancelled or failed download of the same url
+        is resumed with an HTTP Range request when the server supports it;
+        one the server rejects (416) is deleted and the download restarts.
+
+        Args:
+            url (str): The file to download.
+            path (str): Destination path.
+            cancel_event (Optional[threading.Event]): Aborts the download;
+                this returns at once and the partial file is kept.
+            progress_callback (Callable): Receives the downloaded fraction.
+
+        Raises:
+            InterruptedError: If cancelled.
+            OSError: On network or disk errors, including a response shorter
+                than its Content-Length.
+        """
+        part_path = self._part_path(url, path)
+        # Partial files of other urls for this path can never be resumed
+        self._remove_part_files(path, keep=part_path)
+        responses: List[Any] = []
+        downloaded = metrics.counter(
+            "unisub_download_bytes_total", "Bytes of dependencies downloaded"
+        )
+
+        def _open() -> Tuple[int, Any]:
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            request = urllib.request.Request(url, headers=headers)
+            try:
+                return offset, urllib.request.urlopen(request, timeout=30)
+            except urllib.error.HTTPError as e:
+                if e.code != 416 or not offset:
+                    raise
+            # The partial file is not a prefix of what the server has
+            logger.info(f"download_range_rejected_restarting: {offset} bytes")
+            os.remove(part_path)
+            return 0, urllib.request.urlopen(url, timeout=30)
+
+        def _fetch() -> None:
+            offset, response = _open()
+            with response:
+                responses.append(response)
+                if offset and response.status != 206:
+                    logger.info("download_range_not_supported_restarting")
+                    offset = 0
+                elif offset:
+                    logger.info(f"download_resumed: {offset} bytes")
+                total = offset + int(response.headers.get("Content-Length") or 0)
+                received = offset
+                with open(part_path, "ab" if offset else "wb") as f:
+                    while True:
+                        if cancel_event is not None and cancel_event.is_set():
+                            return
+                        chunk = response.read(DOWNLOAD_CHUNK)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        received += len(chunk)
+                        downloaded.inc(len(chunk))
+                        if total and progress_callback:
+                            progress_callback(received / total)
+                if received < total:
+                    # urllib ends a read cut off by the server like a full one
+                    raise ConnectionError(
+                        f"Download cut off at {received} of {total} bytes"
+                    )
+            os.replace(part_path, path)
+
+        def _abort() -> None:
+            # Unblocks a read waiting on the network
+            for response in responses:
+                response.close()
+
+        started = time.monotonic()
+        outcome = "error"
+        try:
+            run_cancellable(_fetch, cancel_event, on_cancel=_abort)
+            if cancel_event is not None and cancel_event.is_set():
+                raise InterruptedError("cancelled_by_user")
+            outcome = "success"
+        except InterruptedError:
+            outcome = "cancelled"
+            raise
+        finally:
+            metrics.histogram(
+                "unisub_download_seconds", "Dependency download time"
+            ).observe(time.monotonic() - started, outcome=outcome)
+
     def download_deps(
         self,
         progress_callback: Optional[Callable[[float, str], None]] = None,
@@ -166,6 +294,9 @@ class DependencyManager:
         """
         lib_dir = self.get_lib_dir()
         os.makedirs(lib_dir, exist_ok=True)
+        packages = metrics.counter(
+            "unisub_dep_packages_total", "Dependency packages processed by outcome"
+        )
 
         pkgs = self.PYPI_PACKAGES
         current_os = platform.system().lower()
@@ -196,6 +327,7 @@ class DependencyManager:
 
             if already_installed:
                 logger.info(f"package_already_present_skipping: {package_name}")
+                packages.inc(outcome="present")
                 if progress_callback:
                     progress_callback(
                         (idx + 1) / len(pkgs) * 100, f"Verified {package_name}"
@@ -210,25 +342,25 @@ class DependencyManager:
             wheel_url = self._get_wheel_url(package_name)
             if not wheel_url:
                 logger.error(f"could_not_find_suitable_wheel_for: {package_name}")
+                packages.inc(outcome="failed")
                 return False
 
             temp_wheel = os.path.join(lib_dir, f"{package_name}.whl")
+            downloaded = False
             try:
                 # 1. Download Phase
-                def _report_hook(block_num, block_size, total_size):
-                    if total_size > 0 and progress_callback:
-                        if cancel_event and cancel_event.is_set():
-                            return
-                        download_prog = (block_num * block_size / total_size) * 0.8
-                        overall = base_overall_progress + (download_prog * pkg_weight)
+                def _report(fraction: float) -> None:
+                    if progress_callback and not (
+                        cancel_event and cancel_event.is_set()
+                    ):
+                        overall = base_overall_progress + (fraction * 0.8 * pkg_weight)
                         progress_callback(
                             min(99, overall), f"Downloading {package_name}..."
                         )
 
                 logger.info(f"downloading_from: {wheel_url}")
-                urllib.request.urlretrieve(
-                    wheel_url, temp_wheel, reporthook=_report_hook
-                )
+                self._download(wheel_url, temp_wheel, cancel_event, _report)
+                downloaded = True
 
                 # 2. Extraction Phase - Robust Search
                 if progress_callback:
@@ -263,16 +395,27 @@ class DependencyManager:
 
                 logger.info(f"extracted_files_from_{package_name}: {extracted_count}")
                 os.remove(temp_wheel)
+                packages.inc(outcome="installed")
 
                 if progress_callback:
                     progress_callback(
                         (idx + 1) / len(pkgs) * 100, f"Installed {package_name}"
                     )
 
+            except InterruptedError:
+                # The partial download is kept and resumed next time
+                logger.info("dependency_download_cancelled")
+                packages.inc(outcome="cancelled")
+                return False
             except Exception as e:
                 logger.error(f"process_failed: {package_name}, {e}", exc_info=True)
+                packages.inc(outcome="failed")
                 if os.path.exists(temp_wheel):
                     os.remove(temp_wheel)
+                network_error = isinstance(e, (OSError, http.client.HTTPException))
+                if downloaded or not network_error:
+                    # Only a download cut off by the network is worth resuming
+                    self._remove_part_files(temp_wheel)
                 return False
 
         if progress_callback:
@@ -0,0 +1,434 @@
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import platform
+import select
+import sqlite3
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from appdirs import user_data_dir
+
+from backend.services.config_mgr import config_mgr
+from backend.services.job_queue import (
+    FINISHED_STATUSES,
+    MEDIA_EXTENSIONS,
+    JobQueue,
+    expand_media_paths,
+)
+from backend.services.logger import logger
+
+# Bytes hashed from each end of a file for its fingerprint
+FINGERPRINT_CHUNK = 1024 * 1024
+# Full rescans in inotify mode; network shares do not report remote writes
+RESCAN_INTERVAL = 60.0
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class Inotify:
+    """
+    Minimal inotify binding over libc (Linux only).
+
+    Raises:
+        OSError: From the constructor if inotify is not available.
+    """
+
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    def __init__(self) -> None:
+        if platform.system() != "Linux":
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, str] = {}
+
+    def add_watch(self, directory: str) -> None:
+        """Watches a directory (not its subdirectories)."""
+        wd = self._libc.inotify_add_watch(
+            self.fd, os.fsencode(directory), ctypes.c_uint32(self.MASK)
+        )
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {directory}")
+        self._dirs[wd] = directory
+
+    def read(self, timeout: float) -> Tuple[List[str], bool]:
+        """
+        Waits up to timeout for events.
+
+        Returns:
+            Tuple[List[str], bool]: Paths that were created, written or moved
+            in (directories included), and whether the kernel queue overflowed
+            so events were lost.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return [], False
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return [], False
+
+        paths: List[str] = []
+        overflow = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+            elif wd in self._dirs and name:
+                paths.append(os.path.join(self._dirs[wd], os.fsdecode(name)))
+        return paths, overflow
+
+    def close(self) -> None:
+        """Releases the inotify descriptor."""
+        os.close(self.fd)
+
+
+def file_fingerprint(path: str) -> str:
+    """
+    Fingerprints a media file by size and the first and last megabyte, so a
+    file copied or renamed into the folder again is still recognised.
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha256(str(size).encode("utf-8"))
+    with open(path, "rb") as f:
+        digest.update(f.read(FINGERPRINT_CHUNK))
+        if size > FINGERPRINT_CHUNK:
+            f.seek(max(FINGERPRINT_CHUNK, size - FINGERPRINT_CHUNK))
+            digest.update(f.read(FINGERPRINT_CHUNK))
+    return digest.hexdigest()
+
+
+class FolderWatcher:
+    """
+    Watches hot folders and queues new media files once they are complete.
+
+    New files are noticed through inotify on Linux (with a periodic rescan
+    as a safety net) or by polling elsewhere. A file is queued after its
+    size and mtime have been stable for watch.settle_seconds, unless its
+    fingerprint is already being processed or was completed before. The
+    fingerprint is recorded once the job completes, so a file whose job
+    failed is picked up again on restart. Jobs still unfinished in the
+    queue (e.g. after an exit) are tracked again on start rather than
+    queued a second time.
+    At most watch.max_pending watched files are queued or running at once.
+    """
+
+    def __init__(self) -> None:
+        self.db_path = os.path.join(
+            user_data_dir("UniversalSub", "UniversalSub"), "watch.db"
+        )
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._queue: Optional[JobQueue] = None
+        self._inotify: Optional[Inotify] = None
+        self.directories: List[str] = []
+        self.mode = "stopped"
+        # path -> (size, mtime_ns, time the two last changed)
+        self._candidates: Dict[str, Tuple[int, int, float]] = {}
+        # Files already handled, by (size, mtime_ns), to skip re-hashing them
+        self._handled: Dict[str, Tuple[int, int]] = {}
+        # Watched jobs not finished yet: job id -> (fingerprint, path)
+        self._jobs: Dict[str, Tuple[str, str]] = {}
+        self._stats: Dict[str, Any] = {}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS processed ("
+                "fingerprint TEXT PRIMARY KEY, path TEXT NOT NULL, "
+                "job_id TEXT, added_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @property
+    def running(self) -> bool:
+        """True while the watch thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, queue: JobQueue, directories: Optional[List[str]] = None) -> None:
+        """
+        Starts watching (restarting if already running).
+
+        Args:
+            queue (JobQueue): Queue that receives the new files.
+            directories (Optional[List[str]]): Folders to watch; defaults to
+                watch.directories from the config.
+        """
+        self.stop()
+        dirs = (
+            directories
+            if directories is not None
+            else config_mgr.config.watch.directories
+        )
+        self.directories = [os.path.abspath(d) for d in dirs if os.path.isdir(d)]
+        for missing in set(map(os.path.abspath, dirs)) - set(self.directories):
+            logger.warning(f"watch_directory_missing: {missing}")
+        if not self.directories:
+            logger.warning("watch_not_started: no directories")
+            return
+
+        self._queue = queue
+        self._stop.clear()
+        self._candidates.clear()
+        self._adopt_unfinished_jobs()
+        self._stats = {
+            "started_at": time.time(),
+            "enqueued": 0,
+            "completed": 0,
+            "failed": 0,
+            "duplicates": 0,
+            "errors": 0,
+            "last_enqueued": None,
+            "last_error": None,
+        }
+        try:
+            self._inotify = Inotify()
+        except (OSError, AttributeError) as e:
+            logger.info(f"watch_inotify_unavailable: {e}, polling")
+            self._inotify = None
+        self.mode = "inotify" if self._inotify else "polling"
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        logger.info(f"watch_started: {self.directories}, mode={self.mode}")
+
+    def _adopt_unfinished_jobs(self) -> None:
+        """
+        Tracks the queue's unfinished jobs for files in the watched folders,
+        so files queued before a restart are not queued a second time.
+        """
+        assert self._queue is not None
+        roots = [os.path.join(d, "") for d in self.directories]
+        with self._lock:
+            known = dict(self._jobs)
+        jobs: Dict[str, Tuple[str, str]] = {}
+        for job in self._queue.list_jobs():
+            path = job["path"]
+            if job["status"] in FINISHED_STATUSES or not path.startswith(tuple(roots)):
+                continue
+            if job["id"] in known:
+                jobs[job["id"]] = known[job["id"]]
+                continue
+            try:
+                jobs[job["id"]] = (file_fingerprint(path), path)
+            except OSError as e:
+                logger.warning(f"watch_job_not_adopted: {path}, {e}")
+        with self._lock:
+            self._jobs = jobs
+        if jobs:
+            logger.info(f"watch_jobs_adopted: {len(jobs)}")
+
+    def stop(self) -> None:
+        """Stops watching; queued jobs are not affected."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self.mode = "stopped"
+        logger.info("watch_stopped")
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Returns the watcher state and counters.
+
+        Returns:
+            Dict[str, Any]: running, mode, directories, settling (files not yet
+            stable), waiting (stable but held back by max_pending), pending_jobs
+            and the enqueued/completed/failed/duplicates/errors counters.
+        """
+        settle = config_mgr.config.watch.settle_seconds
+        now = time.time()
+        with self._lock:
+            candidates = list(self._candidates.values())
+            pending_jobs = len(self._jobs)
+        return {
+            "running": self.running,
+            "mode": self.mode,
+            "directories": list(self.directories),
+            "settling": sum(1 for c in candidates if now - c[2] < settle),
+            "waiting": sum(1 for c in candidates if now - c[2] >= settle),
+            "pending_jobs": pending_jobs,
+            **self._stats,
+        }
+
+    def _watch_tree(self, directory: str) -> None:
+        if self._inotify is None:
+            return
+        for dirpath, _, _ in os.walk(directory):
+            try:
+                self._inotify.add_watch(dirpath)
+            except OSError as e:
+                logger.warning(f"watch_add_failed: {dirpath}, {e}")
+
+    def _scan(self, directories: List[str]) -> None:
+        for path in expand_media_paths(directories):
+            self._observe(path)
+
+    def _observe(self, path: str) -> None:
+        """Notes a new or changed file; the settle timer restarts on change."""
+        if os.path.isdir(path):
+            # A folder created or moved in: watch it and pick up its files
+            self._watch_tree(path)
+            self._scan([path])
+            return
+        if not path.lower().endswith(MEDIA_EXTENSIONS):
+            return
+        try:
+            stat = os.stat(path)
+        except OSError:
+            with self._lock:
+                self._candidates.pop(path, None)
+            return
+        key = (stat.st_size, stat.st_mtime_ns)
+        if self._handled.get(path) == key:
+            return
+        with self._lock:
+            previous = self._candidates.get(path)
+            if previous is None or previous[:2] != key:
+                self._candidates[path] = (*key, time.time())
+
+    def _pending_jobs(self) -> int:
+        """Collects finished watched jobs; returns how many are still pending."""
+        assert self._queue is not None
+        with self._lock:
+            jobs = list(self._jobs.items())
+        for job_id, (fingerprint, path) in jobs:
+            job = self._queue.get(job_id)
+            if job is not None and job["status"] not in FINISHED_STATUSES:
+                continue
+            if job is not None and job["status"] == "completed":
+                db = self._db()
+                db.execute(
+                    "INSERT OR REPLACE INTO processed "
+                    "(fingerprint, path, job_id, added_at) VALUES (?, ?, ?, ?)",
+                    (fingerprint, path, job_id, time.time()),
+                )
+                db.commit()
+                self._stats["completed"] += 1
+            else:
+                self._stats["failed"] += 1
+            with self._lock:
+                self._jobs.pop(job_id, None)
+        with self._lock:
+            return len(self._jobs)
+
+    def _check_candidates(self) -> None:
+        """Queues the files whose size and mtime have settled."""
+        options = config_mgr.config.watch
+        now = time.time()
+        with self._lock:
+            ready = sorted(
+                (since, path)
+                for path, (_, _, since) in self._candidates.items()
+                if now - since >= options.settle_seconds
+            )
+        for _, path in ready:
+            # Re-stat: a write may have happened since the last event
+            self._observe(path)
+            with self._lock:
+                candidate = self._candidates.get(path)
+            if candidate is None or now - candidate[2] < options.settle_seconds:
+                continue
+            if self._pending_jobs() >= max(1, options.max_pending):
+                break
+            self._handle(path, candidate)
+
+    def _handle(self, path: str, candidate: Tuple[int, int, float]) -> None:
+        assert self._queue is not None
+        options = config_mgr.config.watch
+        try:
+            fingerprint = file_fingerprint(path)
+            with self._lock:
+                in_flight = any(
+                    fp == fingerprint or job_path == path
+                    for fp, job_path in self._jobs.values()
+                )
+            if (
+                in_flight
+                or self._db()
+                .execute(
+                    "SELECT 1 FROM processed WHERE fingerprint = ?", (fingerprint,)
+                )
+                .fetchone()
+            ):
+                logger.info(f"watch_duplicate_skipped: {path}")
+                self._stats["duplicates"] += 1
+            else:
+                output_dir = None
+                if options.use_output_dir:
+                    output_dir = os.path.abspath(config_mgr.config.app.output_dir)
+                jobs = self._queue.enqueue(
+                    [path], options.target_lang, output_dir=output_dir
+                )
+                with self._lock:
+                    for job in jobs:
+                        self._jobs[job["id"]] = (fingerprint, path)
+                self._stats["enqueued"] += 1
+                self._stats["last_enqueued"] = path
+                logger.info(f"watch_file_enqueued: {path}")
+        except (OSError, sqlite3.Error) as e:
+            # Still locked or vanished; try again once it changes
+            logger.warning(f"watch_file_failed: {path}, {e}")
+            self._stats["errors"] += 1
+            self._stats["last_error"] = f"{path}: {e}"
+        self._handled[path] = candidate[:2]
+        with self._lock:
+            self._candidates.pop(path, None)
+
+    def _loop(self) -> None:
+        for directory in self.directories:
+            self._watch_tree(directory)
+        # Files dropped while the watcher was not running
+        self._scan(self.directories)
+        last_scan = time.time()
+
+        while not self._stop.is_set():
+            if self._inotify is not None:
+                paths, overflow = self._inotify.read(timeout=1.0)
+                for path in paths:
+                    self._observe(path)
+                rescan = overflow or time.time() - last_scan >= RESCAN_INTERVAL
+            else:
+                self._stop.wait(
+                    min(1.0, max(0.1, config_mgr.config.watch.poll_interval))
+                )
+                rescan = (
+                    time.time() - last_scan >= config_mgr.config.watch.poll_interval
+                )
+            if rescan:
+                self._scan(self.directories)
+                last_scan = time.time()
+            try:
+                self._pending_jobs()
+                self._check_candidates()
+            except Exception as e:
+                logger.error(f"watch_check_failed: {e}", exc_info=True)
+
+
+# Global folder watcher instance
+folder_watcher = FolderWatcher()
@@ -1,6 +1,9 @@
+import hashlib
 import os
 import platform
+import re
 import subprocess
+from typing import Dict, Optional
 
 from backend.services.logger import logger
 
@@ -10,6 +13,9 @@ class HardwareManager:
     Service for detecting system hardware capabilities, specifically GPUs.
     """
 
+    def __init__(self) -> None:
+        self._machine_id: str = ""
+
     def detect_gpu_vendor(self) -> str:
         """
         Detects the GPU vendor.
@@ -81,5 +87,103 @@ class HardwareManager:
         """Quick check if there is an NVIDIA GPU."""
         return self.detect_gpu_vendor() == "nvidia"
 
+    def get_cpu_count(self) -> int:
+        """Returns the number of logical CPUs usable by this process."""
+        if hasattr(os, "sched_getaffinity"):
+            try:
+                return max(1, len(os.sched_getaffinity(0)))
+            except OSError:
+                pass
+        return max(1, os.cpu_count() or 1)
+
+    def get_memory_info(self) -> Optional[Dict[str, int]]:
+        """
+        Returns the physical memory of the machine.
+
+        Returns:
+            Optional[Dict[str, int]]: total and available bytes, or None if
+            this platform cannot be queried.
+        """
+        system = platform.system().lower()
+        try:
+            if system == "linux":
+                return self._linux_memory()
+            elif system == "windows":
+                return self._windows_memory()
+            elif system == "darwin":
+                return self._darwin_memory()
+        except Exception as e:
+            logger.warning(f"memory_probe_failed: {e}")
+        return None
+
+    def _linux_memory(self) -> Dict[str, int]:
+        """Reads /proc/meminfo (values are in KiB)."""
+        fields: Dict[str, int] = {}
+        with open("/proc/meminfo", "r", encoding="ascii") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                fields[name] = int(value.split()[0]) * 1024
+        available = fields.get("MemAvailable", fields.get("MemFree", 0))
+        return {"total": fields["MemTotal"], "available": available}
+
+    def _windows_memory(self) -> Dict[str, int]:
+        """Queries GlobalMemoryStatusEx."""
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        ctypes.windll.kernel32.GlobalMemoryStatusEx(  # type: ignore
+            ctypes.byref(status)
+        )
+        return {"total": status.ullTotalPhys, "available": status.ullAvailPhys}
+
+    def _darwin_memory(self) -> Dict[str, int]:
+        """Uses sysctl for the total and vm_stat for free and reclaimable pages."""
+        total = int(subprocess.check_output(["sysctl", "-n", "hw.memsize"]).strip())
+        output = subprocess.check_output(["vm_stat"]).decode("utf-8")
+        page_size = int(re.search(r"page size of (\d+)", output).group(1))  # type: ignore
+        pages = {
+            name.strip(): int(value)
+            for name, value in re.findall(r"^([^:]+):\s+(\d+)\.?$", output, re.M)
+        }
+        free = sum(
+            pages.get(name, 0)
+            for name in ("Pages free", "Pages inactive", "Pages speculative")
+        )
+        return {"total": total, "available": free * page_size}
+
+    def get_machine_id(self) -> str:
+        """
+        Returns a stable fingerprint of this machine's compute hardware.
+        Used to key persisted tuning profiles, so a copied config does not
+        apply one machine's benchmark results to another.
+        """
+        if self._machine_id:
+            return self._machine_id
+        parts = [
+            platform.node(),
+            platform.system(),
+            platform.machine(),
+            platform.processor(),
+            str(self.get_cpu_count()),
+            self.detect_gpu_vendor(),
+        ]
+        digest = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+        self._machine_id = digest[:16]
+        return self._machine_id
+
 
 hardware_mgr = HardwareManager()
@@ -0,0 +1,627 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from appdirs import user_data_dir
+
+from backend.services.logger import in_log_context, logger
+from backend.services.metrics import metrics
+from backend.services.profiler import (
+    profiling_enabled,
+    span,
+    start_profiler,
+    use_profiler,
+)
+
+# Files picked up when a folder is enqueued
+MEDIA_EXTENSIONS = (
+    ".mp4",
+    ".mkv",
+    ".avi",
+    ".mov",
+    ".webm",
+    ".flv",
+    ".wmv",
+    ".ts",
+    ".m2ts",
+    ".mp3",
+    ".m4a",
+    ".wav",
+    ".flac",
+    ".aac",
+    ".ogg",
+)
+
+JOB_STATUSES = ("queued", "paused", "running", "completed", "failed", "cancelled")
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    target_lang TEXT NOT NULL,
+    options TEXT NOT NULL,
+    audio_stream INTEGER NOT NULL DEFAULT 0,
+    priority INTEGER NOT NULL DEFAULT 0,
+    position REAL NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT,
+    output_dir TEXT,
+    message TEXT,
+    srt_path TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# One pipeline stage: fn(job, context, report(progress, message[, eta]),
+# cancel_event), eta being the stage's seconds left if known. The context dict
+# carries results from one stage to the next; a stage raises InterruptedError
+# when cancelled and any other exception to fail the job.
+StageFn = Callable[
+    [Dict[str, Any], Dict[str, Any], Callable[..., None], threading.Event],
+    None,
+]
+# (stage name, stage function, number of workers)
+Stage = Tuple[str, StageFn, Callable[[], int]]
+# Receives (event, data) for 'queue_updated' and 'job_progress'
+QueueListener = Callable[[str, Dict[str, Any]], None]
+
+
+def expand_media_paths(paths: Iterable[str]) -> List[str]:
+    """
+    Expands folders into the media files they contain (recursively, sorted).
+
+    Args:
+        paths (Iterable[str]): Files and/or folders.
+
+    Returns:
+        List[str]: Absolute media file paths, without duplicates.
+    """
+    found: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    if name.lower().endswith(MEDIA_EXTENSIONS):
+                        found.append(os.path.abspath(os.path.join(dirpath, name)))
+        elif os.path.isfile(path):
+            found.append(os.path.abspath(path))
+    return list(dict.fromkeys(found))
+
+
+class JobQueue:
+    """
+    Persistent queue of subtitle jobs with a stage-based scheduler.
+
+    Jobs live in a SQLite database under the app data directory, so the
+    queue survives restarts; a job that was running when the app exited is
+    queued again and resumes from its transcript checkpoint.
+
+    Each job passes through a sequence of stages (e.g. prepare, transcribe,
+    translate), and every stage has its own pool of workers. A job moves to
+    the next stage's waiting list when a stage finishes, so one file can be
+    transcribed while the previous one is translated and the next one is
+    prepared; batch throughput is bound by the slowest stage rather than
+    the sum of all stages. Pending jobs enter the first stage highest
+    priority first, then in queue order, and only a few jobs are let in
+    ahead of the transcription bottleneck.
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        # ":memory:" gives a private queue that is gone when the process exits
+        self.db_path = db_path or os.path.join(
+            user_data_dir("UniversalSub", "UniversalSub"), "queue.db"
+        )
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stages: List[Stage] = []
+        self._prefetch: Callable[[], int] = lambda: 1
+        self._listeners: List[QueueListener] = []
+        # In-flight jobs: context, cancel event, waiting lists and busy workers
+        self._contexts: Dict[str, Dict[str, Any]] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._waiting: Dict[str, List[Dict[str, Any]]] = {}
+        self._active: Dict[str, int] = {}
+        metrics.add_collector(self._collect_metrics)
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column in ("stage", "output_dir"):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+            # A job left running by a crash or exit is picked up again
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', stage = NULL, started_at = NULL "
+                "WHERE status = 'running'"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["options"] = json.loads(job["options"] or "{}")
+        return job
+
+    def add_listener(self, listener: QueueListener) -> None:
+        """Subscribes to queue events."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: QueueListener) -> None:
+        """Unsubscribes from queue events."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _emit(self, event: str, data: Dict[str, Any]) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(event, data)
+            except Exception as e:
+                logger.error(f"job_queue_listener_failed: {e}")
+
+    def _notify(self) -> None:
+        self._emit("queue_updated", self.snapshot())
+
+    def _collect_metrics(self) -> None:
+        """Mirrors the queue depths into gauges (see metrics.add_collector)."""
+        jobs = metrics.gauge("unisub_queue_jobs", "Queued jobs by status")
+        waiting = metrics.gauge(
+            "unisub_stage_waiting", "Jobs waiting for a pipeline stage"
+        )
+        active = metrics.gauge("unisub_stage_active", "Jobs running a pipeline stage")
+        with self._lock:
+            # Reading metrics should not create the database
+            if self._conn is None:
+                return
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+            ).fetchall()
+            jobs.clear()
+            for row in rows:
+                jobs.set(row["n"], status=row["status"])
+            for name, _, _ in self._stages:
+                waiting.set(len(self._waiting.get(name, [])), stage=name)
+                active.set(self._active.get(name, 0), stage=name)
+
+    @property
+    def paused(self) -> bool:
+        """True while the scheduler is not starting new jobs."""
+        with self._lock:
+            row = (
+                self._db()
+                .execute("SELECT value FROM meta WHERE key = 'paused'")
+                .fetchone()
+            )
+        return bool(row and row["value"] == "1")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns all jobs in scheduling order plus the queue state."""
+        return {"jobs": self.list_jobs(), "paused": self.paused}
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Lists all jobs: running first, then pending in the order they will
+        run, then finished ones (newest first).
+        """
+        with self._lock:
+            rows = (
+                self._db()
+                .execute(
+                    "SELECT * FROM jobs ORDER BY "
+                    "CASE status WHEN 'running' THEN 0 WHEN 'queued' THEN 1 "
+                    "WHEN 'paused' THEN 1 ELSE 2 END, "
+                    "CASE WHEN status IN ('queued', 'paused') "
+                    "THEN -priority ELSE 0 END, "
+                    "CASE WHEN status IN ('queued', 'paused') "
+                    "THEN position ELSE -finished_at END"
+                )
+                .fetchall()
+            )
+        return [self._row_to_job(row) for row in rows]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Returns one job, or None if it does not exist."""
+        with self._lock:
+            row = (
+                self._db()
+                .execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+                .fetchone()
+            )
+        return self._row_to_job(row) if row else None
+
+    def enqueue(
+        self,
+        paths: Iterable[str],
+        target_lang: str = "Chinese",
+        options: Optional[Dict[str, Any]] = None,
+        priority: int = 0,
+        audio_stream: int = 0,
+        output_dir: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Adds media files (folders are expanded) to the end of the queue.
+
+        Args:
+            paths (Iterable[str]): Files and/or folders.
+            target_lang (str): Translation target language.
+            options (Optional[Dict[str, Any]]): Per-job decoding overrides.
+            priority (int): Higher priorities run first.
+            audio_stream (int): Audio track to transcribe.
+            output_dir (Optional[str]): Folder for the SRTs; None writes them
+                next to the media.
+
+        Returns:
+            List[Dict[str, Any]]: The created jobs.
+        """
+        files = expand_media_paths(paths)
+        now = time.time()
+        created: List[str] = []
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT MAX(position) AS pos FROM jobs").fetchone()
+            position = (row["pos"] or 0.0) + 1.0
+            for path in files:
+                job_id = uuid.uuid4().hex[:12]
+                db.execute(
+                    "INSERT INTO jobs (id, path, target_lang, options, audio_stream, "
+                    "priority, position, output_dir, status, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'queued', ?)",
+                    (
+                        job_id,
+                        path,
+                        target_lang,
+                        json.dumps(options or {}),
+                        audio_stream,
+                        priority,
+                        position,
+                        output_dir,
+                        now,
+                    ),
+                )
+                created.append(job_id)
+                position += 1.0
+            db.commit()
+
+        logger.info(f"jobs_enqueued: {len(created)}")
+        self._wake.set()
+        self._notify()
+        return [job for job in (self.get(job_id) for job_id in created) if job]
+
+    def _update(self, job_id: str, **fields: Any) -> bool:
+        with self._lock:
+            db = self._db()
+            columns = ", ".join(f"{key} = ?" for key in fields)
+            cursor = db.execute(
+                f"UPDATE jobs SET {columns} WHERE id = ?",  # nosec
+                (*fields.values(), job_id),
+            )
+            db.commit()
+        return cursor.rowcount > 0
+
+    def _set_status(self, job_id: str, expected: Iterable[str], status: str) -> bool:
+        job = self.get(job_id)
+        if job is None or job["status"] not in expected:
+            return False
+        self._update(job_id, status=status)
+        self._wake.set()
+        self._notify()
+        return True
+
+    def pause_job(self, job_id: str) -> bool:
+        """Holds a queued job back until it is resumed."""
+        return self._set_status(job_id, ("queued",), "paused")
+
+    def resume_job(self, job_id: str) -> bool:
+        """Puts a paused job back in the queue."""
+        return self._set_status(job_id, ("paused",), "queued")
+
+    def retry_job(self, job_id: str) -> bool:
+        """Queues a failed or cancelled job again."""
+        if not self._set_status(job_id, ("failed", "cancelled"), "queued"):
+            return False
+        self._update(job_id, message=None, started_at=None, finished_at=None)
+        return True
+
+    def set_priority(self, job_id: str, priority: int) -> bool:
+        """Changes the priority of a job that has not run yet."""
+        job = self.get(job_id)
+        if job is None or job["status"] not in ("queued", "paused"):
+            return False
+        self._update(job_id, priority=int(priority))
+        self._notify()
+        return True
+
+    def move_job(self, job_id: str, index: int) -> bool:
+        """
+        Moves a pending job to a new place among pending jobs of the same
+        priority.
+
+        Args:
+            job_id (str): The job to move.
+            index (int): Target index in that priority's order (0 = first).
+
+        Returns:
+            bool: False if the job is not pending.
+        """
+        with self._lock:
+            job = self.get(job_id)
+            if job is None or job["status"] not in ("queued", "paused"):
+                return False
+            peers = [
+                j
+                for j in self.list_jobs()
+                if j["status"] in ("queued", "paused")
+                and j["priority"] == job["priority"]
+                and j["id"] != job_id
+            ]
+            index = max(0, min(index, len(peers)))
+            peers.insert(index, job)
+            db = self._db()
+            for position, peer in enumerate(peers, 1):
+                db.execute(
+                    "UPDATE jobs SET position = ? WHERE id = ?",
+                    (float(position), peer["id"]),
+                )
+            db.commit()
+        self._notify()
+        return True
+
+    def remove_job(self, job_id: str) -> bool:
+        """Deletes a job that is not running."""
+        with self._lock:
+            if job_id in self._contexts:
+                return False
+            db = self._db()
+            cursor = db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            db.commit()
+        self._notify()
+        return cursor.rowcount > 0
+
+    def clear_finished(self) -> int:
+        """Deletes completed, failed and cancelled jobs. Returns how many."""
+        with self._lock:
+            db = self._db()
+            cursor = db.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?, ?)", FINISHED_STATUSES
+            )
+            db.commit()
+        self._notify()
+        return cursor.rowcount
+
+    def set_paused(self, paused: bool) -> None:
+        """Pauses or resumes the queue; a running job is not interrupted."""
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('paused', ?)",
+                ("1" if paused else "0",),
+            )
+            db.commit()
+        logger.info(f"job_queue_{'paused' if paused else 'resumed'}")
+        self._wake.set()
+        self._notify()
+
+    def cancel_job(self, job_id: str) -> bool:
+        """
+        Cancels a running job. A job waiting between stages is finished as
+        cancelled at once; one inside a stage stops at its next check.
+        """
+        with self._lock:
+            event = self._cancel_events.get(job_id)
+            if event is None:
+                return False
+            event.set()
+            waiting_job = None
+            for waiting in self._waiting.values():
+                for job in waiting:
+                    if job["id"] == job_id:
+                        waiting.remove(job)
+                        waiting_job = job
+                        break
+            if waiting_job is not None:
+                self._finish(waiting_job, "cancelled", "Task cancelled by user")
+        if waiting_job is not None:
+            # Its prefetch slot is free for the next job
+            self._wake.set()
+            self._notify()
+        return True
+
+    def _next_job(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = (
+                self._db()
+                .execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' "
+                    "ORDER BY priority DESC, position ASC LIMIT 1"
+                )
+                .fetchone()
+            )
+        return self._row_to_job(row) if row else None
+
+    def start(
+        self,
+        stages: List[Stage],
+        listener: Optional[QueueListener] = None,
+        prefetch: Optional[Callable[[], int]] = None,
+    ) -> None:
+        """
+        Starts the scheduler thread (once).
+
+        Args:
+            stages (List[Stage]): (name, function, worker count) in order.
+            listener (QueueListener): Subscribed to queue events (see
+                add_listener).
+            prefetch (Callable): How many jobs may wait for the second stage
+                before no more jobs are let into the first one.
+        """
+        with self._lock:
+            self._stages = list(stages)
+            if listener is not None and listener not in self._listeners:
+                self._listeners.append(listener)
+            if prefetch is not None:
+                self._prefetch = prefetch
+            for name, _, _ in self._stages:
+                self._waiting.setdefault(name, [])
+                self._active.setdefault(name, 0)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+
+    def _admit(self) -> Optional[Dict[str, Any]]:
+        """Takes the next pending job into the pipeline, if there is room."""
+        if self.paused:
+            return None
+        if len(self._stages) > 1:
+            # Jobs already past the first stage but not yet in the second
+            ahead = (
+                len(self._waiting[self._stages[1][0]])
+                + self._active[self._stages[0][0]]
+            )
+            if ahead >= max(1, self._prefetch()):
+                return None
+        job = self._next_job()
+        if job is None:
+            return None
+        self._contexts[job["id"]] = {}
+        if profiling_enabled(job["options"].get("profile")):
+            # Covers every stage; the report is written when the job finishes
+            label = f"{os.path.basename(job['path'])}-{job['id'][:8]}"
+            self._contexts[job["id"]]["profiler"] = start_profiler(label)
+        self._cancel_events[job["id"]] = threading.Event()
+        self._update(
+            job["id"],
+            status="running",
+            stage=self._stages[0][0],
+            started_at=time.time(),
+        )
+        job["status"] = "running"
+        logger.info(f"job_started: {job['id']}, {job['path']}")
+        return job
+
+    def _dispatch(self) -> bool:
+        """Starts workers for every stage with free capacity."""
+        started = False
+        with self._lock:
+            for index, (name, _, workers) in enumerate(self._stages):
+                while self._active[name] < max(1, workers()):
+                    if index == 0:
+                        job = self._admit()
+                    else:
+                        waiting = self._waiting[name]
+                        waiting.sort(key=lambda j: (-j["priority"], j["position"]))
+                        job = waiting.pop(0) if waiting else None
+                    if job is None:
+                        break
+                    self._active[name] += 1
+                    self._update(job["id"], stage=name)
+                    threading.Thread(
+                        target=in_log_context(
+                            self._run_stage, job_id=job["id"], stage=name
+                        ),
+                        args=(index, job),
+                        daemon=True,
+                    ).start()
+                    started = True
+        return started
+
+    def _run_stage(self, index: int, job: Dict[str, Any]) -> None:
+        name, fn, _ = self._stages[index]
+        job_id = job["id"]
+        cancel_event = self._cancel_events[job_id]
+        self._notify()
+
+        def _report(progress: float, message: str, eta: Optional[float] = None) -> None:
+            self._emit(
+                "job_progress",
+                {
+                    "job_id": job_id,
+                    "stage": name,
+                    "progress": round(progress, 1),
+                    "message": message,
+                    "eta": eta,
+                },
+            )
+
+        status, message = None, None
+        started = time.monotonic()
+        try:
+            if cancel_event.is_set():
+                raise InterruptedError("cancelled_by_user")
+            context = self._contexts[job_id]
+            with use_profiler(context.get("profiler")), span(name):
+                fn(job, context, _report, cancel_event)
+        except InterruptedError:
+            status, message = "cancelled", "Task cancelled by user"
+        except Exception as e:
+            logger.error(f"job_stage_failed: {job_id}, {name}: {e}", exc_info=True)
+            status, message = "failed", str(e)
+        metrics.histogram(
+            "unisub_stage_seconds", "Time jobs spend in each pipeline stage"
+        ).observe(time.monotonic() - started, stage=name, outcome=status or "completed")
+
+        with self._lock:
+            self._active[name] -= 1
+            if status is not None:
+                self._finish(job, status, message)
+            elif index + 1 < len(self._stages):
+                next_name = self._stages[index + 1][0]
+                self._waiting[next_name].append(job)
+                self._update(job_id, stage=next_name)
+            else:
+                self._finish(job, "completed", None)
+        self._notify()
+        self._wake.set()
+
+    def _finish(self, job: Dict[str, Any], status: str, message: Optional[str]) -> None:
+        context = self._contexts.pop(job["id"], {})
+        self._cancel_events.pop(job["id"], None)
+        self._update(
+            job["id"],
+            status=status,
+            stage=None,
+            message=message,
+            srt_path=context.get("srt_path"),
+            finished_at=time.time(),
+        )
+        logger.info(f"job_finished: {job['id']}, {status}")
+        profiler = context.get("profiler")
+        if profiler is not None:
+            threading.Thread(
+                target=in_log_context(profiler.write_report, job_id=job["id"]),
+                daemon=True,
+            ).start()
+        metrics.counter("unisub_jobs_total", "Queued jobs finished by status").inc(
+            status=status
+        )
+
+    def _loop(self) -> None:
+        while True:
+            self._wake.clear()
+            if not self._dispatch():
+                self._wake.wait(timeout=5.0)
+
+
+# Global job queue instance
+job_queue = JobQueue()
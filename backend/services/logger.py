@@ -1,15 +1,131 @@
+import atexit
+import contextlib
+import contextvars
 import logging
 import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Callable, Dict, Iterator, Optional, TextIO, TypeVar
 
 from appdirs import user_log_dir
+from pythonjsonlogger.json import JsonFormatter
+
+T = TypeVar("T")
+
+# Fields describing the work in progress (job_id, stage, batch_id, ...),
+# attached to every record logged while they are set
+_context: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar(
+    "log_context", default={}
+)
+
+
+@contextlib.contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """
+    Attaches fields to every record logged inside the block, on this thread.
+
+    New threads start without context; wrap their target with
+    in_log_context to carry it over.
+
+    Args:
+        **fields: e.g. job_id, stage or batch_id. None values are skipped.
+    """
+    token = _context.set(
+        {**_context.get(), **{k: v for k, v in fields.items() if v is not None}}
+    )
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def current_log_context() -> Dict[str, Any]:
+    """Returns the fields set by the enclosing log_context blocks."""
+    return dict(_context.get())
+
+
+def in_log_context(fn: Callable[..., T], **fields: Any) -> Callable[..., T]:
+    """
+    Wraps fn so it runs with the caller's context variables (log fields,
+    the active profiler) plus fields, e.g. as the target of a new thread,
+    which would otherwise start without any. Call the result only once.
+
+    Args:
+        fn (Callable): The function to wrap.
+        **fields: Extra fields for everything fn logs.
+
+    Returns:
+        Callable: fn with the same arguments and result.
+    """
+    context = contextvars.copy_context()
+
+    def _run(*args: Any, **kwargs: Any) -> T:
+        def _inner() -> T:
+            with log_context(**fields):
+                return fn(*args, **kwargs)
+
+        return context.run(_inner)
+
+    return _run
+
+
+class _ContextHandler(QueueHandler):
+    """
+    Hands records to the background listener as they are.
+
+    The base class formats the message on the calling thread; here only the
+    context fields are attached and '%' arguments are merged later by the
+    listener, so the hot path only pays for a queue put. Arguments must
+    therefore not be mutated after the call (pass strings and numbers).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        context = _context.get()
+        if context:
+            record.__dict__.update(context)
+            record.context = context
+        return record
+
+
+class _TextFormatter(logging.Formatter):
+    """Console format, with the context fields appended."""
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        text = super().formatMessage(record)
+        context = getattr(record, "context", None)
+        if context:
+            text += " [" + " ".join(f"{k}={v}" for k, v in context.items()) + "]"
+        return text
+
+
+class _JsonFormatter(JsonFormatter):
+    """One JSON object per line; context fields become top-level keys."""
+
+    def add_fields(
+        self,
+        log_record: Dict[str, Any],
+        record: logging.LogRecord,
+        message_dict: Dict[str, Any],
+    ) -> None:
+        super().add_fields(log_record, record, message_dict)
+        log_record.pop("context", None)
+
+
+_listener: Optional[QueueListener] = None
+_console_handler: Optional[logging.StreamHandler] = None
 
 
 def setup_logger(name: str = "universal-sub") -> logging.Logger:
     """
     Sets up a logger with both console and rotating file handlers.
+
+    Records go through a queue to a listener thread that does the
+    formatting and I/O, so logging never blocks the calling thread on disk
+    or console writes. The file gets one JSON object per line.
     """
+    global _listener, _console_handler
+
     logger = logging.getLogger(name)
 
     # Default level, will be updated by config_mgr
@@ -25,25 +141,38 @@ def setup_logger(name: str = "universal-sub") -> logging.Logger:
 
     # Console Handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    console_handler.setFormatter(
+        _TextFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     )
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
 
     # File Handler
     file_handler = RotatingFileHandler(
         log_file, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8"
     )
-    file_formatter = logging.Formatter(
-        "%(asctime)s [%(levelname)s] %(name)s: %(message)s (%(module)s:%(lineno)d)"
+    file_handler.setFormatter(
+        _JsonFormatter(
+            "%(asctime)s %(levelname)s %(name)s %(message)s %(module)s %(lineno)d",
+            rename_fields={"asctime": "time", "levelname": "level"},
+        )
     )
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    logger.addHandler(_ContextHandler(log_queue))
+    _listener = QueueListener(log_queue, console_handler, file_handler)
+    _listener.start()
+    _console_handler = console_handler
+    # Flushes what is still queued
+    atexit.register(_listener.stop)
 
     return logger
 
 
+def set_console_stream(stream: TextIO) -> None:
+    """Sends console logging to another stream (e.g. stderr)."""
+    if _console_handler is not None:
+        _console_handler.setStream(stream)
+
+
 def get_log_file_path() -> str:
     """Returns the absolute path of the log file."""
     log_dir = user_log_dir("UniversalSub", "UniversalSub")
@@ -0,0 +1,313 @@
+import abc
+import bisect
+import math
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from backend.services.logger import logger
+
+# Label set of one series: sorted (name, value) pairs
+LabelKey = Tuple[Tuple[str, str], ...]
+# An update mirrored to another process: (type, name, help, op, value, labels,
+# buckets), buckets being empty for anything but histograms
+MetricRecord = Tuple[str, str, str, str, float, Dict[str, str], Tuple[float, ...]]
+
+# Seconds: from a quick HTTP call to a long transcription
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+# Real-time factor (processing seconds per media second)
+RATIO_BUCKETS = (0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 5)
+# Throughput (items per second)
+RATE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+M = TypeVar("M", bound="_Metric")
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _snapshot_key(key: LabelKey) -> str:
+    return ",".join(f"{k}={v}" for k, v in key)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric(abc.ABC):
+    type = ""
+    buckets: Tuple[float, ...] = ()
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str) -> None:
+        self._registry = registry
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+
+    def _forward(self, op: str, value: float, labels: Dict[str, Any]) -> None:
+        self._registry._forward(
+            (
+                self.type,
+                self.name,
+                self.help,
+                op,
+                value,
+                dict(_label_key(labels)),
+                self.buckets,
+            )
+        )
+
+    @abc.abstractmethod
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        """Returns (sample name, labels, value) in exposition order."""
+
+    @abc.abstractmethod
+    def snapshot(self) -> Any:
+        """Returns the values by label string, JSON-friendly."""
+
+
+class Counter(_Metric):
+    """A value that only goes up (events, bytes, seconds spent)."""
+
+    type = "counter"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str) -> None:
+        super().__init__(registry, name, help)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, value: float = 1.0, **labels: Any) -> None:
+        """Adds value to the series selected by labels."""
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+        self._forward("inc", value, labels)
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+    def snapshot(self) -> Any:
+        with self._lock:
+            return {_snapshot_key(k): v for k, v in self._values.items()}
+
+
+class Gauge(Counter):
+    """A value that goes up and down (queue depth, active jobs)."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        """Sets the series selected by labels."""
+        with self._lock:
+            self._values[_label_key(labels)] = float(value)
+        self._forward("set", value, labels)
+
+    def clear(self) -> None:
+        """Drops every series (before a collector sets the current ones)."""
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """Counts observations in buckets, plus their sum (latencies, ratios)."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        help: str,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(registry, name, help)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[LabelKey, List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Records one observation."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.setdefault(
+                key, [[0] * (len(self.buckets) + 1), 0.0, 0]
+            )
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+        self._forward("observe", value, labels)
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        out: List[Tuple[str, LabelKey, float]] = []
+        with self._lock:
+            for key, (counts, total, count) in self._series.items():
+                cumulative = 0
+                for bound, bucket in zip(self.buckets + (math.inf,), counts):
+                    cumulative += bucket
+                    le = ("le", _format_value(bound))
+                    out.append((f"{self.name}_bucket", key + (le,), cumulative))
+                out.append((f"{self.name}_sum", key, total))
+                out.append((f"{self.name}_count", key, count))
+        return out
+
+    def _quantile(self, counts: List[int], count: int, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None: +Inf)."""
+        rank = q * count
+        cumulative = 0
+        for bound, bucket in zip(self.buckets, counts):
+            cumulative += bucket
+            if cumulative >= rank:
+                return bound
+        return None
+
+    def snapshot(self) -> Any:
+        with self._lock:
+            return {
+                _snapshot_key(key): {
+                    "count": count,
+                    "sum": round(total, 6),
+                    "mean": round(total / count, 6) if count else None,
+                    "p50": self._quantile(counts, count, 0.5),
+                    "p95": self._quantile(counts, count, 0.95),
+                }
+                for key, (counts, total, count) in self._series.items()
+            }
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters, gauges and histograms.
+
+    Metrics are created on first use by name. Collectors run before every
+    read to refresh gauges that mirror other state (e.g. queue depths).
+    A forwarder receives every update, which is how the isolated Whisper
+    worker reports its metrics to the GUI process (see apply()).
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._forwarder: Optional[Callable[[MetricRecord], None]] = None
+        self._lock = threading.Lock()
+
+    def _get(self, cls: Type[M], name: str, help: str, **kwargs: Any) -> M:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(self, name, help, **kwargs)
+                self._metrics[name] = metric
+            elif type(metric) is not cls:
+                raise ValueError(f"metric {name} is a {metric.type}")
+            elif help and not metric.help:
+                metric.help = help
+            return metric  # type: ignore[return-value]
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        """Returns the counter called name, creating it if needed."""
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        """Returns the gauge called name, creating it if needed."""
+        return self._get(Gauge, name, help)
+
+    def histogram(
+        self, name: str, help: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Returns the histogram called name, creating it if needed."""
+        return self._get(Histogram, name, help, buckets=buckets)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Registers a function that updates gauges before each read."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def set_forwarder(
+        self, forwarder: Optional[Callable[[MetricRecord], None]]
+    ) -> None:
+        """Mirrors every update to forwarder (None stops forwarding)."""
+        self._forwarder = forwarder
+
+    def _forward(self, record: MetricRecord) -> None:
+        forwarder = self._forwarder
+        if forwarder is not None:
+            try:
+                forwarder(record)
+            except (OSError, ValueError) as e:
+                # The receiving end is gone (e.g. the GUI process exited)
+                logger.debug(f"metric_not_forwarded: {record[1]}, {e}")
+
+    def apply(self, record: MetricRecord) -> None:
+        """
+        Replays an update forwarded from another process. Histograms are
+        created with the buckets of the forwarding process.
+        """
+        kind, name, help, op, value, labels, buckets = record
+        if kind == "histogram":
+            self.histogram(name, help, buckets or DEFAULT_BUCKETS).observe(
+                value, **labels
+            )
+        elif kind == "gauge" and op == "set":
+            self.gauge(name, help).set(value, **labels)
+        elif kind == "gauge":
+            self.gauge(name, help).inc(value, **labels)
+        else:
+            self.counter(name, help).inc(value, **labels)
+
+    def _collect(self) -> List[_Metric]:
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                # A failing collector must not take every other metric down
+                logger.error(f"metrics_collector_failed: {e}", exc_info=True)
+        with self._lock:
+            return sorted(self._metrics.values(), key=lambda m: m.name)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns every metric as JSON-friendly data.
+
+        Returns:
+            Dict[str, Any]: name -> {type, help, values}; values map a label
+            string ('k=v,...', '' without labels) to a number, or for
+            histograms to count, sum, mean and bucket-bound p50/p95.
+        """
+        return {
+            metric.name: {
+                "type": metric.type,
+                "help": metric.help,
+                "values": metric.snapshot(),
+            }
+            for metric in self._collect()
+        }
+
+    def to_prometheus(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._collect():
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, key, value in metric.samples():
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry instance
+metrics = MetricsRegistry()
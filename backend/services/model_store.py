@@ -0,0 +1,421 @@
+import json
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from appdirs import user_data_dir
+
+from backend.services.logger import logger
+
+# Files every CTranslate2 Whisper model directory must contain
+REQUIRED_FILES = ["model.bin", "config.json"]
+MANIFEST_NAME = "manifest.json"
+# Weights published on the hub (Systran/faster-whisper-*) are float16
+HUB_COMPUTE_TYPE = "float16"
+# Model sizes and compute types name directories in the store
+ENTRY_NAME_PATTERN = re.compile(r"[\w.-]+")
+
+
+class ModelStore:
+    """
+    Manages CTranslate2 Whisper models stored under the app data directory.
+
+    Models are kept per model size and weight type (models/<size>/<type>),
+    so they load with local_files_only and no hub lookup, and weights
+    quantized ahead of time skip the conversion at load.
+    """
+
+    def __init__(self) -> None:
+        self.root = os.path.join(
+            user_data_dir("UniversalSub", "UniversalSub"), "models"
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _valid_name(name: str) -> bool:
+        return (
+            bool(ENTRY_NAME_PATTERN.fullmatch(name))
+            and not name.startswith(".")
+            and ".." not in name
+        )
+
+    def _entry_dir(self, model_size: str, compute_type: str) -> str:
+        """
+        Returns the store directory of a model.
+
+        Raises:
+            ValueError: If the names are not plain directory names or the
+                directory would resolve outside the store.
+        """
+        for name in (model_size, compute_type):
+            if not self._valid_name(name):
+                raise ValueError(f"Invalid model name: {name!r}")
+        path = os.path.join(self.root, model_size, compute_type)
+        self._check_inside_root(path)
+        return path
+
+    def _check_inside_root(self, path: str) -> None:
+        """Refuses paths that resolve outside the store, e.g. through symlinks."""
+        root = os.path.realpath(self.root)
+        if os.path.commonpath([root, os.path.realpath(path)]) != root:
+            raise ValueError(f"Path is outside the model store: {path}")
+
+    @staticmethod
+    def _is_model_dir(path: str) -> bool:
+        return all(os.path.isfile(os.path.join(path, f)) for f in REQUIRED_FILES)
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for name in filenames:
+                total += os.path.getsize(os.path.join(dirpath, name))
+        return total
+
+    def list_models(self) -> List[Dict[str, Any]]:
+        """
+        Lists installed models.
+
+        Returns:
+            List[Dict[str, Any]]: model_size, compute_type, path, size_bytes,
+            source and installed_at for each installed model.
+        """
+        models: List[Dict[str, Any]] = []
+        if not os.path.isdir(self.root):
+            return models
+
+        for model_size in sorted(os.listdir(self.root)):
+            size_dir = os.path.join(self.root, model_size)
+            if not os.path.isdir(size_dir):
+                continue
+            for compute_type in sorted(os.listdir(size_dir)):
+                path = os.path.join(size_dir, compute_type)
+                if not self._is_model_dir(path):
+                    continue
+                manifest: Dict[str, Any] = {}
+                try:
+                    with open(
+                        os.path.join(path, MANIFEST_NAME), "r", encoding="utf-8"
+                    ) as f:
+                        manifest = json.load(f)
+                except (OSError, ValueError):
+                    pass
+                models.append(
+                    {
+                        "model_size": model_size,
+                        "compute_type": compute_type,
+                        "path": path,
+                        "size_bytes": manifest.get("size_bytes")
+                        or self._dir_size(path),
+                        "source": manifest.get("source", "unknown"),
+                        "installed_at": manifest.get("installed_at"),
+                        "load_seconds": manifest.get("load_seconds"),
+                    }
+                )
+        return models
+
+    def find(self, model_size: str, compute_type: str) -> Optional[str]:
+        """
+        Returns the directory of the best installed match for a model.
+
+        Weights already stored in the requested compute type win; otherwise
+        any installed variant of the size is returned (CTranslate2 converts
+        it at load time).
+
+        Args:
+            model_size (str): Whisper model size, e.g. 'base'.
+            compute_type (str): Compute type the model will be loaded with.
+
+        Returns:
+            Optional[str]: The model directory, or None if not installed.
+        """
+        # Hub repository ids and local paths are never in the store
+        if not (self._valid_name(model_size) and self._valid_name(compute_type)):
+            return None
+        exact = self._entry_dir(model_size, compute_type)
+        if self._is_model_dir(exact):
+            return exact
+        for entry in self.list_models():
+            if entry["model_size"] == model_size:
+                return str(entry["path"])
+        return None
+
+    def resolve(
+        self, model_size: str, compute_type: str, offline: bool = False
+    ) -> Tuple[str, bool]:
+        """
+        Returns what to pass to WhisperModel for a model size.
+
+        Args:
+            model_size (str): Whisper model size, e.g. 'base'.
+            compute_type (str): Compute type the model will be loaded with.
+            offline (bool): Refuse to fall back to the Hugging Face hub.
+
+        Returns:
+            Tuple[str, bool]: The model directory or hub name, and whether it
+            must be loaded with local_files_only.
+
+        Raises:
+            RuntimeError: If offline and the model is not installed.
+        """
+        path = self.find(model_size, compute_type)
+        if path is not None:
+            return path, True
+        if offline:
+            raise RuntimeError(
+                f"Model '{model_size}' is not installed in the local model store."
+            )
+        return model_size, False
+
+    def _install(
+        self, staged_dir: str, model_size: str, compute_type: str, source: str
+    ) -> Dict[str, Any]:
+        """Moves a staged model directory into the store and writes its manifest."""
+        if not self._is_model_dir(staged_dir):
+            raise ValueError(
+                f"Not a CTranslate2 Whisper model (missing {', '.join(REQUIRED_FILES)})."
+            )
+
+        target = self._entry_dir(model_size, compute_type)
+        with self._lock:
+            self._check_inside_root(target)
+            if os.path.exists(target):
+                shutil.rmtree(target)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copytree(staged_dir, target)
+
+            manifest = {
+                "model_size": model_size,
+                "compute_type": compute_type,
+                "source": source,
+                "installed_at": time.time(),
+                "size_bytes": self._dir_size(target),
+            }
+            with open(os.path.join(target, MANIFEST_NAME), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=4)
+
+        logger.info(
+            f"model_installed: {model_size}/{compute_type}, {manifest['size_bytes']} bytes"
+        )
+        return {**manifest, "path": target}
+
+    def download(
+        self,
+        model_size: str,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Downloads a model from the Hugging Face hub into the store.
+
+        Args:
+            model_size (str): Whisper model size, e.g. 'base'.
+            progress_callback (Callable): Receives (progress %, message).
+
+        Returns:
+            Dict[str, Any]: The installed model entry.
+        """
+        from faster_whisper.utils import download_model
+
+        if progress_callback:
+            progress_callback(0, f"Downloading {model_size}...")
+        with tempfile.TemporaryDirectory(prefix="unisub-model-") as tmp:
+            download_model(model_size, output_dir=tmp)
+            if progress_callback:
+                progress_callback(90, "Installing...")
+            entry = self._install(tmp, model_size, HUB_COMPUTE_TYPE, "hub")
+        if progress_callback:
+            progress_callback(100, "Done")
+        return entry
+
+    def quantize(
+        self,
+        model_size: str,
+        compute_type: str,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Converts the original OpenAI checkpoint to CTranslate2 with weights
+        quantized ahead of time, so loading skips the conversion.
+
+        Requires the optional 'transformers' and 'torch' packages and network
+        access; on air-gapped machines import a converted model instead.
+
+        Args:
+            model_size (str): Whisper model size, e.g. 'base'.
+            compute_type (str): Target quantization, e.g. 'int8'.
+            progress_callback (Callable): Receives (progress %, message).
+
+        Returns:
+            Dict[str, Any]: The installed model entry.
+
+        Raises:
+            RuntimeError: If the conversion dependencies are not installed.
+        """
+        try:
+            from ctranslate2.converters import TransformersConverter
+        except ImportError as e:
+            raise RuntimeError(
+                "Pre-quantizing requires the 'transformers' and 'torch' packages. "
+                "Import an already converted model instead."
+            ) from e
+
+        if progress_callback:
+            progress_callback(0, f"Converting {model_size} to {compute_type}...")
+        with tempfile.TemporaryDirectory(prefix="unisub-model-") as tmp:
+            out_dir = os.path.join(tmp, "model")
+            converter = TransformersConverter(
+                f"openai/whisper-{model_size}",
+                copy_files=["tokenizer.json", "preprocessor_config.json"],
+            )
+            try:
+                converter.convert(out_dir, quantization=compute_type)
+            except ImportError as e:
+                raise RuntimeError(
+                    "Pre-quantizing requires the 'transformers' and 'torch' packages."
+                ) from e
+            if progress_callback:
+                progress_callback(90, "Installing...")
+            entry = self._install(out_dir, model_size, compute_type, "converted")
+        if progress_callback:
+            progress_callback(100, "Done")
+        return entry
+
+    def import_model(
+        self, source_path: str, model_size: str, compute_type: str = HUB_COMPUTE_TYPE
+    ) -> Dict[str, Any]:
+        """
+        Imports a CTranslate2 model from a local folder or .zip/.tar(.gz) archive.
+
+        Args:
+            source_path (str): Folder or archive containing the model files,
+                directly or in a single top-level folder.
+            model_size (str): Model size to register it as, e.g. 'base'.
+            compute_type (str): Weight type the model was converted with.
+
+        Returns:
+            Dict[str, Any]: The installed model entry.
+
+        Raises:
+            ValueError: If the source does not contain a model.
+        """
+        if not os.path.exists(source_path):
+            raise ValueError(f"Path not found: {source_path}")
+
+        with tempfile.TemporaryDirectory(prefix="unisub-import-") as tmp:
+            if os.path.isdir(source_path):
+                staged = source_path
+            elif zipfile.is_zipfile(source_path):
+                with zipfile.ZipFile(source_path) as zf:
+                    zf.extractall(tmp)
+                staged = tmp
+            elif tarfile.is_tarfile(source_path):
+                with tarfile.open(source_path) as tf:
+                    if hasattr(tarfile, "data_filter"):
+                        tf.extractall(tmp, filter="data")
+                    else:
+                        # Older Pythons lack extraction filters
+                        tf.extractall(tmp)  # nosec
+                staged = tmp
+            else:
+                raise ValueError("Unsupported archive format (use .zip or .tar.gz).")
+
+            if not self._is_model_dir(staged):
+                # Archives usually wrap the files in one folder
+                subdirs = [
+                    os.path.join(staged, d)
+                    for d in os.listdir(staged)
+                    if os.path.isdir(os.path.join(staged, d))
+                ]
+                if len(subdirs) == 1:
+                    staged = subdirs[0]
+
+            return self._install(staged, model_size, compute_type, "import")
+
+    def remove(self, model_size: str, compute_type: str) -> bool:
+        """
+        Deletes an installed model. Returns False if it was not installed.
+
+        Raises:
+            ValueError: If the names do not identify a directory in the store.
+        """
+        target = self._entry_dir(model_size, compute_type)
+        with self._lock:
+            if not os.path.isdir(target):
+                return False
+            self._check_inside_root(target)
+            shutil.rmtree(target)
+            size_dir = os.path.dirname(target)
+            if not os.listdir(size_dir):
+                os.rmdir(size_dir)
+        logger.info(f"model_removed: {model_size}/{compute_type}")
+        return True
+
+    def benchmark_load(
+        self,
+        model_size: str,
+        compute_type: str,
+        device: str = "cpu",
+        load_as: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Measures how long an installed model takes to load from the store.
+
+        The result is also recorded in the model's manifest.
+
+        Args:
+            model_size (str): Installed model size.
+            compute_type (str): Installed weight type.
+            device (str): Device to load on.
+            load_as (Optional[str]): Compute type to load with (defaults to
+                the stored type, i.e. no conversion).
+
+        Returns:
+            Dict[str, Any]: load_seconds plus the model identification.
+        """
+        from faster_whisper import WhisperModel
+
+        path = self._entry_dir(model_size, compute_type)
+        if not self._is_model_dir(path):
+            raise ValueError(f"Model {model_size}/{compute_type} is not installed.")
+
+        start = time.perf_counter()
+        model = WhisperModel(
+            path,
+            device=device,
+            compute_type=load_as or compute_type,
+            local_files_only=True,
+        )
+        load_seconds = round(time.perf_counter() - start, 3)
+        del model
+
+        manifest_path = os.path.join(path, MANIFEST_NAME)
+        try:
+            with self._lock:
+                manifest: Dict[str, Any] = {}
+                if os.path.exists(manifest_path):
+                    with open(manifest_path, "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                manifest["load_seconds"] = load_seconds
+                with open(manifest_path, "w", encoding="utf-8") as f:
+                    json.dump(manifest, f, indent=4)
+        except (OSError, ValueError) as e:
+            logger.warning(f"model_manifest_update_failed: {e}")
+
+        logger.info(
+            f"model_load_benchmarked: {model_size}/{compute_type}, {load_seconds}s"
+        )
+        return {
+            "model_size": model_size,
+            "compute_type": compute_type,
+            "device": device,
+            "load_seconds": load_seconds,
+        }
+
+
+model_store = ModelStore()
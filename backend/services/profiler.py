@@ -0,0 +1,397 @@
+import contextlib
+import contextvars
+import json
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional
+
+from appdirs import user_log_dir
+
+from backend.services.config_mgr import config_mgr
+from backend.services.logger import logger
+
+# Deepest stack kept per sample
+MAX_STACK_DEPTH = 64
+# Functions listed per thread in the text report
+TOP_FUNCTIONS = 8
+
+# Profiler of the job running on this thread (see use_profiler)
+_active: contextvars.ContextVar[Optional["JobProfiler"]] = contextvars.ContextVar(
+    "active_profiler", default=None
+)
+
+# Stack samples cover every thread and tracemalloc is process-wide, so
+# only one job per process is profiled at a time
+_running_lock = threading.Lock()
+_running: Optional["JobProfiler"] = None
+
+
+def profiles_dir() -> str:
+    """Returns the folder holding the profile reports."""
+    return os.path.join(user_log_dir("UniversalSub", "UniversalSub"), "profiles")
+
+
+def profiling_enabled(requested: Optional[bool] = None) -> bool:
+    """A job's own request wins over profiling.enabled."""
+    if requested is not None:
+        return bool(requested)
+    return config_mgr.config.profiling.enabled
+
+
+def active_profiler() -> Optional["JobProfiler"]:
+    """Returns the profiler of the job running on this thread, if any."""
+    return _active.get()
+
+
+@contextlib.contextmanager
+def use_profiler(profiler: Optional["JobProfiler"]) -> Iterator[None]:
+    """Makes profiler the active one for code run inside the block."""
+    token = _active.set(profiler)
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+def span(name: str) -> Any:
+    """
+    Times a block as a stage of the active job's profile; a no-op (and
+    nearly free) when the job is not profiled.
+
+    Args:
+        name (str): Stage name, e.g. 'decode_audio' or 'llm_request'.
+
+    Returns:
+        ContextManager: Use as 'with span(name):'.
+    """
+    profiler = _active.get()
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.span(name)
+
+
+class StackSampler:
+    """
+    Samples the Python stack of every thread at a fixed interval.
+
+    Time spent in native code (PyAV decoding, CTranslate2, socket reads)
+    is attributed to the Python function that called into it. Threads not
+    working for the job (the UI, unprofiled jobs) are sampled as well and
+    show up under their own thread names.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = max(interval, 0.001)
+        self.samples: "Counter[str]" = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack: List[str] = []
+                current: Any = frame
+                while current is not None and len(stack) < MAX_STACK_DEPTH:
+                    code = current.f_code
+                    stack.append(
+                        f"{code.co_name} "
+                        f"({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                    )
+                    current = current.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.samples[";".join(reversed(stack))] += 1
+
+
+class JobProfiler:
+    """
+    Profiles one job: CPU stack samples, wall-clock stage spans and
+    (optionally) tracemalloc peak and top allocation sites.
+
+    Profiles of the same job recorded in another process (the isolated
+    Whisper worker) are added with merge(); write_report() puts everything
+    in one folder under profiles_dir().
+
+    CPU samples and the memory peak are process-wide, so only one job per
+    process is profiled at a time (see start_profiler).
+    """
+
+    def __init__(self, label: str) -> None:
+        options = config_mgr.config.profiling
+        self.label = label
+        self.trace_memory = options.trace_memory
+        self.top_allocations = options.top_allocations
+        self._sampler = StackSampler(options.sample_interval)
+        self._spans: List[Dict[str, Any]] = []
+        self._remote: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._started = 0.0
+        self._started_at = 0.0
+        self._started_tracing = False
+        self.data: Optional[Dict[str, Any]] = None
+        self.report_path: Optional[str] = None
+
+    def start(self) -> "JobProfiler":
+        """
+        Starts sampling and tracing.
+
+        Raises:
+            RuntimeError: If another job of this process is being profiled.
+        """
+        global _running
+        with _running_lock:
+            if _running is not None:
+                raise RuntimeError(f"{_running.label} is already being profiled")
+            _running = self
+        self._started = time.perf_counter()
+        self._started_at = time.time()
+        if self.trace_memory:
+            # Left running if something else started it (PYTHONTRACEMALLOC)
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        self._sampler.start()
+        logger.info(f"profiling_started: {self.label}")
+        return self
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        Stops sampling and tracing.
+
+        Returns:
+            Dict[str, Any]: The profile (JSON-serialisable, see merge()).
+        """
+        global _running
+        wall = time.perf_counter() - self._started
+        self._sampler.stop()
+        memory = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            memory = self._memory_stats()
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        with _running_lock:
+            if _running is self:
+                _running = None
+        with self._lock:
+            self.data = {
+                "label": self.label,
+                "started_at": self._started_at,
+                "wall_seconds": round(wall, 3),
+                "sample_interval": self._sampler.interval,
+                "samples": dict(self._sampler.samples),
+                "spans": list(self._spans),
+                "memory": memory,
+                "remote": list(self._remote),
+            }
+        return self.data
+
+    def _memory_stats(self) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ]
+        )
+        top = [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[: self.top_allocations]
+        ]
+        return {"current_bytes": current, "peak_bytes": peak, "top": top}
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Records the wall time of the block as a stage span."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            with self._lock:
+                self._spans.append(
+                    {
+                        "name": name,
+                        "thread": threading.current_thread().name,
+                        "start": round(started - self._started, 4),
+                        "seconds": round(ended - started, 4),
+                    }
+                )
+
+    def merge(self, data: Dict[str, Any], source: str) -> None:
+        """
+        Adds a profile of the same job recorded elsewhere.
+
+        Args:
+            data (Dict[str, Any]): What the other profiler's stop() returned.
+            source (str): Where it ran, e.g. 'whisper-worker'.
+        """
+        with self._lock:
+            self._remote.append({**data, "source": source})
+
+    def write_report(self, directory: Optional[str] = None) -> str:
+        """
+        Writes the report folder: report.json (everything), report.txt (a
+        summary) and cpu.folded (collapsed stacks for flame graph tools).
+
+        Args:
+            directory (Optional[str]): Parent folder (default: profiles_dir()).
+
+        Returns:
+            str: The report folder.
+        """
+        data = self.data if self.data is not None else self.stop()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self._started_at))
+        name = re.sub(r"[^\w.-]+", "_", self.label)[:80]
+        path = os.path.join(directory or profiles_dir(), f"{stamp}-{name}")
+        os.makedirs(path, exist_ok=True)
+
+        folded: "Counter[str]" = Counter(data["samples"])
+        for remote in data["remote"]:
+            for stack, count in remote["samples"].items():
+                folded[f"{remote['source']};{stack}"] += count
+
+        with open(os.path.join(path, "report.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(os.path.join(path, "cpu.folded"), "w", encoding="utf-8") as f:
+            for stack, count in folded.most_common():
+                f.write(f"{stack} {count}\n")
+        with open(os.path.join(path, "report.txt"), "w", encoding="utf-8") as f:
+            f.write(_summary(data))
+        logger.info(f"profile_written: {path}")
+        return path
+
+
+def start_profiler(label: str) -> Optional[JobProfiler]:
+    """
+    Starts profiling a job unless another job of this process is being
+    profiled; that job's report would otherwise mix in this one's samples
+    and memory peak.
+
+    Args:
+        label (str): Names the report folder.
+
+    Returns:
+        Optional[JobProfiler]: The running profiler, or None if refused.
+    """
+    try:
+        return JobProfiler(label).start()
+    except RuntimeError as e:
+        logger.warning(f"profiling_skipped: {label}, {e}")
+        return None
+
+
+def _top_functions(samples: Dict[str, int]) -> List[str]:
+    """
+    Formats, per thread, the functions with the most samples (self and
+    inclusive, as a share of that thread's samples). Idle threads show up
+    as time in their wait call.
+    """
+    threads: Dict[str, "Counter[str]"] = {}
+    for stack, count in samples.items():
+        thread, _, rest = stack.partition(";")
+        threads.setdefault(thread, Counter())[rest] += count
+    if not threads:
+        return ["  (no samples)"]
+    lines = []
+    for thread, stacks in sorted(threads.items(), key=lambda t: -sum(t[1].values())):
+        total = sum(stacks.values())
+        own: "Counter[str]" = Counter()
+        inclusive: "Counter[str]" = Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+        lines.append(f"  [{thread}] {total} samples")
+        for frame, count in own.most_common(TOP_FUNCTIONS):
+            lines.append(
+                f"    {100 * count / total:5.1f}% {100 * inclusive[frame] / total:5.1f}%"
+                f"  {frame}"
+            )
+    return lines
+
+
+def _summary(data: Dict[str, Any]) -> str:
+    """Renders a profile as plain text."""
+    lines = [f"Profile: {data['label']}", f"Wall time: {data['wall_seconds']:.2f}s", ""]
+    for section in [data, *data["remote"]]:
+        source = section.get("source", "main process")
+        lines.append(f"== {source} ==")
+        lines.append("Stage spans (start, seconds):")
+        spans = sorted(section["spans"], key=lambda s: s["start"])
+        for entry in spans or [{"name": "(none)", "start": 0, "seconds": 0}]:
+            lines.append(
+                f"  {entry['start']:9.3f} {entry['seconds']:9.3f}  {entry['name']}"
+            )
+        lines.append(
+            f"CPU samples every {section['sample_interval'] * 1000:.0f} ms "
+            f"(self %, total %):"
+        )
+        lines.extend(_top_functions(section["samples"]))
+        memory = section.get("memory")
+        if memory:
+            lines.append(
+                f"Memory: peak {memory['peak_bytes'] / 2**20:.1f} MiB, "
+                f"at end {memory['current_bytes'] / 2**20:.1f} MiB; top allocations:"
+            )
+            for stat in memory["top"]:
+                lines.append(
+                    f"  {stat['size_bytes'] / 2**10:10.1f} KiB {stat['count']:7d}"
+                    f"  {stat['location']}"
+                )
+        lines.append("")
+    return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def profiling(label: str, enabled: bool = True) -> Iterator[Optional[JobProfiler]]:
+    """
+    Profiles the block as one job and writes its report at the end.
+
+    Args:
+        label (str): Names the report folder (e.g. media file and task id).
+        enabled (bool): False makes this a no-op that yields None.
+
+    Yields:
+        Optional[JobProfiler]: The active profiler, or None if disabled or
+        another job is being profiled (see start_profiler); its
+        'report_path' attribute is set once the report is written.
+    """
+    profiler = start_profiler(label) if enabled else None
+    if profiler is None:
+        yield None
+        return
+    try:
+        with use_profiler(profiler):
+            yield profiler
+    finally:
+        profiler.stop()
+        try:
+            profiler.report_path = profiler.write_report()
+        except OSError as e:
+            logger.error(f"profile_write_failed: {e}")
@@ -0,0 +1,215 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from appdirs import user_data_dir
+
+from backend.services.logger import logger
+
+# Weight of the newest run in the persisted rate of a stage
+HISTORY_WEIGHT = 0.3
+# Share of a stage the prior rate counts for against live measurements
+PRIOR_SHARE = 0.1
+# Weight of each new estimate in the displayed ETA
+ETA_SMOOTHING = 0.3
+# Shorter runs are too noisy to remember
+MIN_RECORD_SECONDS = 2.0
+
+
+class ThroughputHistory:
+    """
+    Remembers how fast each kind of work ran before, as seconds per unit
+    (per media second for transcription, per line for translation), so
+    the next job of the same kind starts with a realistic ETA.
+
+    Keys name the work and what it ran on, e.g. 'transcribe:small:cuda'.
+    Rates are a moving average over runs, persisted per machine.
+    """
+
+    def __init__(self) -> None:
+        data_dir = user_data_dir("UniversalSub", "UniversalSub")
+        self.path = os.path.join(data_dir, "throughput.json")
+        self._lock = threading.Lock()
+        self._rates: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        if self._rates is None:
+            self._rates = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._rates = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"throughput_history_unreadable: {e}")
+        return self._rates
+
+    def get(self, key: str) -> Optional[float]:
+        """
+        Returns the remembered rate of a kind of work.
+
+        Args:
+            key (str): Kind of work, e.g. 'transcribe:small:cuda'.
+
+        Returns:
+            Optional[float]: Seconds per unit, or None if it never ran.
+        """
+        with self._lock:
+            entry = self._load().get(key)
+        return float(entry["rate"]) if entry else None
+
+    def record(self, key: str, seconds: float, units: float) -> None:
+        """
+        Folds a finished run into the rate of its kind of work.
+
+        Args:
+            key (str): Kind of work.
+            seconds (float): Wall time of the run.
+            units (float): Work done in it (media seconds, lines).
+        """
+        if units <= 0 or seconds < MIN_RECORD_SECONDS:
+            return
+        rate = seconds / units
+        with self._lock:
+            rates = self._load()
+            entry = rates.get(key)
+            if entry:
+                rate = entry["rate"] + HISTORY_WEIGHT * (rate - entry["rate"])
+            rates[key] = {
+                "rate": round(rate, 6),
+                "runs": (entry["runs"] if entry else 0) + 1,
+                "updated_at": time.time(),
+            }
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(rates, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"throughput_history_not_saved: {e}")
+                return
+        logger.info(f"throughput_recorded: {key}, {rate:.4f}s/unit")
+
+
+class StageProgress:
+    """
+    Progress and ETA of one stage of a job, from the work actually done.
+
+    The caller reports (done, total) in the stage's own units. The clock
+    starts at the first report, so model loading and other setup do not
+    skew the rate. The rate starts from the stage's history and moves
+    toward the rate measured in this run as work gets done. The ETA
+    derived from it is smoothed, so one slow batch does not make it jump.
+    """
+
+    def __init__(self, key: str, fallback_rate: Optional[float] = None) -> None:
+        """
+        Args:
+            key (str): Kind of work (see ThroughputHistory).
+            fallback_rate (Optional[float]): Seconds per unit to assume when
+                the history has none, e.g. a calibration result.
+        """
+        self.key = key
+        self.prior = throughput_history.get(key)
+        if self.prior is None:
+            self.prior = fallback_rate
+        self.done = 0.0
+        self.total = 0.0
+        self._baseline: Optional[float] = None
+        self._started = 0.0
+        self._eta: Optional[float] = None
+        self._eta_at = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, done: float, total: float) -> None:
+        """
+        Reports the work done so far.
+
+        Args:
+            done (float): Units done, including any done before a resume.
+            total (float): Units in the whole stage.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._baseline is None:
+                # Work restored from a checkpoint is not part of this run's rate
+                self._baseline = done
+                self._started = now
+            self.done, self.total = done, total
+            raw = self._estimate(now)
+            if raw is None or self._eta is None or done >= total:
+                self._eta = raw
+            else:
+                # Count down since the last estimate, then move toward the new one
+                previous = max(self._eta - (now - self._eta_at), 0.0)
+                self._eta = previous + ETA_SMOOTHING * (raw - previous)
+            self._eta_at = now
+
+    def _estimate(self, now: float) -> Optional[float]:
+        """Seconds left at the current rate, or None without any rate yet."""
+        remaining = max(self.total - self.done, 0.0)
+        measured = self.done - (self._baseline or 0.0)
+        elapsed = now - self._started
+        if self.prior is not None:
+            weight = PRIOR_SHARE * self.total
+            if weight + measured <= 0:
+                return remaining * self.prior
+            rate = (self.prior * weight + elapsed) / (weight + measured)
+        elif measured > 0:
+            rate = elapsed / measured
+        else:
+            return None
+        return remaining * rate
+
+    @property
+    def fraction(self) -> float:
+        """Share of the stage done, from 0 to 1."""
+        if self.total <= 0:
+            return 0.0
+        return min(max(self.done / self.total, 0.0), 1.0)
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Seconds until the stage is done, or None if not known yet."""
+        with self._lock:
+            if self._eta is None:
+                return None
+            return round(max(self._eta - (time.monotonic() - self._eta_at), 0.0), 1)
+
+    def status(self, start: float = 0.0, span: float = 100.0) -> Dict[str, Any]:
+        """
+        Returns the fields of a status event for this stage.
+
+        Args:
+            start (float): Overall progress when the stage begins.
+            span (float): Overall progress the stage accounts for.
+
+        Returns:
+            Dict[str, Any]: progress (overall %), stage_progress (% of this
+            stage) and eta (seconds left in this stage, or None).
+        """
+        fraction = self.fraction
+        return {
+            "progress": int(start + fraction * span),
+            "stage_progress": round(100.0 * fraction, 1),
+            "eta": self.eta,
+        }
+
+    def finish(self) -> None:
+        """
+        Records this run's rate once the stage completed. The whole stage
+        counts as done: the last segment usually ends before the audio does.
+        """
+        with self._lock:
+            if self._baseline is None:
+                return
+            self.done = self.total
+            seconds = time.monotonic() - self._started
+            units = self.total - self._baseline
+        throughput_history.record(self.key, seconds, units)
+
+
+# Global throughput history instance
+throughput_history = ThroughputHistory()
@@ -0,0 +1,373 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.services.config_mgr import config_mgr
+from backend.services.hardware_mgr import hardware_mgr
+from backend.services.logger import logger
+from backend.services.metrics import metrics
+
+MB = 1024 * 1024
+
+# Approximate parameter counts (millions) of the Whisper model sizes
+MODEL_PARAMS: Dict[str, int] = {
+    "tiny": 39,
+    "tiny.en": 39,
+    "base": 74,
+    "base.en": 74,
+    "small": 244,
+    "small.en": 244,
+    "distil-small.en": 166,
+    "medium": 769,
+    "medium.en": 769,
+    "distil-medium.en": 394,
+    "large": 1550,
+    "large-v1": 1550,
+    "large-v2": 1550,
+    "large-v3": 1550,
+    "distil-large-v2": 756,
+    "distil-large-v3": 756,
+    "large-v3-turbo": 809,
+    "turbo": 809,
+}
+# Next smaller size to try when a model does not fit the memory budget
+SMALLER_MODEL: Dict[str, str] = {
+    "large": "medium",
+    "large-v1": "medium",
+    "large-v2": "medium",
+    "large-v3": "medium",
+    "large-v3-turbo": "small",
+    "turbo": "small",
+    "distil-large-v2": "small",
+    "distil-large-v3": "small",
+    "medium": "small",
+    "small": "base",
+    "base": "tiny",
+    "medium.en": "small.en",
+    "distil-medium.en": "small.en",
+    "small.en": "base.en",
+    "distil-small.en": "base.en",
+    "base.en": "tiny.en",
+}
+# Bytes per weight of each compute type
+WEIGHT_BYTES: Dict[str, int] = {
+    "float32": 4,
+    "float16": 2,
+    "bfloat16": 2,
+    "int8_float32": 1,
+    "int8_float16": 1,
+    "int8_bfloat16": 1,
+    "int8": 1,
+    "int16": 2,
+}
+# Compute type with the smallest weights on CPU
+SMALLEST_COMPUTE_TYPE = "int8"
+# Decoder caches, buffers and the CTranslate2 runtime on top of the weights
+RUNTIME_OVERHEAD_MB = 300
+# Threads CTranslate2 uses when cpu_threads is 0
+DEFAULT_CPU_THREADS = 4
+
+# (niceness on POSIX, priority class on Windows)
+PRIORITIES: Dict[str, Tuple[int, int]] = {
+    "normal": (0, 0x00000020),
+    "below_normal": (10, 0x00004000),
+    "idle": (19, 0x00000040),
+}
+
+# Seconds between memory checks while transcribing, and while paused
+PRESSURE_CHECK_INTERVAL = 1.0
+PRESSURE_POLL_INTERVAL = 2.0
+
+
+class ResourceGovernor:
+    """
+    Keeps transcription within the limits of app.resources: a cap on CPU
+    threads, a lower scheduling priority, a memory budget checked before
+    a model is loaded (loading a smaller model or compute type if it would
+    not fit) and pauses while the machine is short of memory.
+
+    A pause holds the loaded model and the job's slot, so it ends after
+    resources.max_pause_seconds even if memory is still short; the
+    governor then does not pause again until memory has recovered.
+
+    Every intervention is logged as 'resource_governor_<kind>' and counted
+    in unisub_governor_decisions_total.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._windows_priority: Optional[str] = None
+        self._next_check = 0.0
+        # Set when a pause ran out while memory was still short
+        self._gave_up = False
+
+    def _decision(self, kind: str, message: str) -> None:
+        logger.info(f"resource_governor_{kind}: {message}")
+        metrics.counter(
+            "unisub_governor_decisions_total", "Resource governor interventions"
+        ).inc(kind=kind)
+
+    def apply_priority(self) -> None:
+        """
+        Lowers the priority of transcription to resources.process_priority.
+
+        On Windows this sets the process priority class. On POSIX it sets
+        the niceness of the calling thread (on Linux) or process, which
+        threads started from it, such as CTranslate2's, inherit. Without
+        privileges the niceness can only go up, so going back to 'normal'
+        takes a restart of the process.
+        """
+        name = config_mgr.config.app.resources.process_priority
+        if name not in PRIORITIES:
+            logger.warning(f"unknown_process_priority: {name}")
+            return
+        niceness, priority_class = PRIORITIES[name]
+        try:
+            if os.name == "nt":
+                import ctypes
+
+                with self._lock:
+                    if self._windows_priority == name:
+                        return
+                    kernel32 = ctypes.windll.kernel32  # type: ignore
+                    kernel32.SetPriorityClass(
+                        kernel32.GetCurrentProcess(), priority_class
+                    )
+                    self._windows_priority = name
+                self._decision("priority", f"process priority class {name}")
+                return
+
+            current = os.getpriority(os.PRIO_PROCESS, 0)
+            if current == niceness:
+                return
+            if current > niceness:
+                logger.debug(
+                    f"process_priority_kept: niceness {current}, {name} needs privileges"
+                )
+                return
+            os.setpriority(os.PRIO_PROCESS, 0, niceness)
+            self._decision("priority", f"niceness {current} -> {niceness} ({name})")
+        except (OSError, AttributeError) as e:
+            logger.warning(f"process_priority_failed: {e}")
+
+    def cap_threads(self, cpu_threads: int, num_workers: int) -> int:
+        """
+        Applies resources.max_cpu_threads to a model's thread settings.
+
+        Args:
+            cpu_threads (int): Threads per CTranslate2 worker (0 = default).
+            num_workers (int): CTranslate2 workers of the model.
+
+        Returns:
+            int: Threads per worker, so that all workers together stay within
+            the cap (at least one each).
+        """
+        cap = config_mgr.config.app.resources.max_cpu_threads
+        if cap <= 0:
+            return cpu_threads
+        per_worker = max(1, cap // max(num_workers, 1))
+        current = cpu_threads or DEFAULT_CPU_THREADS
+        if current <= per_worker:
+            return cpu_threads
+        self._decision(
+            "thread_cap",
+            f"{current} -> {per_worker} threads x {num_workers} workers (max {cap})",
+        )
+        return per_worker
+
+    def estimate_model_bytes(self, model_size: str, compute_type: str) -> Optional[int]:
+        """
+        Estimates the memory a loaded model takes.
+
+        Returns:
+            Optional[int]: Bytes, or None for unknown sizes or compute types.
+        """
+        params = MODEL_PARAMS.get(model_size)
+        weight_bytes = WEIGHT_BYTES.get(compute_type)
+        if params is None or weight_bytes is None:
+            return None
+        return params * 1_000_000 * weight_bytes + RUNTIME_OVERHEAD_MB * MB
+
+    def memory_budget(self) -> Optional[int]:
+        """
+        Returns the memory a model about to be loaded may take: what is
+        available minus resources.min_free_memory_mb, and at most
+        resources.max_memory_mb when set.
+
+        Returns:
+            Optional[int]: Bytes, or None if there is no limit to apply.
+        """
+        limits = config_mgr.config.app.resources
+        budget = None
+        info = hardware_mgr.get_memory_info()
+        if info is not None:
+            budget = max(info["available"] - limits.min_free_memory_mb * MB, 0)
+        if limits.max_memory_mb > 0:
+            ceiling = limits.max_memory_mb * MB
+            budget = ceiling if budget is None else min(budget, ceiling)
+        return budget
+
+    def _candidates(self, model_size: str, compute_type: str) -> List[Tuple[str, str]]:
+        """Smaller set-ups in order of preference: compute type first, then size."""
+        candidates = []
+        size: Optional[str] = model_size
+        while size is not None:
+            for ct in dict.fromkeys([compute_type, SMALLEST_COMPUTE_TYPE]):
+                if (size, ct) != (model_size, compute_type):
+                    candidates.append((size, ct))
+            size = SMALLER_MODEL.get(size)
+        return candidates
+
+    def plan_model(
+        self,
+        model_size: str,
+        compute_type: str,
+        device: str,
+        loadable: Callable[[str, str], bool],
+    ) -> Tuple[str, str]:
+        """
+        Checks a model against the memory budget before it is loaded.
+
+        Args:
+            model_size (str): Requested model size.
+            compute_type (str): Requested compute type.
+            device (str): Resolved device; only 'cpu' models are checked,
+                GPU memory is left to the CUDA fallback.
+            loadable (Callable[[str, str], bool]): Whether a (size, compute
+                type) can be loaded, e.g. is in the model store when offline.
+
+        Returns:
+            Tuple[str, str]: The model size and compute type to load. With
+            resources.auto_downgrade, the first smaller one that fits, or the
+            smallest loadable one if none does.
+        """
+        if device != "cpu":
+            return model_size, compute_type
+        budget = self.memory_budget()
+        needed = self.estimate_model_bytes(model_size, compute_type)
+        if budget is None or needed is None:
+            logger.info(
+                f"resource_governor_memory_unchecked: {model_size}/{compute_type}"
+            )
+            return model_size, compute_type
+        if needed <= budget:
+            logger.info(
+                f"resource_governor_model_fits: {model_size}/{compute_type}, "
+                f"~{needed // MB} MB of {budget // MB} MB"
+            )
+            return model_size, compute_type
+
+        requested = f"{model_size}/{compute_type} needs ~{needed // MB} MB"
+        if not config_mgr.config.app.resources.auto_downgrade:
+            self._decision(
+                "over_budget", f"{requested}, budget {budget // MB} MB; loading anyway"
+            )
+            return model_size, compute_type
+
+        smallest = None
+        for size, ct in self._candidates(model_size, compute_type):
+            if not loadable(size, ct):
+                continue
+            smallest = (size, ct)
+            candidate = self.estimate_model_bytes(size, ct)
+            if candidate is not None and candidate <= budget:
+                self._decision(
+                    "downgrade",
+                    f"{requested}, budget {budget // MB} MB; loading {size}/{ct} "
+                    f"(~{candidate // MB} MB)",
+                )
+                return size, ct
+        if smallest is None:
+            self._decision(
+                "over_budget",
+                f"{requested}, budget {budget // MB} MB; nothing smaller to load",
+            )
+            return model_size, compute_type
+        self._decision(
+            "over_budget",
+            f"{requested}, budget {budget // MB} MB; nothing fits, loading "
+            f"{smallest[0]}/{smallest[1]}",
+        )
+        return smallest
+
+    def _free_memory_if_low(self) -> Optional[int]:
+        """Returns the available bytes if below the pressure threshold."""
+        limits = config_mgr.config.app.resources
+        if not limits.pause_under_pressure:
+            return None
+        info = hardware_mgr.get_memory_info()
+        if info is None or info["available"] >= limits.pressure_free_memory_mb * MB:
+            self._gave_up = False
+            return None
+        return info["available"]
+
+    def wait_for_headroom(
+        self,
+        cancel_event: Optional[threading.Event] = None,
+        status_callback: Optional[Callable[[str, str], None]] = None,
+    ) -> bool:
+        """
+        Pauses while free memory is below resources.pressure_free_memory_mb,
+        for at most resources.max_pause_seconds.
+
+        Args:
+            cancel_event (Optional[threading.Event]): Ends the wait when set.
+            status_callback (Callable): Receives (message, stage) on pause
+                and resume.
+
+        Returns:
+            bool: False if cancelled while paused.
+        """
+        available = self._free_memory_if_low()
+        if available is None or self._gave_up:
+            return True
+        limits = config_mgr.config.app.resources
+        self._decision(
+            "pause",
+            f"{available // MB} MB free, below {limits.pressure_free_memory_mb} MB; "
+            "waiting",
+        )
+        if status_callback:
+            status_callback(
+                f"Paused: low memory ({available // MB} MB free)...", "paused"
+            )
+        started = time.monotonic()
+        while available is not None:
+            if cancel_event is None:
+                time.sleep(PRESSURE_POLL_INTERVAL)
+            elif cancel_event.wait(PRESSURE_POLL_INTERVAL):
+                return False
+            available = self._free_memory_if_low()
+            waited = time.monotonic() - started
+            if available is not None and 0 < limits.max_pause_seconds <= waited:
+                self._gave_up = True
+                self._decision(
+                    "pause_timeout",
+                    f"{available // MB} MB free after {waited:.0f}s; continuing",
+                )
+                break
+        else:
+            self._decision("resume", f"after {time.monotonic() - started:.0f}s")
+        if status_callback:
+            status_callback("Resuming transcription...", "transcribing")
+        return True
+
+    def check_pressure(
+        self,
+        cancel_event: Optional[threading.Event] = None,
+        status_callback: Optional[Callable[[str, str], None]] = None,
+    ) -> bool:
+        """
+        Like wait_for_headroom, but only looks at memory once per
+        PRESSURE_CHECK_INTERVAL, so it can be called for every segment.
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return True
+        self._next_check = now + PRESSURE_CHECK_INTERVAL
+        return self.wait_for_headroom(cancel_event, status_callback)
+
+
+# Global resource governor instance
+resource_governor = ResourceGovernor()
@@ -0,0 +1,410 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from backend.services.logger import logger
+
+TASK_KINDS = ("transcribe", "translate", "merge")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    target_lang TEXT NOT NULL,
+    options TEXT NOT NULL,
+    audio_stream INTEGER NOT NULL DEFAULT 0,
+    output_dir TEXT,
+    status TEXT NOT NULL,
+    message TEXT,
+    srt_path TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks (status, lease_until);
+CREATE INDEX IF NOT EXISTS tasks_by_job ON tasks (job_id, kind);
+"""
+
+# (kind, payload) of a task to create
+NewTask = Tuple[str, Dict[str, Any]]
+# Called inside the completing transaction when the last task of a kind is
+# done: (job, kind, results in seq order) -> follow-up tasks. Raising
+# ValueError fails the job with that message.
+StageDone = Callable[[Dict[str, Any], str, List[Any]], List[NewTask]]
+
+
+class LeaseQueue:
+    """
+    Durable task queue shared by worker processes through one SQLite file.
+
+    Workers lease a task for a limited time and keep the lease alive with
+    heartbeats. A task whose lease expires (its worker died or hung) is
+    leased again by another worker, up to max_attempts times, after which
+    the task and its job fail. Every state change runs in an immediate
+    transaction, so any number of processes can use the same file.
+
+    SQLite relies on file locks: the file must be on a local disk or on a
+    network filesystem with working POSIX locking.
+    """
+
+    def __init__(self, db_path: str, max_attempts: int = 3) -> None:
+        self.db_path = os.path.abspath(db_path)
+        self.max_attempts = max_attempts
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self)
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["options"] = json.loads(job["options"] or "{}")
+        return job
+
+    @staticmethod
+    def _row_to_task(row: sqlite3.Row) -> Dict[str, Any]:
+        task = dict(row)
+        task["payload"] = json.loads(task["payload"])
+        task["result"] = json.loads(task["result"]) if task["result"] else None
+        return task
+
+    def _insert_tasks(
+        self, db: sqlite3.Connection, job_id: str, tasks: Sequence[NewTask]
+    ) -> None:
+        now = time.time()
+        for seq, (kind, payload) in enumerate(tasks):
+            if kind not in TASK_KINDS:
+                raise ValueError(f"unknown task kind: {kind}")
+            db.execute(
+                "INSERT INTO tasks (job_id, kind, seq, payload, status, updated_at) "
+                "VALUES (?, ?, ?, ?, 'pending', ?)",
+                (job_id, kind, seq, json.dumps(payload, ensure_ascii=False), now),
+            )
+
+    def submit(
+        self,
+        path: str,
+        target_lang: str,
+        tasks: Sequence[NewTask],
+        options: Optional[Dict[str, Any]] = None,
+        audio_stream: int = 0,
+        output_dir: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Creates a job with its first tasks.
+
+        Args:
+            path (str): Media path, as seen by every worker.
+            target_lang (str): Translation target language.
+            tasks (Sequence[NewTask]): The job's initial tasks.
+            options (Optional[Dict[str, Any]]): Per-job decoding overrides.
+            audio_stream (int): Audio track to transcribe.
+            output_dir (Optional[str]): Folder for the SRT (None = next to media).
+
+        Returns:
+            Dict[str, Any]: The created job.
+        """
+        job_id = uuid.uuid4().hex[:12]
+        with self._transaction() as db:
+            db.execute(
+                "INSERT INTO jobs (id, path, target_lang, options, audio_stream, "
+                "output_dir, status, created_at) VALUES (?, ?, ?, ?, ?, ?, 'queued', ?)",
+                (
+                    job_id,
+                    path,
+                    target_lang,
+                    json.dumps(options or {}),
+                    audio_stream,
+                    output_dir,
+                    time.time(),
+                ),
+            )
+            self._insert_tasks(db, job_id, tasks)
+        logger.info(f"dist_job_submitted: {job_id}, {path}, tasks={len(tasks)}")
+        job = self.get_job(job_id)
+        assert job is not None
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Returns one job, or None."""
+        with self._lock:
+            row = (
+                self._db()
+                .execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+                .fetchone()
+            )
+        return self._row_to_job(row) if row else None
+
+    def progress(self, job_id: str) -> Dict[str, Dict[str, int]]:
+        """Returns task counts per kind and status for a job."""
+        with self._lock:
+            rows = (
+                self._db()
+                .execute(
+                    "SELECT kind, status, COUNT(*) AS n FROM tasks "
+                    "WHERE job_id = ? GROUP BY kind, status",
+                    (job_id,),
+                )
+                .fetchall()
+            )
+        counts: Dict[str, Dict[str, int]] = {}
+        for row in rows:
+            counts.setdefault(row["kind"], {})[row["status"]] = row["n"]
+        return counts
+
+    def claim(
+        self, worker: str, lease_seconds: float, kinds: Sequence[str] = TASK_KINDS
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Leases the next task: pending ones, or those whose lease expired.
+        Later stages go first so started jobs finish before new ones begin.
+
+        Args:
+            worker (str): Worker id holding the lease.
+            lease_seconds (float): Lease length; renew with heartbeat().
+            kinds (Sequence[str]): Task kinds this worker runs.
+
+        Returns:
+            Optional[Dict[str, Any]]: The task with its job under 'job', or None.
+        """
+        now = time.time()
+        marks = ", ".join("?" for _ in kinds)
+        with self._transaction() as db:
+            self._expire(db, now)
+            row = db.execute(
+                "SELECT tasks.* FROM tasks JOIN jobs ON jobs.id = tasks.job_id "
+                f"WHERE tasks.kind IN ({marks}) AND jobs.status IN "
+                "('queued', 'running') AND (tasks.status = 'pending' OR "
+                "(tasks.status = 'leased' AND tasks.lease_until < ?)) "
+                "ORDER BY CASE tasks.kind WHEN 'merge' THEN 0 "
+                "WHEN 'translate' THEN 1 ELSE 2 END, jobs.created_at, tasks.seq "
+                "LIMIT 1",
+                (*kinds, now),
+            ).fetchone()
+            if row is None:
+                return None
+            if row["status"] == "leased":
+                logger.warning(
+                    f"dist_lease_expired: task={row['id']}, worker={row['worker']}"
+                )
+            db.execute(
+                "UPDATE tasks SET status = 'leased', attempts = attempts + 1, "
+                "worker = ?, lease_until = ?, updated_at = ? WHERE id = ?",
+                (worker, now + lease_seconds, now, row["id"]),
+            )
+            db.execute(
+                "UPDATE jobs SET status = 'running' WHERE id = ? AND status = 'queued'",
+                (row["job_id"],),
+            )
+            task = self._row_to_task(
+                db.execute("SELECT * FROM tasks WHERE id = ?", (row["id"],)).fetchone()
+            )
+            job_row = db.execute(
+                "SELECT * FROM jobs WHERE id = ?", (row["job_id"],)
+            ).fetchone()
+            task["job"] = self._row_to_job(job_row)
+        return task
+
+    def _expire(self, db: sqlite3.Connection, now: float) -> None:
+        """Fails tasks whose lease expired after their last allowed attempt."""
+        rows = db.execute(
+            "SELECT id, job_id, kind FROM tasks WHERE status = 'leased' "
+            "AND lease_until < ? AND attempts >= ?",
+            (now, self.max_attempts),
+        ).fetchall()
+        for row in rows:
+            message = f"{row['kind']} task {row['id']} lost its worker too often"
+            self._fail_job(db, row["job_id"], row["id"], message)
+
+    def _fail_job(
+        self, db: sqlite3.Connection, job_id: str, task_id: int, message: str
+    ) -> None:
+        now = time.time()
+        db.execute(
+            "UPDATE tasks SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+            (message, now, task_id),
+        )
+        db.execute(
+            "UPDATE jobs SET status = 'failed', message = ?, finished_at = ? "
+            "WHERE id = ? AND status IN ('queued', 'running')",
+            (message, now, job_id),
+        )
+        logger.error(f"dist_job_failed: {job_id}, {message}")
+
+    def heartbeat(self, task_id: int, worker: str, lease_seconds: float) -> bool:
+        """
+        Extends a lease.
+
+        Returns:
+            bool: False if the worker no longer holds the task (it expired
+            and was leased to another worker, or its job ended).
+        """
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE tasks SET lease_until = ?, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (time.time() + lease_seconds, time.time(), task_id, worker),
+            )
+        return cursor.rowcount > 0
+
+    def complete(
+        self,
+        task_id: int,
+        worker: str,
+        result: Any,
+        on_stage_done: Optional[StageDone] = None,
+    ) -> bool:
+        """
+        Stores a task's result. When it was the last unfinished task of its
+        kind, on_stage_done creates the job's next tasks in the same
+        transaction; a job without unfinished tasks is completed.
+
+        Args:
+            task_id (int): The leased task.
+            worker (str): Worker id holding the lease.
+            result (Any): JSON-serialisable result.
+            on_stage_done (Optional[StageDone]): Builds follow-up tasks.
+
+        Returns:
+            bool: False if the lease was lost, in which case the result is
+            discarded (another worker redoes the task).
+        """
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT * FROM tasks WHERE id = ? AND worker = ? AND status = 'leased'",
+                (task_id, worker),
+            ).fetchone()
+            if row is None:
+                logger.warning(f"dist_lease_lost: task={task_id}, worker={worker}")
+                return False
+            db.execute(
+                "UPDATE tasks SET status = 'done', result = ?, error = NULL, "
+                "updated_at = ? WHERE id = ?",
+                (json.dumps(result, ensure_ascii=False), time.time(), task_id),
+            )
+            job_id, kind = row["job_id"], row["kind"]
+            remaining = db.execute(
+                "SELECT COUNT(*) FROM tasks WHERE job_id = ? AND kind = ? "
+                "AND status != 'done'",
+                (job_id, kind),
+            ).fetchone()[0]
+            if remaining == 0 and on_stage_done is not None:
+                results = [
+                    json.loads(r["result"])
+                    for r in db.execute(
+                        "SELECT result FROM tasks WHERE job_id = ? AND kind = ? "
+                        "ORDER BY seq",
+                        (job_id, kind),
+                    )
+                ]
+                job = self._row_to_job(
+                    db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                )
+                try:
+                    self._insert_tasks(db, job_id, on_stage_done(job, kind, results))
+                except ValueError as e:
+                    self._fail_job(db, job_id, task_id, str(e))
+                    return True
+            unfinished = db.execute(
+                "SELECT COUNT(*) FROM tasks WHERE job_id = ? AND status != 'done'",
+                (job_id,),
+            ).fetchone()[0]
+            if unfinished == 0:
+                db.execute(
+                    "UPDATE jobs SET status = 'completed', finished_at = ? "
+                    "WHERE id = ? AND status = 'running'",
+                    (time.time(), job_id),
+                )
+                logger.info(f"dist_job_completed: {job_id}")
+        return True
+
+    def fail(self, task_id: int, worker: str, error: str) -> None:
+        """
+        Releases a task after an error: it is retried until max_attempts,
+        then the task and its job fail.
+        """
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT * FROM tasks WHERE id = ? AND worker = ? AND status = 'leased'",
+                (task_id, worker),
+            ).fetchone()
+            if row is None:
+                return
+            if row["attempts"] >= self.max_attempts:
+                self._fail_job(db, row["job_id"], task_id, error)
+            else:
+                db.execute(
+                    "UPDATE tasks SET status = 'pending', worker = NULL, "
+                    "lease_until = NULL, error = ?, updated_at = ? WHERE id = ?",
+                    (error, time.time(), task_id),
+                )
+                logger.warning(f"dist_task_retry: task={task_id}, {error}")
+
+    def release(self, task_id: int, worker: str) -> None:
+        """Hands a task back unfinished (e.g. on shutdown) without using an attempt."""
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE tasks SET status = 'pending', worker = NULL, "
+                "lease_until = NULL, attempts = attempts - 1, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (time.time(), task_id, worker),
+            )
+
+    def set_srt_path(self, job_id: str, srt_path: str) -> None:
+        """Records where a job's subtitles were written."""
+        with self._transaction() as db:
+            db.execute("UPDATE jobs SET srt_path = ? WHERE id = ?", (srt_path, job_id))
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT (or ROLLBACK on error) on a LeaseQueue."""
+
+    def __init__(self, owner: LeaseQueue) -> None:
+        self._owner = owner
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._owner._lock.acquire()
+        try:
+            db = self._owner._db()
+            db.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            # __exit__ does not run when __enter__ fails (e.g. database locked)
+            self._owner._lock.release()
+            raise
+        return db
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        db = self._owner._db()
+        try:
+            db.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._owner._lock.release()
@@ -0,0 +1,247 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from appdirs import user_data_dir
+
+from backend.services.config_mgr import config_mgr
+from backend.services.hardware_mgr import hardware_mgr
+from backend.services.logger import logger
+from backend.services.model_store import model_store
+
+# Candidate compute types per device, in order of preference when results tie
+CPU_COMPUTE_TYPES = ["int8", "int8_float32", "float32"]
+CUDA_COMPUTE_TYPES = ["float16", "int8_float16", "int8"]
+
+# Length of the clip used for the micro-benchmark
+BENCHMARK_SECONDS = 15
+SAMPLING_RATE = 16000
+
+
+class TunerManager:
+    """
+    Calibrates Faster-Whisper for the local hardware.
+
+    Runs a short micro-benchmark across compute types and CPU thread counts,
+    and persists the fastest profile per machine, model size and device.
+    Calibration runs on request (offered once on first launch) through
+    whisper_svc.calibrate; whisper.auto_tune applies its result.
+    """
+
+    def __init__(self) -> None:
+        data_dir = user_data_dir("UniversalSub", "UniversalSub")
+        self.profile_path = os.path.join(data_dir, "tuning.json")
+        self._lock = threading.Lock()
+
+    def resolve_device(self, device: str) -> str:
+        """Resolves 'auto' to the concrete device CTranslate2 would pick."""
+        if device != "auto":
+            return device
+        try:
+            import ctranslate2
+
+            return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        except ImportError:
+            return "cpu"
+
+    def _profile_key(self, model_size: str, device: str) -> str:
+        return f"{hardware_mgr.get_machine_id()}:{model_size}:{device}"
+
+    def _load_profiles(self) -> Dict[str, Any]:
+        if not os.path.exists(self.profile_path):
+            return {}
+        try:
+            with open(self.profile_path, "r", encoding="utf-8") as f:
+                profiles: Dict[str, Any] = json.load(f)
+                return profiles
+        except (OSError, ValueError) as e:
+            logger.warning(f"tuning_profiles_unreadable: {e}")
+            return {}
+
+    def _save_profiles(self, profiles: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self.profile_path), exist_ok=True)
+        tmp_path = self.profile_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(profiles, f, indent=2)
+        os.replace(tmp_path, self.profile_path)
+
+    def get_profile(self, model_size: str, device: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the persisted tuning profile for this machine, if any.
+
+        Args:
+            model_size (str): Whisper model size.
+            device (str): Device ('cpu', 'cuda' or 'auto').
+
+        Returns:
+            Optional[Dict[str, Any]]: The fastest measured profile or None.
+        """
+        key = self._profile_key(model_size, self.resolve_device(device))
+        with self._lock:
+            return self._load_profiles().get(key)
+
+    def _candidates(self, device: str) -> List[Dict[str, Any]]:
+        """Builds the compute type / thread count grid to benchmark."""
+        compute_types = CUDA_COMPUTE_TYPES if device == "cuda" else CPU_COMPUTE_TYPES
+        try:
+            import ctranslate2
+
+            supported = ctranslate2.get_supported_compute_types(device)
+            compute_types = [c for c in compute_types if c in supported]
+        except (ImportError, RuntimeError, ValueError) as e:
+            logger.warning(f"compute_type_probe_failed: {e}")
+
+        if device == "cuda":
+            # Thread count only affects the host side on GPU
+            thread_counts = [0]
+        else:
+            cpus = hardware_mgr.get_cpu_count()
+            thread_counts = sorted({max(1, cpus // 4), max(1, cpus // 2), cpus})
+
+        return [
+            {"compute_type": c, "cpu_threads": t}
+            for c in compute_types
+            for t in thread_counts
+        ]
+
+    def _benchmark_audio(self) -> Any:
+        """
+        Generates a deterministic speech-like signal for the benchmark, used
+        when no real speech sample is available.
+        """
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        t = np.arange(BENCHMARK_SECONDS * SAMPLING_RATE) / SAMPLING_RATE
+        # Amplitude-modulated harmonics keep the decoder busy like real audio
+        envelope = 0.5 * (1 + np.sin(2 * np.pi * 3 * t))
+        signal = sum(
+            np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate([180, 360, 720])
+        )
+        noise = rng.normal(0, 0.05, t.shape)
+        return (0.3 * envelope * signal + noise).astype(np.float32)
+
+    def calibrate(
+        self,
+        model_size: str,
+        device: str,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        cancel_event: Optional[Any] = None,
+        audio: Optional[Any] = None,
+        transcribe_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Benchmarks every candidate configuration and persists the fastest one.
+
+        Args:
+            model_size (str): Whisper model size to benchmark.
+            device (str): Device ('cpu', 'cuda' or 'auto').
+            progress_callback (Callable): Receives (progress percent, message).
+            cancel_event (threading.Event): Aborts between candidates when set.
+            audio (Optional[np.ndarray]): 16 kHz speech to decode; a
+                synthetic signal is used when omitted.
+            transcribe_kwargs (Optional[Dict[str, Any]]): Decoding arguments
+                for transcribe(), so the timing matches real jobs.
+
+        Returns:
+            Optional[Dict[str, Any]]: The winning profile, or None if nothing ran.
+        """
+        from faster_whisper import WhisperModel
+
+        device = self.resolve_device(device)
+        candidates = self._candidates(device)
+        sample = "speech" if audio is not None else "synthetic"
+        if audio is None:
+            audio = self._benchmark_audio()
+        audio_seconds = audio.shape[0] / SAMPLING_RATE
+        decode_kwargs = {
+            "language": config_mgr.config.whisper.language,
+            **(transcribe_kwargs or {}),
+        }
+        results: List[Dict[str, Any]] = []
+
+        logger.info(
+            f"calibration_started: model={model_size}, device={device}, candidates={len(candidates)}, sample={sample}, seconds={audio_seconds:.1f}"
+        )
+
+        for idx, cand in enumerate(candidates):
+            if cancel_event and cancel_event.is_set():
+                logger.info("calibration_cancelled")
+                return None
+
+            label = f"{cand['compute_type']} / {cand['cpu_threads'] or 'auto'} threads"
+            if progress_callback:
+                progress_callback(
+                    idx / len(candidates) * 100, f"Benchmarking {label}..."
+                )
+
+            try:
+                source, local_only = model_store.resolve(
+                    model_size,
+                    cand["compute_type"],
+                    offline=config_mgr.config.whisper.offline,
+                )
+                load_start = time.perf_counter()
+                model = WhisperModel(
+                    source,
+                    device=device,
+                    compute_type=cand["compute_type"],
+                    cpu_threads=cand["cpu_threads"],
+                    local_files_only=local_only,
+                )
+                load_time = time.perf_counter() - load_start
+
+                # Warm-up pass so one-time allocations don't skew the timing
+                list(model.transcribe(audio[: SAMPLING_RATE * 2], **decode_kwargs)[0])
+
+                run_start = time.perf_counter()
+                segments, _ = model.transcribe(audio, **decode_kwargs)
+                list(segments)
+                elapsed = time.perf_counter() - run_start
+                del model
+            except (RuntimeError, ValueError, OSError) as e:
+                logger.warning(f"calibration_candidate_failed: {label}, {e}")
+                continue
+
+            rtf = elapsed / audio_seconds
+            results.append(
+                {**cand, "rtf": round(rtf, 4), "load_time": round(load_time, 3)}
+            )
+            logger.info(f"calibration_candidate_measured: {label}, rtf={rtf:.4f}")
+
+        if not results:
+            logger.error("calibration_produced_no_results")
+            return None
+
+        best = min(results, key=lambda r: r["rtf"])
+        profile = {
+            "model_size": model_size,
+            "device": device,
+            "compute_type": best["compute_type"],
+            "cpu_threads": best["cpu_threads"],
+            "rtf": best["rtf"],
+            "sample": sample,
+            "calibrated_at": time.time(),
+            "results": results,
+        }
+
+        with self._lock:
+            profiles = self._load_profiles()
+            profiles[self._profile_key(model_size, device)] = profile
+            try:
+                self._save_profiles(profiles)
+            except OSError as e:
+                logger.error(f"failed_to_save_tuning_profile: {e}")
+
+        if progress_callback:
+            progress_callback(100, "Calibration finished.")
+        logger.info(
+            f"calibration_completed: {best['compute_type']}, threads={best['cpu_threads']}, rtf={best['rtf']}"
+        )
+        return profile
+
+
+# Global tuner manager instance
+tuner_mgr = TunerManager()
@@ -5,12 +5,37 @@ export interface Config {
     pypi_mirror: string;
     language: string;
     log_level: string;
+    ui_event_rate: number;
+    resources: {
+      max_cpu_threads: number;
+      process_priority: string;
+      max_memory_mb: number;
+      min_free_memory_mb: number;
+      auto_downgrade: boolean;
+      pause_under_pressure: boolean;
+      pressure_free_memory_mb: number;
+      max_pause_seconds: number;
+    };
   };
   whisper: {
     model_size: string;
     device: string;
     compute_type: string;
     language: string | null;
+    cpu_threads: number;
+    num_workers: number;
+    max_concurrent_jobs: number;
+    auto_tune: boolean;
+    calibration_offered: boolean;
+    preset: string;
+    decoding: Record<string, any>;
+    two_pass: boolean;
+    draft_preset: string;
+    segment_filter: Record<string, any>;
+    offline: boolean;
+    isolated_worker: boolean;
+    worker_idle_timeout: number;
+    live: Record<string, any>;
   };
   ai: {
     api_key: string;
@@ -21,11 +46,149 @@ export interface Config {
     system_prompt: string;
     fallback_prompt: string;
   };
+  pipeline: Record<string, any>;
+  watch: {
+    enabled: boolean;
+    directories: string[];
+    target_lang: string;
+    use_output_dir: boolean;
+    settle_seconds: number;
+    poll_interval: number;
+    max_pending: number;
+  };
+  api: {
+    enabled: boolean;
+    host: string;
+    port: number;
+    token: string;
+    max_pending: number;
+    output_roots: string[];
+    metrics: boolean;
+  };
+  distributed: Record<string, any>;
+  profiling: {
+    enabled: boolean;
+    sample_interval: number;
+    trace_memory: boolean;
+    top_allocations: number;
+  };
+}
+
+export interface WatchStatus {
+  running: boolean;
+  mode: string;
+  directories: string[];
+  settling: number;
+  waiting: number;
+  pending_jobs: number;
+  enqueued: number;
+  completed: number;
+  failed: number;
+  duplicates: number;
+  errors: number;
+  last_enqueued: string | null;
+  last_error: string | null;
+}
+
+export interface TuningResult {
+  compute_type: string;
+  cpu_threads: number;
+  rtf: number;
+  load_time: number;
+}
+
+export interface TuningProfile {
+  model_size: string;
+  device: string;
+  compute_type: string;
+  cpu_threads: number;
+  rtf: number;
+  calibrated_at: number;
+  results: TuningResult[];
+}
+
+export interface HistogramValue {
+  count: number;
+  sum: number;
+  mean: number | null;
+  p50: number | null;
+  p95: number | null;
+}
+
+export interface Metric {
+  type: "counter" | "gauge" | "histogram";
+  help: string;
+  values: Record<string, number | HistogramValue>;
+}
+
+export interface StoredModel {
+  model_size: string;
+  compute_type: string;
+  path: string;
+  size_bytes: number;
+  source: string;
+  installed_at: number | null;
+  load_seconds: number | null;
+}
+
+export interface AudioStream {
+  index: number;
+  codec: string;
+  language: string | null;
+  title: string | null;
+  channels: number;
+  duration: number | null;
+}
+
+export interface JobProgress {
+  job_id: string;
+  stage: string;
+  progress: number;
+  message: string;
+  // Seconds left in the stage, from measured throughput
+  eta: number | null;
+}
+
+export interface QueueJob {
+  id: string;
+  path: string;
+  target_lang: string;
+  options: Record<string, any>;
+  audio_stream: number;
+  priority: number;
+  position: number;
+  status: string;
+  stage: string | null;
+  message: string | null;
+  srt_path: string | null;
+  created_at: number;
+  started_at: number | null;
+  finished_at: number | null;
+}
+
+export interface QueueSnapshot {
+  jobs: QueueJob[];
+  paused: boolean;
+}
+
+export interface MediaAnalysis {
+  status: string;
+  message?: string;
+  duration: number;
+  speech_seconds: number;
+  speech_ratio: number;
+  chunk_count: number;
+  estimated_seconds: number | null;
 }
 
 export interface TaskStatus {
   message: string;
   progress: number;
+  stage?: string;
+  channel?: string;
+  // Progress within the current stage and its seconds left, once measured
+  stage_progress?: number;
+  eta?: number | null;
 }
 
 export interface Segment {
@@ -33,6 +196,32 @@ export interface Segment {
   end: number;
   text: string;
   translated_text?: string;
+  refined?: boolean;
+  tentative?: boolean;
+  latency?: number;
+}
+
+export interface SegmentPage {
+  status: string;
+  message?: string;
+  segments: Segment[];
+  offset: number;
+  total: number;
+  version: number;
+}
+
+export interface SegmentChanges {
+  status: string;
+  message?: string;
+  changes: { index: number; segment: Segment }[];
+  total: number;
+  version: number;
+}
+
+export interface LiveLatency {
+  p50: number | null;
+  p95: number | null;
+  max: number | null;
 }
 
 declare global {
@@ -47,12 +236,30 @@ declare global {
         check_task_resume_point(video_path: string): Promise<{
           has_audio: boolean;
           has_transcript: boolean;
+          has_partial_transcript: boolean;
+          resume_from: number;
         }>;
         start_task(
           video_path: string,
           target_lang: string,
-          resume_mode: string
-        ): Promise<{ status: string; message?: string }>;
+          resume_mode: string,
+          options?: Record<string, any>,
+          time_ranges?: [number, number | null][] | null,
+          audio_stream?: number,
+          profile?: boolean | null
+        ): Promise<{ status: string; message?: string; task_id?: string }>;
+        start_live(
+          source: string,
+          target_lang: string,
+          output_path?: string | null,
+          input_format?: string,
+          audio_stream?: number
+        ): Promise<{ status: string; message?: string; output_path?: string }>;
+        list_audio_streams(video_path: string): Promise<{
+          status: string;
+          message?: string;
+          streams: AudioStream[];
+        }>;
         minimize(): void;
         close(): void;
         get_position(): Promise<{ x: number; y: number }>;
@@ -66,15 +273,76 @@ declare global {
           needs_install: boolean;
         }>;
         install_deps(): Promise<{ status: string }>;
+        cancel_install_deps(): Promise<{ status: string }>;
         get_app_paths(): Promise<{
           config: string;
           logs: string;
           libs: string;
+          models: string;
+          profiles: string;
         }>;
         open_path(
           path_type: string
         ): Promise<{ status: string; message?: string }>;
         get_app_info(): Promise<{ version: string; name: string }>;
+        get_tuning_profile(): Promise<{
+          status: string;
+          profile: TuningProfile | null;
+        }>;
+        run_calibration(): Promise<{ status: string; message?: string }>;
+        get_metrics(): Promise<{
+          status: string;
+          metrics?: Record<string, Metric>;
+          message?: string;
+        }>;
+        analyze_media(
+          video_path: string,
+          options?: Record<string, any>
+        ): Promise<MediaAnalysis>;
+        list_models(): Promise<{ status: string; models: StoredModel[] }>;
+        download_model(model_size: string): Promise<{ status: string }>;
+        quantize_model(
+          model_size: string,
+          compute_type: string
+        ): Promise<{ status: string }>;
+        import_model(
+          source_path: string,
+          model_size: string,
+          compute_type: string
+        ): Promise<{ status: string }>;
+        remove_model(
+          model_size: string,
+          compute_type: string
+        ): Promise<{ status: string; message?: string; models: StoredModel[] }>;
+        benchmark_model_load(
+          model_size: string,
+          compute_type: string
+        ): Promise<{ status: string }>;
+        select_model_source(archive: boolean): Promise<string | null>;
+        select_files(): Promise<string[]>;
+        select_folder(): Promise<string | null>;
+        enqueue_jobs(
+          paths: string[],
+          target_lang: string,
+          options?: Record<string, any>,
+          priority?: number
+        ): Promise<{ status: string; message?: string; jobs?: QueueJob[] }>;
+        list_jobs(): Promise<{ status: string } & QueueSnapshot>;
+        pause_queue(): Promise<{ status: string }>;
+        resume_queue(): Promise<{ status: string }>;
+        update_job(
+          job_id: string,
+          action: string,
+          value?: number
+        ): Promise<{ status: string; message?: string }>;
+        clear_finished_jobs(): Promise<{ status: string; removed: number }>;
+        get_watch_status(): Promise<{ status: string } & WatchStatus>;
+        get_segments(offset: number, limit: number): Promise<SegmentPage>;
+        get_segments_since(
+          version: number,
+          offset: number,
+          limit: number | null
+        ): Promise<SegmentChanges>;
       };
     };
     onBackendEvent: (event: string, data: any) => void;
@@ -148,19 +416,58 @@ export const bridge = {
     return await window.pywebview.api.select_file();
   },
 
+  async selectModelSource(archive: boolean = false): Promise<string | null> {
+    await waitForBridge();
+    return await window.pywebview.api.select_model_source(archive);
+  },
+
   async startTask(
     videoPath: string,
     targetLang: string = "Chinese",
-    resumeMode: string = "fresh"
+    resumeMode: string = "fresh",
+    options: Record<string, any> = {},
+    timeRanges: [number, number | null][] | null = null,
+    audioStream: number = 0,
+    profile: boolean | null = null
   ): Promise<any> {
     await waitForBridge();
     return await window.pywebview.api.start_task(
       videoPath,
       targetLang,
-      resumeMode
+      resumeMode,
+      options,
+      timeRanges,
+      audioStream,
+      profile
     );
   },
 
+  async startLive(
+    source: string,
+    targetLang: string = "Chinese",
+    outputPath: string | null = null,
+    inputFormat: string = "auto",
+    audioStream: number = 0
+  ): Promise<{ status: string; message?: string; output_path?: string }> {
+    await waitForBridge();
+    return await window.pywebview.api.start_live(
+      source,
+      targetLang,
+      outputPath,
+      inputFormat,
+      audioStream
+    );
+  },
+
+  async listAudioStreams(videoPath: string): Promise<{
+    status: string;
+    message?: string;
+    streams: AudioStream[];
+  }> {
+    await waitForBridge();
+    return await window.pywebview.api.list_audio_streams(videoPath);
+  },
+
   async minimize(): Promise<void> {
     await waitForBridge();
     window.pywebview.api.minimize();
@@ -211,7 +518,18 @@ export const bridge = {
     return await window.pywebview.api.install_deps();
   },
 
-  async getAppPaths(): Promise<{ config: string; logs: string; libs: string }> {
+  async cancelInstallDeps(): Promise<any> {
+    await waitForBridge();
+    return await window.pywebview.api.cancel_install_deps();
+  },
+
+  async getAppPaths(): Promise<{
+    config: string;
+    logs: string;
+    libs: string;
+    models: string;
+    profiles: string;
+  }> {
     await waitForBridge();
     return await window.pywebview.api.get_app_paths();
   },
@@ -225,4 +543,146 @@ export const bridge = {
     await waitForBridge();
     return await window.pywebview.api.get_app_info();
   },
+
+  async getTuningProfile(): Promise<{
+    status: string;
+    profile: TuningProfile | null;
+  }> {
+    await waitForBridge();
+    return await window.pywebview.api.get_tuning_profile();
+  },
+
+  async getMetrics(): Promise<{
+    status: string;
+    metrics?: Record<string, Metric>;
+    message?: string;
+  }> {
+    await waitForBridge();
+    return await window.pywebview.api.get_metrics();
+  },
+
+  async runCalibration(): Promise<any> {
+    await waitForBridge();
+    return await window.pywebview.api.run_calibration();
+  },
+
+  async listModels(): Promise<{ status: string; models: StoredModel[] }> {
+    await waitForBridge();
+    return await window.pywebview.api.list_models();
+  },
+
+  async downloadModel(modelSize: string): Promise<any> {
+    await waitForBridge();
+    return await window.pywebview.api.download_model(modelSize);
+  },
+
+  async importModel(
+    sourcePath: string,
+    modelSize: string,
+    computeType: string = "float16",
+  ): Promise<any> {
+    await waitForBridge();
+    return await window.pywebview.api.import_model(
+      sourcePath,
+      modelSize,
+      computeType,
+    );
+  },
+
+  async removeModel(modelSize: string, computeType: string): Promise<any> {
+    await waitForBridge();
+    return await window.pywebview.api.remove_model(modelSize, computeType);
+  },
+
+  async benchmarkModelLoad(
+    modelSize: string,
+    computeType: string,
+  ): Promise<any> {
+    await waitForBridge();
+    return await window.pywebview.api.benchmark_model_load(
+      modelSize,
+      computeType,
+    );
+  },
+
+  async selectFiles(): Promise<string[]> {
+    await waitForBridge();
+    return await window.pywebview.api.select_files();
+  },
+
+  async selectFolder(): Promise<string | null> {
+    await waitForBridge();
+    return await window.pywebview.api.select_folder();
+  },
+
+  async enqueueJobs(
+    paths: string[],
+    targetLang: string = "Chinese",
+    options: Record<string, any> = {},
+    priority: number = 0
+  ): Promise<{ status: string; message?: string; jobs?: QueueJob[] }> {
+    await waitForBridge();
+    return await window.pywebview.api.enqueue_jobs(
+      paths,
+      targetLang,
+      options,
+      priority
+    );
+  },
+
+  async listJobs(): Promise<{ status: string } & QueueSnapshot> {
+    await waitForBridge();
+    return await window.pywebview.api.list_jobs();
+  },
+
+  async pauseQueue(): Promise<any> {
+    await waitForBridge();
+    return await window.pywebview.api.pause_queue();
+  },
+
+  async resumeQueue(): Promise<any> {
+    await waitForBridge();
+    return await window.pywebview.api.resume_queue();
+  },
+
+  async updateJob(
+    jobId: string,
+    action: string,
+    value: number = 0
+  ): Promise<{ status: string; message?: string }> {
+    await waitForBridge();
+    return await window.pywebview.api.update_job(jobId, action, value);
+  },
+
+  async clearFinishedJobs(): Promise<any> {
+    await waitForBridge();
+    return await window.pywebview.api.clear_finished_jobs();
+  },
+
+  async getWatchStatus(): Promise<{ status: string } & WatchStatus> {
+    await waitForBridge();
+    return await window.pywebview.api.get_watch_status();
+  },
+
+  async getSegments(offset: number = 0, limit: number = 100): Promise<SegmentPage> {
+    await waitForBridge();
+    return await window.pywebview.api.get_segments(offset, limit);
+  },
+
+  async getSegmentsSince(
+    version: number,
+    offset: number = 0,
+    limit: number | null = null
+  ): Promise<SegmentChanges> {
+    await waitForBridge();
+    return await window.pywebview.api.get_segments_since(version, offset, limit);
+  },
+
+  async analyzeMedia(
+    videoPath: string,
+    options: Record<string, any> = {}
+  ): Promise<MediaAnalysis> {
+    await waitForBridge();
+    return await window.pywebview.api.analyze_media(videoPath, options);
+  },
 };
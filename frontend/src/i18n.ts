@@ -30,6 +30,22 @@ export const translations = {
     pypiHint:
       "Hint: Use https://pypi.tuna.tsinghua.edu.cn for faster downloads in China.",
     outputDir: "Output Directory",
+    watchFolders: "Watch Folders",
+    watchEnabled: "Watch folders",
+    watchHint: "New media files are queued automatically once fully written",
+    watchDirectories: "Folders (one per line)",
+    watchTargetLang: "Target language",
+    watchMaxPending: "Max files in queue",
+    watchUseOutputDir: "Write subtitles to the output directory instead of next to the media",
+    watchStatus: "Watching",
+    watchQueued: "queued",
+    watchCompleted: "completed",
+    watchDuplicates: "duplicates skipped",
+    watchSettling: "being written",
+    jobApi: "Job API",
+    jobApiEnabled: "Local HTTP job API",
+    jobApiPort: "Port",
+    jobApiToken: "Access token (optional)",
     uiLanguage: "UI Language",
     logLevel: "Log Level",
     logHint:
@@ -57,6 +73,8 @@ export const translations = {
       "Previous temporary files were found for this video. How would you like to proceed?",
     resumeTrans: "Resume Translation Only",
     skipStt: "Skipping extraction and transcription",
+    resumeStt: "Resume Transcription",
+    resumeSttFrom: "Continue from",
     useExistingAudio: "Use Existing Audio",
     rerunStt: "Re-run transcription stage",
     startFresh: "Start Fresh",
@@ -72,10 +90,88 @@ export const translations = {
     large: "Large V3 (Studio Grade)",
     cuda: "NVIDIA® CUDA Parallel",
     cpu: "Generic CPU (Universal)",
+    decodingPreset: "Decoding Preset",
+    presetDraft: "Draft (Fastest, base model at most)",
+    presetBalanced: "Balanced",
+    presetAccurate: "Accurate (Slowest)",
+    twoPassMode: "Two-pass Mode",
+    twoPassHint: "Instant draft, refined in the background",
+    refiningDraft: "Refining draft...",
+    queue: "Queue",
+    jobQueue: "Job Queue",
+    jobQueueDesc: "Process many files unattended; the queue survives restarts",
+    addFiles: "Add Files",
+    addFolder: "Add Folder",
+    pauseQueue: "Pause Queue",
+    resumeQueue: "Resume Queue",
+    clearFinished: "Clear Finished",
+    queueEmpty: "No jobs queued.",
+    priority: "Priority",
+    jobStatus: {
+      queued: "Queued",
+      paused: "Paused",
+      running: "Running",
+      completed: "Completed",
+      failed: "Failed",
+      cancelled: "Cancelled",
+    },
+    jobStage: {
+      prepare: "Analyzing audio",
+      transcribe: "Transcribing",
+      translate: "Translating",
+    },
+    startLive: "Live (still recording)",
+    liveLatency: "Latency",
+    timeLeft: "Time left",
     checkAgain: "Check Again",
+    performanceTuning: "Performance Tuning",
+    runCalibration: "Run Calibration",
+    calibrating: "Calibrating...",
+    notCalibrated:
+      "Not calibrated yet. Run a calibration, then turn on Auto-tune in Settings to use it.",
+    calibrationOfferTitle: "Tune for This Computer?",
+    calibrationOfferDesc:
+      "A short benchmark finds the fastest settings for your hardware. It runs in the background and turns on Auto-tune when done.",
+    calibrateNow: "Calibrate in Background",
+    notNow: "Not Now",
+    computeType: "Compute Type",
+    cpuThreads: "CPU Threads",
+    realTimeFactor: "Real-time Factor",
+    audioTrack: "Audio Track",
+    defaultTrack: "Default",
+    timeRanges: "Time Ranges (optional)",
+    timeRangesHint: "e.g. 0:10:00-0:12:30, 1:02:00-1:03:00",
+    localModels: "Local Models",
+    downloadModel: "Download",
+    importFolder: "Import Folder",
+    importArchive: "Import Archive",
+    benchmarkLoad: "Benchmark Load",
+    removeModel: "Remove",
+    noLocalModels:
+      "No local models. Models are fetched from the hub unless offline mode is on.",
+    offlineMode: "Offline Mode",
+    offlineHint: "Only load models from the local store",
+    autoTune: "Auto-tune",
+    autoTuneHint: "Use the compute type and threads found by calibration",
+    resourceLimits: "Resource Limits",
+    maxCpuThreads: "Max CPU Threads",
+    processPriority: "Transcription Priority",
+    priorityNormal: "Normal",
+    priorityBelowNormal: "Below Normal",
+    priorityIdle: "Idle",
+    maxMemory: "Max Model Memory (MB)",
+    minFreeMemory: "Keep Free (MB)",
+    resourceLimitsHint:
+      "0 means no limit. Models are checked against free memory before they load.",
+    autoDowngrade: "Auto Downgrade",
+    autoDowngradeHint: "Use a smaller model or int8 when memory is short",
+    pauseUnderPressure: "Pause Under Pressure",
+    pauseUnderPressureHint: "Pause transcription while free memory is low",
+    maxPause: "Max Pause (s)",
     installSuccess:
       "Installation successful. Please restart application to enable GPU.",
     installError: "Download failed. Check your internet connection.",
+    installCancelled: "Installation cancelled. The download resumes next time.",
   },
   zh: {
     translate: "翻译",
@@ -108,6 +204,22 @@ export const translations = {
     pypiHint:
       "提示：在中国境内使用 https://pypi.tuna.tsinghua.edu.cn 可加速下载。",
     outputDir: "字幕输出目录",
+    watchFolders: "监视文件夹",
+    watchEnabled: "监视文件夹",
+    watchHint: "新媒体文件写入完成后自动加入队列",
+    watchDirectories: "文件夹（每行一个）",
+    watchTargetLang: "目标语言",
+    watchMaxPending: "队列中最多文件数",
+    watchUseOutputDir: "字幕写入输出目录，而非媒体文件旁",
+    watchStatus: "监视中",
+    watchQueued: "已加入",
+    watchCompleted: "已完成",
+    watchDuplicates: "重复已跳过",
+    watchSettling: "写入中",
+    jobApi: "任务 API",
+    jobApiEnabled: "本地 HTTP 任务接口",
+    jobApiPort: "端口",
+    jobApiToken: "访问令牌（可选）",
     uiLanguage: "界面语言",
     logLevel: "日志等级",
     logHint: "日志保存在程序所在目录的 logs 文件夹中。",
@@ -131,6 +243,8 @@ export const translations = {
     restoreDesc: "发现该视频存在之前的临时文件。您想如何继续？",
     resumeTrans: "仅恢复翻译步骤",
     skipStt: "跳过音频提取与听写过程",
+    resumeStt: "继续听写",
+    resumeSttFrom: "从此处继续：",
     useExistingAudio: "使用现有音频缓存",
     rerunStt: "重新运行听写阶段",
     startFresh: "全新开始",
@@ -146,9 +260,84 @@ export const translations = {
     large: "专业级 (Large V3)",
     cuda: "NVIDIA® CUDA 并行计算",
     cpu: "Generic CPU (Universal)",
+    decodingPreset: "解码预设",
+    presetDraft: "草稿 (最快，最大 Base 模型)",
+    presetBalanced: "均衡",
+    presetAccurate: "精确 (最慢)",
+    twoPassMode: "两遍模式",
+    twoPassHint: "先快速出草稿，后台精修",
+    refiningDraft: "正在精修草稿...",
+    queue: "队列",
+    jobQueue: "任务队列",
+    jobQueueDesc: "批量无人值守处理文件，重启后队列仍会保留",
+    addFiles: "添加文件",
+    addFolder: "添加文件夹",
+    pauseQueue: "暂停队列",
+    resumeQueue: "继续队列",
+    clearFinished: "清除已完成",
+    queueEmpty: "队列为空。",
+    priority: "优先级",
+    jobStatus: {
+      queued: "排队中",
+      paused: "已暂停",
+      running: "运行中",
+      completed: "已完成",
+      failed: "失败",
+      cancelled: "已取消",
+    },
+    jobStage: {
+      prepare: "分析音频",
+      transcribe: "转录中",
+      translate: "翻译中",
+    },
+    startLive: "实时 (录制中)",
+    liveLatency: "延迟",
+    timeLeft: "剩余时间",
     checkAgain: "重新检测",
+    performanceTuning: "性能调优",
+    runCalibration: "运行校准",
+    calibrating: "正在校准...",
+    notCalibrated: "尚未校准。运行校准后，在设置中开启自动调优即可应用。",
+    calibrationOfferTitle: "为这台电脑调优？",
+    calibrationOfferDesc:
+      "一次简短的基准测试可找出最适合您硬件的设置。测试在后台运行，完成后自动开启自动调优。",
+    calibrateNow: "后台校准",
+    notNow: "暂不",
+    computeType: "计算精度",
+    cpuThreads: "CPU 线程数",
+    realTimeFactor: "实时率",
+    audioTrack: "音轨",
+    defaultTrack: "默认",
+    timeRanges: "时间范围 (可选)",
+    timeRangesHint: "例如 0:10:00-0:12:30, 1:02:00-1:03:00",
+    localModels: "本地模型",
+    downloadModel: "下载",
+    importFolder: "导入文件夹",
+    importArchive: "导入压缩包",
+    benchmarkLoad: "测试加载",
+    removeModel: "删除",
+    noLocalModels: "暂无本地模型。未开启离线模式时将从模型仓库下载。",
+    offlineMode: "离线模式",
+    offlineHint: "仅从本地模型库加载模型",
+    autoTune: "自动调优",
+    autoTuneHint: "使用校准测得的计算精度与线程数",
+    resourceLimits: "资源限制",
+    maxCpuThreads: "最大 CPU 线程数",
+    processPriority: "转录优先级",
+    priorityNormal: "正常",
+    priorityBelowNormal: "低于正常",
+    priorityIdle: "空闲",
+    maxMemory: "模型内存上限 (MB)",
+    minFreeMemory: "保留空闲内存 (MB)",
+    resourceLimitsHint: "0 表示不限制。加载模型前会根据空闲内存进行检查。",
+    autoDowngrade: "自动降级",
+    autoDowngradeHint: "内存不足时改用更小的模型或 int8",
+    pauseUnderPressure: "内存紧张时暂停",
+    pauseUnderPressureHint: "空闲内存过低时暂停转录",
+    maxPause: "最长暂停 (秒)",
     installSuccess: "安装成功。请重新启动程序以启用 GPU 加速。",
     installError: "下载失败。请检查您的网络连接。",
+    installCancelled: "安装已取消，下次将继续下载。",
   },
 };
 
@@ -1,20 +1,66 @@
 import { defineStore } from "pinia";
-import { bridge, type Config, type Segment } from "../api/bridge";
+import {
+  bridge,
+  type AudioStream,
+  type Config,
+  type JobProgress,
+  type LiveLatency,
+  type QueueJob,
+  type QueueSnapshot,
+  type Segment,
+  type StoredModel,
+  type TaskStatus,
+  type TuningProfile,
+  type WatchStatus,
+} from "../api/bridge";
+
+// Segments of a finished task kept in the UI; the rest stay in Python
+export const RESULTS_WINDOW = 50;
+
+// Seconds left as m:ss (h:mm:ss past an hour)
+export const formatEta = (seconds: number) => {
+  const total = Math.ceil(seconds);
+  const h = Math.floor(total / 3600);
+  const m = Math.floor((total % 3600) / 60);
+  const s = String(total % 60).padStart(2, "0");
+  return h > 0 ? `${h}:${String(m).padStart(2, "0")}:${s}` : `${m}:${s}`;
+};
 
 export const useAppStore = defineStore("app", {
   state: () => ({
     config: null as Config | null,
     isProcessing: false,
     currentProgress: 0,
+    // Seconds left in the current stage (null until measurable)
+    currentEta: null as number | null,
     statusMessage: "",
-    currentStage: "idle", // idle, loading_model, transcribing, translating, saving, installing, cancelling
+    currentStage: "idle", // idle, queued, paused, loading_model, transcribing, translating, refining, saving, installing, cancelling
     results: [] as Segment[],
+    // Size and version of the backend segment list (see get_segments)
+    segmentTotal: 0,
+    segmentsVersion: 0,
+    // Two-pass mode: refinement runs on its own progress channel
+    isDraft: false,
+    refineProgress: 0,
+    refineEta: null as number | null,
+    refineMessage: "",
     selectedFilePath: null as string | null,
+    audioStreams: [] as AudioStream[],
+    selectedAudioStream: 0,
+    timeRanges: null as [number, number | null][] | null,
+    liveLatency: null as LiveLatency | null,
+    queueJobs: [] as QueueJob[],
+    queuePaused: false,
+    queueMessage: "",
+    jobProgress: {} as Record<string, JobProgress>,
+    watchStatus: null as WatchStatus | null,
     // Resume Logic State
     showResumeModal: false,
     resumePoints: null as {
       has_audio: boolean;
       has_transcript: boolean;
+      has_partial_transcript: boolean;
+      resume_from: number;
     } | null,
     pendingVideoPath: null as string | null,
     systemStatus: {
@@ -28,18 +74,39 @@ export const useAppStore = defineStore("app", {
       config: "",
       logs: "",
       libs: "",
+      models: "",
+      profiles: "",
     },
+    lastProfilePath: null as string | null,
     appVersion: "0.1.0",
+    tuning: {
+      profile: null as TuningProfile | null,
+      is_calibrating: false,
+      progress: 0,
+      message: "",
+    },
+    modelStore: {
+      models: [] as StoredModel[],
+      busy: false,
+      progress: 0,
+      message: "",
+    },
   }),
   getters: {
     buttonText: (state) => {
       switch (state.currentStage) {
+        case "queued":
+          return "Waiting for a Slot...";
         case "loading_model":
           return "Loading AI Model...";
         case "transcribing":
           return "Transcribing Audio...";
         case "translating":
           return "Translating Text...";
+        case "refining":
+          return "Refining Draft...";
+        case "live":
+          return "Live Subtitling...";
         case "saving":
           return "Saving Results...";
         case "cancelling":
@@ -68,6 +135,11 @@ export const useAppStore = defineStore("app", {
       this.statusMessage = "Starting installation...";
       await bridge.installDeps();
     },
+    async cancelInstallation() {
+      // The partial download is kept and resumed by the next install
+      this.statusMessage = "Cancelling...";
+      await bridge.cancelInstallDeps();
+    },
     updateInstallProgress(data: {
       progress: number;
       message: string;
@@ -116,35 +188,205 @@ export const useAppStore = defineStore("app", {
     ) {
       this.isProcessing = true;
       this.currentProgress = 0;
+      this.currentEta = null;
       this.currentStage = "loading_model";
       this.statusMessage = "Starting...";
-      // Only clear results if it's not a resume of translation
-      if (resumeMode === "fresh") {
+      // Only clear results if it's not a resume of translation or a partial redo
+      if (resumeMode === "fresh" && !this.timeRanges) {
         this.results = [];
+        this.segmentTotal = 0;
+      }
+      const resp = await bridge.startTask(
+        videoPath,
+        targetLang,
+        resumeMode,
+        {},
+        this.timeRanges,
+        this.selectedAudioStream
+      );
+      if (resp.status !== "started") {
+        this.isProcessing = false;
+        this.currentStage = "idle";
+        this.statusMessage = `Error: ${resp.message}`;
+      }
+      return resp;
+    },
+
+    async startLive(source: string, targetLang: string = "Chinese") {
+      this.isProcessing = true;
+      this.currentProgress = 0;
+      this.currentStage = "live";
+      this.statusMessage = "Starting live session...";
+      this.results = [];
+      this.segmentTotal = 0;
+      this.liveLatency = null;
+      const resp = await bridge.startLive(
+        source,
+        targetLang,
+        null,
+        "auto",
+        this.selectedAudioStream
+      );
+      if (resp.status !== "started") {
+        this.isProcessing = false;
+        this.currentStage = "idle";
+        this.statusMessage = `Error: ${resp.message}`;
+      }
+      return resp;
+    },
+    appendLiveSegments(data: {
+      segments: Segment[];
+      latency: LiveLatency;
+      total: number;
+    }) {
+      // Committed segments replace the tentative tail they came from
+      const committed = this.results.filter((s) => !s.tentative);
+      this.results = [...committed, ...data.segments].slice(-RESULTS_WINDOW);
+      this.segmentTotal = data.total;
+      this.liveLatency = data.latency;
+    },
+    showTentativeSegments(data: { segments: Segment[] }) {
+      const committed = this.results.filter((s) => !s.tentative);
+      const tentative = data.segments.map((s) => ({ ...s, tentative: true }));
+      this.results = [...committed, ...tentative];
+    },
+
+    async fetchJobs() {
+      const resp = await bridge.listJobs();
+      if (resp.status === "success") {
+        this.queueUpdated(resp);
+      }
+    },
+    queueUpdated(data: QueueSnapshot) {
+      this.queueJobs = data.jobs;
+      this.queuePaused = data.paused;
+      // Drop progress of jobs that left the pipeline
+      const running = new Set(
+        data.jobs.filter((j) => j.status === "running").map((j) => j.id)
+      );
+      for (const id of Object.keys(this.jobProgress)) {
+        if (!running.has(id)) delete this.jobProgress[id];
+      }
+    },
+    async fetchWatchStatus() {
+      const resp = await bridge.getWatchStatus();
+      if (resp.status === "success") {
+        this.watchStatus = resp;
+      }
+    },
+    updateJobProgress(data: JobProgress) {
+      this.jobProgress[data.job_id] = data;
+    },
+    async enqueuePaths(paths: string[], targetLang: string = "Chinese") {
+      if (!paths.length) return;
+      const resp = await bridge.enqueueJobs(paths, targetLang);
+      this.queueMessage =
+        resp.status === "success"
+          ? `Queued ${resp.jobs?.length ?? 0} files.`
+          : `Error: ${resp.message}`;
+    },
+    async setQueuePaused(paused: boolean) {
+      if (paused) {
+        await bridge.pauseQueue();
+      } else {
+        await bridge.resumeQueue();
       }
-      return await bridge.startTask(videoPath, targetLang, resumeMode);
+    },
+    async updateJob(jobId: string, action: string, value: number = 0) {
+      const resp = await bridge.updateJob(jobId, action, value);
+      if (resp.status !== "success") {
+        this.queueMessage = `Error: ${resp.message}`;
+      }
+    },
+    async clearFinishedJobs() {
+      await bridge.clearFinishedJobs();
     },
 
     async checkResumePoint(path: string) {
       return await bridge.checkResumePoint(path);
     },
 
-    updateStatus(data: { message: string; progress: number; stage?: string }) {
+    updateStatus(data: TaskStatus) {
+      if (data.channel === "refine") {
+        // Refinement reports on its own channel next to the main progress
+        this.refineProgress = data.progress;
+        this.refineEta = data.eta ?? null;
+        this.refineMessage = data.message;
+        return;
+      }
       this.statusMessage = data.message;
       this.currentProgress = data.progress;
+      this.currentEta = data.eta ?? null;
       if (data.stage) {
         this.currentStage = data.stage;
       }
     },
-    completeTask(data: { segments: Segment[] }) {
-      this.results = data.segments;
+    async loadSegments() {
+      // First window of the result list; the backend keeps the rest
+      const page = await bridge.getSegments(0, RESULTS_WINDOW);
+      if (page.status === "success") {
+        this.results = page.segments;
+        this.segmentTotal = page.total;
+        this.segmentsVersion = page.version;
+      }
+    },
+    async syncSegments() {
+      // Only what changed in the loaded window since the last sync
+      const resp = await bridge.getSegmentsSince(
+        this.segmentsVersion,
+        0,
+        RESULTS_WINDOW
+      );
+      if (resp.status !== "success" || resp.version <= this.segmentsVersion) {
+        return;
+      }
+      const next = this.results.slice(0, Math.min(resp.total, RESULTS_WINDOW));
+      for (const change of resp.changes) {
+        next[change.index] = change.segment;
+      }
+      this.results = next;
+      this.segmentTotal = resp.total;
+      this.segmentsVersion = resp.version;
+    },
+    showDraft(data: { total: number }) {
+      this.segmentTotal = data.total;
+      this.loadSegments();
+      this.isDraft = true;
+      this.refineProgress = 0;
+      this.refineEta = null;
+      this.refineMessage = "";
+      this.currentStage = "refining";
+    },
+    applyRefinedSegments(data: { total: number; version: number }) {
+      // The backend merged the refined segments over the draft
+      if (data.version > this.segmentsVersion) {
+        this.syncSegments();
+      }
+    },
+    profileReady(data: { path: string; label: string }) {
+      this.lastProfilePath = data.path;
+    },
+    completeTask(data: {
+      total: number;
+      filter_stats?: Record<string, number> | null;
+    }) {
+      this.segmentTotal = data.total;
+      this.loadSegments();
+      this.isDraft = false;
       this.isProcessing = false;
       this.currentProgress = 100;
       this.currentStage = "idle";
-      this.statusMessage = "Task completed successfully.";
+      const dropped = data.filter_stats
+        ? data.filter_stats.input - data.filter_stats.kept
+        : 0;
+      this.statusMessage =
+        dropped > 0
+          ? `Task completed successfully. Dropped ${dropped} junk segments.`
+          : "Task completed successfully.";
     },
     taskFailed(data: { message: string; cancelled?: boolean }) {
       this.isProcessing = false;
+      this.isDraft = false;
       this.currentStage = "idle";
       if (data.cancelled) {
         this.statusMessage = "Task cancelled by user.";
@@ -152,8 +394,38 @@ export const useAppStore = defineStore("app", {
         this.statusMessage = `Error: ${data.message}`;
       }
     },
-    setSelectedFile(path: string | null) {
+    async setSelectedFile(path: string | null) {
       this.selectedFilePath = path;
+      this.audioStreams = [];
+      this.selectedAudioStream = 0;
+      this.timeRanges = null;
+      if (path) {
+        const resp = await bridge.listAudioStreams(path);
+        if (resp.status === "success") {
+          this.audioStreams = resp.streams;
+        }
+      }
+    },
+    setTimeRanges(text: string): boolean {
+      // "0:10:00-0:12:30, 1:02:00-" -> [[600, 750], [3720, null]]
+      const toSeconds = (v: string) =>
+        v
+          .trim()
+          .split(":")
+          .reduce((acc, part) => acc * 60 + Number(part), 0);
+      const ranges: [number, number | null][] = [];
+      for (const part of text.split(",")) {
+        if (!part.trim()) continue;
+        const [start, end] = part.split("-");
+        const s = toSeconds(start ?? "");
+        const e = end && end.trim() ? toSeconds(end) : null;
+        if (Number.isNaN(s) || (e !== null && (Number.isNaN(e) || e <= s))) {
+          return false;
+        }
+        ranges.push([s, e]);
+      }
+      this.timeRanges = ranges.length ? ranges : null;
+      return true;
     },
     setResumeState(data: {
       show: boolean;
@@ -174,5 +446,79 @@ export const useAppStore = defineStore("app", {
     async openPath(type: string) {
       await bridge.openPath(type);
     },
+    async fetchTuningProfile() {
+      const resp = await bridge.getTuningProfile();
+      this.tuning.profile = resp.profile;
+    },
+    async startCalibration() {
+      this.tuning.is_calibrating = true;
+      this.tuning.progress = 0;
+      this.tuning.message = "";
+      const resp = await bridge.runCalibration();
+      if (resp.status !== "started") {
+        this.tuning.is_calibrating = false;
+        this.tuning.message = resp.message || "";
+      }
+    },
+    updateCalibrationProgress(data: { progress: number; message: string }) {
+      this.tuning.progress = data.progress;
+      this.tuning.message = data.message;
+    },
+    completeCalibration(data: { profile: TuningProfile }) {
+      this.tuning.is_calibrating = false;
+      this.tuning.progress = 100;
+      this.tuning.profile = data.profile;
+      this.tuning.message = "";
+    },
+    calibrationFailed(data: { message: string }) {
+      this.tuning.is_calibrating = false;
+      this.tuning.message = data.message;
+    },
+    async fetchModels() {
+      const resp = await bridge.listModels();
+      this.modelStore.models = resp.models;
+    },
+    async runModelStoreOp(op: () => Promise<any>) {
+      this.modelStore.busy = true;
+      this.modelStore.progress = 0;
+      this.modelStore.message = "";
+      const resp = await op();
+      if (resp.status !== "started") {
+        this.modelStore.busy = false;
+        this.modelStore.message = resp.message || "";
+      }
+    },
+    async downloadModel(modelSize: string) {
+      await this.runModelStoreOp(() => bridge.downloadModel(modelSize));
+    },
+    async importModel(sourcePath: string, modelSize: string) {
+      await this.runModelStoreOp(() =>
+        bridge.importModel(sourcePath, modelSize),
+      );
+    },
+    async benchmarkModelLoad(modelSize: string, computeType: string) {
+      await this.runModelStoreOp(() =>
+        bridge.benchmarkModelLoad(modelSize, computeType),
+      );
+    },
+    async removeModel(modelSize: string, computeType: string) {
+      const resp = await bridge.removeModel(modelSize, computeType);
+      if (resp.status === "success") {
+        this.modelStore.models = resp.models;
+      }
+    },
+    updateModelStoreProgress(data: { progress: number; message: string }) {
+      this.modelStore.progress = data.progress;
+      this.modelStore.message = data.message;
+    },
+    modelStoreUpdated(data: { models: StoredModel[] }) {
+      this.modelStore.busy = false;
+      this.modelStore.models = data.models;
+      this.modelStore.message = "";
+    },
+    modelStoreFailed(data: { message: string }) {
+      this.modelStore.busy = false;
+      this.modelStore.message = data.message;
+    },
   },
 });
@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 import platform
 import sys
@@ -118,8 +119,15 @@ def main() -> None:
     bridge.set_window(window)
     webview.start(debug=dev_mode)
 
+    # Release the transcription worker (and its model memory) on exit
+    from backend.core.whisper_worker import whisper_worker
+
+    whisper_worker.terminate()
+
 
 if __name__ == "__main__":
+    # Required for the spawned Whisper worker in frozen builds
+    multiprocessing.freeze_support()
     try:
         main()
     except Exception as e:
@@ -0,0 +1,46 @@
+import argparse
+import os
+import sys
+
+# Allow running as `python scripts/benchmark_presets.py` from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core.presets import DECODING_PRESETS  # noqa: E402
+from backend.core.whisper_svc import whisper_svc  # noqa: E402
+
+
+def main():
+    """Reports the real-time factor of each decoding preset on a media file."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("media", help="Audio or video file to sample.")
+    parser.add_argument(
+        "--presets",
+        nargs="+",
+        default=list(DECODING_PRESETS),
+        choices=list(DECODING_PRESETS),
+        help="Presets to compare; agreement is measured against the last one.",
+    )
+    parser.add_argument(
+        "--seconds",
+        type=float,
+        default=120.0,
+        help="Length of the sample taken from the start of the media.",
+    )
+    args = parser.parse_args()
+
+    results = whisper_svc.benchmark_presets(
+        args.media, presets=args.presets, max_seconds=args.seconds
+    )
+
+    print(f"{'preset':<10}{'model':<10}{'rtf':>8}{'speedup':>9}{'segs':>6}{'agree':>8}")
+    slowest = max((r["rtf"] for r in results), default=0.0)
+    for r in results:
+        speedup = slowest / r["rtf"] if r["rtf"] else 0.0
+        print(
+            f"{r['preset']:<10}{r['model_size']:<10}{r['rtf']:>8.3f}"
+            f"{speedup:>8.1f}x{r['segments']:>6}{r['agreement']:>8.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
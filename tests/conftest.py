@@ -0,0 +1,7 @@
+"""Shared pytest set-up: keep app data of the tests out of the user's profile."""
+
+import os
+import tempfile
+
+# appdirs reads XDG_DATA_HOME when services are imported, so set it first
+os.environ["XDG_DATA_HOME"] = tempfile.mkdtemp(prefix="unisub-tests-")
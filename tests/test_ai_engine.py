@@ -0,0 +1,55 @@
+import threading
+import time
+import types
+from typing import Any, List
+
+import pytest
+
+from backend.core.ai_engine import AIEngine
+
+
+class BlockingClient:
+    """Stands in for the OpenAI client; a request waits until it is closed."""
+
+    def __init__(self) -> None:
+        self.closed = threading.Event()
+        self.closed_by: List[str] = []
+        self.chat = types.SimpleNamespace(
+            completions=types.SimpleNamespace(create=self._create)
+        )
+
+    def _create(self, **kwargs: Any) -> Any:
+        self.closed.wait(5)
+        raise ConnectionError("connection closed")
+
+    def close(self) -> None:
+        self.closed_by.append(threading.current_thread().name)
+        self.closed.set()
+
+
+def test_cancelled_batch_leaves_closing_to_the_helper(monkeypatch) -> None:
+    client = BlockingClient()
+    engine = AIEngine()
+    monkeypatch.setattr(engine, "_get_client", lambda **kwargs: client)
+    cancel_event = threading.Event()
+    threading.Timer(0.1, cancel_event.set).start()
+
+    with pytest.raises(InterruptedError):
+        engine.translate_batch(["Hello"], cancel_event=cancel_event)
+
+    assert client.closed.wait(2)
+    time.sleep(0.1)
+    assert len(client.closed_by) == 1
+    assert client.closed_by[0] != threading.current_thread().name
+
+
+def test_failed_batch_closes_the_client(monkeypatch) -> None:
+    client = BlockingClient()
+    client.closed.set()
+    engine = AIEngine()
+    monkeypatch.setattr(engine, "_get_client", lambda **kwargs: client)
+
+    with pytest.raises(ConnectionError):
+        engine.translate_batch(["Hello"])
+
+    assert client.closed_by == [threading.current_thread().name]
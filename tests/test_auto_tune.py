@@ -0,0 +1,105 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pytest
+
+from backend.core.whisper_svc import FasterWhisperService
+from backend.models.schema import WhisperConfig
+from backend.services.config_mgr import config_mgr
+from backend.services.model_store import model_store
+from backend.services.tuner_mgr import SAMPLING_RATE, TunerManager, tuner_mgr
+
+PROFILE = {"compute_type": "int8_float32", "cpu_threads": 6}
+
+
+@pytest.fixture(autouse=True)
+def whisper_config(monkeypatch) -> None:
+    config = config_mgr.config.whisper
+    monkeypatch.setattr(config, "device", "cpu")
+    monkeypatch.setattr(config, "compute_type", "default")
+    monkeypatch.setattr(config, "cpu_threads", 0)
+
+    def _no_calibration(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("calibration must not run on the job path")
+
+    monkeypatch.setattr(tuner_mgr, "calibrate", _no_calibration)
+
+
+def _profile(monkeypatch, profile: Optional[Dict[str, Any]]) -> None:
+    monkeypatch.setattr(tuner_mgr, "get_profile", lambda *args: profile)
+
+
+def test_profile_is_ignored_without_auto_tune(monkeypatch) -> None:
+    assert not WhisperConfig().auto_tune
+    _profile(monkeypatch, PROFILE)
+    monkeypatch.setattr(config_mgr.config.whisper, "auto_tune", False)
+
+    assert FasterWhisperService()._resolve_runtime("base") == ("int8", 0)
+
+
+def test_defaults_until_calibrated(monkeypatch) -> None:
+    _profile(monkeypatch, None)
+    monkeypatch.setattr(config_mgr.config.whisper, "auto_tune", True)
+
+    assert FasterWhisperService()._resolve_runtime("base") == ("int8", 0)
+
+
+def test_profile_applies_where_not_configured(monkeypatch) -> None:
+    _profile(monkeypatch, PROFILE)
+    monkeypatch.setattr(config_mgr.config.whisper, "auto_tune", True)
+    service = FasterWhisperService()
+
+    assert service._resolve_runtime("base") == ("int8_float32", 6)
+    monkeypatch.setattr(config_mgr.config.whisper, "cpu_threads", 2)
+    assert service._resolve_runtime("base") == ("int8_float32", 2)
+
+
+def test_calibration_decodes_the_sample_like_a_job(monkeypatch, tmp_path) -> None:
+    import faster_whisper
+
+    calls: List[Dict[str, Any]] = []
+
+    class _Model:
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            pass
+
+        def transcribe(self, audio: Any, **kwargs: Any) -> Any:
+            calls.append({"seconds": audio.shape[0] / SAMPLING_RATE, **kwargs})
+            return iter([]), None
+
+    monkeypatch.setattr(faster_whisper, "WhisperModel", _Model)
+    monkeypatch.setattr(model_store, "resolve", lambda *args, **kwargs: ("base", True))
+    monkeypatch.setattr(config_mgr.config.whisper, "isolated_worker", False)
+    monkeypatch.setattr(config_mgr.config.whisper, "model_size", "base")
+    monkeypatch.setattr(config_mgr.config.whisper, "preset", "accurate")
+    tuner = TunerManager()
+    tuner.profile_path = str(tmp_path / "tuning.json")
+    monkeypatch.setattr(tuner, "_candidates", lambda device: [PROFILE])
+    monkeypatch.setattr("backend.core.whisper_svc.tuner_mgr", tuner)
+    service = FasterWhisperService()
+    speech = np.zeros(8 * SAMPLING_RATE, dtype=np.float32)
+    monkeypatch.setattr(service, "_calibration_audio", lambda *args: speech)
+
+    profile = service.calibrate("talk.wav")
+
+    assert profile is not None and profile["sample"] == "speech"
+    # Warm-up on the first two seconds, then the timed run on all of it
+    assert [call["seconds"] for call in calls] == [2.0, 8.0]
+    assert calls[1]["beam_size"] == 8 and not calls[1]["vad_filter"]
+    assert tuner.get_profile("base", "cpu") == profile
+
+
+def test_calibration_falls_back_to_a_synthetic_signal(monkeypatch) -> None:
+    captured: Dict[str, Any] = {}
+
+    def _calibrate(model_size: str, device: str, **kwargs: Any) -> dict:
+        captured.update(kwargs)
+        return {}
+
+    monkeypatch.setattr(tuner_mgr, "calibrate", _calibrate)
+    monkeypatch.setattr(config_mgr.config.whisper, "isolated_worker", False)
+
+    FasterWhisperService().calibrate("missing.wav")
+
+    assert captured["audio"] is None
+    assert captured["transcribe_kwargs"]["beam_size"] > 1
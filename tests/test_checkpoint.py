@@ -0,0 +1,152 @@
+import json
+import threading
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from backend.core import pipeline
+from backend.core.checkpoint import TranscriptCheckpoint
+from backend.services.config_mgr import config_mgr
+
+SETTINGS = {"model": "small", "preset": "balanced", "audio_stream": 0}
+
+
+def _segment(start: float) -> Dict[str, Any]:
+    return {"start": start, "end": start + 1.0, "text": f"at {start:.0f}"}
+
+
+@pytest.fixture
+def media(tmp_path) -> str:
+    return str(tmp_path / "a.mkv")
+
+
+@pytest.fixture
+def whisper_config(monkeypatch) -> None:
+    config = config_mgr.config.whisper
+    monkeypatch.setattr(config, "model_size", "small")
+    monkeypatch.setattr(config, "preset", "balanced")
+    monkeypatch.setattr(config, "decoding", {})
+
+
+def test_segments_and_header_round_trip(media) -> None:
+    checkpoint = TranscriptCheckpoint(media)
+    checkpoint.open(SETTINGS)
+    checkpoint.append(_segment(0))
+    checkpoint.append(_segment(1))
+    checkpoint.mark_complete()
+
+    loaded = TranscriptCheckpoint(media)
+    assert loaded.load() == ([_segment(0), _segment(1)], True)
+    assert loaded.settings == SETTINGS
+    assert loaded.matches(SETTINGS)
+    assert not loaded.matches({**SETTINGS, "model": "tiny"})
+
+
+def test_header_is_only_written_once(media) -> None:
+    checkpoint = TranscriptCheckpoint(media)
+    checkpoint.open(SETTINGS)
+    checkpoint.append(_segment(0))
+    checkpoint.close()
+    # Resuming appends to the existing file, header included
+    checkpoint.open({**SETTINGS, "model": "tiny"})
+    checkpoint.append(_segment(1))
+    checkpoint.close()
+
+    with open(checkpoint.path, encoding="utf-8") as f:
+        assert sum("__settings__" in line for line in f) == 1
+    assert checkpoint.load()[0] == [_segment(0), _segment(1)]
+    assert checkpoint.settings == SETTINGS
+
+
+def test_truncated_line_is_skipped_and_terminated(media) -> None:
+    checkpoint = TranscriptCheckpoint(media)
+    checkpoint.open(SETTINGS)
+    checkpoint.append(_segment(0))
+    checkpoint.close()
+    with open(checkpoint.path, "a", encoding="utf-8") as f:
+        f.write('{"start": 1.0, "en')
+
+    assert checkpoint.load() == ([_segment(0)], False)
+    checkpoint.append(_segment(2))
+    checkpoint.close()
+    assert checkpoint.load() == ([_segment(0), _segment(2)], False)
+
+
+def test_replace_keeps_the_header(media) -> None:
+    checkpoint = TranscriptCheckpoint(media)
+    checkpoint.open(SETTINGS)
+    checkpoint.append(_segment(0))
+    checkpoint.close()
+
+    checkpoint.replace([{**_segment(0), "translated_text": "x"}], complete=True)
+
+    assert checkpoint.load()[1]
+    assert checkpoint.settings == SETTINGS
+
+
+def test_checkpoint_without_header_matches_anything(media) -> None:
+    with open(media + ".temp.json", "w", encoding="utf-8") as f:
+        json.dump([_segment(0)], f)
+
+    checkpoint = TranscriptCheckpoint(media)
+    assert checkpoint.exists()
+    assert checkpoint.load() == ([_segment(0)], True)
+    assert checkpoint.matches(SETTINGS)
+
+    checkpoint.reset()
+    assert not checkpoint.exists()
+
+
+def test_load_checkpoint_ignores_other_settings(media, whisper_config) -> None:
+    checkpoint = TranscriptCheckpoint(media)
+    checkpoint.replace([_segment(0)], complete=True, settings=SETTINGS)
+
+    assert pipeline.load_checkpoint(media)[1:] == ([_segment(0)], True)
+    assert pipeline.load_checkpoint(media, audio_stream=1)[1:] == ([], False)
+    assert pipeline.load_checkpoint(media, {"preset": "accurate"})[1:] == ([], False)
+    assert pipeline.load_checkpoint(media, {"model_size": "tiny"})[1:] == ([], False)
+
+
+def test_transcribe_stage_starts_over_for_other_settings(
+    monkeypatch, media, whisper_config
+) -> None:
+    TranscriptCheckpoint(media).replace(
+        [_segment(0)], complete=False, settings={**SETTINGS, "model": "tiny"}
+    )
+    calls: List[float] = []
+
+    def _transcribe(*args: Any, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        calls.append(kwargs["start_offset"])
+        yield _segment(5)
+
+    monkeypatch.setattr(pipeline.whisper_svc, "transcribe", _transcribe)
+    job = {"path": media, "options": {}, "audio_stream": 0}
+    context: Dict[str, Any] = {}
+
+    pipeline.transcribe_stage(job, context, lambda *args: None, threading.Event())
+
+    # Not resumed after the segment of the other model, and not kept
+    assert calls == [0.0]
+    assert context["segments"] == [_segment(5)]
+    checkpoint = TranscriptCheckpoint(media)
+    assert checkpoint.load() == ([_segment(5)], True)
+    assert checkpoint.settings == SETTINGS
+
+
+def test_header_records_the_model_that_loaded(
+    monkeypatch, media, whisper_config
+) -> None:
+    def _transcribe(*args: Any, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        # The resource governor downgraded small to base
+        kwargs["model_callback"]("base", "int8")
+        yield _segment(0)
+
+    monkeypatch.setattr(pipeline.whisper_svc, "transcribe", _transcribe)
+    checkpoint = TranscriptCheckpoint(media)
+
+    pipeline.transcribe_media(media, checkpoint, [])
+
+    checkpoint.load()
+    assert checkpoint.settings == {**SETTINGS, "model": "base"}
+    # A full-size run does not resume the downgraded transcript
+    assert pipeline.load_checkpoint(media)[1:] == ([], False)
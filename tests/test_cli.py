@@ -0,0 +1,111 @@
+import json
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+from backend import cli
+from backend.core import pipeline
+
+
+def _media(tmp_path, *names: str) -> List[str]:
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"media")
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def stages(monkeypatch) -> List[str]:
+    """Replaces the pipeline with one stage that fails files named 'bad'."""
+    ran: List[str] = []
+
+    def _subtitle(job: Dict[str, Any], context: Dict[str, Any], report, cancel) -> None:
+        ran.append(os.path.basename(job["path"]))
+        if "bad" in job["path"]:
+            raise RuntimeError("cannot decode")
+        context["srt_path"] = pipeline.srt_path_for(job["path"])
+
+    monkeypatch.setattr(
+        pipeline, "job_stages", lambda: [("transcribe", _subtitle, lambda: 1)]
+    )
+    return ran
+
+
+def test_override_is_parsed_as_json_where_possible() -> None:
+    assert cli.parse_override("whisper.beam_size=3") == {"whisper": {"beam_size": 3}}
+    assert cli.parse_override('whisper.decoding={"beam_size": 2}') == {
+        "whisper": {"decoding": {"beam_size": 2}}
+    }
+    assert cli.parse_override("app.flag=true") == {"app": {"flag": True}}
+    assert cli.parse_override("whisper.model_size=small") == {
+        "whisper": {"model_size": "small"}
+    }
+    assert cli.parse_override("a.b=") == {"a": {"b": ""}}
+    with pytest.raises(ValueError):
+        cli.parse_override("whisper.model_size")
+    with pytest.raises(ValueError):
+        cli.parse_override("=small")
+
+
+def test_media_is_collected_from_globs_and_folders(tmp_path) -> None:
+    a, b, c, _ = _media(tmp_path, "x/a.mkv", "x/deep/b.mp4", "c.wav", "x/notes.txt")
+
+    found = cli.collect_media([str(tmp_path / "*.wav"), str(tmp_path / "x"), c])
+
+    assert found == [c, a, b]
+    assert cli.collect_media([str(tmp_path / "**" / "*.mp4")]) == [b]
+
+
+def test_srt_newer_than_the_media_is_up_to_date(tmp_path) -> None:
+    (media,) = _media(tmp_path, "a.mkv")
+    assert not cli.is_up_to_date(media)
+
+    srt = pipeline.srt_path_for(media)
+    with open(srt, "w", encoding="utf-8") as f:
+        f.write("")
+    assert cli.is_up_to_date(media)
+
+    stat = os.stat(srt)
+    os.utime(media, (stat.st_atime, stat.st_mtime + 10))
+    assert not cli.is_up_to_date(media)
+
+
+def test_batch_exit_codes(tmp_path, stages, capsys) -> None:
+    good, bad = _media(tmp_path, "good.wav", "bad.wav")
+    args = cli.build_parser().parse_args([good, "--json"])
+    assert cli.run(args) == cli.EXIT_OK
+
+    args = cli.build_parser().parse_args([good, bad, "--json"])
+    assert cli.run(args) == cli.EXIT_FAILED
+    assert stages == ["good.wav", "good.wav", "bad.wav"]
+
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    summary = events[-1]
+    assert summary["event"] == "summary"
+    assert (summary["completed"], summary["failed"], summary["skipped"]) == (1, 1, 0)
+    finished = [e for e in events if e["event"] == "job_finished"]
+    assert finished[-1]["message"] == "cannot decode"
+
+
+def test_up_to_date_files_are_skipped_unless_forced(tmp_path, stages) -> None:
+    (media,) = _media(tmp_path, "a.wav")
+    with open(pipeline.srt_path_for(media), "w", encoding="utf-8") as f:
+        f.write("")
+
+    assert cli.run(cli.build_parser().parse_args([media])) == cli.EXIT_OK
+    assert stages == []
+    assert cli.run(cli.build_parser().parse_args([media, "--force"])) == cli.EXIT_OK
+    assert stages == ["a.wav"]
+
+
+def test_usage_errors(tmp_path, monkeypatch, capsys) -> None:
+    # The captured stderr is gone after the test
+    monkeypatch.setattr(cli, "_logs_to_stderr", lambda: None)
+    assert cli.main([]) == cli.EXIT_USAGE
+    assert cli.main([str(tmp_path), "--set", "no-value"]) == cli.EXIT_USAGE
+    assert "expected section.key=value" in capsys.readouterr().err
+    assert cli.run(cli.build_parser().parse_args([str(tmp_path)])) == cli.EXIT_USAGE
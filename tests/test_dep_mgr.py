@@ -0,0 +1,159 @@
+import glob
+import http.server
+import io
+import os
+import threading
+import zipfile
+from typing import Dict, Iterator, List, Optional
+
+import pytest
+
+from backend.services.dep_mgr import DependencyManager
+
+WHEEL = b"0123456789" * 1000
+
+
+class WheelServer(http.server.ThreadingHTTPServer):
+    """Serves WHEEL-like bodies by path, honouring Range requests."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), WheelHandler)
+        self.files: Dict[str, bytes] = {}
+        self.ranges: List[Optional[str]] = []
+        # Bytes to send of the next response before dropping the connection
+        self.cut_after: Optional[int] = None
+
+    def url(self, name: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/{name}"
+
+
+class WheelHandler(http.server.BaseHTTPRequestHandler):
+    server: WheelServer
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        body = self.server.files[self.path.lstrip("/")]
+        header = self.headers.get("Range")
+        self.server.ranges.append(header)
+        start = int(header[len("bytes=") : -1]) if header else 0
+        if start >= len(body) and header:
+            self.send_response(416)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(206 if header else 200)
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+        data = body[start:]
+        if self.server.cut_after is not None:
+            data = data[: self.server.cut_after]
+            self.server.cut_after = None
+            self.close_connection = True
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def server() -> Iterator[WheelServer]:
+    server = WheelServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _wheel() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as wheel:
+        wheel.writestr("nvidia/cublas/lib/libcublas.so.12", b"lib")
+    return buffer.getvalue()
+
+
+def test_part_file_is_named_after_the_url(tmp_path) -> None:
+    manager = DependencyManager()
+    path = str(tmp_path / "pkg.whl")
+
+    assert manager._part_path("https://a/1.whl", path) != manager._part_path(
+        "https://a/2.whl", path
+    )
+    assert manager._part_path("https://a/1.whl", path).endswith(".part")
+
+
+def test_partial_download_is_resumed(tmp_path, server) -> None:
+    manager = DependencyManager()
+    server.files["pkg.whl"] = WHEEL
+    url, path = server.url("pkg.whl"), str(tmp_path / "pkg.whl")
+    with open(manager._part_path(url, path), "wb") as f:
+        f.write(WHEEL[:4000])
+
+    manager._download(url, path)
+
+    assert server.ranges == ["bytes=4000-"]
+    with open(path, "rb") as f:
+        assert f.read() == WHEEL
+    assert glob.glob(path + ".*.part") == []
+
+
+def test_part_of_another_url_is_not_resumed(tmp_path, server) -> None:
+    manager = DependencyManager()
+    server.files["new.whl"] = WHEEL
+    path = str(tmp_path / "pkg.whl")
+    stale = manager._part_path(server.url("old.whl"), path)
+    with open(stale, "wb") as f:
+        f.write(b"x" * 4000)
+
+    manager._download(server.url("new.whl"), path)
+
+    assert server.ranges == [None]
+    assert not os.path.exists(stale)
+    with open(path, "rb") as f:
+        assert f.read() == WHEEL
+
+
+def test_rejected_range_restarts_the_download(tmp_path, server) -> None:
+    manager = DependencyManager()
+    server.files["pkg.whl"] = WHEEL
+    url, path = server.url("pkg.whl"), str(tmp_path / "pkg.whl")
+    # Longer than the file, as after the wheel was replaced by a smaller one
+    with open(manager._part_path(url, path), "wb") as f:
+        f.write(b"x" * (len(WHEEL) + 10))
+
+    manager._download(url, path)
+
+    assert server.ranges == [f"bytes={len(WHEEL) + 10}-", None]
+    with open(path, "rb") as f:
+        assert f.read() == WHEEL
+
+
+def _install(manager: DependencyManager, tmp_path, monkeypatch, url: str) -> bool:
+    monkeypatch.setattr(manager, "get_lib_dir", lambda: str(tmp_path))
+    monkeypatch.setattr(manager, "_get_wheel_url", lambda name: url)
+    monkeypatch.setattr(manager, "PYPI_PACKAGES", ["nvidia-cublas-cu12"])
+    monkeypatch.setattr(manager, "PACKAGE_CHECKS", {})
+    return manager.download_deps()
+
+
+def test_cut_download_is_kept_for_resuming(tmp_path, server, monkeypatch) -> None:
+    manager = DependencyManager()
+    server.files["pkg.whl"] = _wheel()
+    server.cut_after = 10
+    url = server.url("pkg.whl")
+
+    assert not _install(manager, tmp_path, monkeypatch, url)
+    parts = glob.glob(str(tmp_path / "*.part"))
+    assert [os.path.getsize(p) for p in parts] == [10]
+
+    assert _install(manager, tmp_path, monkeypatch, url)
+    assert server.ranges[-1] == "bytes=10-"
+    assert os.path.exists(tmp_path / "libcublas.so.12")
+    assert glob.glob(str(tmp_path / "*.part")) == []
+
+
+def test_failed_install_leaves_no_files(tmp_path, server, monkeypatch) -> None:
+    manager = DependencyManager()
+    server.files["pkg.whl"] = b"not a zip file"
+
+    assert not _install(manager, tmp_path, monkeypatch, server.url("pkg.whl"))
+
+    assert os.listdir(tmp_path) == []
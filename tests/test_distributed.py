@@ -0,0 +1,193 @@
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import pytest
+
+from backend.core import distributed
+from backend.core.checkpoint import TranscriptCheckpoint
+from backend.core.srt_utils import load_srt
+from backend.services.config_mgr import config_mgr
+from backend.services.task_queue import LeaseQueue
+
+CHUNK_SECONDS = 10.0
+# Simulated transcription time of one chunk
+TRANSCRIBE_SECONDS = 0.3
+
+
+def _fake_transcribe(
+    media_path: str,
+    options: Optional[Dict[str, Any]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    time_ranges: Optional[List[List[Optional[float]]]] = None,
+    audio_stream: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    assert time_ranges is not None
+    start = time_ranges[0][0] or 0.0
+    time.sleep(TRANSCRIBE_SECONDS)
+    yield {"start": start + 1.0, "end": start + 2.0, "text": f"at {start:.0f}"}
+
+
+def _fake_translate(
+    segments: List[Dict[str, Any]],
+    target_lang: str,
+    cancel_event: Optional[threading.Event] = None,
+) -> List[Dict[str, Any]]:
+    return [{**s, "translated_text": s["text"].upper()} for s in segments]
+
+
+@pytest.fixture(autouse=True)
+def fakes(monkeypatch) -> None:
+    options = config_mgr.config.distributed
+    monkeypatch.setattr(options, "chunk_seconds", CHUNK_SECONDS)
+    monkeypatch.setattr(options, "poll_interval", 0.02)
+    monkeypatch.setattr(options, "lease_seconds", 30.0)
+    monkeypatch.setattr(config_mgr.config.ai, "batch_size", 2)
+    monkeypatch.setattr(config_mgr.config.whisper.segment_filter, "enabled", False)
+    monkeypatch.setattr(distributed.whisper_svc, "transcribe", _fake_transcribe)
+    monkeypatch.setattr(distributed, "translate_segments", _fake_translate)
+
+
+def _submit(db_path: str, media: str, chunks: int) -> Dict[str, Any]:
+    # Speech every CHUNK_SECONDS, so each region gets its own chunk
+    regions = [
+        (i * CHUNK_SECONDS + 1.0, i * CHUNK_SECONDS + 2.0) for i in range(chunks)
+    ]
+
+    def speech_regions(*args: Any, **kwargs: Any) -> Any:
+        return regions, chunks * CHUNK_SECONDS
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(distributed.whisper_svc, "speech_regions", speech_regions)
+        return distributed.submit_job(LeaseQueue(db_path), media, "English")
+
+
+def _run_workers(db_path: str, job_id: str, workers: int) -> float:
+    """Runs workers until the job ends; returns the wall time."""
+    stop_event = threading.Event()
+    threads = [
+        threading.Thread(
+            target=distributed.run_worker,
+            # One connection per worker, like separate processes
+            args=(LeaseQueue(db_path), stop_event, f"w{i}"),
+            daemon=True,
+        )
+        for i in range(workers)
+    ]
+    queue = LeaseQueue(db_path)
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    deadline = started + 30
+    while queue.get_job(job_id)["status"] not in ("completed", "failed"):
+        assert time.monotonic() < deadline, "job did not finish"
+        time.sleep(0.01)
+    elapsed = time.monotonic() - started
+    stop_event.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    return elapsed
+
+
+def test_plan_chunks_cuts_in_silences() -> None:
+    regions = [(1.0, 4.0), (8.0, 12.0), (14.0, 20.0)]
+
+    assert distributed.plan_chunks(regions, 10.0) == [[0.0, 13.0], [13.0, None]]
+    assert distributed.plan_chunks([], 10.0) == [[0.0, None]]
+
+
+def test_job_runs_through_every_stage(tmp_path) -> None:
+    db_path = str(tmp_path / "tasks.db")
+    media = str(tmp_path / "a.wav")
+    job = _submit(db_path, media, chunks=3)
+    queue = LeaseQueue(db_path)
+    assert queue.progress(job["id"]) == {"transcribe": {"pending": 3}}
+
+    _run_workers(db_path, job["id"], workers=2)
+
+    finished = queue.get_job(job["id"])
+    assert finished["status"] == "completed"
+    # 3 segments in batches of 2, then one merge; none created twice
+    assert queue.progress(job["id"]) == {
+        "transcribe": {"done": 3},
+        "translate": {"done": 2},
+        "merge": {"done": 1},
+    }
+    segments = load_srt(finished["srt_path"])
+    # Chunks are cut half way between speech regions
+    assert [s["translated_text"] for s in segments] == ["AT 0", "AT 6", "AT 16"]
+    _, complete = TranscriptCheckpoint(media).load()
+    assert complete
+    checkpoint = TranscriptCheckpoint(media)
+    checkpoint.load()
+    assert checkpoint.settings == distributed.whisper_svc.transcript_settings()
+
+
+def test_complete_checkpoint_skips_transcription(tmp_path) -> None:
+    db_path = str(tmp_path / "tasks.db")
+    media = str(tmp_path / "a.wav")
+    TranscriptCheckpoint(media).replace(
+        [{"start": 0.0, "end": 1.0, "text": "done before"}], complete=True
+    )
+
+    job = _submit(db_path, media, chunks=3)
+
+    assert LeaseQueue(db_path).progress(job["id"]) == {"translate": {"pending": 1}}
+
+
+def test_more_workers_finish_sooner(tmp_path) -> None:
+    chunks = 4
+    single = _submit(str(tmp_path / "one.db"), str(tmp_path / "one.wav"), chunks)
+    several = _submit(str(tmp_path / "many.db"), str(tmp_path / "many.wav"), chunks)
+
+    one = _run_workers(str(tmp_path / "one.db"), single["id"], workers=1)
+    many = _run_workers(str(tmp_path / "many.db"), several["id"], workers=chunks)
+
+    assert one >= chunks * TRANSCRIBE_SECONDS
+    assert many < one * 0.6
+
+
+def test_worker_retries_after_database_errors(tmp_path, monkeypatch) -> None:
+    db_path = str(tmp_path / "tasks.db")
+    job = _submit(db_path, str(tmp_path / "a.wav"), chunks=1)
+    monkeypatch.setattr(distributed, "MAX_CLAIM_BACKOFF", 0.05)
+    queue = LeaseQueue(db_path)
+    claim = queue.claim
+    errors = [sqlite3.OperationalError("database is locked")] * 2
+
+    def _flaky_claim(*args: Any, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        if errors:
+            raise errors.pop()
+        return claim(*args, **kwargs)
+
+    monkeypatch.setattr(queue, "claim", _flaky_claim)
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=distributed.run_worker, args=(queue, stop_event, "w1"), daemon=True
+    )
+    thread.start()
+    deadline = time.monotonic() + 30
+    while queue.get_job(job["id"])["status"] != "completed":
+        assert time.monotonic() < deadline, "worker did not recover"
+        time.sleep(0.01)
+    stop_event.set()
+    thread.join(timeout=5)
+
+    assert not errors
+    assert not thread.is_alive()
+
+
+def test_checkpoint_of_other_settings_is_ignored(tmp_path) -> None:
+    db_path = str(tmp_path / "tasks.db")
+    media = str(tmp_path / "a.wav")
+    settings = {**distributed.whisper_svc.transcript_settings(), "audio_stream": 1}
+    TranscriptCheckpoint(media).replace(
+        [{"start": 0.0, "end": 1.0, "text": "other track"}],
+        complete=True,
+        settings=settings,
+    )
+
+    job = _submit(db_path, media, chunks=3)
+
+    assert LeaseQueue(db_path).progress(job["id"]) == {"transcribe": {"pending": 3}}
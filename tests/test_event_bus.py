@@ -0,0 +1,113 @@
+import json
+import re
+import threading
+from typing import Any, List, Tuple
+
+import pytest
+
+from backend.api.event_bus import EventBus
+from backend.services.config_mgr import config_mgr
+
+CALL = re.compile(r'window\.onBackendEvent\(("[^"]*"), (.*?)\);(?=window|$)')
+
+
+class Recorder:
+    """Collects what the bus delivers, one list of events per flush."""
+
+    def __init__(self) -> None:
+        self.flushes: List[List[Tuple[str, Any]]] = []
+        self.delivered = threading.Event()
+
+    def __call__(self, script: str) -> None:
+        self.flushes.append(
+            [
+                (json.loads(name), json.loads(data))
+                for name, data in CALL.findall(script)
+            ]
+        )
+        self.delivered.set()
+
+    @property
+    def events(self) -> List[Tuple[str, Any]]:
+        return [event for flush in self.flushes for event in flush]
+
+
+@pytest.fixture
+def slow_rate(monkeypatch) -> None:
+    # One delivery per second, so everything published at once is coalesced
+    monkeypatch.setattr(config_mgr.config.app, "ui_event_rate", 1.0)
+
+
+def _deliver(bus: EventBus) -> Recorder:
+    recorder = Recorder()
+    bus.start(recorder)
+    bus.stop()
+    return recorder
+
+
+def test_progress_keeps_the_latest_per_key(slow_rate) -> None:
+    bus = EventBus()
+    for progress in range(5):
+        bus.publish("job_progress", {"job_id": "a", "progress": progress})
+        bus.publish("job_progress", {"job_id": "b", "progress": 10 + progress})
+
+    recorder = _deliver(bus)
+
+    assert recorder.events == [
+        ("job_progress", {"job_id": "a", "progress": 4}),
+        ("job_progress", {"job_id": "b", "progress": 14}),
+    ]
+
+
+def test_segment_deltas_are_concatenated(slow_rate) -> None:
+    bus = EventBus()
+    bus.publish("live_segments", {"segments": [1], "total": 1})
+    bus.publish("live_segments", {"segments": [2, 3], "total": 3})
+
+    recorder = _deliver(bus)
+
+    assert recorder.events == [("live_segments", {"segments": [1, 2, 3], "total": 3})]
+
+
+def test_ordered_events_are_kept_in_order_and_not_merged_across(slow_rate) -> None:
+    bus = EventBus()
+    bus.publish("job_progress", {"job_id": "a", "progress": 50})
+    data = {"job_id": "a"}
+    bus.publish("task_completed", data)
+    # Changes after publishing are not delivered
+    data["job_id"] = "changed"
+    bus.publish("job_progress", {"job_id": "a", "progress": 0})
+
+    recorder = _deliver(bus)
+
+    assert recorder.events == [
+        ("job_progress", {"job_id": "a", "progress": 50}),
+        ("task_completed", {"job_id": "a"}),
+        ("job_progress", {"job_id": "a", "progress": 0}),
+    ]
+
+
+def test_ordered_events_do_not_wait_for_the_next_tick(monkeypatch) -> None:
+    monkeypatch.setattr(config_mgr.config.app, "ui_event_rate", 0.1)
+    bus = EventBus()
+    recorder = Recorder()
+    bus.start(recorder)
+    try:
+        bus.publish("task_failed", {"message": "first"})
+        assert recorder.delivered.wait(2)
+        recorder.delivered.clear()
+        # Within the 10 s interval, but delivered at once
+        bus.publish("task_failed", {"message": "second"})
+        assert recorder.delivered.wait(2)
+    finally:
+        bus.stop()
+
+    assert [data["message"] for _, data in recorder.events] == ["first", "second"]
+
+
+def test_unserializable_events_are_dropped(slow_rate) -> None:
+    bus = EventBus()
+    bus.publish("task_failed", {"error": object()})
+    bus.publish("task_completed", {})
+
+    assert _deliver(bus).events == [("task_completed", {})]
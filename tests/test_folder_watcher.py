@@ -0,0 +1,75 @@
+import os
+import time
+from typing import Callable, Iterator
+
+import pytest
+
+from backend.services.config_mgr import config_mgr
+from backend.services.folder_watcher import FolderWatcher
+from backend.services.job_queue import JobQueue
+
+TIMEOUT = 10.0
+
+
+@pytest.fixture
+def watcher(tmp_path, monkeypatch) -> Iterator[FolderWatcher]:
+    monkeypatch.setattr(config_mgr.config.watch, "settle_seconds", 0.0)
+    monkeypatch.setattr(config_mgr.config.watch, "poll_interval", 0.1)
+    watcher = FolderWatcher()
+    watcher.db_path = str(tmp_path / "watch.db")
+    yield watcher
+    watcher.stop()
+
+
+@pytest.fixture
+def folder(tmp_path) -> str:
+    path = tmp_path / "in"
+    path.mkdir()
+    return str(path)
+
+
+def _write(path: str, content: bytes) -> str:
+    # Moved in whole, so the watcher never sees a half-written file
+    partial = os.path.join(os.path.dirname(os.path.dirname(path)), ".partial")
+    with open(partial, "wb") as f:
+        f.write(content)
+    os.replace(partial, path)
+    return path
+
+
+def _wait_until(condition: Callable[[], bool], timeout: float = TIMEOUT) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+def test_new_file_is_queued_once(watcher: FolderWatcher, folder: str) -> None:
+    queue = JobQueue(":memory:")
+    path = _write(os.path.join(folder, "a.wav"), b"audio")
+    _write(os.path.join(folder, "notes.txt"), b"text")
+
+    watcher.start(queue, [folder])
+    _wait_until(lambda: watcher.status()["enqueued"] == 1)
+
+    # A copy with the same content is a duplicate
+    _write(os.path.join(folder, "copy.wav"), b"audio")
+    _wait_until(lambda: watcher.status()["duplicates"] == 1)
+    assert [job["path"] for job in queue.list_jobs()] == [path]
+
+
+def test_restart_adopts_unfinished_jobs(watcher: FolderWatcher, folder: str) -> None:
+    queue = JobQueue(":memory:")
+    path = _write(os.path.join(folder, "a.wav"), b"audio")
+    outside = _write(os.path.join(os.path.dirname(folder), "b.wav"), b"other")
+    # Queued by an earlier run of the watcher (or by hand), still pending
+    queue.enqueue([path, outside])
+
+    watcher.start(queue, [folder])
+
+    assert watcher.status()["pending_jobs"] == 1
+    _write(os.path.join(folder, "c.wav"), b"new")
+    _wait_until(lambda: watcher.status()["enqueued"] == 1)
+    paths = sorted(job["path"] for job in queue.list_jobs())
+    assert paths == sorted([path, outside, os.path.join(folder, "c.wav")])
+    assert watcher.status()["duplicates"] == 1
@@ -0,0 +1,311 @@
+import http.client
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pytest
+
+from backend.api.http_api import JobApiServer
+from backend.services.config_mgr import config_mgr
+from backend.services.job_queue import JobQueue
+
+SRT_TEXT = "1\n00:00:00,000 --> 00:00:01,500\nHello\n\n"
+TIMEOUT = 10.0
+
+Response = Tuple[int, Dict[str, str], Any]
+
+
+class Api:
+    """Small client for the server under test."""
+
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self.token: Optional[str] = None
+
+    def connection(self) -> http.client.HTTPConnection:
+        return http.client.HTTPConnection("127.0.0.1", self.port, timeout=TIMEOUT)
+
+    def headers(self, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        headers.update(extra or {})
+        return headers
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        conn = self.connection()
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        conn.request(method, path, body=payload, headers=self.headers(headers))
+        response = conn.getresponse()
+        raw = response.read()
+        conn.close()
+        content_type = response.getheader("Content-Type", "")
+        data: Any = json.loads(raw) if "json" in content_type else raw.decode()
+        return response.status, dict(response.getheaders()), data
+
+
+class Gate:
+    """Holds stub stages until the test lets them finish."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.entered = threading.Event()
+
+
+@pytest.fixture
+def gate() -> Gate:
+    return Gate()
+
+
+@pytest.fixture
+def media(tmp_path) -> List[str]:
+    paths = []
+    for name in ("a.wav", "b.wav", "c.wav"):
+        path = tmp_path / name
+        path.write_bytes(b"RIFF")
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def api(monkeypatch, gate: Gate) -> Iterator[Api]:
+    monkeypatch.setattr(config_mgr.config.api, "token", "")
+    monkeypatch.setattr(config_mgr.config.api, "max_pending", 2)
+    monkeypatch.setattr(config_mgr.config.api, "output_roots", [])
+
+    def _work(
+        job: Dict[str, Any],
+        context: Dict[str, Any],
+        report: Any,
+        cancel_event: threading.Event,
+    ) -> None:
+        gate.entered.set()
+        while not gate.release.wait(0.05):
+            if cancel_event.is_set():
+                raise InterruptedError("cancelled_by_user")
+        report(50.0, "Half way", 1.0)
+        srt_path = os.path.splitext(job["path"])[0] + ".srt"
+        with open(srt_path, "w", encoding="utf-8") as f:
+            f.write(SRT_TEXT)
+        context["srt_path"] = srt_path
+
+    jobs = JobQueue(":memory:")
+    jobs.start([("work", _work, lambda: 1)])
+    server = JobApiServer()
+    _, port = server.start(jobs, host="127.0.0.1", port=0)
+    yield Api(port)
+    gate.release.set()
+    server.stop()
+
+
+def _read_event(response: http.client.HTTPResponse) -> Optional[Tuple[str, Any]]:
+    """Reads one SSE event, skipping comments; None at the end of the stream."""
+    event, data = "", None
+    while True:
+        line = response.fp.readline().decode("utf-8")
+        if not line:
+            return None
+        line = line.rstrip("\n")
+        if line.startswith("event: "):
+            event = line[len("event: ") :]
+        elif line.startswith("data: "):
+            data = json.loads(line[len("data: ") :])
+        elif not line and event:
+            return event, data
+
+
+def _wait_for(api: Api, job_id: str, status: str) -> Dict[str, Any]:
+    conn = api.connection()
+    conn.request("GET", f"/events?job_id={job_id}", headers=api.headers())
+    response = conn.getresponse()
+    job: Dict[str, Any] = {}
+    while job.get("status") != status:
+        item = _read_event(response)
+        assert item is not None, f"stream ended before the job was {status}"
+        if item[0] == "job_updated":
+            job = item[1]
+    conn.close()
+    return job
+
+
+def test_submit_and_get(api: Api, media: List[str]) -> None:
+    status, _, data = api.request("POST", "/jobs", {"paths": media[:1]})
+
+    assert status == 202
+    assert data["status"] == "accepted"
+    job_id = data["jobs"][0]["id"]
+    status, _, data = api.request("GET", f"/jobs/{job_id}")
+    assert status == 200
+    assert data["job"]["path"] == media[0]
+    status, _, data = api.request("GET", "/jobs")
+    assert [job["id"] for job in data["jobs"]] == [job_id]
+
+
+def test_rejects_missing_files_and_bad_bodies(api: Api, tmp_path) -> None:
+    status, _, data = api.request("POST", "/jobs", {"paths": [str(tmp_path / "x")]})
+    assert status == 400
+    assert data["paths"] == [str(tmp_path / "x")]
+
+    status, _, _ = api.request("POST", "/jobs", {"paths": []})
+    assert status == 400
+    status, _, _ = api.request("POST", "/jobs", {"paths": [str(tmp_path)]})
+    assert status == 400
+    status, _, _ = api.request("GET", "/nowhere")
+    assert status == 404
+
+
+def test_backpressure_counts_the_submitted_files(api: Api, media: List[str]) -> None:
+    status, _, _ = api.request("POST", "/jobs", {"paths": media[:1]})
+    assert status == 202
+
+    # One job pending, limit two: two more files would overflow the queue
+    status, headers, data = api.request("POST", "/jobs", {"paths": media[1:]})
+    assert status == 429
+    assert headers["Retry-After"]
+    assert (data["pending"], data["submitted"], data["limit"]) == (1, 2, 2)
+
+    status, _, _ = api.request("POST", "/jobs", {"paths": media[1:2]})
+    assert status == 202
+    status, _, _ = api.request("POST", "/jobs", {"paths": media[2:]})
+    assert status == 429
+
+
+def test_event_stream_and_result(api: Api, gate: Gate, media: List[str]) -> None:
+    _, _, data = api.request("POST", "/jobs", {"paths": media[:1]})
+    job_id = data["jobs"][0]["id"]
+    assert gate.entered.wait(TIMEOUT)
+
+    conn = api.connection()
+    conn.request("GET", f"/events?job_id={job_id}", headers=api.headers())
+    response = conn.getresponse()
+    assert response.getheader("Content-Type") == "text/event-stream"
+    first = _read_event(response)
+    assert first is not None and first[0] == "job_updated"
+    assert first[1]["status"] == "running"
+
+    status, _, data = api.request("GET", f"/jobs/{job_id}/result")
+    assert status == 409
+
+    gate.release.set()
+    events = []
+    while (item := _read_event(response)) is not None:
+        events.append(item)
+    conn.close()
+    progress = [data for event, data in events if event == "job_progress"]
+    assert progress and progress[0]["progress"] == 50.0
+    assert events[-1][0] == "job_updated"
+    assert events[-1][1]["status"] == "completed"
+
+    status, headers, body = api.request("GET", f"/jobs/{job_id}/result")
+    assert status == 200
+    assert headers["Content-Type"].startswith("application/x-subrip")
+    assert body == SRT_TEXT
+    status, _, data = api.request("GET", f"/jobs/{job_id}/result?format=json")
+    assert status == 200
+    assert data["segments"][0]["start"] == 0.0
+    assert data["segments"][0]["end"] == 1.5
+
+
+def test_delete_cancels_then_removes(api: Api, gate: Gate, media: List[str]) -> None:
+    _, _, data = api.request("POST", "/jobs", {"paths": media[:1]})
+    job_id = data["jobs"][0]["id"]
+    assert gate.entered.wait(TIMEOUT)
+
+    status, _, data = api.request("DELETE", f"/jobs/{job_id}")
+    assert (status, data["status"]) == (200, "cancelled")
+    assert _wait_for(api, job_id, "cancelled")["status"] == "cancelled"
+
+    status, _, data = api.request("DELETE", f"/jobs/{job_id}")
+    assert (status, data["status"]) == (200, "removed")
+    status, _, _ = api.request("GET", f"/jobs/{job_id}")
+    assert status == 404
+
+
+def test_token_auth(api: Api, monkeypatch, media: List[str]) -> None:
+    monkeypatch.setattr(config_mgr.config.api, "token", "secret")
+
+    status, _, _ = api.request("GET", "/jobs")
+    assert status == 401
+    api.token = "wrong"
+    status, _, _ = api.request("POST", "/jobs", {"paths": media[:1]})
+    assert status == 401
+    api.token = "secret"
+    status, _, _ = api.request("GET", "/jobs")
+    assert status == 200
+
+
+def test_refuses_browser_style_requests(api: Api, media: List[str]) -> None:
+    body = {"paths": media[:1]}
+
+    status, _, _ = api.request("POST", "/jobs", body, {"Content-Type": "text/plain"})
+    assert status == 415
+    status, _, _ = api.request("POST", "/jobs", body, {"Origin": "http://evil.example"})
+    assert status == 403
+    status, _, _ = api.request(
+        "POST", "/jobs", body, {"Origin": f"http://127.0.0.1:{api.port}"}
+    )
+    assert status == 202
+
+
+def test_refuses_rebound_host_names(api: Api, monkeypatch) -> None:
+    # A page on evil.example whose name now resolves to 127.0.0.1
+    rebound = f"evil.example:{api.port}"
+    status, _, _ = api.request(
+        "GET", "/jobs", headers={"Host": rebound, "Origin": f"http://{rebound}"}
+    )
+    assert status == 403
+    for host in (f"localhost:{api.port}", f"[::1]:{api.port}"):
+        status, _, _ = api.request("GET", "/jobs", headers={"Host": host})
+        assert status == 200
+    status, _, _ = api.request("GET", "/jobs", headers={"Host": "localhost:1"})
+    assert status == 403
+
+    # With a token the caller is authenticated, whatever name it used
+    monkeypatch.setattr(config_mgr.config.api, "token", "secret")
+    api.token = "secret"
+    status, _, _ = api.request("GET", "/jobs", headers={"Host": rebound})
+    assert status == 200
+
+
+def test_public_address_needs_a_token(monkeypatch) -> None:
+    monkeypatch.setattr(config_mgr.config.api, "token", "")
+    server = JobApiServer()
+
+    for host in ("0.0.0.0", "", "192.168.1.5"):
+        with pytest.raises(ValueError, match="api.token"):
+            server.start(JobQueue(":memory:"), host=host, port=0)
+
+    monkeypatch.setattr(config_mgr.config.api, "token", "secret")
+    _, port = server.start(JobQueue(":memory:"), host="0.0.0.0", port=0)
+    server.stop()
+    assert port > 0
+
+
+def test_output_dir_must_be_in_an_allowed_root(
+    api: Api, monkeypatch, media: List[str], tmp_path
+) -> None:
+    allowed = tmp_path / "subs"
+    allowed.mkdir()
+    body = {"paths": media[:1], "output_dir": str(allowed)}
+
+    status, _, _ = api.request("POST", "/jobs", body)
+    assert status == 403
+    monkeypatch.setattr(config_mgr.config.api, "output_roots", [str(tmp_path)])
+    status, _, _ = api.request(
+        "POST", "/jobs", {**body, "output_dir": str(allowed / "..")}
+    )
+    assert status == 202
+    status, _, _ = api.request(
+        "POST", "/jobs", {**body, "output_dir": str(tmp_path / "..")}
+    )
+    assert status == 403
+    status, _, data = api.request("POST", "/jobs", body)
+    assert status == 202
+    assert data["jobs"][0]["output_dir"] == str(allowed)
@@ -0,0 +1,191 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.services.job_queue import JobQueue, expand_media_paths
+
+TIMEOUT = 10.0
+
+
+def _media(tmp_path, *names: str) -> List[str]:
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"media")
+        paths.append(str(path))
+    return paths
+
+
+def _wait_until(condition: Callable[[], bool], timeout: float = TIMEOUT) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def _status(queue: JobQueue, job_id: str) -> str:
+    job = queue.get(job_id)
+    assert job is not None
+    return str(job["status"])
+
+
+def _next_id(queue: JobQueue) -> Optional[str]:
+    job = queue._next_job()
+    return job["id"] if job else None
+
+
+def test_folders_are_expanded_to_media_files(tmp_path) -> None:
+    a, b, _ = _media(tmp_path, "in/a.mkv", "in/sub/b.MP3", "in/notes.txt")
+    (single,) = _media(tmp_path, "c.wav")
+
+    found = expand_media_paths([str(tmp_path / "in"), single, a, "missing.mp4"])
+
+    assert found == [a, b, single]
+
+
+def test_pending_jobs_follow_priority_then_position(tmp_path) -> None:
+    queue = JobQueue(":memory:")
+    first, second, third = (
+        job["id"] for job in queue.enqueue(_media(tmp_path, "a.wav", "b.wav", "c.wav"))
+    )
+
+    assert queue.set_priority(third, 5)
+    assert queue.move_job(second, 0)
+    assert [job["id"] for job in queue.list_jobs()] == [third, second, first]
+
+    assert queue.pause_job(first)
+    assert not queue.resume_job(second)
+    # Paused jobs keep their place but are never picked
+    assert _next_id(queue) == third
+    assert queue.remove_job(third)
+    assert _next_id(queue) == second
+    assert queue.resume_job(first)
+    assert _status(queue, first) == "queued"
+
+
+def test_jobs_run_through_all_stages(tmp_path) -> None:
+    queue = JobQueue(":memory:")
+    seen: List[str] = []
+    events: List[Dict[str, Any]] = []
+
+    def _prepare(job: Dict[str, Any], context: Dict[str, Any], report, cancel) -> None:
+        context["prepared"] = True
+        report(50.0, "preparing")
+
+    def _write(job: Dict[str, Any], context: Dict[str, Any], report, cancel) -> None:
+        assert context["prepared"]
+        seen.append(job["path"])
+        context["srt_path"] = job["path"] + ".srt"
+
+    def _listener(event: str, data: Dict[str, Any]) -> None:
+        if event == "job_progress":
+            events.append(data)
+
+    (path,) = _media(tmp_path, "a.wav")
+    (job,) = queue.enqueue([path])
+    queue.start(
+        [("prepare", _prepare, lambda: 1), ("write", _write, lambda: 1)], _listener
+    )
+
+    _wait_until(lambda: _status(queue, job["id"]) == "completed")
+    finished = queue.get(job["id"])
+    assert finished is not None and finished["srt_path"] == path + ".srt"
+    assert seen == [path]
+    assert events[0]["stage"] == "prepare" and events[0]["progress"] == 50.0
+
+
+def test_failed_job_can_be_retried(tmp_path) -> None:
+    queue = JobQueue(":memory:")
+    attempts: List[str] = []
+
+    def _flaky(job: Dict[str, Any], context: Dict[str, Any], report, cancel) -> None:
+        attempts.append(job["id"])
+        if len(attempts) == 1:
+            raise ValueError("decoder broke")
+
+    (job,) = queue.enqueue(_media(tmp_path, "a.wav"))
+    queue.start([("transcribe", _flaky, lambda: 1)])
+
+    _wait_until(lambda: _status(queue, job["id"]) == "failed")
+    failed = queue.get(job["id"])
+    assert failed is not None and failed["message"] == "decoder broke"
+
+    assert queue.retry_job(job["id"])
+    _wait_until(lambda: _status(queue, job["id"]) == "completed")
+    assert len(attempts) == 2
+    assert queue.clear_finished() == 1
+    assert queue.list_jobs() == []
+
+
+def test_running_job_is_cancelled(tmp_path) -> None:
+    queue = JobQueue(":memory:")
+    started = threading.Event()
+
+    def _slow(job: Dict[str, Any], context: Dict[str, Any], report, cancel) -> None:
+        started.set()
+        if cancel.wait(TIMEOUT):
+            raise InterruptedError("cancelled_by_user")
+
+    (job,) = queue.enqueue(_media(tmp_path, "a.wav"))
+    queue.start([("transcribe", _slow, lambda: 1)])
+    assert started.wait(TIMEOUT)
+    # A running job cannot be removed
+    assert not queue.remove_job(job["id"])
+
+    assert queue.cancel_job(job["id"])
+    _wait_until(lambda: _status(queue, job["id"]) == "cancelled")
+    assert not queue.cancel_job(job["id"])
+
+
+def test_paused_queue_starts_no_jobs(tmp_path) -> None:
+    queue = JobQueue(":memory:")
+    ran = threading.Event()
+    queue.set_paused(True)
+    (job,) = queue.enqueue(_media(tmp_path, "a.wav"))
+
+    queue.start([("transcribe", lambda *args: ran.set(), lambda: 1)])
+    time.sleep(0.2)
+    assert _status(queue, job["id"]) == "queued"
+    assert queue.snapshot()["paused"]
+
+    queue.set_paused(False)
+    assert ran.wait(TIMEOUT)
+    _wait_until(lambda: _status(queue, job["id"]) == "completed")
+
+
+def test_cancelling_a_waiting_job_frees_its_slot_at_once(tmp_path) -> None:
+    queue = JobQueue(":memory:")
+    release = threading.Event()
+    prepared: List[str] = []
+    updates: List[Dict[str, str]] = []
+
+    def _prepare(job: Dict[str, Any], context: Dict[str, Any], report, cancel) -> None:
+        prepared.append(job["id"])
+
+    def _transcribe(
+        job: Dict[str, Any], context: Dict[str, Any], report, cancel
+    ) -> None:
+        release.wait(TIMEOUT)
+
+    def _listener(event: str, data: Dict[str, Any]) -> None:
+        if event == "queue_updated":
+            updates.append({job["id"]: job["status"] for job in data["jobs"]})
+
+    first, second, third = (
+        job["id"] for job in queue.enqueue(_media(tmp_path, "a.wav", "b.wav", "c.wav"))
+    )
+    queue.start(
+        [("prepare", _prepare, lambda: 1), ("transcribe", _transcribe, lambda: 1)],
+        _listener,
+        prefetch=lambda: 1,
+    )
+    # The first job transcribes, the second waits for it, the third may not start
+    _wait_until(lambda: prepared == [first, second])
+
+    started = time.monotonic()
+    assert queue.cancel_job(second)
+    assert updates[-1][second] == "cancelled"
+    _wait_until(lambda: prepared == [first, second, third], timeout=2.0)
+    assert time.monotonic() - started < 2.0
+    release.set()
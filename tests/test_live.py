@@ -0,0 +1,191 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pytest
+
+from backend.core.live import LiveSession, LiveSource, LiveTranscriber, PcmSource
+from backend.core.media_io import SAMPLING_RATE
+from backend.core.srt_utils import SubtitleAppender
+from backend.models.schema import LiveOptions
+from backend.services.metrics import metrics
+
+OPTIONS = LiveOptions(step_seconds=2.0, max_window_seconds=10.0, stability_margin=1.0)
+
+
+def _audio(seconds: float) -> Any:
+    return np.zeros(int(seconds * SAMPLING_RATE), dtype=np.float32)
+
+
+class ScriptedDecoder:
+    """Returns segments (window-relative) from a script, one entry per pass."""
+
+    def __init__(self, passes: List[List[Dict[str, Any]]]) -> None:
+        self.passes = passes
+        self.windows: List[float] = []
+
+    def __call__(self, audio: Any, prompt: Optional[str]) -> List[Dict[str, Any]]:
+        self.windows.append(audio.shape[0] / SAMPLING_RATE)
+        return self.passes.pop(0) if self.passes else []
+
+
+def _seg(start: float, end: float, text: str) -> Dict[str, Any]:
+    return {"start": start, "end": end, "text": text}
+
+
+def test_live_source_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        LiveSource()  # type: ignore[abstract]
+
+
+def test_segment_commits_once_two_passes_agree() -> None:
+    decoder = ScriptedDecoder(
+        [
+            [_seg(0.0, 1.5, "hello"), _seg(2.0, 3.9, "wor")],
+            [_seg(0.0, 1.5, "Hello."), _seg(2.0, 3.5, "world"), _seg(4, 5.9, "a")],
+        ]
+    )
+    live = LiveTranscriber(decoder, OPTIONS)
+
+    live.feed(_audio(4.0))
+    committed, tentative = live.process()
+    assert committed == [] and len(tentative) == 2
+
+    live.feed(_audio(2.0))
+    committed, tentative = live.process()
+    assert [s["text"] for s in committed] == ["Hello."]
+    # "wor" became "world": a rollback of the tentative tail
+    assert [s["text"] for s in tentative] == ["world", "a"]
+    assert live.stats["rollbacks"] == 1
+    assert live.buffer_start == pytest.approx(1.5)
+
+
+def test_full_window_commits_all_but_the_last_segment() -> None:
+    decoder = ScriptedDecoder([[_seg(0, 4, "a"), _seg(4, 8, "b"), _seg(8, 11, "c")]])
+    live = LiveTranscriber(decoder, OPTIONS)
+
+    live.feed(_audio(11.0))
+    committed, tentative = live.process()
+
+    assert [s["text"] for s in committed] == ["a", "b"]
+    assert [s["text"] for s in tentative] == ["c"]
+    assert live.buffer_start == pytest.approx(8.0)
+
+
+def test_single_segment_spanning_a_full_window_is_committed() -> None:
+    decoder = ScriptedDecoder([[_seg(0.0, 11.8, "one long sentence")]])
+    live = LiveTranscriber(decoder, OPTIONS)
+
+    live.feed(_audio(12.0))
+    committed, tentative = live.process()
+
+    assert [s["text"] for s in committed] == ["one long sentence"]
+    assert tentative == []
+    assert live.buffer_start == pytest.approx(11.8)
+    assert live.buffer.shape[0] == int(0.2 * SAMPLING_RATE)
+
+
+def test_silent_full_window_slides_forward() -> None:
+    live = LiveTranscriber(ScriptedDecoder([]), OPTIONS)
+
+    live.feed(_audio(12.0))
+    assert live.process() == ([], [])
+    assert live.buffer_start == pytest.approx(11.0)
+
+
+class ListSource(LiveSource):
+    def __init__(self, chunks: List[Any]) -> None:
+        self._chunks = chunks
+
+    def chunks(self, stop_event: threading.Event) -> Iterator[Any]:
+        yield from self._chunks
+
+
+def _latency_count() -> int:
+    histogram = metrics.histogram("unisub_live_latency_seconds")
+    return int(histogram.snapshot().get("", {}).get("count", 0))
+
+
+def test_session_translates_and_commits_everything_at_the_end() -> None:
+    observed = _latency_count()
+    decoder = ScriptedDecoder([[_seg(0.0, 1.0, "hi"), _seg(1.5, 2.5, "there")]])
+    session = LiveSession(
+        ListSource([_audio(1.0), _audio(2.0)]),
+        decoder,
+        translate_fn=lambda texts: [t.upper() for t in texts],
+        options=OPTIONS,
+    )
+
+    stats = session.run()
+
+    assert [s["translated_text"] for s in session.segments] == ["HI", "THERE"]
+    assert stats["written"] == 2
+    assert stats["audio_seconds"] == 3.0
+    assert all(s["latency"] >= 0 for s in session.segments)
+    assert _latency_count() == observed + 2
+
+
+class SilentSource(LiveSource):
+    """Never yields and ignores the stop event, like a stalled input."""
+
+    def chunks(self, stop_event: threading.Event) -> Iterator[Any]:
+        threading.Event().wait(30)
+        yield from ()
+
+
+def test_cancel_ends_a_session_waiting_on_a_stalled_source() -> None:
+    cancel = threading.Event()
+    session = LiveSession(
+        SilentSource(), ScriptedDecoder([]), options=OPTIONS, cancel_event=cancel
+    )
+    threading.Timer(0.1, cancel.set).start()
+
+    started = time.monotonic()
+    session.run()
+
+    assert time.monotonic() - started < 2
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows pipes cannot be polled")
+def test_pcm_pipe_reader_stops_without_input(tmp_path) -> None:
+    path = str(tmp_path / "audio.pcm.fifo")
+    os.mkfifo(path)
+    # Held open for writing so the pipe never reaches EOF
+    writer = os.open(path, os.O_RDWR)
+    stop = threading.Event()
+    chunks: List[Any] = []
+    try:
+        os.write(writer, b"\x00\x40" * 4)
+        reader = threading.Thread(
+            target=lambda: chunks.extend(
+                PcmSource(path, poll_interval=0.05).chunks(stop)
+            )
+        )
+        reader.start()
+        time.sleep(0.2)
+        stop.set()
+        reader.join(2)
+    finally:
+        os.close(writer)
+
+    assert not reader.is_alive()
+    assert [chunk.tolist() for chunk in chunks] == [[0.5] * 4]
+
+
+def test_appender_writes_vtt_cues(tmp_path) -> None:
+    path = str(tmp_path / "live" / "a.vtt")
+    appender = SubtitleAppender(path, "vtt")
+    appender.append({"start": 0.0, "end": 1.5, "text": "hi"})
+    appender.append({"start": 2.0, "end": 3.0, "text": "x", "translated_text": "y"})
+    appender.close()
+
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == (
+            "WEBVTT\n\n"
+            "00:00:00.000 --> 00:00:01.500\nhi\n\n"
+            "00:00:02.000 --> 00:00:03.000\ny\n\n"
+        )
+    with pytest.raises(ValueError):
+        SubtitleAppender(path, "ass")
@@ -0,0 +1,95 @@
+import json
+import logging
+import queue
+import threading
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from backend.services.logger import (
+    _ContextHandler,
+    _JsonFormatter,
+    _TextFormatter,
+    current_log_context,
+    in_log_context,
+    log_context,
+)
+
+# Not registered with logging, so no other handler sees its records
+test_logger = logging.Logger("universal-sub-test")
+
+
+@pytest.fixture
+def records() -> Iterator["queue.SimpleQueue[logging.LogRecord]"]:
+    """Records as handed to the listener thread."""
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = _ContextHandler(log_queue)
+    test_logger.addHandler(handler)
+    yield log_queue
+    test_logger.removeHandler(handler)
+
+
+def _log(message: str, *args: Any) -> None:
+    test_logger.warning(message, *args)
+
+
+def _json(record: logging.LogRecord) -> Dict[str, Any]:
+    formatter = _JsonFormatter("%(levelname)s %(message)s")
+    return dict(json.loads(formatter.format(record)))
+
+
+def test_context_fields_are_top_level_json_keys(records) -> None:
+    with log_context(job_id="j1", stage=None):
+        with log_context(stage="transcribe"):
+            _log("stage_started")
+        _log("stage_done")
+    _log("idle")
+
+    inner, outer, idle = (_json(records.get_nowait()) for _ in range(3))
+    assert inner["job_id"] == "j1" and inner["stage"] == "transcribe"
+    assert "context" not in inner
+    assert outer["job_id"] == "j1" and "stage" not in outer
+    assert "job_id" not in idle and idle["message"] == "idle"
+
+
+def test_console_lines_end_with_the_context(records) -> None:
+    with log_context(job_id="j1", batch_id=3):
+        _log("batch_translated")
+
+    line = _TextFormatter("%(levelname)s %(message)s").format(records.get_nowait())
+    assert line == "WARNING batch_translated [job_id=j1 batch_id=3]"
+
+
+def test_arguments_are_formatted_by_the_listener(records) -> None:
+    class Expensive:
+        calls = 0
+
+        def __repr__(self) -> str:
+            Expensive.calls += 1
+            return "<expensive>"
+
+    _log("value: %r", Expensive())
+
+    record = records.get_nowait()
+    # Only queued on the calling thread; formatting happens on the listener
+    assert Expensive.calls == 0
+    assert record.msg == "value: %r"
+    assert _json(record)["message"] == "value: <expensive>"
+    assert Expensive.calls == 1
+
+
+def test_context_is_carried_into_threads() -> None:
+    seen: List[Dict[str, Any]] = []
+
+    def _worker() -> None:
+        seen.append(current_log_context())
+
+    with log_context(job_id="j1"):
+        plain = threading.Thread(target=_worker)
+        carried = threading.Thread(target=in_log_context(_worker, stage="translate"))
+    for thread in (plain, carried):
+        thread.start()
+        thread.join(5)
+
+    assert seen == [{}, {"job_id": "j1", "stage": "translate"}]
+    assert current_log_context() == {}
@@ -0,0 +1,70 @@
+import wave
+
+import numpy as np
+import pytest
+
+from backend.core.media_io import (
+    SAMPLING_RATE,
+    decode_audio_ranges,
+    in_ranges,
+    normalize_ranges,
+)
+
+
+@pytest.fixture
+def steps_wav(tmp_path) -> str:
+    """Five seconds of 16 kHz mono audio whose level is 1000 * the second."""
+    samples = np.repeat(np.arange(5, dtype=np.int16) * 1000, SAMPLING_RATE)
+    path = str(tmp_path / "steps.wav")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLING_RATE)
+        f.writeframes(samples.tobytes())
+    return path
+
+
+def test_normalize_ranges_sorts_merges_and_clips() -> None:
+    assert normalize_ranges(None) is None
+    assert normalize_ranges([]) is None
+    assert normalize_ranges([[10, 20], [0, 5], [4, 8], [30, None], [35, 40]]) == [
+        (0.0, 8.0),
+        (10.0, 20.0),
+        (30.0, None),
+    ]
+    # Empty and reversed ranges are dropped, negative starts clipped
+    assert normalize_ranges([[5, 5], [9, 3], [-2, 1]]) == [(0.0, 1.0)]
+    # Resuming drops what was already done
+    assert normalize_ranges([[0, 10], [20, 30]], start_offset=25) == [(25.0, 30.0)]
+
+
+def test_normalize_ranges_rejects_malformed_ranges() -> None:
+    with pytest.raises(ValueError):
+        normalize_ranges([[1, 2, 3]])
+    with pytest.raises(ValueError):
+        normalize_ranges([["start", 2]])
+
+
+def test_in_ranges_uses_the_midpoint() -> None:
+    ranges = [(10.0, 20.0), (30.0, None)]
+
+    assert in_ranges({"start": 9.0, "end": 12.0}, ranges)
+    assert not in_ranges({"start": 19.0, "end": 22.0}, ranges)
+    assert in_ranges({"start": 100.0, "end": 101.0}, ranges)
+
+
+def test_ranges_are_trimmed_after_the_preroll(steps_wav: str) -> None:
+    regions = decode_audio_ranges(steps_wav, [(2.0, 3.0), (4.0, None)])
+
+    assert [start for start, _ in regions] == [2.0, 4.0]
+    # The pre-roll decoded before each start is dropped sample-exactly
+    first, last = regions[0][1], regions[1][1]
+    assert first.shape[0] == SAMPLING_RATE
+    assert np.allclose(first, 2000 / 32768.0)
+    assert last.shape[0] == SAMPLING_RATE
+    assert np.allclose(last, 4000 / 32768.0)
+
+
+def test_missing_audio_stream_is_rejected(steps_wav: str) -> None:
+    with pytest.raises(ValueError, match="Audio stream 1 not found"):
+        decode_audio_ranges(steps_wav, None, audio_stream=1)
@@ -0,0 +1,89 @@
+from typing import List
+
+import pytest
+
+from backend.services.metrics import (
+    DEFAULT_BUCKETS,
+    RATIO_BUCKETS,
+    MetricRecord,
+    MetricsRegistry,
+    _Metric,
+)
+
+
+def test_counter_gauge_and_histogram_snapshot() -> None:
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs").inc(kind="a")
+    registry.counter("jobs_total").inc(2, kind="a")
+    registry.gauge("depth", "Depth").set(4)
+    histogram = registry.histogram("latency", "Latency", buckets=(1, 2, 5))
+    for value in (0.5, 1.5, 1.7, 10):
+        histogram.observe(value, stage="x")
+
+    snapshot = registry.snapshot()
+    assert snapshot["jobs_total"]["values"] == {"kind=a": 3.0}
+    assert snapshot["depth"]["values"] == {"": 4.0}
+    latency = snapshot["latency"]["values"]["stage=x"]
+    assert (latency["count"], latency["sum"], latency["p50"]) == (4, 13.7, 2)
+    # The slowest observation is past the last bucket
+    assert latency["p95"] is None
+
+
+def test_prometheus_exposition() -> None:
+    registry = MetricsRegistry()
+    registry.counter("events_total", "Events").inc(kind='say "hi"')
+    registry.histogram("seconds", buckets=(1,)).observe(0.5)
+
+    text = registry.to_prometheus()
+    assert "# HELP events_total Events\n# TYPE events_total counter\n" in text
+    assert 'events_total{kind="say \\"hi\\""} 1\n' in text
+    assert 'seconds_bucket{le="1"} 1\n' in text
+    assert 'seconds_bucket{le="+Inf"} 1\n' in text
+    assert "seconds_count 1\n" in text
+
+
+def test_name_reused_for_another_type_is_rejected() -> None:
+    registry = MetricsRegistry()
+    registry.counter("x")
+
+    with pytest.raises(ValueError):
+        registry.gauge("x")
+
+
+def test_metric_base_class_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        _Metric(MetricsRegistry(), "x", "")  # type: ignore[abstract]
+
+
+def test_forwarded_histograms_keep_their_buckets() -> None:
+    worker, gui = MetricsRegistry(), MetricsRegistry()
+    records: List[MetricRecord] = []
+    worker.set_forwarder(records.append)
+
+    worker.histogram("rtf", "RTF", buckets=RATIO_BUCKETS).observe(0.15, model="x")
+    worker.counter("done_total").inc()
+    worker.gauge("active").set(2)
+    for record in records:
+        gui.apply(record)
+
+    assert gui.histogram("rtf").buckets == RATIO_BUCKETS
+    assert gui.histogram("rtf").snapshot()["model=x"]["p50"] == 0.2
+    assert gui.snapshot()["done_total"]["values"] == {"": 1.0}
+    assert gui.snapshot()["active"]["values"] == {"": 2.0}
+    assert gui.histogram("other").buckets == DEFAULT_BUCKETS
+
+
+def test_broken_forwarder_and_collector_do_not_raise() -> None:
+    registry = MetricsRegistry()
+
+    def _broken_pipe(record: MetricRecord) -> None:
+        raise BrokenPipeError("gone")
+
+    def _failing_collector() -> None:
+        raise RuntimeError("boom")
+
+    registry.set_forwarder(_broken_pipe)
+    registry.add_collector(_failing_collector)
+    registry.counter("c").inc()
+
+    assert registry.snapshot()["c"]["values"] == {"": 1.0}
@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from backend.services.model_store import REQUIRED_FILES, ModelStore
+
+
+def _make_model(path: str) -> str:
+    os.makedirs(path, exist_ok=True)
+    for name in REQUIRED_FILES:
+        with open(os.path.join(path, name), "w", encoding="utf-8") as f:
+            f.write("{}")
+    return path
+
+
+@pytest.fixture
+def store(tmp_path) -> ModelStore:
+    store = ModelStore()
+    store.root = str(tmp_path / "models")
+    return store
+
+
+def test_install_find_and_remove(store: ModelStore, tmp_path) -> None:
+    staged = _make_model(str(tmp_path / "staged"))
+    entry = store.import_model(staged, "base", "int8")
+
+    assert entry["path"] == os.path.join(store.root, "base", "int8")
+    assert store.find("base", "int8") == entry["path"]
+    # Any installed variant of the size is used when the type is missing
+    assert store.find("base", "float16") == entry["path"]
+    assert store.remove("base", "int8")
+    assert not store.remove("base", "int8")
+    assert not os.path.exists(os.path.join(store.root, "base"))
+
+
+@pytest.mark.parametrize(
+    "model_size, compute_type",
+    [
+        ("..", "int8"),
+        ("base", ".."),
+        ("../../etc", "int8"),
+        ("base/../..", "int8"),
+        ("/tmp", "int8"),
+        (".hidden", "int8"),
+        ("base", "int8/.."),
+        ("", "int8"),
+    ],
+)
+def test_rejects_names_outside_the_store(
+    store: ModelStore, tmp_path, model_size: str, compute_type: str
+) -> None:
+    staged = _make_model(str(tmp_path / "staged"))
+
+    with pytest.raises(ValueError):
+        store.import_model(staged, model_size, compute_type)
+    with pytest.raises(ValueError):
+        store.remove(model_size, compute_type)
+    assert store.find(model_size, compute_type) is None
+
+
+def test_remove_refuses_symlink_out_of_the_store(store: ModelStore, tmp_path) -> None:
+    outside = _make_model(str(tmp_path / "outside" / "int8"))
+    os.makedirs(store.root)
+    os.symlink(os.path.dirname(outside), os.path.join(store.root, "base"))
+
+    with pytest.raises(ValueError):
+        store.remove("base", "int8")
+    assert os.path.isdir(outside)
+
+
+def test_hub_ids_are_not_looked_up(store: ModelStore) -> None:
+    assert store.find("Systran/faster-whisper-small", "int8") is None
+    assert store.resolve("Systran/faster-whisper-small", "int8") == (
+        "Systran/faster-whisper-small",
+        False,
+    )
@@ -0,0 +1,68 @@
+from typing import Optional
+
+import pytest
+
+from backend.core.presets import DECODING_PRESETS, job_decoding, resolve_decoding
+from backend.services.config_mgr import config_mgr
+
+
+@pytest.fixture
+def configured(monkeypatch):
+    def _set(model_size: str) -> None:
+        monkeypatch.setattr(config_mgr.config.whisper, "model_size", model_size)
+
+    return _set
+
+
+@pytest.mark.parametrize(
+    "model_size, expected",
+    [
+        ("tiny", None),
+        ("base", None),
+        ("large-v3", "base"),
+        ("small.en", "base.en"),
+        ("tiny.en", None),
+        ("/models/custom-ct2", None),
+    ],
+)
+def test_draft_never_loads_a_larger_model(
+    configured, model_size: str, expected: Optional[str]
+) -> None:
+    configured(model_size)
+
+    assert resolve_decoding("draft").model_size == expected
+
+
+def test_model_size_override_is_used_as_given(configured) -> None:
+    configured("tiny")
+
+    assert resolve_decoding("draft", {"model_size": "small"}).model_size == "small"
+
+
+def test_overrides_apply_on_top_of_the_preset(configured) -> None:
+    configured("small")
+    decoding = resolve_decoding("accurate", {"beam_size": 2, "unknown": 1})
+
+    assert decoding.beam_size == 2
+    assert decoding.best_of == DECODING_PRESETS["accurate"].best_of
+    assert not hasattr(decoding, "unknown")
+
+
+def test_unknown_preset_falls_back_to_balanced() -> None:
+    assert resolve_decoding("nope") == resolve_decoding("balanced")
+    assert resolve_decoding(None) == DECODING_PRESETS["balanced"]
+
+
+def test_job_decoding_layers_config_and_job_options(monkeypatch, caplog) -> None:
+    whisper = config_mgr.config.whisper
+    monkeypatch.setattr(whisper, "preset", "accurate")
+    monkeypatch.setattr(whisper, "decoding", {"beam_size": 3, "best_of": 2})
+    options = {"best_of": 4, "two_pass": True, "profile": True}
+
+    preset, decoding = job_decoding(options)
+
+    assert preset == "accurate"
+    assert (decoding.beam_size, decoding.best_of) == (3, 4)
+    assert "unknown_decoding_overrides_ignored" not in caplog.text
+    assert options == {"best_of": 4, "two_pass": True, "profile": True}
+    assert job_decoding({"preset": "draft"})[0] == "draft"
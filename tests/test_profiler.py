@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+from backend.services.config_mgr import config_mgr
+from backend.services.profiler import (
+    JobProfiler,
+    active_profiler,
+    profiling,
+    span,
+    start_profiler,
+)
+
+
+@pytest.fixture(autouse=True)
+def profiling_config(monkeypatch) -> None:
+    options = config_mgr.config.profiling
+    monkeypatch.setattr(options, "sample_interval", 0.005)
+    monkeypatch.setattr(options, "trace_memory", True)
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+def test_report_has_spans_samples_and_memory(tmp_path) -> None:
+    profiler = JobProfiler("job").start()
+    with profiler.span("work"):
+        _busy(0.1)
+    data = profiler.stop()
+
+    assert [s["name"] for s in data["spans"]] == ["work"]
+    assert any("_busy" in stack for stack in data["samples"])
+    assert data["memory"]["peak_bytes"] > 0
+    assert not tracemalloc.is_tracing()
+
+    path = profiler.write_report(str(tmp_path))
+    assert sorted(os.listdir(path)) == ["cpu.folded", "report.json", "report.txt"]
+    with open(os.path.join(path, "report.json"), encoding="utf-8") as f:
+        assert json.load(f)["label"] == "job"
+
+
+def test_only_one_job_is_profiled_at_a_time() -> None:
+    first = start_profiler("first")
+    assert first is not None
+    try:
+        assert start_profiler("second") is None
+        with pytest.raises(RuntimeError, match="first"):
+            JobProfiler("third").start()
+    finally:
+        first.stop()
+
+    again = start_profiler("again")
+    assert again is not None
+    again.stop()
+
+
+def test_concurrent_job_runs_unprofiled(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("backend.services.profiler.profiles_dir", lambda: str(tmp_path))
+    started = threading.Event()
+    release = threading.Event()
+    seen = []
+
+    def _job() -> None:
+        with profiling("first") as profiler:
+            seen.append(profiler)
+            started.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=_job, daemon=True)
+    thread.start()
+    assert started.wait(5)
+    with profiling("second") as second:
+        assert second is None
+        assert active_profiler() is None
+        # Spans are free no-ops without a profiler
+        with span("ignored"):
+            pass
+    release.set()
+    thread.join(5)
+
+    assert seen[0] is not None and seen[0].report_path is not None
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_tracing_started_elsewhere_is_left_running() -> None:
+    tracemalloc.start()
+    try:
+        JobProfiler("job").start().stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
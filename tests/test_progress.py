@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from backend.services import progress as progress_module
+from backend.services.progress import StageProgress, ThroughputHistory
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(progress_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch) -> ThroughputHistory:
+    history = ThroughputHistory()
+    history.path = str(tmp_path / "throughput.json")
+    monkeypatch.setattr(progress_module, "throughput_history", history)
+    return history
+
+
+def test_history_averages_runs_and_persists(history: ThroughputHistory) -> None:
+    history.record("transcribe:small:cpu", 10.0, 100.0)
+    history.record("transcribe:small:cpu", 20.0, 100.0)
+    # Too short to be a reliable rate
+    history.record("translate:x", 1.0, 10.0)
+
+    rate = 0.1 + progress_module.HISTORY_WEIGHT * (0.2 - 0.1)
+    assert history.get("transcribe:small:cpu") == pytest.approx(rate)
+    assert history.get("translate:x") is None
+
+    with open(history.path, encoding="utf-8") as f:
+        assert json.load(f)["transcribe:small:cpu"]["runs"] == 2
+    reloaded = ThroughputHistory()
+    reloaded.path = history.path
+    assert reloaded.get("transcribe:small:cpu") == pytest.approx(rate)
+
+
+def test_unreadable_history_is_ignored(history: ThroughputHistory) -> None:
+    with open(history.path, "w", encoding="utf-8") as f:
+        f.write("{not json")
+
+    assert history.get("transcribe:small:cpu") is None
+
+
+def test_eta_is_measured_from_the_first_report(clock, history) -> None:
+    stage = StageProgress("transcribe:small:cpu")
+    assert stage.eta is None
+
+    # Setup time before the first report does not count
+    clock.now += 30.0
+    stage.update(0.0, 100.0)
+    assert stage.eta is None
+    clock.now += 10.0
+    stage.update(50.0, 100.0)
+
+    assert stage.eta == 10.0
+    assert stage.status(20.0, 50.0) == {
+        "progress": 45,
+        "stage_progress": 50.0,
+        "eta": 10.0,
+    }
+    clock.now += 4.0
+    assert stage.eta == 6.0
+
+
+def test_resumed_work_is_not_part_of_the_rate(clock, history) -> None:
+    stage = StageProgress("transcribe:small:cpu")
+    stage.update(80.0, 100.0)
+    clock.now += 10.0
+    stage.update(90.0, 100.0)
+
+    assert stage.eta == 10.0
+    clock.now += 10.0
+    stage.finish()
+    assert stage.fraction == 1.0
+    assert history.get("transcribe:small:cpu") == pytest.approx(1.0)
+
+
+def test_prior_rate_gives_an_eta_before_any_work(clock, history) -> None:
+    history.record("transcribe:small:cpu", 20.0, 10.0)
+    assert StageProgress("transcribe:small:cpu").prior == pytest.approx(2.0)
+
+    stage = StageProgress("transcribe:tiny:cpu", fallback_rate=0.5)
+    stage.update(0.0, 100.0)
+    assert stage.eta == 50.0
+
+
+def test_eta_is_smoothed(clock, history) -> None:
+    stage = StageProgress("translate:x")
+    stage.update(0.0, 100.0)
+    clock.now += 10.0
+    stage.update(50.0, 100.0)
+    # One slow batch: the raw estimate jumps from 10s to 40 * 40/60s
+    clock.now += 30.0
+    stage.update(60.0, 100.0)
+
+    raw = 40.0 * 40.0 / 60.0
+    assert stage.eta == round(progress_module.ETA_SMOOTHING * raw, 1)
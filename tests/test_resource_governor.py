@@ -0,0 +1,198 @@
+import threading
+from typing import List, Tuple
+
+import pytest
+
+from backend.models.schema import ResourceLimits
+from backend.services import resource_governor as governor_module
+from backend.services.config_mgr import config_mgr
+from backend.services.hardware_mgr import hardware_mgr
+from backend.services.resource_governor import MB, ResourceGovernor
+
+
+@pytest.fixture
+def free_memory(monkeypatch) -> List[int]:
+    """Available memory in MB the governor sees; the last value repeats."""
+    readings: List[int] = [4096]
+
+    def _memory_info() -> dict:
+        available = readings.pop(0) if len(readings) > 1 else readings[0]
+        return {"total": 16384 * MB, "available": available * MB}
+
+    monkeypatch.setattr(hardware_mgr, "get_memory_info", _memory_info)
+    monkeypatch.setattr(governor_module, "PRESSURE_POLL_INTERVAL", 0.01)
+    limits = config_mgr.config.app.resources
+    monkeypatch.setattr(limits, "min_free_memory_mb", 1024)
+    monkeypatch.setattr(limits, "max_memory_mb", 0)
+    monkeypatch.setattr(limits, "pressure_free_memory_mb", 512)
+    return readings
+
+
+def _all_loadable(size: str, compute_type: str) -> bool:
+    return True
+
+
+def test_interventions_are_opt_in() -> None:
+    limits = ResourceLimits()
+    assert not limits.auto_downgrade
+    assert not limits.pause_under_pressure
+    assert limits.max_pause_seconds > 0
+
+
+def test_model_that_fits_is_kept(free_memory) -> None:
+    plan = ResourceGovernor().plan_model("small", "int8", "cpu", _all_loadable)
+    assert plan == ("small", "int8")
+
+
+def test_over_budget_model_is_kept_without_auto_downgrade(
+    monkeypatch, free_memory
+) -> None:
+    monkeypatch.setattr(config_mgr.config.app.resources, "auto_downgrade", False)
+    free_memory[:] = [2048]
+
+    plan = ResourceGovernor().plan_model("medium", "float32", "cpu", _all_loadable)
+
+    assert plan == ("medium", "float32")
+
+
+def test_auto_downgrade_tries_compute_type_before_size(
+    monkeypatch, free_memory
+) -> None:
+    monkeypatch.setattr(config_mgr.config.app.resources, "auto_downgrade", True)
+    # 1 GB budget: medium/int8 (~1.1 GB) and small/float32 (~1.3 GB) do not fit
+    free_memory[:] = [2048]
+    tried: List[Tuple[str, str]] = []
+
+    def _loadable(size: str, compute_type: str) -> bool:
+        tried.append((size, compute_type))
+        return True
+
+    plan = ResourceGovernor().plan_model("medium", "float32", "cpu", _loadable)
+
+    assert plan == ("small", "int8")
+    assert tried == [("medium", "int8"), ("small", "float32"), ("small", "int8")]
+
+
+def test_auto_downgrade_skips_models_that_cannot_load(monkeypatch, free_memory) -> None:
+    monkeypatch.setattr(config_mgr.config.app.resources, "auto_downgrade", True)
+    free_memory[:] = [1024 + 400]
+
+    plan = ResourceGovernor().plan_model(
+        "small", "int8", "cpu", lambda size, ct: size == "small"
+    )
+
+    # Nothing smaller is in the store, so the requested model is loaded
+    assert plan == ("small", "int8")
+
+
+def test_gpu_models_are_not_checked(monkeypatch, free_memory) -> None:
+    monkeypatch.setattr(config_mgr.config.app.resources, "auto_downgrade", True)
+    free_memory[:] = [0]
+
+    plan = ResourceGovernor().plan_model("large-v3", "float16", "cuda", _all_loadable)
+
+    assert plan == ("large-v3", "float16")
+
+
+def test_pause_ends_when_memory_recovers(monkeypatch, free_memory) -> None:
+    limits = config_mgr.config.app.resources
+    monkeypatch.setattr(limits, "pause_under_pressure", True)
+    monkeypatch.setattr(limits, "max_pause_seconds", 60)
+    free_memory[:] = [100, 100, 100, 4096]
+    stages: List[str] = []
+
+    resumed = ResourceGovernor().wait_for_headroom(
+        threading.Event(), lambda message, stage: stages.append(stage)
+    )
+
+    assert resumed
+    assert stages == ["paused", "transcribing"]
+    assert free_memory == [4096]
+
+
+def test_pause_is_bounded(monkeypatch, free_memory) -> None:
+    limits = config_mgr.config.app.resources
+    monkeypatch.setattr(limits, "pause_under_pressure", True)
+    monkeypatch.setattr(limits, "max_pause_seconds", 0.05)
+    free_memory[:] = [100]
+    governor = ResourceGovernor()
+
+    assert governor.wait_for_headroom(threading.Event())
+    # Memory is still short, but the job goes on without pausing again
+    free_memory[:] = [100]
+    calls: List[str] = []
+    assert governor.wait_for_headroom(None, lambda m, s: calls.append(s))
+    assert calls == []
+
+    # Once memory recovered, the next shortage pauses again
+    free_memory[:] = [4096]
+    assert governor.wait_for_headroom(None)
+    free_memory[:] = [100, 4096]
+    assert governor.wait_for_headroom(None, lambda m, s: calls.append(s))
+    assert calls == ["paused", "transcribing"]
+
+
+def test_cancel_ends_pause(monkeypatch, free_memory) -> None:
+    monkeypatch.setattr(config_mgr.config.app.resources, "pause_under_pressure", True)
+    free_memory[:] = [100]
+    cancel = threading.Event()
+    cancel.set()
+
+    assert not ResourceGovernor().wait_for_headroom(cancel)
+
+
+def test_plan_is_kept_while_its_model_is_loaded(monkeypatch) -> None:
+    from backend.core.whisper_svc import FasterWhisperService
+
+    monkeypatch.setattr(config_mgr.config.whisper, "auto_tune", False)
+    monkeypatch.setattr(config_mgr.config.whisper, "compute_type", "default")
+    plans: List[Tuple[str, str]] = [("medium", "int8"), ("small", "int8")]
+    calls: List[str] = []
+
+    def _plan_model(size: str, compute_type: str, device: str, loadable) -> tuple:
+        calls.append(size)
+        return plans.pop(0)
+
+    monkeypatch.setattr(governor_module.resource_governor, "plan_model", _plan_model)
+    service = FasterWhisperService()
+    requested = service._requested_key("large-v3")
+
+    with service._load_lock:
+        planned = service._planned_key(requested)
+    assert planned[0] == "medium"
+    service._models[planned] = object()
+    assert service.loaded_model("large-v3") == ("medium", "int8")
+
+    # The resident medium model shrinks the budget, but is not planned again
+    with service._load_lock:
+        assert service._planned_key(requested) == planned
+    assert calls == ["large-v3"]
+
+    # Once it was evicted, the budget is checked again
+    del service._models[planned]
+    with service._load_lock:
+        assert service._planned_key(requested)[0] == "small"
+    assert calls == ["large-v3", "large-v3"]
+
+
+def test_throughput_is_keyed_by_the_model_that_runs(monkeypatch) -> None:
+    from backend.core.whisper_svc import FasterWhisperService
+    from backend.models.schema import DecodingOptions
+
+    whisper = config_mgr.config.whisper
+    monkeypatch.setattr(whisper, "auto_tune", False)
+    monkeypatch.setattr(whisper, "device", "cpu")
+    monkeypatch.setattr(whisper, "compute_type", "default")
+    monkeypatch.setattr(
+        governor_module.resource_governor,
+        "plan_model",
+        lambda *args: ("small", "int8"),
+    )
+    service = FasterWhisperService()
+    decoding = DecodingOptions(model_size="large-v3")
+
+    # Before planning: the requested model, with the compute type resolved
+    assert service._throughput_key(decoding) == "transcribe:large-v3:cpu:int8"
+    with service._load_lock:
+        service._planned_key(service._requested_key("large-v3"))
+    assert service._throughput_key(decoding) == "transcribe:small:cpu:int8"
@@ -0,0 +1,67 @@
+from typing import Any, Dict
+
+from backend.core.segment_filter import SegmentFilter, filter_segments
+from backend.models.schema import SegmentFilterOptions
+
+
+def _segment(start: float, text: str, **extra: Any) -> Dict[str, Any]:
+    return {"start": start, "end": start + 1.0, "text": text, **extra}
+
+
+def test_empty_and_zero_length_segments_are_dropped() -> None:
+    segments = [
+        _segment(0.0, "  "),
+        _segment(1.0, "..."),
+        {"start": 2.0, "end": 2.01, "text": "blip"},
+        _segment(3.0, "kept"),
+    ]
+
+    kept, stats = filter_segments(segments)
+
+    assert kept == [segments[3]]
+    assert stats["empty"] == 3
+    assert stats["input"] == 4
+
+
+def test_low_confidence_needs_both_signals() -> None:
+    unsure = _segment(0.0, "music", no_speech_prob=0.9, avg_logprob=-1.5)
+    quiet_but_clear = _segment(1.0, "hello", no_speech_prob=0.9, avg_logprob=-0.2)
+    mumbled_speech = _segment(2.0, "hmm", no_speech_prob=0.1, avg_logprob=-1.5)
+
+    kept, stats = filter_segments([unsure, quiet_but_clear, mumbled_speech])
+
+    assert kept == [quiet_but_clear, mumbled_speech]
+    assert stats["low_confidence"] == 1
+
+
+def test_repetition_loop_is_collapsed() -> None:
+    loop = [_segment(float(i), "Thanks for watching!") for i in range(5)]
+    near = _segment(5.0, "thanks for watching")
+    after = _segment(6.0, "Something else")
+
+    kept, stats = filter_segments([*loop, near, after])
+
+    assert kept == [loop[0], loop[1], after]
+    assert stats["repeated"] == 4
+
+
+def test_repeats_must_be_consecutive() -> None:
+    segments = [
+        _segment(0.0, "yes"),
+        _segment(1.0, "no"),
+        _segment(2.0, "yes"),
+        _segment(3.0, "no"),
+    ]
+
+    assert filter_segments(segments, SegmentFilterOptions(max_repeats=1))[0] == (
+        segments
+    )
+
+
+def test_streamed_segments_are_judged_against_what_was_kept() -> None:
+    segment_filter = SegmentFilter(SegmentFilterOptions(max_repeats=1))
+
+    assert segment_filter.accept(_segment(0.0, "again"))
+    assert not segment_filter.accept(_segment(1.0, "again"))
+    assert segment_filter.accept(_segment(2.0, "new"))
+    assert segment_filter.stats["kept"] == 2
@@ -0,0 +1,62 @@
+from typing import Any, Dict, List
+
+from backend.api.segment_store import MAX_PAGE, SegmentStore
+
+
+def _segments(count: int, start: int = 0) -> List[Dict[str, Any]]:
+    return [{"start": float(i), "text": str(i)} for i in range(start, start + count)]
+
+
+def test_pages_are_capped() -> None:
+    store = SegmentStore()
+    store.append(_segments(MAX_PAGE + 10))
+
+    page = store.page(offset=5, limit=MAX_PAGE * 2)
+
+    assert len(page["segments"]) == MAX_PAGE
+    assert page["segments"][0]["text"] == "5"
+    assert page["total"] == MAX_PAGE + 10
+    assert store.page(offset=-3, limit=2)["segments"] == _segments(2)
+
+
+def test_since_returns_only_appended_segments() -> None:
+    store = SegmentStore()
+    first = store.append(_segments(3))
+    store.append(_segments(2, start=3))
+
+    delta = store.since(first)
+
+    assert [c["index"] for c in delta["changes"]] == [3, 4]
+    assert delta["total"] == 5
+    assert store.since(delta["version"])["changes"] == []
+
+
+def test_replace_marks_from_the_first_different_segment() -> None:
+    store = SegmentStore()
+    segments = _segments(4)
+    version = store.replace(segments)
+
+    refined = segments[:2] + [{"start": 2.0, "text": "two"}, segments[3]]
+    store.replace(refined)
+
+    # The object at index 3 is the same, but everything after a change moves
+    assert [c["index"] for c in store.since(version)["changes"]] == [2, 3]
+
+
+def test_since_respects_the_client_window() -> None:
+    store = SegmentStore()
+    store.append(_segments(10))
+
+    delta = store.since(0, offset=4, limit=3)
+
+    assert [c["index"] for c in delta["changes"]] == [4, 5, 6]
+
+
+def test_clear_shrinks_the_list() -> None:
+    store = SegmentStore()
+    store.append(_segments(3))
+
+    version = store.clear()
+
+    assert store.total == 0
+    assert store.since(0) == {"changes": [], "total": 0, "version": version}
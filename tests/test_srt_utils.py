@@ -0,0 +1,33 @@
+from backend.core.srt_utils import format_timestamp, load_srt, merge_segments, save_srt
+
+
+def test_merge_segments_replaces_only_the_ranges() -> None:
+    existing = [
+        {"start": 0.0, "end": 2.0, "text": "keep a"},
+        {"start": 10.0, "end": 12.0, "text": "old"},
+        {"start": 20.0, "end": 22.0, "text": "keep b"},
+    ]
+    replacements = [
+        {"start": 9.5, "end": 11.0, "text": "new 1"},
+        {"start": 11.0, "end": 13.0, "text": "new 2"},
+    ]
+
+    merged = merge_segments(existing, replacements, [(9.0, 15.0)])
+
+    assert [s["text"] for s in merged] == ["keep a", "new 1", "new 2", "keep b"]
+
+
+def test_srt_round_trip_restores_source_text(tmp_path) -> None:
+    path = str(tmp_path / "a.srt")
+    segments = [
+        {"start": 1.5, "end": 3.25, "text": "Hallo", "translated_text": "Hello"},
+        {"start": 3661.0, "end": 3662.0, "text": "Zwei\nZeilen"},
+    ]
+
+    save_srt(segments, path)
+    loaded = load_srt(path, transcript=segments)
+
+    assert format_timestamp(3661.0) == "01:01:01,000"
+    assert [(s["start"], s["end"]) for s in loaded] == [(1.5, 3.25), (3661.0, 3662.0)]
+    assert [s["translated_text"] for s in loaded] == ["Hello", "Zwei\nZeilen"]
+    assert [s["text"] for s in loaded] == ["Hallo", "Zwei\nZeilen"]
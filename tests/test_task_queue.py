@@ -0,0 +1,169 @@
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from backend.services.task_queue import LeaseQueue, NewTask
+
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    return str(tmp_path / "tasks.db")
+
+
+def _submit(queue: LeaseQueue, chunks: int = 1) -> Dict[str, Any]:
+    tasks: List[NewTask] = [
+        ("transcribe", {"range": [i, i + 1]}) for i in range(chunks)
+    ]
+    return queue.submit("/media/a.wav", "English", tasks)
+
+
+def _job(queue: LeaseQueue, job_id: str) -> Dict[str, Any]:
+    job = queue.get_job(job_id)
+    assert job is not None
+    return job
+
+
+def _claim(queue: LeaseQueue, worker: str) -> Dict[str, Any]:
+    task = queue.claim(worker, lease_seconds=30)
+    assert task is not None
+    return task
+
+
+def test_expired_lease_is_leased_again(db_path: str) -> None:
+    queue = LeaseQueue(db_path)
+    job = _submit(queue)
+
+    first = queue.claim("w1", lease_seconds=0.05)
+    assert first is not None and first["job"]["id"] == job["id"]
+    assert queue.claim("w2", lease_seconds=0.05) is None
+    time.sleep(0.1)
+
+    second = queue.claim("w2", lease_seconds=30)
+    assert second is not None
+    assert (second["id"], second["worker"], second["attempts"]) == (
+        first["id"],
+        "w2",
+        2,
+    )
+    # The first worker lost the task: it can neither renew nor complete it
+    assert not queue.heartbeat(first["id"], "w1", 30)
+    assert not queue.complete(first["id"], "w1", [])
+    assert queue.heartbeat(second["id"], "w2", 30)
+    assert queue.complete(second["id"], "w2", [])
+    assert _job(queue, job["id"])["status"] == "completed"
+
+
+def test_job_fails_after_max_attempts_of_lost_leases(db_path: str) -> None:
+    queue = LeaseQueue(db_path, max_attempts=2)
+    job = _submit(queue)
+
+    for worker in ("w1", "w2"):
+        assert queue.claim(worker, lease_seconds=0.01) is not None
+        time.sleep(0.05)
+
+    assert queue.claim("w3", lease_seconds=30) is None
+    failed = _job(queue, job["id"])
+    assert failed["status"] == "failed"
+    assert "lost its worker" in failed["message"]
+    assert queue.progress(job["id"]) == {"transcribe": {"failed": 1}}
+
+
+def test_job_fails_after_max_attempts_of_errors(db_path: str) -> None:
+    queue = LeaseQueue(db_path, max_attempts=2)
+    job = _submit(queue)
+
+    task = _claim(queue, "w1")
+    queue.fail(task["id"], "w1", "boom")
+    assert _job(queue, job["id"])["status"] == "running"
+    task = _claim(queue, "w1")
+    assert task["attempts"] == 2
+    queue.fail(task["id"], "w1", "boom again")
+
+    assert _job(queue, job["id"])["status"] == "failed"
+    assert _job(queue, job["id"])["message"] == "boom again"
+    assert queue.claim("w1", lease_seconds=30) is None
+
+
+def test_release_does_not_use_an_attempt(db_path: str) -> None:
+    queue = LeaseQueue(db_path, max_attempts=1)
+    _submit(queue)
+
+    task = _claim(queue, "w1")
+    queue.release(task["id"], "w1")
+
+    again = queue.claim("w2", lease_seconds=30)
+    assert again is not None and again["attempts"] == 1
+
+
+def test_next_stage_is_created_exactly_once(db_path: str) -> None:
+    chunks = 8
+    _submit(LeaseQueue(db_path), chunks)
+    calls: List[List[Any]] = []
+    barrier = threading.Barrier(chunks)
+
+    def _on_stage_done(
+        job: Dict[str, Any], kind: str, results: List[Any]
+    ) -> List[NewTask]:
+        calls.append(results)
+        return [("translate", {"segments": results})] if kind == "transcribe" else []
+
+    def _work(worker: str) -> None:
+        # One connection per worker, like separate processes
+        queue = LeaseQueue(db_path)
+        task = queue.claim(worker, lease_seconds=30)
+        assert task is not None
+        barrier.wait()
+        assert queue.complete(task["id"], worker, task["seq"], _on_stage_done)
+
+    threads = [threading.Thread(target=_work, args=(f"w{i}",)) for i in range(chunks)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [list(range(chunks))]
+    queue = LeaseQueue(db_path)
+    translate = queue.claim("w0", lease_seconds=30, kinds=["translate"])
+    assert translate is not None
+    assert translate["payload"] == {"segments": list(range(chunks))}
+    assert queue.claim("w1", lease_seconds=30, kinds=["translate"]) is None
+
+
+def test_stage_error_fails_the_job(db_path: str) -> None:
+    queue = LeaseQueue(db_path)
+    job = _submit(queue)
+
+    def _no_speech(job: Dict[str, Any], kind: str, results: List[Any]) -> List[NewTask]:
+        raise ValueError("No speech detected in this media file.")
+
+    task = _claim(queue, "w1")
+    assert queue.complete(task["id"], "w1", [], _no_speech)
+    assert _job(queue, job["id"])["message"] == "No speech detected in this media file."
+
+
+def test_failed_begin_releases_the_lock(db_path: str) -> None:
+    queue = LeaseQueue(db_path)
+    _submit(queue)
+    # Another process holds the write lock past the busy timeout
+    blocker = sqlite3.connect(db_path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    queue._db().execute("PRAGMA busy_timeout = 10")
+
+    with pytest.raises(sqlite3.OperationalError):
+        queue.claim("w1", lease_seconds=30)
+    blocker.execute("ROLLBACK")
+
+    acquired = queue._lock.acquire(timeout=1)
+    assert acquired
+    queue._lock.release()
+    # Other threads can use the queue again
+    result: List[Any] = []
+    thread = threading.Thread(
+        target=lambda: result.append(queue.claim("w2", 30)), daemon=True
+    )
+    thread.start()
+    thread.join(timeout=5)
+    assert result and result[0] is not None
@@ -0,0 +1,131 @@
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pytest
+
+from backend.core.two_pass import RefinementJob, RefinementMerger, normalize_text
+
+
+def _segment(start: float, end: float, text: str, **extra: Any) -> Dict[str, Any]:
+    return {"start": start, "end": end, "text": text, **extra}
+
+
+def test_normalize_text_ignores_case_spacing_and_punctuation() -> None:
+    assert normalize_text("Hello, World!") == normalize_text("hello world")
+    assert normalize_text("ｈｅｌｌｏ") == "hello"
+    assert normalize_text("hello") != normalize_text("help")
+
+
+def test_unchanged_segment_reuses_the_draft_translation() -> None:
+    merger = RefinementMerger(
+        [
+            _segment(0.0, 2.0, "Hello there.", translated_text="Hola."),
+            _segment(2.0, 4.0, "How are you", translated_text="¿Cómo estás?"),
+        ]
+    )
+    refined = _segment(1.9, 4.1, "how are you?")
+
+    assert not merger.merge(refined)
+    assert refined["translated_text"] == "¿Cómo estás?"
+    assert (merger.reused, merger.changed) == (1, 0)
+
+
+def test_corrected_segment_needs_translating() -> None:
+    merger = RefinementMerger(
+        [_segment(0.0, 2.0, "Hollow there", translated_text="Hueco.")]
+    )
+    refined = _segment(0.0, 2.0, "Hello there")
+
+    assert merger.merge(refined)
+    assert "translated_text" not in refined
+    assert (merger.reused, merger.changed) == (0, 1)
+
+
+def test_segment_without_overlap_or_draft_translation_needs_translating() -> None:
+    merger = RefinementMerger(
+        [
+            _segment(0.0, 2.0, "untranslated"),
+            _segment(5.0, 6.0, "later", translated_text="luego"),
+        ]
+    )
+
+    assert merger.merge(_segment(0.0, 2.0, "untranslated"))
+    assert merger.merge(_segment(3.0, 4.0, "later"))
+    assert merger.changed == 2
+
+
+def _job(
+    segments: List[Dict[str, Any]], error: bool = False
+) -> Tuple[RefinementJob, threading.Event]:
+    release = threading.Event()
+
+    def _produce(cancel: threading.Event) -> Iterator[Dict[str, Any]]:
+        yield segments[0]
+        # The rest arrive together, after the first batch was taken
+        release.wait(5)
+        yield from segments[1:]
+        if error:
+            raise RuntimeError("decoder failed")
+
+    return RefinementJob(_produce).start(), release
+
+
+def test_batches_take_what_is_available() -> None:
+    segments = [_segment(float(i), i + 1.0, str(i)) for i in range(5)]
+    job, release = _job(segments)
+    batches = job.batches(max_size=3)
+
+    first = next(batches)
+    release.set()
+    rest = list(batches)
+
+    assert first == segments[:1]
+    assert [s for batch in rest for s in batch] == segments[1:]
+    assert all(len(batch) <= 3 for batch in rest)
+
+
+def test_batches_reraise_producer_errors() -> None:
+    job, release = _job([_segment(0.0, 1.0, "a"), _segment(1.0, 2.0, "b")], True)
+    release.set()
+
+    with pytest.raises(RuntimeError, match="decoder failed"):
+        list(job.batches(max_size=10))
+
+
+def _endless(produced: List[int]) -> Any:
+    def _produce(cancel: threading.Event) -> Iterator[Dict[str, Any]]:
+        while not cancel.is_set():
+            produced.append(len(produced))
+            yield _segment(float(len(produced)), len(produced) + 1.0, "x")
+
+    return _produce
+
+
+def test_decoder_waits_for_a_slow_consumer() -> None:
+    produced: List[int] = []
+    job = RefinementJob(_endless(produced), max_pending=4).start()
+
+    batches = job.batches(max_size=2)
+    next(batches)
+    time.sleep(0.3)
+    # Two handed out, four queued and one waiting for room
+    assert len(produced) == 7
+
+    job.cancel()
+    assert job.join(5)
+
+
+def test_task_cancel_stops_the_job_and_its_decoder() -> None:
+    produced: List[int] = []
+    task_cancel = threading.Event()
+    job = RefinementJob(_endless(produced), cancel_event=task_cancel).start()
+    batches = job.batches(max_size=1)
+    next(batches)
+
+    task_cancel.set()
+    for _ in batches:
+        pass
+
+    assert job.cancel_event.is_set()
+    assert job.join(5)
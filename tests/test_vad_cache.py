@@ -0,0 +1,69 @@
+import os
+from typing import Any, Dict
+
+import pytest
+
+from backend.core.vad_cache import SAMPLING_RATE, VadCache
+
+PARAMS: Dict[str, Any] = {"threshold": 0.5, "min_silence_duration_ms": 500}
+
+
+@pytest.fixture
+def cache(tmp_path) -> VadCache:
+    cache = VadCache()
+    cache.cache_dir = str(tmp_path / "vad")
+    return cache
+
+
+@pytest.fixture
+def media(tmp_path) -> str:
+    path = tmp_path / "a.mkv"
+    path.write_bytes(b"media")
+    return str(path)
+
+
+def _speech_map() -> Dict[str, Any]:
+    chunks = [
+        {"start": 0, "end": SAMPLING_RATE},
+        {"start": 2 * SAMPLING_RATE, "end": 3 * SAMPLING_RATE},
+    ]
+    return {"chunks": chunks, **VadCache.compute_stats(chunks, 4.0)}
+
+
+def test_stats_describe_the_speech() -> None:
+    assert _speech_map()["speech_seconds"] == 2.0
+    assert _speech_map()["speech_ratio"] == 0.5
+    assert _speech_map()["chunk_count"] == 2
+    assert VadCache.compute_stats([], 0.0)["speech_ratio"] == 0.0
+
+
+def test_saved_map_is_served_without_vad(cache: VadCache, media: str) -> None:
+    assert cache.load(media, PARAMS) is None
+    cache._save(media, PARAMS, _speech_map())
+
+    assert cache.load(media, PARAMS) == _speech_map()
+    # A hit never decodes the audio or loads the VAD model
+    assert cache.get_speech_map(media, dict(reversed(PARAMS.items()))) == _speech_map()
+
+
+def test_key_changes_with_params_stream_and_file(cache: VadCache, media: str) -> None:
+    cache._save(media, PARAMS, _speech_map())
+
+    assert cache.load(media, {**PARAMS, "threshold": 0.6}) is None
+    assert cache.load(media, PARAMS, audio_stream=1) is None
+    stat = os.stat(media)
+    os.utime(media, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.load(media, PARAMS) is None
+
+
+def test_default_stream_keeps_the_original_key(cache: VadCache, media: str) -> None:
+    assert cache._cache_key(media, PARAMS) == cache._cache_key(media, PARAMS, 0)
+    assert cache._cache_key(media, PARAMS) != cache._cache_key(media, PARAMS, 1)
+
+
+def test_unreadable_entry_is_a_miss(cache: VadCache, media: str) -> None:
+    cache._save(media, PARAMS, _speech_map())
+    with open(cache._cache_path(cache._cache_key(media, PARAMS)), "w") as f:
+        f.write("{broken")
+
+    assert cache.load(media, PARAMS) is None
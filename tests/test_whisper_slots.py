@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List
+
+import pytest
+
+from backend.core.whisper_svc import FasterWhisperService
+from backend.services.config_mgr import config_mgr
+
+TIMEOUT = 5.0
+
+
+class BlockingDecoder:
+    """Stands in for _transcribe_local; every job runs until released."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.running: List[str] = []
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, media_path: str, *args: Any) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            self.running.append(media_path)
+            self.peak = max(self.peak, len(self.running))
+        self.release.wait(TIMEOUT)
+        with self._lock:
+            self.running.remove(media_path)
+        yield {"text": media_path}
+
+
+@pytest.fixture
+def decoder(monkeypatch) -> BlockingDecoder:
+    config = config_mgr.config.whisper
+    monkeypatch.setattr(config, "isolated_worker", False)
+    monkeypatch.setattr(config, "max_concurrent_jobs", 2)
+    return BlockingDecoder()
+
+
+def _service(monkeypatch, decoder: BlockingDecoder) -> FasterWhisperService:
+    service = FasterWhisperService()
+    monkeypatch.setattr(service, "_transcribe_local", decoder)
+    return service
+
+
+def _wait_until(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_jobs_beyond_the_limit_wait_for_a_slot(monkeypatch, decoder) -> None:
+    service = _service(monkeypatch, decoder)
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    statuses: List[str] = []
+
+    def _run(path: str) -> None:
+        results[path] = list(
+            service.transcribe(path, status_callback=lambda m, s: statuses.append(s))
+        )
+
+    threads = [
+        threading.Thread(target=_run, args=(f"{i}.wav",), daemon=True) for i in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    _wait_until(lambda: len(decoder.running) == 2 and statuses == ["queued"])
+    assert service._active_jobs == 2
+
+    decoder.release.set()
+    for thread in threads:
+        thread.join(TIMEOUT)
+    assert decoder.peak == 2
+    assert sorted(results) == ["0.wav", "1.wav", "2.wav"]
+    assert all(len(segments) == 1 for segments in results.values())
+    assert service._active_jobs == 0
+
+
+def test_cancel_while_waiting_gives_up_the_turn(monkeypatch, decoder) -> None:
+    monkeypatch.setattr(config_mgr.config.whisper, "max_concurrent_jobs", 1)
+    service = _service(monkeypatch, decoder)
+    first = threading.Thread(
+        target=lambda: list(service.transcribe("a.wav")), daemon=True
+    )
+    first.start()
+    _wait_until(lambda: decoder.running == ["a.wav"])
+
+    cancel = threading.Event()
+    cancel.set()
+    assert list(service.transcribe("b.wav", cancel_event=cancel)) == []
+
+    decoder.release.set()
+    first.join(TIMEOUT)
+    assert service._active_jobs == 0
+
+
+def test_slot_is_released_when_the_consumer_stops_early(monkeypatch, decoder) -> None:
+    monkeypatch.setattr(config_mgr.config.whisper, "max_concurrent_jobs", 1)
+    service = _service(monkeypatch, decoder)
+    decoder.release.set()
+
+    segments = service.transcribe("a.wav")
+    next(segments)
+    assert service._active_jobs == 1
+    segments.close()
+
+    assert service._active_jobs == 0
+    assert list(service.transcribe("b.wav")) == [{"text": "b.wav"}]
@@ -0,0 +1,208 @@
+import threading
+import time
+from multiprocessing import Pipe
+from typing import Any, Callable, List
+
+import pytest
+
+from backend.core import whisper_worker as worker_module
+from backend.core.whisper_svc import whisper_svc
+from backend.core.whisper_worker import (
+    MSG_ACCEPTED,
+    MSG_ANALYZE,
+    MSG_CALIBRATE,
+    MSG_DONE,
+    MSG_MODEL,
+    MSG_PROGRESS,
+    MSG_RESULT,
+    MSG_SEGMENT,
+    MSG_TRANSCRIBE,
+    WhisperWorkerClient,
+)
+from backend.services.config_mgr import config_mgr
+
+# Fake worker: receives the job, answers on the connection, then returns
+# its exit code (the connection is closed when it returns)
+Behaviour = Callable[[Any, tuple], int]
+
+
+class FakeProcess:
+    def __init__(self) -> None:
+        self.alive = True
+        self.exitcode: Any = None
+        self.pid = 0
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def join(self, timeout: Any = None) -> None:
+        pass
+
+
+def _client(behaviours: List[Behaviour]) -> WhisperWorkerClient:
+    """A client whose workers are threads running the given behaviours in turn."""
+    client = WhisperWorkerClient()
+
+    def _ensure_started() -> Any:
+        if client._process is not None and client._process.is_alive():
+            return client._process
+        behaviour = behaviours.pop(0)
+        parent_conn, child_conn = Pipe(duplex=True)
+        process = FakeProcess()
+
+        def _worker() -> None:
+            msg = child_conn.recv()
+            assert msg[0] in (MSG_TRANSCRIBE, MSG_ANALYZE, MSG_CALIBRATE)
+            process.exitcode = behaviour(child_conn, msg)
+            process.alive = False
+            child_conn.close()
+
+        threading.Thread(target=_worker, daemon=True).start()
+        client._process, client._conn = process, parent_conn
+        threading.Thread(
+            target=client._read_loop, args=(process, parent_conn), daemon=True
+        ).start()
+        return process
+
+    client._ensure_started = _ensure_started  # type: ignore[method-assign]
+    return client
+
+
+def _exit_on_idle(conn: Any, msg: tuple) -> int:
+    return 0
+
+
+def _transcribe(conn: Any, msg: tuple) -> int:
+    job_id = msg[1]
+    conn.send((MSG_ACCEPTED, job_id))
+    conn.send((MSG_SEGMENT, job_id, {"text": msg[2]}))
+    conn.send((MSG_DONE, job_id))
+    return 0
+
+
+def _analyze(conn: Any, msg: tuple) -> int:
+    conn.send((MSG_ACCEPTED, msg[1]))
+    conn.send((MSG_RESULT, msg[1], {"media": msg[2], **msg[3]}))
+    return 0
+
+
+def _crash_after_accepting(conn: Any, msg: tuple) -> int:
+    conn.send((MSG_ACCEPTED, msg[1]))
+    return 0
+
+
+def test_job_lost_to_idle_exit_is_resent() -> None:
+    behaviours: List[Behaviour] = [_exit_on_idle, _transcribe]
+    client = _client(behaviours)
+
+    segments = list(client.transcribe("a.wav"))
+
+    assert segments == [{"text": "a.wav"}]
+    assert behaviours == []
+    assert client._jobs == {}
+
+
+def test_accepted_job_is_not_resent() -> None:
+    behaviours: List[Behaviour] = [_crash_after_accepting, _transcribe]
+    client = _client(behaviours)
+
+    with pytest.raises(RuntimeError, match="exited unexpectedly"):
+        list(client.transcribe("a.wav"))
+    assert len(behaviours) == 1
+
+
+def test_job_is_resent_only_once() -> None:
+    behaviours: List[Behaviour] = [_exit_on_idle, _exit_on_idle, _transcribe]
+    client = _client(behaviours)
+
+    with pytest.raises(RuntimeError, match="exited unexpectedly"):
+        list(client.transcribe("a.wav"))
+    assert len(behaviours) == 1
+
+
+def test_next_job_starts_a_new_worker() -> None:
+    behaviours: List[Behaviour] = [_transcribe, _transcribe]
+    client = _client(behaviours)
+
+    assert list(client.transcribe("a.wav")) == [{"text": "a.wav"}]
+    # Wait for the reader to see the first worker go
+    first = client._process
+    for _ in range(100):
+        if client._process is not first:
+            break
+        time.sleep(0.05)
+    assert list(client.transcribe("b.wav")) == [{"text": "b.wav"}]
+    assert behaviours == []
+
+
+def test_analysis_runs_in_the_worker() -> None:
+    behaviours: List[Behaviour] = [_exit_on_idle, _analyze]
+    client = _client(behaviours)
+
+    stats = client.analyze_media("a.wav", audio_stream=1)
+
+    assert stats == {"media": "a.wav", "audio_stream": 1}
+    assert behaviours == []
+    assert client._jobs == {}
+
+
+def test_analysis_is_delegated_to_the_worker(monkeypatch) -> None:
+    monkeypatch.setattr(config_mgr.config.whisper, "isolated_worker", True)
+    calls: List[Any] = []
+
+    def _analyze_media(media_path: str, **kwargs: Any) -> dict:
+        calls.append((media_path, kwargs["audio_stream"]))
+        return {}
+
+    monkeypatch.setattr(worker_module.whisper_worker, "analyze_media", _analyze_media)
+
+    assert whisper_svc.analyze_media("a.wav", audio_stream=2) == {}
+    assert calls == [("a.wav", 2)]
+
+
+def test_loaded_model_is_reported() -> None:
+    def _downgraded(conn: Any, msg: tuple) -> int:
+        conn.send((MSG_ACCEPTED, msg[1]))
+        conn.send((MSG_MODEL, msg[1], "base", "int8"))
+        return _transcribe(conn, msg)
+
+    client = _client([_downgraded])
+    models: List[Any] = []
+
+    segments = list(
+        client.transcribe("a.wav", model_callback=lambda *m: models.append(m))
+    )
+
+    assert segments == [{"text": "a.wav"}]
+    assert models == [("base", "int8")]
+
+
+def test_calibration_runs_in_the_worker() -> None:
+    def _calibrate(conn: Any, msg: tuple) -> int:
+        conn.send((MSG_ACCEPTED, msg[1]))
+        conn.send((MSG_PROGRESS, msg[1], 50.0, "Benchmarking int8..."))
+        conn.send((MSG_RESULT, msg[1], {"sample_path": msg[2]}))
+        return 0
+
+    client = _client([_calibrate])
+    progress: List[Any] = []
+
+    profile = client.calibrate("a.wav", progress_callback=lambda *p: progress.append(p))
+
+    assert profile == {"sample_path": "a.wav"}
+    assert progress == [(50.0, "Benchmarking int8...")]
+    assert client._jobs == {}
+
+
+def test_calibration_is_delegated_to_the_worker(monkeypatch) -> None:
+    monkeypatch.setattr(config_mgr.config.whisper, "isolated_worker", True)
+    calls: List[Any] = []
+
+    def _calibrate(sample_path: Any, **kwargs: Any) -> dict:
+        calls.append(sample_path)
+        return {"rtf": 0.1}
+
+    monkeypatch.setattr(worker_module.whisper_worker, "calibrate", _calibrate)
+
+    assert whisper_svc.calibrate("a.wav") == {"rtf": 0.1}
+    assert calls == ["a.wav"]